@@ -0,0 +1,97 @@
+"""Baseline schema (users and prediction tables)
+
+Databases created earlier with init_db.py already have these tables;
+mark them with `alembic stamp 0001` instead of upgrading.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    op.create_table(
+        "crop_predictions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("nitrogen", sa.Float(), nullable=True),
+        sa.Column("phosphorus", sa.Float(), nullable=True),
+        sa.Column("potassium", sa.Float(), nullable=True),
+        sa.Column("temperature", sa.Float(), nullable=True),
+        sa.Column("humidity", sa.Float(), nullable=True),
+        sa.Column("ph", sa.Float(), nullable=True),
+        sa.Column("rainfall", sa.Float(), nullable=True),
+        sa.Column("recommended_crop", sa.String(), nullable=True),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column("alternative_crops", sa.Text(), nullable=True),
+        sa.Column("reasoning", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_crop_predictions_id", "crop_predictions", ["id"])
+
+    op.create_table(
+        "disease_predictions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("disease", sa.String(), nullable=True),
+        sa.Column("confidence", sa.Float(), nullable=True),
+        sa.Column("severity", sa.String(), nullable=True),
+        sa.Column("affected_plant", sa.String(), nullable=True),
+        sa.Column("image_path", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_disease_predictions_id", "disease_predictions", ["id"])
+
+    op.create_table(
+        "irrigation_schedules",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("crop_type", sa.String(), nullable=True),
+        sa.Column("soil_moisture", sa.Float(), nullable=True),
+        sa.Column("temperature", sa.Float(), nullable=True),
+        sa.Column("humidity", sa.Float(), nullable=True),
+        sa.Column("rainfall", sa.Float(), nullable=True),
+        sa.Column("crop_stage", sa.String(), nullable=True),
+        sa.Column("irrigation_needed", sa.Boolean(), nullable=True),
+        sa.Column("water_amount", sa.Float(), nullable=True),
+        sa.Column("schedule", sa.Text(), nullable=True),
+        sa.Column("next_irrigation", sa.String(), nullable=True),
+        sa.Column("reasoning", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_irrigation_schedules_id", "irrigation_schedules", ["id"])
+
+
+def downgrade():
+    op.drop_table("irrigation_schedules")
+    op.drop_table("disease_predictions")
+    op.drop_table("crop_predictions")
+    op.drop_table("users")
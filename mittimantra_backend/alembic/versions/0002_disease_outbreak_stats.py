@@ -0,0 +1,50 @@
+"""Disease region column and outbreak summary tables
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("disease_predictions") as batch_op:
+        batch_op.add_column(sa.Column("region", sa.String(), nullable=True))
+
+    op.create_table(
+        "disease_outbreak_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bucket_date", sa.Date(), nullable=False),
+        sa.Column("disease", sa.String(), nullable=False),
+        sa.Column("affected_plant", sa.String(), nullable=False),
+        sa.Column("region", sa.String(), nullable=False),
+        sa.Column("detection_count", sa.Integer(), nullable=False),
+        sa.Column("confidence_sum", sa.Float(), nullable=False),
+        sa.Column("high_severity_count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("bucket_date", "disease", "affected_plant", "region", name="uq_disease_outbreak_bucket"),
+    )
+    op.create_index("ix_disease_outbreak_stats_id", "disease_outbreak_stats", ["id"])
+    op.create_index("ix_disease_outbreak_stats_bucket_date", "disease_outbreak_stats", ["bucket_date"])
+
+    op.create_table(
+        "aggregation_watermarks",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("last_id", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade():
+    op.drop_table("aggregation_watermarks")
+    op.drop_table("disease_outbreak_stats")
+    with op.batch_alter_table("disease_predictions") as batch_op:
+        batch_op.drop_column("region")
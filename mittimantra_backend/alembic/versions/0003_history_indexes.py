@@ -0,0 +1,25 @@
+"""Composite (user_id, created_at, id) indexes for history pagination
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+HISTORY_TABLES = ["crop_predictions", "disease_predictions", "irrigation_schedules"]
+
+
+def upgrade():
+    for table in HISTORY_TABLES:
+        op.create_index(f"ix_{table}_user_created", table, ["user_id", "created_at", "id"])
+
+
+def downgrade():
+    for table in HISTORY_TABLES:
+        op.drop_index(f"ix_{table}_user_created", table_name=table)
@@ -0,0 +1,35 @@
+"""Per-user prediction statistics table
+
+Run backfill_user_stats.py after upgrading to populate existing users.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_stats",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("crop_prediction_count", sa.Integer(), nullable=False),
+        sa.Column("disease_prediction_count", sa.Integer(), nullable=False),
+        sa.Column("irrigation_schedule_count", sa.Integer(), nullable=False),
+        sa.Column("crop_counts", sa.Text(), nullable=True),
+        sa.Column("total_water_recommended", sa.Float(), nullable=False),
+        sa.Column("water_by_month", sa.Text(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade():
+    op.drop_table("user_stats")
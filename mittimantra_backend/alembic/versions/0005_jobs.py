@@ -0,0 +1,61 @@
+"""Background job queue tables
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "jobs",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("total_items", sa.Integer(), nullable=False),
+        sa.Column("processed_items", sa.Integer(), nullable=False),
+        sa.Column("failed_items", sa.Integer(), nullable=False),
+        sa.Column("chunk_count", sa.Integer(), nullable=False),
+        sa.Column("finished_chunks", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_jobs_user_id", "jobs", ["user_id"])
+
+    op.create_table(
+        "job_chunks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.String(), sa.ForeignKey("jobs.id"), nullable=False),
+        sa.Column("chunk_index", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("result", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("worker_id", sa.String(), nullable=True),
+        sa.Column("lease_expires", sa.Float(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_id", "chunk_index", name="uq_job_chunk_index"),
+    )
+    op.create_index("ix_job_chunks_id", "job_chunks", ["id"])
+    op.create_index("ix_job_chunks_claim", "job_chunks", ["status", "lease_expires"])
+
+
+def downgrade():
+    op.drop_index("ix_job_chunks_claim", table_name="job_chunks")
+    op.drop_index("ix_job_chunks_id", table_name="job_chunks")
+    op.drop_table("job_chunks")
+    op.drop_index("ix_jobs_user_id", table_name="jobs")
+    op.drop_table("jobs")
\ No newline at end of file
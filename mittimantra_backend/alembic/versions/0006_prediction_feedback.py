@@ -0,0 +1,37 @@
+"""Farmer feedback on predictions
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "prediction_feedback",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("prediction_type", sa.String(), nullable=False),
+        sa.Column("prediction_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("correct", sa.Boolean(), nullable=True),
+        sa.Column("actual_label", sa.String(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_prediction_feedback_id", "prediction_feedback", ["id"])
+    op.create_index("ix_prediction_feedback_prediction", "prediction_feedback", ["prediction_type", "prediction_id"])
+
+
+def downgrade():
+    op.drop_index("ix_prediction_feedback_prediction", table_name="prediction_feedback")
+    op.drop_index("ix_prediction_feedback_id", table_name="prediction_feedback")
+    op.drop_table("prediction_feedback")
\ No newline at end of file
@@ -10,6 +10,7 @@ from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+import logging
 import os
 from dotenv import load_dotenv
 
@@ -18,6 +19,8 @@ from app.db_models import User
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Security configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-this-in-production")
 ALGORITHM = "HS256"
@@ -101,6 +104,30 @@ async def get_current_user(
     return user
 
 
+async def get_optional_user(
+    request: Request,
+    token: Optional[str] = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """
+    Get the authenticated user if a valid token is present, otherwise None
+    Used by public prediction endpoints to attribute stored history
+    """
+    if not token:
+        token = request.cookies.get("access_token")
+    if not token:
+        return None
+
+    payload = decode_access_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+
+    user = db.query(User).filter(User.username == payload.get("sub")).first()
+    if user is None or not user.is_active:
+        return None
+    return user
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
@@ -110,11 +137,22 @@ async def get_current_active_user(
     return current_user
 
 
+async def get_current_admin_user(
+    current_user: User = Depends(get_current_user)
+) -> User:
+    """Get current user, requiring administrator rights"""
+    if not current_user.is_admin:
+        raise HTTPException(status_code=403, detail="Administrator access required")
+    return current_user
+
+
 def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
     """Authenticate a user with username and password"""
     user = db.query(User).filter(User.username == username).first()
     if not user:
+        logger.info("Login failed for unknown user %s", username)
         return None
     if not verify_password(password, user.hashed_password):
+        logger.info("Login failed for user %s: wrong password", username)
         return None
     return user
\ No newline at end of file
@@ -3,14 +3,19 @@ Database Configuration
 SQLAlchemy setup for SQLite (local development)
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
+from typing import Dict
+import logging
 import os
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./mittimantra.db")
 
@@ -20,6 +25,34 @@ engine = create_engine(
     connect_args={"check_same_thread": False}  # Required for SQLite with FastAPI
 )
 
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _enable_sqlite_wal(dbapi_connection, connection_record):
+        # Readers don't block the writer, so job worker processes and the API can share the file
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA busy_timeout=10000")
+        cursor.close()
+
+# Statements slower than this are logged with the request ID that issued them
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    context._query_start = time.perf_counter()
+
+
+@event.listens_for(engine, "after_cursor_execute")
+def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - context._query_start) * 1000
+    if elapsed_ms >= SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms): %s", elapsed_ms, statement[:500],
+            extra={"duration_ms": round(elapsed_ms, 1)}
+        )
+
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -37,4 +70,41 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def increment_counters(db: Session, model, keys: Dict, increments: Dict) -> None:
+    """
+    Add to the counter columns of the row identified by keys, inserting it if missing
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE on SQLite and PostgreSQL so
+    concurrent writers never lose increments. The keys must be covered by a
+    unique constraint on the model's table.
+    """
+    table = model.__table__
+    dialect = db.bind.dialect.name
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        insert = None
+
+    if insert is not None:
+        stmt = insert(table).values(**keys, **increments)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(keys.keys()),
+            set_={name: table.c[name] + stmt.excluded[name] for name in increments}
+        )
+        db.execute(stmt)
+        return
+
+    # Generic fallback: read-modify-write inside the caller's transaction
+    row = db.query(model).filter_by(**keys).with_for_update().first()
+    if row is None:
+        db.add(model(**keys, **increments))
+    else:
+        for name, value in increments.items():
+            setattr(row, name, (getattr(row, name) or 0) + value)
+    db.flush()
@@ -3,7 +3,7 @@ Database Models
 SQLAlchemy ORM models for users and predictions
 """
 
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Text, Boolean, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -27,11 +27,16 @@ class User(Base):
     crop_predictions = relationship("CropPrediction", back_populates="user", cascade="all, delete-orphan")
     disease_predictions = relationship("DiseasePrediction", back_populates="user", cascade="all, delete-orphan")
     irrigation_schedules = relationship("IrrigationSchedule", back_populates="user", cascade="all, delete-orphan")
+    stats = relationship("UserStats", uselist=False, cascade="all, delete-orphan")
 
 
 class CropPrediction(Base):
     """Model to store crop recommendation predictions"""
     __tablename__ = "crop_predictions"
+    __table_args__ = (
+        # Per-user history listing (keyset pagination on created_at, id)
+        Index("ix_crop_predictions_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -60,6 +65,10 @@ class CropPrediction(Base):
 class DiseasePrediction(Base):
     """Model to store disease detection predictions"""
     __tablename__ = "disease_predictions"
+    __table_args__ = (
+        # Per-user history listing (keyset pagination on created_at, id)
+        Index("ix_disease_predictions_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -69,6 +78,7 @@ class DiseasePrediction(Base):
     confidence = Column(Float)
     severity = Column(String, nullable=True)
     affected_plant = Column(String, nullable=True)
+    region = Column(String, nullable=True)
     
     # Image metadata (optional)
     image_path = Column(String, nullable=True)
@@ -82,6 +92,10 @@ class DiseasePrediction(Base):
 class IrrigationSchedule(Base):
     """Model to store irrigation schedules"""
     __tablename__ = "irrigation_schedules"
+    __table_args__ = (
+        # Per-user history listing (keyset pagination on created_at, id)
+        Index("ix_irrigation_schedules_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
@@ -104,4 +118,122 @@ class IrrigationSchedule(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship
-    user = relationship("User", back_populates="irrigation_schedules")
\ No newline at end of file
+    user = relationship("User", back_populates="irrigation_schedules")
+
+
+class DiseaseOutbreakStat(Base):
+    """Daily roll-up of disease detections per disease, crop and region"""
+    __tablename__ = "disease_outbreak_stats"
+    __table_args__ = (
+        UniqueConstraint("bucket_date", "disease", "affected_plant", "region", name="uq_disease_outbreak_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bucket_date = Column(Date, nullable=False, index=True)
+    disease = Column(String, nullable=False)
+    affected_plant = Column(String, nullable=False, default="")
+    region = Column(String, nullable=False, default="")
+
+    # Aggregates
+    detection_count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+    high_severity_count = Column(Integer, nullable=False, default=0)
+
+
+class AggregationWatermark(Base):
+    """Last source row folded into a materialized summary table"""
+    __tablename__ = "aggregation_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class UserStats(Base):
+    """Pre-aggregated per-user prediction statistics, maintained on insert"""
+    __tablename__ = "user_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+
+    # Prediction counts per type
+    crop_prediction_count = Column(Integer, nullable=False, default=0)
+    disease_prediction_count = Column(Integer, nullable=False, default=0)
+    irrigation_schedule_count = Column(Integer, nullable=False, default=0)
+
+    # Breakdowns
+    crop_counts = Column(Text, nullable=True)  # JSON {crop: count}
+    total_water_recommended = Column(Float, nullable=False, default=0.0)
+    water_by_month = Column(Text, nullable=True)  # JSON {"YYYY-MM": mm}
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class Job(Base):
+    """Long-running bulk prediction job, processed chunk by chunk by job workers"""
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)  # UUID hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    kind = Column(String, nullable=False)  # crop | disease
+    status = Column(String, nullable=False, default="queued")  # queued | running | completed | failed | cancelled
+
+    # Progress
+    total_items = Column(Integer, nullable=False, default=0)
+    processed_items = Column(Integer, nullable=False, default=0)
+    failed_items = Column(Integer, nullable=False, default=0)
+    chunk_count = Column(Integer, nullable=False, default=0)
+    finished_chunks = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    chunks = relationship("JobChunk", back_populates="job", cascade="all, delete-orphan")
+
+
+class JobChunk(Base):
+    """One unit of job work; its stored result is the job's checkpoint"""
+    __tablename__ = "job_chunks"
+    __table_args__ = (
+        UniqueConstraint("job_id", "chunk_index", name="uq_job_chunk_index"),
+        # Workers claim the oldest pending (or lease-expired) chunk
+        Index("ix_job_chunks_claim", "status", "lease_expires"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(String, ForeignKey("jobs.id"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending | running | done | failed
+
+    payload = Column(Text, nullable=False)  # JSON list of items
+    result = Column(Text, nullable=True)  # JSON list of per-item results
+    error = Column(Text, nullable=True)
+
+    # Lease held by the worker processing the chunk (epoch seconds)
+    worker_id = Column(String, nullable=True)
+    lease_expires = Column(Float, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+
+    job = relationship("Job", back_populates="chunks")
+
+
+class PredictionFeedback(Base):
+    """Farmer-reported outcome of a crop recommendation or disease detection"""
+    __tablename__ = "prediction_feedback"
+    __table_args__ = (
+        # Training scans join feedback onto predictions of one type
+        Index("ix_prediction_feedback_prediction", "prediction_type", "prediction_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    prediction_type = Column(String, nullable=False)  # crop | disease
+    prediction_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # Either a confirmation (correct=True) or a correction naming the actual crop/disease
+    correct = Column(Boolean, nullable=True)
+    actual_label = Column(String, nullable=True)
+    notes = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
@@ -4,13 +4,16 @@ Mittimantra - AI-Driven Agricultural Decision Support System
 Main FastAPI Application
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Depends, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response, Depends, Form, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, FileResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import RedirectResponse, FileResponse, HTMLResponse, PlainTextResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+from typing import List, Optional
+import asyncio
+import ipaddress
 import logging
 import os
 
@@ -22,76 +25,181 @@ from app.models.response_models import (
     IrrigationResponse,
     PestControlResponse
 )
-from app.services.crop_service import CropRecommendationService
-from app.services.disease_service import DiseaseDetectionService
 from app.services.irrigation_service import IrrigationService
 from app.services.pest_service import PestPredictionService
+from app.services.history_service import PredictionHistoryService
+from app.services.outbreak_service import OutbreakAggregationService
+from app.services.weather_service import WeatherService
+from app.services.water_balance_service import WaterBalanceService
+from app.services.inference_scheduler import LaneFull, chunked, scheduler as inference_scheduler
+from app.services.model_registry import model_registry, model_version_header
+from app.services.shadow_service import run_timed, shadow_evaluator
+from app.services.blob_store import image_store
+from app.services.feedback_service import FEEDBACK_COMPACTION_INTERVAL, feedback_compactor, feedback_log
+from app.schemas import CropBatchRequest, IrrigationForecastRequest, IrrigationPlanRequest
+from app.middleware.observability import ObservabilityMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.content_negotiation import ContentNegotiationMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.utils.logging_config import configure_logging, shutdown_logging
+from app.utils.metrics import model_request, registry as metrics_registry, stage
+from app.utils.serialization import FastJSONResponse, trusted_response
+from app.utils.static_assets import PrecompressedStaticFiles, prepare_static_assets, static_url
+from app.utils.page_cache import anonymous_page_key, configure_templates, page_cache, user_page_key
+from app.utils.streaming import batch_events, event_stream
 
 # Import Auth Router
 from app.routes.auth_routes import router as auth_router
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Global service instances
-crop_service = None
-disease_service = None
+# Global service instances (crop and disease models live in model_registry)
 irrigation_service = None
 pest_service = None
+history_service = None
+outbreak_service = None
+weather_service = None
+water_balance_service = None
+
+# Seconds between runs of the outbreak aggregation job (the only path that updates the summary)
+OUTBREAK_REFRESH_INTERVAL = int(os.getenv("OUTBREAK_REFRESH_INTERVAL", "60"))
+
+# Rows / images per scheduled batch (bulk requests yield to interactive ones between batches)
+CROP_BATCH_CHUNK = int(os.getenv("CROP_BATCH_CHUNK", "256"))
+DISEASE_BATCH_CHUNK = int(os.getenv("DISEASE_BATCH_CHUNK", "8"))
+DISEASE_BATCH_MAX_FILES = int(os.getenv("DISEASE_BATCH_MAX_FILES", "32"))
+
+
+def _refresh_outbreaks():
+    """Fold any unaggregated disease detections into the outbreak summary"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        processed = outbreak_service.refresh(db)
+        if processed:
+            logger.info("Outbreak aggregation caught up %s detections", processed)
+    except Exception as e:
+        logger.error("Outbreak aggregation job failed: %s", e)
+    finally:
+        db.close()
+
+
+async def _outbreak_refresh_loop():
+    """Periodic outbreak aggregation job (folds in detections from the API and from job workers)"""
+    while True:
+        await run_in_threadpool(_refresh_outbreaks)
+        await asyncio.sleep(OUTBREAK_REFRESH_INTERVAL)
+
+
+def _compact_feedback():
+    """Move feedback logged since the last run into the Parquet segments"""
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        feedback_compactor.compact(db)
+    except Exception as e:
+        logger.error("Feedback compaction failed: %s", e)
+    finally:
+        db.close()
+
+
+async def _feedback_compaction_loop():
+    """Periodic feedback compaction job"""
+    while True:
+        await asyncio.sleep(FEEDBACK_COMPACTION_INTERVAL)
+        await run_in_threadpool(_compact_feedback)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
-    global crop_service, disease_service, irrigation_service, pest_service
+    global irrigation_service, pest_service
+    global history_service, outbreak_service, weather_service, water_balance_service
     
     logger.info("Loading ML models...")
     try:
-        # Initialize services with proper error handling
-        try:
-            crop_service = CropRecommendationService()
-            logger.info("Crop recommendation service loaded")
-        except Exception as e:
-            logger.warning(f"Crop service not available: {str(e)}")
-            crop_service = None
+        # Crop and disease models are loaded and warmed up by the registry,
+        # which later swaps in new model files without a restart
+        loaded = await run_in_threadpool(model_registry.load_all)
+        for name, available in loaded.items():
+            if not available:
+                logger.warning("%s model not available", name)
+        model_registry.start_watching()
         
-        try:
-            disease_service = DiseaseDetectionService()
-            logger.info("Disease detection service loaded")
-        except Exception as e:
-            logger.warning(f"Disease service not available: {str(e)}")
-            disease_service = None
+        # Candidate models in SHADOW_MODELS_DIR score a sample of traffic in the background
+        await run_in_threadpool(shadow_evaluator.start)
         
+        # Initialize services with proper error handling
         try:
             irrigation_service = IrrigationService()
+            water_balance_service = WaterBalanceService(irrigation_service)
             logger.info("Irrigation service loaded")
         except Exception as e:
-            logger.warning(f"Irrigation service not available: {str(e)}")
+            logger.warning("Irrigation service not available: %s", e)
             irrigation_service = None
+            water_balance_service = None
         
         try:
-            pest_service = PestPredictionService()
+            pest_service = PestPredictionService(disease_service=model_registry.service("disease"))
             logger.info("Pest service loaded")
         except Exception as e:
-            logger.warning(f"Pest service not available: {str(e)}")
+            logger.warning("Pest service not available: %s", e)
             pest_service = None
         
+        try:
+            weather_service = WeatherService()
+            logger.info("Weather service loaded")
+        except Exception as e:
+            logger.warning("Weather service not available: %s", e)
+            weather_service = None
+        
+        history_service = PredictionHistoryService()
+        outbreak_service = OutbreakAggregationService()
+        
         logger.info("Startup complete")
     except Exception as e:
-        logger.error(f"Failed during startup: {str(e)}")
+        logger.error("Failed during startup: %s", e)
+    
+    outbreak_task = asyncio.create_task(_outbreak_refresh_loop())
+    # Feedback is written in batches by a background thread
+    feedback_log.start()
+    compaction_task = (
+        asyncio.create_task(_feedback_compaction_loop()) if FEEDBACK_COMPACTION_INTERVAL > 0 else None
+    )
     
     yield
     
+    outbreak_task.cancel()
+    if compaction_task is not None:
+        compaction_task.cancel()
+    await run_in_threadpool(feedback_log.stop)
+    model_registry.stop_watching()
+    shadow_evaluator.stop()
     logger.info("Shutting down Mittimantra backend")
+    shutdown_logging()
 
 
 app = FastAPI(
     title="Mittimantra API",
     description="AI-Driven Agricultural Decision Support System",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
+# JSON / MessagePack selection from the Accept header (innermost, wraps only the routes)
+app.add_middleware(ContentNegotiationMiddleware)
+
+# gzip/brotli for JSON and text bodies above COMPRESSION_MIN_SIZE (static files are precompressed)
+app.add_middleware(CompressionMiddleware)
+
+# Per-client rate limiting (inside CORS, so 429 responses stay readable by the frontend)
+app.add_middleware(RateLimitMiddleware)
+
 # CORS Configuration - Allow React frontend on localhost:3000
 app.add_middleware(
     CORSMiddleware,
@@ -104,20 +212,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Prediction ids are needed to send /feedback from the browser
+    expose_headers=["X-Prediction-ID"],
 )
 
-# Mount Static Files
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# Request latency metrics and tracing (wraps CORS, so preflights are measured too)
+app.add_middleware(ObservabilityMiddleware)
+
+# Request IDs and log sampling (outermost, so every layer below sees the request ID)
+app.add_middleware(RequestContextMiddleware)
+
+# Mount Static Files (hashed, precompressed copies built at startup or by build_static.py)
+app.mount("/static", PrecompressedStaticFiles(directory=prepare_static_assets()), name="static")
 
 # Setup Templates
-templates = Jinja2Templates(directory="templates")
+templates = configure_templates(Jinja2Templates(directory="templates"))
+templates.env.globals["static_url"] = static_url
 
 # Include Auth Routers
 from app.routes.auth_routes import router as auth_router
 from app.routes.api_auth_routes import router as api_auth_router
+from app.routes.history_routes import router as history_router
+from app.routes.analytics_routes import router as analytics_router
+from app.routes.admin_routes import router as admin_router
+from app.routes.job_routes import router as job_router
+from app.routes.feedback_routes import router as feedback_router
 
 app.include_router(api_auth_router, prefix="/api/auth", tags=["API Authentication"])
 app.include_router(auth_router, prefix="/auth", tags=["HTML Authentication"])
+app.include_router(history_router, prefix="/api/history", tags=["Prediction History"])
+app.include_router(analytics_router, prefix="/api/analytics", tags=["Analytics"])
+app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
+app.include_router(job_router, prefix="/jobs", tags=["Background Jobs"])
+app.include_router(feedback_router, prefix="/feedback", tags=["Feedback"])
 
 
 @app.get("/", include_in_schema=False)
@@ -134,19 +261,33 @@ async def favicon():
     return RedirectResponse(url="/static/favicon.ico") # Fallback if png missing
 
 
+def _render_page(name: str, context: dict) -> str:
+    """Render a Jinja template to HTML"""
+    return templates.get_template(name).render(context)
+
+
+def _anonymous_page(request: Request, name: str) -> HTMLResponse:
+    """Serve a page that is the same for every visitor, rendered once per cache TTL"""
+    html = page_cache.get_or_render(
+        anonymous_page_key(name),
+        lambda: _render_page(name, {"request": request})
+    )
+    return HTMLResponse(html)
+
+
 @app.get("/login")
 async def login_page(request: Request):
     """Serve the login page"""
-    return templates.TemplateResponse("login.html", {"request": request})
+    return _anonymous_page(request, "login.html")
 
 
 @app.get("/register")
 async def register_page(request: Request):
     """Serve the registration page"""
-    return templates.TemplateResponse("register.html", {"request": request})
+    return _anonymous_page(request, "register.html")
 
 
-from app.auth import decode_access_token
+from app.auth import decode_access_token, get_optional_user
 from app.database import get_db
 from app.db_models import User
 from sqlalchemy.orm import Session
@@ -165,11 +306,35 @@ async def dashboard_page(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/login")
         
     username = payload.get("sub")
+    cache_key = user_page_key(username, "dashboard.html")
+    html = page_cache.get(cache_key)
+    if html is not None:
+        # Invalidated on profile update and account deletion (see auth_routes)
+        return HTMLResponse(html)
+
     user = db.query(User).filter(User.username == username).first()
     if not user:
         return RedirectResponse(url="/login")
 
-    return templates.TemplateResponse("dashboard.html", {"request": request, "user": user})
+    html = _render_page("dashboard.html", {"request": request, "user": user})
+    page_cache.set(cache_key, html)
+    return HTMLResponse(html)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus metrics (served to loopback clients only)"""
+    client_host = request.client.host if request.client else ""
+    try:
+        is_local = ipaddress.ip_address(client_host).is_loopback
+    except ValueError:
+        is_local = client_host == "localhost"
+    if not is_local:
+        raise HTTPException(status_code=403, detail="Metrics are only available locally")
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -181,45 +346,155 @@ async def health_check():
     )
 
 
+async def _store_prediction(record, db: Session, *args, **kwargs) -> Optional[int]:
+    """
+    Persist a prediction via the history service without failing the request
+    Runs in the thread pool; returns the stored row's id, or None if it could not be saved
+    """
+    def write():
+        try:
+            return record(db, *args, **kwargs).id
+        except Exception as e:
+            db.rollback()
+            logger.warning("Failed to record prediction history: %s", e)
+            return None
+
+    with stage("db_write"):
+        return await run_in_threadpool(write)
+
+
+async def _run_inference(lane: str, fn, *args, cost: float = 1.0, **kwargs):
+    """Run model work through the inference scheduler, shedding load when a lane is full"""
+    try:
+        return await inference_scheduler.run(lane, fn, *args, cost=cost, **kwargs)
+    except LaneFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
 @app.post("/predict-crop", response_model=CropPredictionResponse)
-async def predict_crop(request: CropPredictionRequest):
+async def predict_crop(
+    request: CropPredictionRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """
     Data-Driven Crop Pattern Recommendation
     
     Recommends optimal crop based on soil and environmental conditions
     """
-    if crop_service is None:
+    if model_registry.current("crop") is None:
         raise HTTPException(
             status_code=503,
             detail="Crop recommendation service is not available. Model not loaded."
         )
     
     try:
-        result = crop_service.predict_crop(
-            nitrogen=request.nitrogen,
-            phosphorus=request.phosphorus,
-            potassium=request.potassium,
-            temperature=request.temperature,
-            humidity=request.humidity,
-            ph=request.ph,
-            rainfall=request.rainfall
+        features = {
+            "nitrogen": request.nitrogen,
+            "phosphorus": request.phosphorus,
+            "potassium": request.potassium,
+            "temperature": request.temperature,
+            "humidity": request.humidity,
+            "ph": request.ph,
+            "rainfall": request.rainfall
+        }
+        with model_registry.lease("crop") as model, model_request("crop"):
+            result, seconds = await _run_inference("interactive", run_timed, model.service.predict_crop, **features)
+        shadow_evaluator.submit("crop", "predict_crop", (), features, model, result, seconds)
+        response.headers.update(model_version_header(model))
+        prediction_id = await _store_prediction(
+            history_service.record_crop_prediction, db, features, result,
+            user_id=current_user.id if current_user else None
         )
+        if prediction_id is not None:
+            # Lets the client send /feedback on this recommendation
+            response.headers["X-Prediction-ID"] = str(prediction_id)
         return CropPredictionResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Crop prediction error: {str(e)}")
+        logger.error("Crop prediction error: %s", e)
         raise HTTPException(status_code=500, detail="Crop prediction failed")
 
 
+async def _crop_batch_chunks(rows: List[dict], lane: str, model):
+    """Score rows on the given lane one chunk at a time, all with the same model version"""
+    with model_registry.lease("crop", model):
+        for chunk in chunked(rows, CROP_BATCH_CHUNK):
+            with model_request("crop"):
+                results = await _run_inference(lane, model.service.predict_crops, chunk, cost=len(chunk))
+            yield results
+
+
+@app.post("/predict-crop/batch")
+async def predict_crop_batch(
+    request: CropBatchRequest,
+    stream: bool = Query(False, description="Stream per-row results as server-sent events")
+):
+    """
+    Bulk Crop Recommendation
+    
+    Scores many rows on the bulk or background lane, one chunk at a time
+    (?stream=true sends each result as it is ready)
+    """
+    if model_registry.current("crop") is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Crop recommendation service is not available. Model not loaded."
+        )
+    
+    model = model_registry.current("crop")
+    rows = [row.model_dump() for row in request.rows]
+    if stream:
+        return event_stream(
+            batch_events(_crop_batch_chunks(rows, request.lane, model), len(rows)),
+            headers=model_version_header(model)
+        )
+    
+    try:
+        results = []
+        async for chunk_results in _crop_batch_chunks(rows, request.lane, model):
+            results.extend(chunk_results)
+        return trusted_response({"count": len(results), "results": results}, headers=model_version_header(model))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Batch crop prediction error: %s", e)
+        raise HTTPException(status_code=500, detail="Batch crop prediction failed")
+
+
+async def _archive_upload(file: UploadFile) -> Optional[str]:
+    """Stream an upload into the image archive; returns its path there, or None"""
+    if not image_store.enabled:
+        return None
+    try:
+        with stage("image_archive"):
+            file.file.seek(0)
+            stored = await run_in_threadpool(image_store.put, file.file)
+        return stored.path
+    except ValueError:
+        return None
+
+
 @app.post("/predict-disease", response_model=DiseasePredictionResponse)
-async def predict_disease(file: UploadFile = File(...)):
+async def predict_disease(
+    response: Response,
+    file: UploadFile = File(...),
+    region: Optional[str] = Form(None),
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """
     Pest & Disease Prediction
     
     Detects plant diseases from leaf images
     """
-    if disease_service is None:
+    if model_registry.current("disease") is None:
         raise HTTPException(
             status_code=503,
             detail="Disease detection service is not available. Model not loaded."
@@ -232,18 +507,101 @@ async def predict_disease(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be an image")
     
     try:
-        image_bytes = await file.read()
-        result = disease_service.predict_disease(image_bytes)
+        with model_request("disease"):
+            with stage("upload_read"):
+                image_bytes = await file.read()
+            with model_registry.lease("disease") as model:
+                result, seconds = await _run_inference(
+                    "interactive", run_timed, model.service.predict_disease, image_bytes
+                )
+        shadow_evaluator.submit("disease", "predict_disease", (image_bytes,), {}, model, result, seconds)
+        response.headers.update(model_version_header(model))
+        image_path = await _archive_upload(file)
+        prediction_id = await _store_prediction(
+            history_service.record_disease_prediction, db, result,
+            user_id=current_user.id if current_user else None, region=region, image_path=image_path
+        )
+        if prediction_id is not None:
+            response.headers["X-Prediction-ID"] = str(prediction_id)
         return DiseasePredictionResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Disease prediction error: {str(e)}")
+        logger.error("Disease prediction error: %s", e)
         raise HTTPException(status_code=500, detail="Disease prediction failed")
 
 
+async def _disease_batch_chunks(uploads: List, lane: str, model):
+    """Score (filename, bytes) uploads one chunk at a time, dropping each chunk's bytes once scored"""
+    with model_registry.lease("disease", model):
+        for start in range(0, len(uploads), DISEASE_BATCH_CHUNK):
+            chunk = uploads[start:start + DISEASE_BATCH_CHUNK]
+            uploads[start:start + len(chunk)] = [None] * len(chunk)
+            with model_request("disease"):
+                predictions = await _run_inference(
+                    lane, model.service.predict_diseases, [data for _, data in chunk], cost=len(chunk)
+                )
+            names = [name for name, _ in chunk]
+            del chunk
+            yield [{"filename": name, **prediction} for name, prediction in zip(names, predictions)]
+
+
+@app.post("/predict-disease/batch")
+async def predict_disease_batch(
+    files: List[UploadFile] = File(...),
+    lane: str = Form("bulk", pattern="^(bulk|background)$"),
+    stream: bool = Query(False, description="Stream per-image results as server-sent events")
+):
+    """
+    Bulk Disease Detection
+    
+    Classifies several leaf images on the bulk or background lane,
+    scoring them one chunk at a time (?stream=true sends each result as it is ready)
+    """
+    if model_registry.current("disease") is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Disease detection service is not available. Model not loaded."
+        )
+    
+    if len(files) > DISEASE_BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {DISEASE_BATCH_MAX_FILES} images per batch")
+    
+    if any(not file.content_type.startswith("image/") for file in files):
+        raise HTTPException(status_code=400, detail="All files must be images")
+    
+    # Uploads are closed once this handler returns, so read them before streaming
+    with stage("upload_read"):
+        uploads = [(file.filename, await file.read()) for file in files]
+    model = model_registry.current("disease")
+    if stream:
+        return event_stream(
+            batch_events(_disease_batch_chunks(uploads, lane, model), len(uploads)),
+            headers=model_version_header(model)
+        )
+    
+    try:
+        results = []
+        async for chunk_results in _disease_batch_chunks(uploads, lane, model):
+            results.extend(chunk_results)
+        return trusted_response({"count": len(results), "results": results}, headers=model_version_header(model))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Batch disease prediction error: %s", e)
+        raise HTTPException(status_code=500, detail="Batch disease prediction failed")
+
+
 @app.post("/irrigation-schedule", response_model=IrrigationResponse)
-async def get_irrigation_schedule(request: IrrigationRequest):
+async def get_irrigation_schedule(
+    request: IrrigationRequest,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
     """
     Smart Irrigation Scheduling
     
@@ -256,29 +614,127 @@ async def get_irrigation_schedule(request: IrrigationRequest):
         )
     
     try:
-        result = irrigation_service.calculate_irrigation_schedule(
-            crop_type=request.crop_type,
-            soil_moisture=request.soil_moisture,
-            temperature=request.temperature,
-            humidity=request.humidity,
-            rainfall=request.rainfall,
-            crop_stage=request.crop_stage
+        inputs = {
+            "crop_type": request.crop_type,
+            "soil_moisture": request.soil_moisture,
+            "temperature": request.temperature,
+            "humidity": request.humidity,
+            "rainfall": request.rainfall,
+            "crop_stage": request.crop_stage
+        }
+        result = irrigation_service.calculate_irrigation_schedule(**inputs)
+        await _store_prediction(
+            history_service.record_irrigation_schedule, db, inputs, result,
+            user_id=current_user.id if current_user else None
         )
         return IrrigationResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Irrigation scheduling error: {str(e)}")
+        logger.error("Irrigation scheduling error: %s", e)
         raise HTTPException(status_code=500, detail="Irrigation scheduling failed")
 
 
+@app.post("/irrigation-forecast")
+async def get_irrigation_forecast(
+    request: IrrigationForecastRequest,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    """
+    Weather-Aware Irrigation Scheduling
+    
+    Projects soil moisture over a multi-day forecast for the field location
+    and returns the days irrigation is needed
+    """
+    if irrigation_service is None or weather_service is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Weather-aware irrigation is not available. Service not loaded."
+        )
+    
+    try:
+        forecast = await run_in_threadpool(
+            weather_service.get_forecast, request.latitude, request.longitude, request.days
+        )
+        result = irrigation_service.calculate_forecast_schedule(
+            crop_type=request.crop_type,
+            soil_moisture=request.soil_moisture,
+            crop_stage=request.crop_stage,
+            forecast=forecast
+        )
+        today = forecast[0]
+        await _store_prediction(
+            history_service.record_irrigation_schedule, db,
+            {
+                "crop_type": request.crop_type,
+                "soil_moisture": request.soil_moisture,
+                "temperature": today["temperature"],
+                "humidity": today["humidity"],
+                "rainfall": today["rainfall"],
+                "crop_stage": request.crop_stage
+            },
+            result,
+            user_id=current_user.id if current_user else None
+        )
+        return trusted_response(result)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Forecast irrigation scheduling error: %s", e)
+        raise HTTPException(status_code=500, detail="Forecast irrigation scheduling failed")
+
+
+@app.post("/irrigation-plan")
+async def get_irrigation_plan(request: IrrigationPlanRequest):
+    """
+    Season Irrigation Planning
+    
+    Simulates the daily soil water balance of each field over the horizon
+    and returns an irrigation calendar per field
+    """
+    if water_balance_service is None or weather_service is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Irrigation planning is not available. Service not loaded."
+        )
+    
+    for field in request.fields:
+        if field.crop_stage is None and field.days_after_planting is None:
+            raise HTTPException(status_code=400, detail="Each field needs crop_stage or days_after_planting")
+    
+    try:
+        forecast = await run_in_threadpool(weather_service.get_forecast, request.latitude, request.longitude)
+        plans = await run_in_threadpool(
+            water_balance_service.plan_fields,
+            [field.model_dump() for field in request.fields],
+            forecast,
+            request.horizon_days,
+            None,
+            request.latitude,
+            request.elevation
+        )
+        return trusted_response({"forecast_days": len(forecast), "fields": plans})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Irrigation planning error: %s", e)
+        raise HTTPException(status_code=500, detail="Irrigation planning failed")
+
+
 @app.post("/pest-control", response_model=PestControlResponse)
-async def get_pest_control(file: UploadFile = File(...)):
+async def get_pest_control(response: Response, file: UploadFile = File(...)):
     """
     Pest & Disease Control Recommendations
     
     Provides control measures for detected diseases
     """
+    if pest_service is None or model_registry.current("disease") is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Pest control service is not available. Model not loaded."
+        )
+    
     if not file:
         raise HTTPException(status_code=400, detail="No file uploaded")
     
@@ -286,13 +742,22 @@ async def get_pest_control(file: UploadFile = File(...)):
         raise HTTPException(status_code=400, detail="File must be an image")
     
     try:
-        image_bytes = await file.read()
-        result = pest_service.get_control_recommendations(image_bytes)
+        with model_request("disease"):
+            with stage("upload_read"):
+                image_bytes = await file.read()
+            with model_registry.lease("disease") as model:
+                result = await _run_inference(
+                    "interactive", pest_service.get_control_recommendations, image_bytes,
+                    disease_service=model.service
+                )
+        response.headers.update(model_version_header(model))
         return PestControlResponse(**result)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Pest control recommendation error: {str(e)}")
+        logger.error("Pest control recommendation error: %s", e)
         raise HTTPException(status_code=500, detail="Pest control recommendation failed")
 
 
@@ -302,30 +767,58 @@ async def get_crop_patterns():
     Get historical crop pattern data for the region
     """
     try:
-        patterns = crop_service.get_crop_patterns()
-        return {"patterns": patterns}
+        patterns = model_registry.service("crop").get_crop_patterns()
+        return trusted_response({"patterns": patterns})
     except Exception as e:
-        logger.error(f"Crop pattern retrieval error: {str(e)}")
+        logger.error("Crop pattern retrieval error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve crop patterns")
 
 
+@app.get("/disease-outbreaks")
+async def get_disease_outbreaks(
+    days: int = 7,
+    limit: int = 10,
+    region: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Disease Outbreak Summary
+    
+    Top detected diseases and daily detection trend from the aggregated history
+    """
+    if days < 1 or days > 365 or limit < 1 or limit > 100:
+        raise HTTPException(status_code=400, detail="days must be 1-365 and limit 1-100")
+    
+    try:
+        return trusted_response({
+            "window_days": days,
+            "top_diseases": outbreak_service.top_diseases(db, days=days, limit=limit, region=region),
+            "daily_counts": outbreak_service.daily_counts(db, days=days, region=region)
+        })
+    except Exception as e:
+        logger.error("Disease outbreak retrieval error: %s", e)
+        raise HTTPException(status_code=500, detail="Failed to retrieve disease outbreaks")
+
+
 @app.get("/farmer-insights")
-async def get_farmer_insights():
+async def get_farmer_insights(db: Session = Depends(get_db)):
     """
     Smart Farmer Interaction Layer
     
     Provides aggregated insights and recommendations
     """
     try:
+        outbreaks = outbreak_service.top_diseases(db, days=7, limit=3)
         insights = {
-            "seasonal_recommendations": crop_service.get_seasonal_recommendations(),
-            "common_diseases": disease_service.get_common_diseases(),
+            "seasonal_recommendations": model_registry.service("crop").get_seasonal_recommendations(),
+            "common_diseases": model_registry.service("disease").get_common_diseases(),
             "irrigation_tips": irrigation_service.get_general_tips(),
-            "pest_alerts": pest_service.get_active_alerts()
+            "pest_alerts": pest_service.get_active_alerts(outbreaks),
+            "disease_outbreaks": outbreaks
         }
-        return insights
+        return trusted_response(insights)
     except Exception as e:
-        logger.error(f"Farmer insights error: {str(e)}")
+        logger.error("Farmer insights error: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve farmer insights")
 
 
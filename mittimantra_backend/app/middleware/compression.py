@@ -0,0 +1,121 @@
+# app/middleware/compression.py
+"""
+Compression Middleware
+Negotiated gzip/brotli encoding for response bodies above a size threshold
+"""
+
+import os
+
+from app.utils.compression import StreamCompressor, choose_encoding, compress_bytes, is_compressible
+
+# Bodies smaller than this are sent as-is (compression overhead outweighs the saving)
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing text, JSON and MessagePack responses
+
+    Complete bodies under minimum_size pass through untouched. Streamed
+    bodies (NDJSON job downloads) are compressed chunk by chunk and flushed,
+    so clients keep receiving data incrementally. Responses that already
+    carry a Content-Encoding (precompressed static files) and event streams
+    are left alone.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers") or []:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                content_type = b""
+                content_length = None
+                for name, value in headers:
+                    if name == b"content-encoding":
+                        passthrough = True
+                    elif name == b"content-type":
+                        content_type = value
+                    elif name == b"content-length":
+                        content_length = int(value)
+                if not is_compressible(content_type.decode("latin-1")) or (
+                    content_length is not None and content_length < self.minimum_size
+                ):
+                    passthrough = True
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held until the first body message shows whether the body is worth compressing
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body:
+                    if len(body) < self.minimum_size:
+                        passthrough = True
+                        await send(start_message)
+                        await send(message)
+                        return
+                    # Complete body: one-shot encoding, so Content-Length can be kept
+                    data = compress_bytes(body, encoding, self.levels[encoding])
+                    await send(self._encoded_start(start_message, encoding, len(data)))
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                compressor = StreamCompressor(encoding, self.levels[encoding])
+                await send(self._encoded_start(start_message, encoding))
+
+            if more_body:
+                data = compressor.compress(body) if body else b""
+            else:
+                data = (compressor.compress(body) if body else b"") + compressor.finish()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _encoded_start(message, encoding: str, content_length: int = None):
+        """Response start with Content-Encoding set and Content-Length replaced (dropped when streaming)"""
+        headers = [(name, value) for name, value in message.get("headers", []) if name != b"content-length"]
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        headers.append((b"content-encoding", encoding.encode("latin-1")))
+        headers.append((b"vary", b"Accept-Encoding"))
+        return {**message, "headers": headers}
\ No newline at end of file
@@ -0,0 +1,50 @@
+# app/middleware/content_negotiation.py
+"""
+Content Negotiation Middleware
+Selects MessagePack or JSON response encoding from the Accept header
+"""
+
+from app.utils.serialization import accepts_msgpack, response_format_var
+
+# Response types whose encoding depends on the Accept header
+_NEGOTIATED_TYPES = (b"application/json", b"application/msgpack")
+
+
+class ContentNegotiationMiddleware:
+    """
+    Pure ASGI middleware recording the negotiated response encoding
+
+    Clients sending Accept: application/msgpack get MessagePack bodies from
+    FastJSONResponse (the app's default response class); everyone else
+    gets JSON. Negotiated responses carry Vary: Accept so caches keep the
+    two encodings apart.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for name, value in scope.get("headers") or []:
+            if name == b"accept":
+                accept = value.decode("latin-1")
+                break
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                content_type = next((value for name, value in headers if name == b"content-type"), b"")
+                if content_type.startswith(_NEGOTIATED_TYPES):
+                    headers.append((b"vary", b"Accept"))
+                    message["headers"] = headers
+            await send(message)
+
+        token = response_format_var.set("msgpack" if accepts_msgpack(accept) else "json")
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            response_format_var.reset(token)
\ No newline at end of file
@@ -0,0 +1,85 @@
+# app/middleware/observability.py
+"""
+Observability Middleware
+Per-route latency metrics, request tracing and slow-request captures
+"""
+
+import time
+
+from app.utils.metrics import REQUEST_LATENCY, REQUESTS_IN_PROGRESS
+from app.utils import tracing
+from app.utils.logging_config import get_request_id
+from app.utils.profiling import request_stages_var, slow_requests
+
+# Route label for requests that matched no route (keeps label cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class ObservabilityMiddleware:
+    """
+    Pure ASGI middleware recording request latency by route template
+
+    Routes are labelled with their path template (e.g. /api/history/{kind})
+    rather than the raw path, read from the scope after routing. Requests
+    under a mounted app (static files) are labelled with the mount path.
+    Requests slower than SLOW_REQUEST_MS are kept with their stage breakdown.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        headers = dict(scope.get("headers") or [])
+        traceparent = headers.get(b"traceparent", b"").decode("latin-1") or None
+
+        stages = slow_requests.begin()
+        stages_token = request_stages_var.set(stages)
+        start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.inc(method=method)
+        try:
+            with tracing.tracer.start_trace(
+                f"{method} {scope['path']}", traceparent,
+                **{"http.method": method, "request.id": get_request_id() or ""}
+            ) as span:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                finally:
+                    route = self._route_label(scope, root_path)
+                    if span is not None:
+                        span.name = f"{method} {route}"
+                        span.set_attribute("http.route", route)
+                        span.set_attribute("http.status_code", status_holder["status"])
+        finally:
+            elapsed = time.perf_counter() - start
+            route = self._route_label(scope, root_path)
+            request_stages_var.reset(stages_token)
+            REQUESTS_IN_PROGRESS.dec(method=method)
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route, status=status_holder["status"])
+            slow_requests.finish(
+                stages, elapsed,
+                request_id=get_request_id(), method=method, route=route, status=status_holder["status"]
+            )
+
+    @staticmethod
+    def _route_label(scope, original_root_path: str) -> str:
+        """Get the matched route template for a request scope"""
+        route = scope.get("route")
+        if route is not None and getattr(route, "path", None):
+            return route.path
+        root_path = scope.get("root_path", "")
+        if root_path != original_root_path:
+            return root_path[len(original_root_path):] + "/{path}"
+        return UNMATCHED_ROUTE
\ No newline at end of file
@@ -0,0 +1,97 @@
+# app/middleware/rate_limit.py
+"""
+Rate Limit Middleware
+Refuses over-budget requests with 429 before their body is read
+"""
+
+import json
+import math
+
+from starlette.concurrency import run_in_threadpool
+
+from app.auth import decode_access_token
+from app.utils.rate_limit import RateLimiter, rate_limiter_from_env
+
+
+def client_key(scope) -> str:
+    """
+    Identify the client of a request
+
+    Uses the username of a valid bearer token or access_token cookie (the
+    identity get_current_user would resolve, without a database lookup),
+    falling back to the client IP address.
+    """
+    token = None
+    for name, value in scope.get("headers") or []:
+        if name == b"authorization":
+            scheme, _, credentials = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                token = credentials.strip()
+        elif name == b"cookie" and token is None:
+            for part in value.decode("latin-1").split(";"):
+                key, _, cookie_value = part.strip().partition("=")
+                if key == "access_token":
+                    token = cookie_value.strip('"')
+                    if token.lower().startswith("bearer "):
+                        token = token[7:]
+    if token:
+        payload = decode_access_token(token)
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    client = scope.get("client")
+    return f"ip:{client[0]}" if client else "ip:unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying cost-weighted token buckets per client
+
+    Runs before routing, so a refused upload is answered without reading or
+    decoding its body. Checks against a blocking backend (SQLite) run in
+    the thread pool, so a contended bucket file never stalls the event loop.
+    """
+
+    def __init__(self, app, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter if limiter is not None else rate_limiter_from_env()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.limiter is None or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        if self.limiter.cost_for(scope["path"]) <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        if self.limiter.backend.blocking:
+            decision = await run_in_threadpool(self.limiter.check, client_key(scope), scope["path"])
+        else:
+            decision = self.limiter.check(client_key(scope), scope["path"])
+        if decision is None:
+            await self.app(scope, receive, send)
+            return
+
+        remaining = str(math.floor(decision.remaining)).encode("latin-1")
+        if not decision.allowed:
+            retry_after = "3600" if math.isinf(decision.retry_after) else str(max(1, math.ceil(decision.retry_after)))
+            body = json.dumps({"detail": "Too many requests, please retry later"}).encode("utf-8")
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                    (b"retry-after", retry_after.encode("latin-1")),
+                    (b"x-ratelimit-remaining", remaining),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-ratelimit-remaining", remaining)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
\ No newline at end of file
@@ -0,0 +1,59 @@
+# app/middleware/request_context.py
+"""
+Request Context Middleware
+Assigns each request an ID for log correlation and applies log sampling
+"""
+
+import re
+import uuid
+
+from app.utils.logging_config import (
+    RequestSampler, log_sampled_var, request_id_var, request_path_var, sampler_from_env
+)
+
+# Accepted client-supplied request IDs (anything else is replaced)
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware setting the request ID, path and log sampling decision
+
+    A valid incoming X-Request-ID header is reused, otherwise a new ID is
+    generated. The ID is echoed in the X-Request-ID response header and,
+    through context variables, attached to every log record written while
+    the request is handled, including in threadpool calls.
+    """
+
+    def __init__(self, app, sampler: RequestSampler = None):
+        self.app = app
+        self.sampler = sampler or sampler_from_env()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers") or []:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not request_id or not _VALID_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        tokens = (
+            request_id_var.set(request_id),
+            request_path_var.set(scope["path"]),
+            log_sampled_var.set(self.sampler.should_log(scope["path"])),
+        )
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            for var, token in zip((request_id_var, request_path_var, log_sampled_var), tokens):
+                var.reset(token)
\ No newline at end of file
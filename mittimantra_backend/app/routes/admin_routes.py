@@ -0,0 +1,177 @@
+"""
+Admin Routes
+On-demand profiling and diagnostics (administrators only)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.auth import get_current_admin_user
+from app.services.inference_scheduler import scheduler
+from app.services.model_registry import model_registry
+from app.services.shadow_service import shadow_evaluator
+from app.services.blob_store import image_store
+from app.services.feedback_service import feedback_compactor, feedback_log
+from app.utils.profiling import (
+    MAX_PROFILE_SECONDS, profiler, slow_requests, start_tracemalloc, stop_tracemalloc, top_allocations
+)
+
+router = APIRouter(dependencies=[Depends(get_current_admin_user)])
+
+
+@router.post("/profiler/start", status_code=202)
+async def start_profiler(
+    seconds: float = Query(10, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000)
+):
+    """
+    Sample every thread's stack for the given number of seconds
+    Fetch the result from /profiler/stacks once the session has finished
+    """
+    try:
+        profiler.start(seconds, interval_ms)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return profiler.status()
+
+
+@router.post("/profiler/stop")
+async def stop_profiler():
+    """Stop the running profiling session early"""
+    profiler.stop()
+    return profiler.status()
+
+
+@router.get("/profiler")
+async def get_profiler_status():
+    """Get the state of the current or last profiling session"""
+    return profiler.status()
+
+
+@router.get("/profiler/stacks", response_class=PlainTextResponse)
+async def get_profiler_stacks():
+    """
+    Collapsed stacks of the last session
+    Feed to flamegraph.pl or load into speedscope
+    """
+    return PlainTextResponse(profiler.collapsed())
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(frames: int = Query(10, ge=1, le=50)):
+    """Start tracemalloc (allocations made before this are not traced)"""
+    started = start_tracemalloc(frames)
+    return {"tracing": True, "started": started}
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing():
+    """Stop tracemalloc and release its bookkeeping"""
+    stop_tracemalloc()
+    return {"tracing": False}
+
+
+@router.get("/memory/top")
+async def get_top_allocations(
+    limit: int = Query(20, ge=1, le=200),
+    group_by: str = Query("lineno")
+):
+    """Largest live allocation sites since tracing started"""
+    try:
+        return top_allocations(limit, group_by)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/slow-requests")
+async def get_slow_requests(limit: int = Query(20, ge=1, le=50)):
+    """Recent requests slower than SLOW_REQUEST_MS, with the stack at their slowest stage"""
+    return {"threshold_ms": slow_requests.threshold_ms, "requests": slow_requests.entries(limit)}
+
+
+@router.delete("/slow-requests", status_code=204)
+async def clear_slow_requests():
+    """Discard recorded slow-request captures"""
+    slow_requests.clear()
+
+
+@router.get("/scheduler")
+async def get_scheduler_stats():
+    """Per-lane queue depth, in-flight work and recent queue latency of the inference scheduler"""
+    return {"workers": scheduler.workers, "lanes": scheduler.get_stats()}
+
+
+@router.get("/models")
+async def get_model_versions():
+    """Current and draining versions of each model"""
+    return model_registry.get_stats()
+
+
+@router.post("/models/reload", status_code=202)
+async def reload_models():
+    """
+    Check the models directory for new files now
+    New versions load and warm up in the background, then replace the current ones
+    """
+    started = model_registry.reload_async()
+    return {"started": started, "models": model_registry.get_stats()}
+
+
+@router.get("/duplicates")
+async def get_duplicate_stats():
+    """
+    Near-duplicate upload index of the current disease model
+    Hits are predictions answered without a forward pass
+    """
+    service = model_registry.service("disease")
+    if service is None or service.duplicates is None:
+        return {"enabled": False}
+    return {"enabled": True, **service.duplicates.get_stats()}
+
+
+@router.get("/image-store")
+async def get_image_store_stats():
+    """Size and retention settings of the archive of uploaded leaf images"""
+    return await run_in_threadpool(image_store.get_stats)
+
+
+@router.get("/feedback")
+async def get_feedback_stats():
+    """Feedback waiting to be written, and the Parquet segments compacted so far"""
+    stats = await run_in_threadpool(feedback_compactor.get_stats)
+    return {"pending": feedback_log.pending, **stats}
+
+
+@router.post("/feedback/compact")
+async def compact_feedback():
+    """Write buffered feedback now and compact it into Parquet without waiting for the periodic job"""
+    from app.database import SessionLocal
+
+    def compact():
+        feedback_log.flush()
+        db = SessionLocal()
+        try:
+            return feedback_compactor.compact(db)
+        finally:
+            db.close()
+
+    try:
+        return await run_in_threadpool(compact)
+    except ImportError:
+        raise HTTPException(status_code=503, detail="Feedback compaction requires pyarrow")
+
+
+@router.get("/shadow")
+async def get_shadow_stats():
+    """
+    Candidate vs production comparisons from shadow evaluation
+    Agreement rate, confidence deltas and latency per model version pair
+    """
+    return shadow_evaluator.get_stats()
+
+
+@router.delete("/shadow", status_code=204)
+async def reset_shadow_stats():
+    """Discard recorded shadow comparisons"""
+    shadow_evaluator.reset()
\ No newline at end of file
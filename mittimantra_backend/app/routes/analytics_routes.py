@@ -0,0 +1,29 @@
+"""
+Analytics Routes
+Per-user insights served from pre-aggregated statistics
+"""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.db_models import User
+from app.schemas import UserStatsResponse
+from app.auth import get_current_active_user
+from app.services.stats_service import UserStatsService
+
+router = APIRouter()
+
+stats_service = UserStatsService()
+
+
+@router.get("/me", response_model=UserStatsResponse)
+async def get_my_analytics(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the current user's prediction statistics
+    Single-row lookup; the statistics are maintained as predictions are recorded
+    """
+    return stats_service.get_stats(db, current_user.id)
@@ -21,6 +21,7 @@ from app.auth import (
     get_current_active_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
+from app.utils.page_cache import page_cache
 
 router = APIRouter()
 
@@ -166,6 +167,7 @@ async def update_user_profile(
     
     db.commit()
     db.refresh(current_user)
+    page_cache.invalidate_user(current_user.username)
     
     return current_user
 
@@ -201,7 +203,9 @@ async def delete_account(
     """
     Delete current user account
     """
+    username = current_user.username
     db.delete(current_user)
     db.commit()
+    page_cache.invalidate_user(username)
     
     return {"message": "Account deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Feedback Routes
+Farmers confirm or correct crop recommendations and disease detections
+Feedback is logged in batches and compacted into Parquet for analytics and retraining
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.auth import get_optional_user
+from app.database import get_db
+from app.db_models import CropPrediction, DiseasePrediction, User
+from app.schemas import FeedbackRequest
+from app.services.feedback_service import feedback_log
+
+router = APIRouter()
+
+_PREDICTION_MODELS = {"crop": CropPrediction, "disease": DiseasePrediction}
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def submit_feedback(
+    request: FeedbackRequest,
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Confirm a prediction (correct=true) or correct it (actual_label)
+    The prediction id is in the X-Prediction-ID header of /predict-crop and
+    /predict-disease responses, and in the prediction history
+    """
+    model = _PREDICTION_MODELS[request.prediction_type]
+    owner = db.query(model.id, model.user_id).filter(model.id == request.prediction_id).first()
+    # Predictions made with a token only take feedback from that user
+    if owner is None or (
+        owner.user_id is not None
+        and (current_user is None or (current_user.id != owner.user_id and not current_user.is_admin))
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Prediction not found")
+
+    try:
+        feedback_log.append(
+            request.prediction_type,
+            request.prediction_id,
+            correct=request.correct,
+            actual_label=request.actual_label.strip() if request.actual_label else None,
+            notes=request.notes,
+            user_id=current_user.id if current_user else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"status": "accepted"}
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Prediction History Routes
+Paginated access to the current user's stored predictions
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.database import get_db
+from app.db_models import User
+from app.schemas import HistoryPage
+from app.auth import get_current_active_user
+from app.services.history_service import PredictionHistoryService
+
+router = APIRouter()
+
+history_service = PredictionHistoryService()
+
+
+@router.get("/{kind}", response_model=HistoryPage)
+async def list_history(
+    kind: str,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=PredictionHistoryService.MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    List the current user's crop, disease or irrigation history, newest first
+    Pass the returned next_cursor to fetch the following page
+    """
+    if kind not in PredictionHistoryService.HISTORY_KINDS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown history type")
+    
+    try:
+        return history_service.list_history(db, current_user.id, kind, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/{kind}/{entry_id}")
+async def get_history_entry(
+    kind: str,
+    entry_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get one full history entry, including reasoning and schedule text
+    """
+    if kind not in PredictionHistoryService.HISTORY_KINDS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown history type")
+    
+    entry = history_service.get_entry(db, current_user.id, kind, entry_id)
+    if entry is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="History entry not found")
+    
+    return history_service.serialize_entry(entry)
@@ -0,0 +1,208 @@
+"""
+Job Routes
+Submit long-running bulk predictions and download their results
+Jobs are processed by run_job_workers.py
+"""
+
+import asyncio
+import os
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.auth import get_optional_user
+from app.database import SessionLocal, get_db
+from app.db_models import Job, User
+from app.schemas import CropJobRequest
+from app.services.job_service import JobService
+from app.utils.serialization import dumps
+from app.utils.streaming import KEEPALIVE_SECONDS, event_stream, format_event, keepalive
+
+router = APIRouter()
+
+job_service = JobService()
+
+# Images accepted by one disease job
+JOB_MAX_FILES = int(os.getenv("JOB_MAX_FILES", "5000"))
+
+# Seconds between progress checks on /jobs/{id}/events
+JOB_EVENT_INTERVAL = float(os.getenv("JOB_EVENT_INTERVAL", "1"))
+
+
+def _get_owned_job(db: Session, job_id: str, user: Optional[User]) -> Job:
+    """Load a job the caller may see (jobs submitted with a token are private to that user)"""
+    job = job_service.get_job(db, job_id)
+    if job is None or (
+        job.user_id is not None
+        and (user is None or (user.id != job.user_id and not user.is_admin))
+    ):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
+
+
+@router.post("/crop", status_code=status.HTTP_202_ACCEPTED)
+async def submit_crop_job(
+    request: CropJobRequest,
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue crop recommendations for a soil survey
+    Poll /jobs/{id} or stream /jobs/{id}/events for progress
+    """
+    job = await run_in_threadpool(
+        job_service.create_crop_job, db,
+        [row.model_dump() for row in request.rows],
+        user_id=current_user.id if current_user else None,
+        chunk_size=request.chunk_size
+    )
+    return job_service.serialize_job(job)
+
+
+@router.post("/disease", status_code=status.HTTP_202_ACCEPTED)
+async def submit_disease_job(
+    files: List[UploadFile] = File(...),
+    chunk_size: Optional[int] = Form(None, ge=1, le=256),
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Queue disease detection for an archive of leaf images
+    Poll /jobs/{id} or stream /jobs/{id}/events for progress
+    """
+    if len(files) > JOB_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {JOB_MAX_FILES} images per job")
+
+    if any(not file.content_type.startswith("image/") for file in files):
+        raise HTTPException(status_code=400, detail="All files must be images")
+
+    job = await run_in_threadpool(
+        job_service.create_disease_job, db,
+        [(file.filename, file.file) for file in files],
+        user_id=current_user.id if current_user else None,
+        chunk_size=chunk_size
+    )
+    return job_service.serialize_job(job)
+
+
+@router.get("/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Get a job's status and progress"""
+    return job_service.serialize_job(_get_owned_job(db, job_id, current_user))
+
+
+@router.get("/{job_id}/results")
+async def download_job_results(
+    job_id: str,
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Download a finished job's results as JSON Lines, one item per line in input order
+    """
+    job = _get_owned_job(db, job_id, current_user)
+    if job.status not in JobService.FINISHED_STATUSES:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job is {job.status}")
+
+    def lines():
+        # Own session: the request's session is closed before the body is streamed
+        session = SessionLocal()
+        try:
+            for result in job_service.iter_results(session, job_id):
+                yield dumps(result) + b"\n"
+        finally:
+            session.close()
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="job-{job_id}.jsonl"'}
+    )
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Stream a job's progress and per-item results as server-sent events
+    
+    Results arrive in input order as "result" events, with "progress" events
+    when the counters change and a final "done" event. The last result of
+    each chunk carries the chunk number as its event ID, so a reconnecting
+    EventSource resumes after the last complete chunk.
+    """
+    _get_owned_job(db, job_id, current_user)
+    first_chunk = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    def poll(chunk_index: int):
+        """Job status, plus the results of chunk_index if it is ready"""
+        session = SessionLocal()
+        try:
+            job = job_service.get_job(session, job_id)
+            finished = job.status in JobService.FINISHED_STATUSES
+            results = None
+            if chunk_index < job.chunk_count:
+                results = job_service.chunk_results(session, job_id, chunk_index, include_unfinished=finished)
+            return job_service.serialize_job(job), results
+        finally:
+            session.close()
+
+    async def events():
+        chunk_index = first_chunk
+        last_progress = None
+        idle = 0.0
+        while True:
+            job, results = await run_in_threadpool(poll, chunk_index)
+            sent = results is not None
+            if sent:
+                for position, result in enumerate(results):
+                    event_id = str(chunk_index) if position == len(results) - 1 else None
+                    yield format_event(result, event="result", event_id=event_id)
+                chunk_index += 1
+                idle = 0.0
+            # Sent; don't hold the chunk while waiting for the next one
+            del results
+
+            progress = (job["status"], job["processed_items"])
+            if progress != last_progress:
+                yield format_event(job, event="progress")
+                last_progress = progress
+                idle = 0.0
+            if job["status"] in JobService.FINISHED_STATUSES and chunk_index >= job["chunk_count"]:
+                yield format_event(job, event="done")
+                return
+
+            if sent:
+                continue
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(JOB_EVENT_INTERVAL)
+            idle += JOB_EVENT_INTERVAL
+            if idle >= KEEPALIVE_SECONDS:
+                yield keepalive()
+                idle = 0.0
+
+    return event_stream(events())
+
+
+@router.delete("/{job_id}")
+async def cancel_job(
+    job_id: str,
+    current_user: Optional[User] = Depends(get_optional_user),
+    db: Session = Depends(get_db)
+):
+    """Cancel a queued or running job"""
+    job = _get_owned_job(db, job_id, current_user)
+    return job_service.serialize_job(job_service.cancel_job(db, job))
\ No newline at end of file
@@ -1,10 +1,10 @@
 """
-Authentication Schemas
-Pydantic models for authentication requests and responses
+API Schemas
+Pydantic models for authentication and history requests and responses
 """
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
 
 
@@ -57,4 +57,94 @@ class UserUpdate(BaseModel):
 class PasswordChange(BaseModel):
     """Schema for changing password"""
     old_password: str
-    new_password: str = Field(..., min_length=6)
\ No newline at end of file
+    new_password: str = Field(..., min_length=6)
+
+
+class HistoryPage(BaseModel):
+    """Schema for one page of prediction history"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class CropCount(BaseModel):
+    """Schema for a crop and how often it was recommended"""
+    crop: str
+    count: int
+
+
+class MonthlyWater(BaseModel):
+    """Schema for recommended irrigation water in one month"""
+    month: str
+    water_amount: float
+
+
+class UserStatsResponse(BaseModel):
+    """Schema for per-user analytics"""
+    user_id: int
+    crop_prediction_count: int
+    disease_prediction_count: int
+    irrigation_schedule_count: int
+    top_crops: List[CropCount]
+    total_water_recommended: float
+    water_by_month: List[MonthlyWater]
+
+
+class IrrigationForecastRequest(BaseModel):
+    """Schema for a forecast-driven irrigation schedule request"""
+    crop_type: str
+    crop_stage: str = Field(..., pattern="^(seedling|vegetative|flowering|fruiting|maturity)$")
+    soil_moisture: float = Field(..., ge=0, le=100)
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    days: int = Field(7, ge=1, le=7)
+
+
+class FieldPlanInput(BaseModel):
+    """Schema for one field in a season irrigation plan"""
+    crop_type: str
+    soil_moisture: float = Field(..., ge=0, le=100)
+    crop_stage: Optional[str] = Field(None, pattern="^(seedling|vegetative|flowering|fruiting|maturity)$")
+    days_after_planting: Optional[float] = Field(None, ge=0)
+    season_length: Optional[float] = Field(None, gt=0, le=365)
+    available_water: Optional[float] = Field(None, gt=0, le=500)
+
+
+class IrrigationPlanRequest(BaseModel):
+    """Schema for a multi-field season irrigation plan request"""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    elevation: float = Field(0.0, ge=-500, le=9000)
+    horizon_days: int = Field(120, ge=1, le=365)
+    fields: List[FieldPlanInput] = Field(..., min_length=1, max_length=1000)
+
+
+class CropFeatures(BaseModel):
+    """Schema for one row of soil and environmental readings"""
+    nitrogen: float
+    phosphorus: float
+    potassium: float
+    temperature: float
+    humidity: float = Field(..., ge=0, le=100)
+    ph: float = Field(..., ge=0, le=14)
+    rainfall: float = Field(..., ge=0)
+
+
+class CropBatchRequest(BaseModel):
+    """Schema for a bulk crop recommendation request"""
+    rows: List[CropFeatures] = Field(..., min_length=1, max_length=10000)
+    lane: str = Field("bulk", pattern="^(bulk|background)$")
+
+
+class CropJobRequest(BaseModel):
+    """Schema for a background crop recommendation job"""
+    rows: List[CropFeatures] = Field(..., min_length=1, max_length=1000000)
+    chunk_size: Optional[int] = Field(None, ge=1, le=10000)
+
+
+class FeedbackRequest(BaseModel):
+    """Schema for a farmer's confirmation or correction of a prediction"""
+    prediction_type: str = Field(..., pattern="^(crop|disease)$")
+    prediction_id: int = Field(..., ge=1)
+    correct: Optional[bool] = None
+    actual_label: Optional[str] = Field(None, min_length=1, max_length=100)
+    notes: Optional[str] = Field(None, max_length=2000)
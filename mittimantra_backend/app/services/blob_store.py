@@ -0,0 +1,258 @@
+# app/services/blob_store.py
+"""
+Blob Store
+Content-addressed, deduplicated archive of uploaded images with size-based retention
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from PIL import Image, ImageOps, features
+
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Where archived uploads are kept
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "image_store")
+# Total size the archive may grow to before the least recently stored images are evicted (0 disables archiving)
+IMAGE_STORE_MAX_MB = float(os.getenv("IMAGE_STORE_MAX_MB", "1024"))
+# Archived copies: "webp" or "jpeg" re-encoded within IMAGE_STORE_MAX_DIMENSION, or "original" bytes
+IMAGE_STORE_FORMAT = os.getenv("IMAGE_STORE_FORMAT", "webp").lower()
+IMAGE_STORE_MAX_DIMENSION = int(os.getenv("IMAGE_STORE_MAX_DIMENSION", "1024"))
+IMAGE_STORE_QUALITY = int(os.getenv("IMAGE_STORE_QUALITY", "80"))
+
+IMAGE_STORE_WRITES = registry.counter(
+    "mittimantra_image_store_writes_total",
+    "Archived uploads by outcome (stored, duplicate, failed)",
+    ["outcome"]
+)
+IMAGE_STORE_EVICTIONS = registry.counter(
+    "mittimantra_image_store_evictions_total",
+    "Archived images deleted to stay within IMAGE_STORE_MAX_MB"
+)
+IMAGE_STORE_BYTES = registry.gauge(
+    "mittimantra_image_store_bytes",
+    "Size of the image archive as last measured by this process"
+)
+
+# Bytes read from the upload per write
+_CHUNK_SIZE = 1 << 20
+# Eviction frees space down to this fraction of the limit, so it does not run on every write
+_LOW_WATERMARK = 0.9
+
+_EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg", "original": ""}
+
+
+class StoredBlob(NamedTuple):
+    """An archived upload: its SHA-256, path relative to the store and stored size"""
+    key: str
+    path: str
+    size: int
+    duplicate: bool
+
+
+class BlobStore:
+    """
+    Archive of uploads keyed by the SHA-256 of the uploaded bytes
+
+    Blobs live in two levels of shard directories (ab/cd/abcd....webp) so
+    no directory grows too large. An upload is streamed to a temporary file
+    while it is hashed; if the key is already stored the copy is discarded
+    (and the existing blob counts as recently used), otherwise it is
+    re-encoded if configured and renamed into place, so readers never see
+    a partial file. When the archive exceeds max_bytes the least recently
+    stored blobs are deleted.
+    """
+
+    def __init__(
+        self,
+        root: str = IMAGE_STORE_DIR,
+        max_bytes: int = int(IMAGE_STORE_MAX_MB * 1024 * 1024),
+        image_format: str = IMAGE_STORE_FORMAT,
+        max_dimension: int = IMAGE_STORE_MAX_DIMENSION,
+        quality: int = IMAGE_STORE_QUALITY
+    ):
+        """
+        Initialize blob store
+
+        Args:
+            root: Archive directory
+            max_bytes: Size limit of the archive (0 disables the store)
+            image_format: "webp", "jpeg" or "original"
+            max_dimension: Longest side of re-encoded images (0 keeps the resolution)
+            quality: Encoder quality for re-encoded images
+        """
+        if image_format not in _EXTENSIONS:
+            raise ValueError(f"Unknown image store format: {image_format}")
+        if image_format == "webp" and not features.check("webp"):
+            logger.warning("Pillow was built without WebP support; archiving images as JPEG")
+            image_format = "jpeg"
+        self.root = root
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _relative_path(self, key: str) -> str:
+        return os.path.join(key[:2], key[2:4], key + _EXTENSIONS[self.image_format])
+
+    def find(self, key: str) -> Optional[str]:
+        """Absolute path of a stored blob, whatever format it was stored in, or None"""
+        shard = os.path.join(self.root, key[:2], key[2:4])
+        try:
+            names = os.listdir(shard)
+        except OSError:
+            return None
+        for name in names:
+            if name == key or name.startswith(key + "."):
+                return os.path.join(shard, name)
+        return None
+
+    def put(self, fileobj: BinaryIO) -> StoredBlob:
+        """
+        Archive an upload, reading it in chunks from its current position
+
+        Args:
+            fileobj: Readable binary file (e.g. UploadFile.file)
+
+        Returns:
+            The stored (or already present) blob
+
+        Raises:
+            ValueError: If the upload cannot be stored
+        """
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, "wb") as out:
+                for block in iter(lambda: fileobj.read(_CHUNK_SIZE), b""):
+                    digest.update(block)
+                    out.write(block)
+            key = digest.hexdigest()
+
+            existing = self.find(key)
+            if existing is not None:
+                # Refresh its recency so retention keeps images that keep arriving
+                os.utime(existing)
+                IMAGE_STORE_WRITES.inc(outcome="duplicate")
+                return StoredBlob(key, os.path.relpath(existing, self.root), os.path.getsize(existing), True)
+
+            relative_path = self._relative_path(key)
+            path = os.path.join(self.root, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.image_format != "original":
+                self._reencode(tmp_path)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            IMAGE_STORE_WRITES.inc(outcome="failed")
+            logger.error("Failed to archive image: %s", e)
+            raise ValueError(f"Failed to archive image: {str(e)}")
+        finally:
+            for leftover in (tmp_path, tmp_path + ".enc"):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+
+        IMAGE_STORE_WRITES.inc(outcome="stored")
+        self._account(size)
+        return StoredBlob(key, relative_path, size, False)
+
+    def _reencode(self, path: str) -> None:
+        """Rewrite an image in place within max_dimension and in the store's format"""
+        with Image.open(path) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            if self.max_dimension > 0:
+                image.thumbnail((self.max_dimension, self.max_dimension), Image.Resampling.LANCZOS)
+            encoded = path + ".enc"
+            image.save(encoded, format=self.image_format.upper(), quality=self.quality)
+        os.replace(encoded, path)
+
+    def _blobs(self) -> List[Tuple[float, int, str]]:
+        """(mtime, size, path) of every stored blob"""
+        blobs = []
+        for shard, dirs, files in os.walk(self.root):
+            if shard == self.root:
+                dirs[:] = [name for name in dirs if name != "tmp"]
+            for name in files:
+                path = os.path.join(shard, name)
+                try:
+                    stat_result = os.stat(path)
+                except OSError:
+                    continue
+                blobs.append((stat_result.st_mtime, stat_result.st_size, path))
+        return blobs
+
+    def _account(self, added: int) -> None:
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._blobs())
+            else:
+                self._total_bytes += added
+            over_limit = self._total_bytes > self.max_bytes
+            IMAGE_STORE_BYTES.set(self._total_bytes)
+        if over_limit:
+            self.enforce_limit()
+
+    def enforce_limit(self) -> int:
+        """
+        Delete the least recently stored blobs until the archive is under the low watermark
+
+        Rescans the directory, so the limit holds even when several
+        processes write to the same store.
+
+        Returns:
+            Number of blobs deleted
+        """
+        with self._lock:
+            blobs = sorted(self._blobs())
+            total = sum(size for _, size, _ in blobs)
+            target = self.max_bytes * _LOW_WATERMARK
+            evicted = 0
+            for _, size, path in blobs:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+            self._total_bytes = total
+            IMAGE_STORE_BYTES.set(total)
+        if evicted:
+            IMAGE_STORE_EVICTIONS.inc(evicted)
+            logger.info("Evicted %s archived image(s); archive now %.1f MB", evicted, total / (1024 * 1024))
+        return evicted
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            blobs = self._blobs()
+            self._total_bytes = sum(size for _, size, _ in blobs)
+            return {
+                "enabled": self.enabled,
+                "blobs": len(blobs),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "format": self.image_format,
+                "max_dimension": self.max_dimension,
+                "oldest": min((mtime for mtime, _, _ in blobs), default=None),
+            }
+
+
+# Process-wide archive of /predict-disease uploads
+image_store = BlobStore()
\ No newline at end of file
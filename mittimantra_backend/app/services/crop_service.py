@@ -8,7 +8,9 @@ import joblib
 import numpy as np
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from app.utils.metrics import model_forward, stage
 
 logger = logging.getLogger(__name__)
 
@@ -16,20 +18,36 @@ logger = logging.getLogger(__name__)
 class CropRecommendationService:
     """Service for crop recommendation"""
     
-    def __init__(self):
-        """Load crop recommendation model and label encoder"""
+    # Model input columns, in training order
+    FEATURE_NAMES = ["nitrogen", "phosphorus", "potassium", "temperature", "humidity", "ph", "rainfall"]
+    
+    def __init__(self, model_path: Optional[str] = None, encoder_path: Optional[str] = None):
+        """
+        Load crop recommendation model and label encoder
+        
+        Args:
+            model_path: Model file (default models/crop_planning_brain.pkl)
+            encoder_path: Label encoder file (default models/crop_label_encoder.pkl)
+        """
         try:
-            model_path = Path("models/crop_planning_brain.pkl")
-            encoder_path = Path("models/crop_label_encoder.pkl")
+            model_path = Path(model_path or "models/crop_planning_brain.pkl")
+            encoder_path = Path(encoder_path or "models/crop_label_encoder.pkl")
             
             self.model = joblib.load(model_path)
             self.label_encoder = joblib.load(encoder_path)
             
             logger.info("Crop recommendation model loaded successfully")
         except Exception as e:
-            logger.error(f"Failed to load crop recommendation model: {str(e)}")
+            logger.error("Failed to load crop recommendation model: %s", e)
             raise
     
+    def warm_up(self):
+        """Run one throwaway prediction so the first request does not pay for lazy initialization"""
+        features = np.zeros((1, len(self.FEATURE_NAMES)))
+        self.model.predict(features)
+        if hasattr(self.model, 'predict_proba'):
+            self.model.predict_proba(features)
+    
     def predict_crop(
         self,
         nitrogen: float,
@@ -63,42 +81,85 @@ class CropRecommendationService:
             ]])
             
             # Make prediction
-            prediction = self.model.predict(features)
+            probabilities = None
+            with model_forward("crop"):
+                # Flattened: some boosters (CatBoost) return a column vector
+                prediction = np.asarray(self.model.predict(features)).reshape(-1)
+                
+                # Get prediction probabilities if available
+                if hasattr(self.model, 'predict_proba'):
+                    probabilities = self.model.predict_proba(features)[0]
             
-            # Get prediction probabilities if available
-            confidence = None
-            alternative_crops = None
+            with stage("postprocess"):
+                return self._build_result(features[0], prediction[0], probabilities)
             
-            if hasattr(self.model, 'predict_proba'):
-                probabilities = self.model.predict_proba(features)[0]
-                confidence = float(np.max(probabilities))
-                
-                # Get top 3 alternatives
-                top_indices = np.argsort(probabilities)[-3:][::-1]
-                alternative_crops = [
-                    self.label_encoder.inverse_transform([idx])[0]
-                    for idx in top_indices[1:]
-                ]
+        except Exception as e:
+            logger.error("Crop prediction error: %s", e)
+            raise ValueError(f"Failed to predict crop: {str(e)}")
+    
+    def predict_crops(self, rows: List[Dict]) -> List[Dict]:
+        """
+        Predict optimal crops for a batch of soil and environmental readings
+        
+        Args:
+            rows: Dictionaries with the predict_crop keyword arguments
             
-            # Decode prediction to crop name
-            recommended_crop = self.label_encoder.inverse_transform(prediction)[0]
+        Returns:
+            One result dictionary per row, in input order
+        """
+        try:
+            features = np.array([
+                [row[name] for name in self.FEATURE_NAMES]
+                for row in rows
+            ], dtype=float)
             
-            # Generate reasoning
-            reasoning = self._generate_reasoning(
-                recommended_crop, nitrogen, phosphorus, potassium,
-                temperature, humidity, ph, rainfall
-            )
+            # One vectorized call for the whole batch
+            probabilities = None
+            with model_forward("crop"):
+                predictions = np.asarray(self.model.predict(features)).reshape(-1)
+                if hasattr(self.model, 'predict_proba'):
+                    probabilities = self.model.predict_proba(features)
             
-            return {
-                "recommended_crop": recommended_crop,
-                "confidence": confidence,
-                "alternative_crops": alternative_crops,
-                "reasoning": reasoning
-            }
+            with stage("postprocess"):
+                return [
+                    self._build_result(
+                        features[i], predictions[i],
+                        probabilities[i] if probabilities is not None else None
+                    )
+                    for i in range(len(rows))
+                ]
             
         except Exception as e:
-            logger.error(f"Crop prediction error: {str(e)}")
-            raise ValueError(f"Failed to predict crop: {str(e)}")
+            logger.error("Batch crop prediction error: %s", e)
+            raise ValueError(f"Failed to predict crops: {str(e)}")
+    
+    def _build_result(self, features: np.ndarray, prediction, probabilities) -> Dict:
+        """Turn one row's model output into a recommendation"""
+        confidence = None
+        alternative_crops = None
+        
+        if probabilities is not None:
+            confidence = float(np.max(probabilities))
+            
+            # Get top 3 alternatives
+            top_indices = np.argsort(probabilities)[-3:][::-1]
+            alternative_crops = [
+                self.label_encoder.inverse_transform([idx])[0]
+                for idx in top_indices[1:]
+            ]
+        
+        # Decode prediction to crop name
+        recommended_crop = self.label_encoder.inverse_transform([prediction])[0]
+        
+        # Generate reasoning
+        reasoning = self._generate_reasoning(recommended_crop, *features)
+        
+        return {
+            "recommended_crop": recommended_crop,
+            "confidence": confidence,
+            "alternative_crops": alternative_crops,
+            "reasoning": reasoning
+        }
     
     def _generate_reasoning(
         self, crop: str, n: float, p: float, k: float,
@@ -0,0 +1,426 @@
+# app/services/crop_training.py
+"""
+Crop Model Training
+Offline retraining of the crop model from stored predictions, farmer feedback and seed data
+"""
+
+import csv
+import json
+import logging
+import os
+import resource
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db_models import CropPrediction, PredictionFeedback
+from app.services.crop_service import CropRecommendationService
+from app.services.model_registry import MODELS_DIR
+
+logger = logging.getLogger(__name__)
+
+FEATURE_NAMES = CropRecommendationService.FEATURE_NAMES
+MODEL_FILE = "crop_planning_brain.pkl"
+ENCODER_FILE = "crop_label_encoder.pkl"
+REPORT_FILE = "training_report.json"
+
+# Where versioned artifacts are written
+TRAINING_OUTPUT_DIR = os.getenv("TRAINING_OUTPUT_DIR", os.path.join(MODELS_DIR, "trained"))
+# Rows fetched from the database per round trip
+TRAINING_CHUNK_SIZE = int(os.getenv("TRAINING_CHUNK_SIZE", "5000"))
+
+# Seed dataset columns (Crop_recommendation.csv layout) that differ from FEATURE_NAMES
+_SEED_ALIASES = {"n": "nitrogen", "p": "phosphorus", "k": "potassium", "label": "crop"}
+
+
+def _random_forest(threads: int):
+    from sklearn.ensemble import RandomForestClassifier
+    return RandomForestClassifier(n_estimators=300, n_jobs=threads, random_state=0)
+
+
+def _xgboost(threads: int):
+    from xgboost import XGBClassifier
+    return XGBClassifier(n_estimators=300, max_depth=6, learning_rate=0.1, tree_method="hist", n_jobs=threads, random_state=0)
+
+
+def _lightgbm(threads: int):
+    from lightgbm import LGBMClassifier
+    return LGBMClassifier(n_estimators=300, learning_rate=0.05, n_jobs=threads, random_state=0, verbose=-1)
+
+
+def _catboost(threads: int):
+    from catboost import CatBoostClassifier
+    return CatBoostClassifier(iterations=500, thread_count=threads, random_seed=0, verbose=False, allow_writing_files=False)
+
+
+# Candidate name -> factory taking the number of threads the model may use
+CANDIDATES: Dict[str, Callable[[int], object]] = {
+    "random_forest": _random_forest,
+    "xgboost": _xgboost,
+    "lightgbm": _lightgbm,
+    "catboost": _catboost,
+}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory of this process (ru_maxrss is KiB on Linux)"""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _normalize_label(label: Optional[str]) -> Optional[str]:
+    label = (label or "").strip().lower()
+    return label or None
+
+
+def iter_feedback_rows(
+    db: Session,
+    chunk_size: int = TRAINING_CHUNK_SIZE,
+    include_unconfirmed: bool = False
+) -> Iterator[Tuple[np.ndarray, List[str], Dict[str, int]]]:
+    """
+    Stream labelled crop predictions from the database in chunks
+
+    The label of a prediction comes from its latest feedback: the actual
+    crop when the farmer corrected it, the recommended crop when they
+    confirmed it. Rejections without a correction are skipped. Predictions
+    without feedback are only used (labelled with the model's own
+    recommendation) when include_unconfirmed is set.
+
+    Yields:
+        (features, labels, counts by label source) per chunk
+    """
+    latest = (
+        select(PredictionFeedback.prediction_id, func.max(PredictionFeedback.id).label("feedback_id"))
+        .where(PredictionFeedback.prediction_type == "crop")
+        .group_by(PredictionFeedback.prediction_id)
+        .subquery()
+    )
+    stmt = (
+        select(
+            *[getattr(CropPrediction, name) for name in FEATURE_NAMES],
+            CropPrediction.recommended_crop,
+            PredictionFeedback.correct,
+            PredictionFeedback.actual_label,
+        )
+        .outerjoin(latest, latest.c.prediction_id == CropPrediction.id)
+        .outerjoin(PredictionFeedback, PredictionFeedback.id == latest.c.feedback_id)
+        .order_by(CropPrediction.id)
+    )
+    if not include_unconfirmed:
+        stmt = stmt.where(latest.c.feedback_id.isnot(None))
+
+    # yield_per streams from a server-side cursor instead of loading every row
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for rows in result.partitions():
+        features, labels = [], []
+        counts = {"corrected": 0, "confirmed": 0, "unconfirmed": 0}
+        for row in rows:
+            values = row[:len(FEATURE_NAMES)]
+            if any(value is None for value in values):
+                continue
+            recommended, correct, actual = row[len(FEATURE_NAMES):]
+            if _normalize_label(actual):
+                label, source = _normalize_label(actual), "corrected"
+            elif correct:
+                label, source = _normalize_label(recommended), "confirmed"
+            elif correct is None and include_unconfirmed:
+                label, source = _normalize_label(recommended), "unconfirmed"
+            else:
+                continue
+            if label is None:
+                continue
+            features.append(values)
+            labels.append(label)
+            counts[source] += 1
+        yield np.asarray(features, dtype=np.float32).reshape(-1, len(FEATURE_NAMES)), labels, counts
+
+
+def iter_seed_rows(path: str, chunk_size: int = TRAINING_CHUNK_SIZE) -> Iterator[Tuple[np.ndarray, List[str]]]:
+    """
+    Stream a labelled CSV (e.g. the original Crop_recommendation.csv) in chunks
+
+    Columns are the feature names (or N, P, K) plus crop (or label).
+    """
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        columns = {name.strip().lower(): name for name in reader.fieldnames or []}
+        mapping = {_SEED_ALIASES.get(key, key): original for key, original in columns.items()}
+        missing = [name for name in FEATURE_NAMES + ["crop"] if name not in mapping]
+        if missing:
+            raise ValueError(f"Seed data is missing columns: {', '.join(missing)}")
+
+        features, labels = [], []
+        for row in reader:
+            label = _normalize_label(row[mapping["crop"]])
+            if label is None:
+                continue
+            features.append([float(row[mapping[name]]) for name in FEATURE_NAMES])
+            labels.append(label)
+            if len(features) >= chunk_size:
+                yield np.asarray(features, dtype=np.float32), labels
+                features, labels = [], []
+        if features:
+            yield np.asarray(features, dtype=np.float32), labels
+
+
+def _macro_f1(expected: np.ndarray, predicted: np.ndarray) -> float:
+    scores = []
+    for label in np.unique(expected):
+        true_positive = np.sum((predicted == label) & (expected == label))
+        predicted_count = np.sum(predicted == label)
+        actual_count = np.sum(expected == label)
+        precision = true_positive / predicted_count if predicted_count else 0.0
+        recall = true_positive / actual_count if actual_count else 0.0
+        scores.append(2 * precision * recall / (precision + recall) if precision + recall else 0.0)
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def evaluate(expected: np.ndarray, predicted: np.ndarray) -> Dict:
+    """Holdout accuracy and macro-averaged F1"""
+    return {
+        "accuracy": round(float(np.mean(expected == predicted)), 4) if len(expected) else None,
+        "macro_f1": round(_macro_f1(expected, predicted), 4),
+    }
+
+
+def _predict_labels(model, features: np.ndarray) -> np.ndarray:
+    # CatBoost returns a column vector; everything else a flat array
+    return np.asarray(model.predict(features)).reshape(len(features))
+
+
+def _train_candidate(name: str, factory: Callable[[int], object], threads: int, train, holdout) -> Dict:
+    """Fit one candidate and score it on the holdout (runs in a joblib worker process)"""
+    x_train, y_train = train
+    x_holdout, y_holdout = holdout
+    try:
+        model = factory(threads)
+    except ImportError as e:
+        return {"name": name, "skipped": f"not installed ({e.name})"}
+
+    started = time.perf_counter()
+    try:
+        model.fit(x_train, y_train)
+    except Exception as e:
+        return {"name": name, "failed": str(e)}
+    train_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    predicted = _predict_labels(model, x_holdout)
+    predict_seconds = time.perf_counter() - started
+    return {
+        "name": name,
+        **evaluate(y_holdout, predicted),
+        "train_seconds": round(train_seconds, 3),
+        "predict_ms_per_row": round(predict_seconds * 1000 / max(1, len(x_holdout)), 4),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def holdout_split(labels: np.ndarray, fraction: float, seed: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Stratified train/holdout index split
+
+    Every class with at least two rows contributes about fraction of its
+    rows to the holdout; singleton classes stay in training.
+    """
+    rng = np.random.default_rng(seed)
+    train, holdout = [], []
+    for label in np.unique(labels):
+        indices = rng.permutation(np.flatnonzero(labels == label))
+        count = int(round(len(indices) * fraction)) if len(indices) > 1 else 0
+        count = min(max(count, 1 if len(indices) > 1 else 0), len(indices) - 1)
+        holdout.append(indices[:count])
+        train.append(indices[count:])
+    return np.sort(np.concatenate(train)), np.sort(np.concatenate(holdout))
+
+
+class CropTrainingPipeline:
+    """
+    Trains candidate crop models in parallel and writes the best as a versioned artifact
+
+    Everything runs locally: rows are streamed from the application
+    database (and optionally a seed CSV), candidates are fitted in separate
+    joblib worker processes that split the machine's cores between them,
+    and the winner is refitted on all rows and saved in the layout the
+    model registry loads (crop_planning_brain.pkl, crop_label_encoder.pkl).
+    """
+
+    def __init__(
+        self,
+        candidates: Optional[Dict[str, Callable[[int], object]]] = None,
+        output_dir: str = TRAINING_OUTPUT_DIR,
+        chunk_size: int = TRAINING_CHUNK_SIZE,
+        holdout_fraction: float = 0.2,
+        n_jobs: int = -1,
+        seed: int = 0
+    ):
+        """
+        Initialize training pipeline
+
+        Args:
+            candidates: Name -> model factory (default CANDIDATES)
+            output_dir: Directory for versioned artifacts
+            chunk_size: Rows per database round trip
+            holdout_fraction: Share of each class held out for evaluation
+            n_jobs: CPU cores to use (-1 for all)
+            seed: Random seed for the holdout split
+        """
+        self.candidates = dict(candidates or CANDIDATES)
+        self.output_dir = output_dir
+        self.chunk_size = chunk_size
+        self.holdout_fraction = holdout_fraction
+        self.cores = n_jobs if n_jobs > 0 else (os.cpu_count() or 1)
+        self.seed = seed
+
+    def load_data(
+        self,
+        db: Optional[Session] = None,
+        seed_path: Optional[str] = None,
+        include_unconfirmed: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, int]]:
+        """
+        Collect training rows from the database and/or a seed CSV
+
+        Returns:
+            (features, labels, row counts by source)
+        """
+        features, labels = [], []
+        sources = {"seed": 0, "corrected": 0, "confirmed": 0, "unconfirmed": 0}
+        if seed_path:
+            for chunk, chunk_labels in iter_seed_rows(seed_path, self.chunk_size):
+                features.append(chunk)
+                labels.extend(chunk_labels)
+                sources["seed"] += len(chunk_labels)
+        if db is not None:
+            for chunk, chunk_labels, counts in iter_feedback_rows(db, self.chunk_size, include_unconfirmed):
+                features.append(chunk)
+                labels.extend(chunk_labels)
+                for source, count in counts.items():
+                    sources[source] += count
+        if not labels:
+            raise ValueError("No labelled training rows found")
+        return np.concatenate(features), np.asarray(labels), sources
+
+    def _baseline(self, models_dir: Optional[str], features: np.ndarray, labels: np.ndarray) -> Optional[Dict]:
+        """Score the model currently in models_dir on the same holdout"""
+        if not models_dir or not os.path.exists(os.path.join(models_dir, MODEL_FILE)):
+            return None
+        try:
+            service = CropRecommendationService(
+                os.path.join(models_dir, MODEL_FILE), os.path.join(models_dir, ENCODER_FILE)
+            )
+            predicted = service.label_encoder.inverse_transform(_predict_labels(service.model, features))
+            return evaluate(labels, np.char.lower(np.asarray(predicted, dtype=str)))
+        except Exception as e:
+            logger.warning("Could not evaluate the current crop model: %s", e)
+            return None
+
+    def train(
+        self,
+        features: np.ndarray,
+        labels: np.ndarray,
+        sources: Optional[Dict[str, int]] = None,
+        baseline_dir: Optional[str] = MODELS_DIR
+    ) -> Dict:
+        """
+        Fit every candidate, pick the best on the holdout and write the artifact
+
+        Args:
+            features: Rows in FEATURE_NAMES order
+            labels: Crop names
+            sources: Row counts by source, for the report
+            baseline_dir: Directory of the current model to compare against (None to skip)
+
+        Returns:
+            The training report (also saved next to the artifact)
+
+        Raises:
+            ValueError: If there is too little data or every candidate fails
+        """
+        from joblib import Parallel, delayed
+        from sklearn.preprocessing import LabelEncoder
+
+        started = time.perf_counter()
+        encoder = LabelEncoder().fit(labels)
+        if len(encoder.classes_) < 2:
+            raise ValueError("Training needs at least two crop classes")
+        encoded = encoder.transform(labels)
+        train_index, holdout_index = holdout_split(encoded, self.holdout_fraction, self.seed)
+        if not len(holdout_index):
+            raise ValueError("Not enough rows for a holdout set")
+        train = (features[train_index], encoded[train_index])
+        holdout = (features[holdout_index], encoded[holdout_index])
+
+        # Candidates train side by side, each with its share of the cores
+        parallel = max(1, min(len(self.candidates), self.cores))
+        threads = max(1, self.cores // parallel)
+        logger.info(
+            "Training %s crop model candidate(s) on %s rows (%s in parallel, %s thread(s) each)",
+            len(self.candidates), len(train_index), parallel, threads
+        )
+        results = Parallel(n_jobs=parallel)(
+            delayed(_train_candidate)(name, factory, threads, train, holdout)
+            for name, factory in self.candidates.items()
+        )
+        scored = [result for result in results if "macro_f1" in result]
+        if not scored:
+            raise ValueError("Every crop model candidate failed: " + json.dumps(results))
+        winner = max(scored, key=lambda result: (result["macro_f1"], result["accuracy"], -result["train_seconds"]))["name"]
+
+        # Refit the winner on every row with all cores
+        refit_started = time.perf_counter()
+        model = self.candidates[winner](self.cores)
+        model.fit(features, encoded)
+        refit_seconds = time.perf_counter() - refit_started
+
+        version = datetime.now(timezone.utc).strftime("crop-%Y%m%dT%H%M%SZ")
+        report = {
+            "version": version,
+            "rows": int(len(labels)),
+            "sources": sources or {},
+            "classes": {str(name): int(count) for name, count in zip(*np.unique(labels, return_counts=True))},
+            "holdout_rows": int(len(holdout_index)),
+            "candidates": {result.pop("name"): result for result in results},
+            "winner": winner,
+            "production": self._baseline(baseline_dir, holdout[0], labels[holdout_index]),
+            "refit_seconds": round(refit_seconds, 3),
+            "total_seconds": round(time.perf_counter() - started, 3),
+            "peak_rss_mb": _peak_rss_mb(),
+        }
+        report["artifact"] = self._write_artifact(version, model, encoder, report)
+        logger.info("Crop model %s trained: %s", version, report["winner"])
+        return report
+
+    def _write_artifact(self, version: str, model, encoder, report: Dict) -> str:
+        """Save model, encoder and report into output_dir/version, appearing all at once"""
+        path = os.path.join(self.output_dir, version)
+        staging = path + ".tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        joblib.dump(model, os.path.join(staging, MODEL_FILE))
+        joblib.dump(encoder, os.path.join(staging, ENCODER_FILE))
+        with open(os.path.join(staging, REPORT_FILE), "w") as f:
+            json.dump({**report, "artifact": path}, f, indent=2)
+        os.replace(staging, path)
+        return path
+
+
+def promote(artifact_dir: str, models_dir: str) -> None:
+    """
+    Copy an artifact's model files into a directory the model registry watches
+
+    Typically the shadow candidate directory, so the new model is compared
+    against production before it replaces it. Each file is copied under a
+    temporary name and renamed, so the registry never reads a partial file.
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    for filename in (ENCODER_FILE, MODEL_FILE):
+        target = os.path.join(models_dir, filename)
+        shutil.copyfile(os.path.join(artifact_dir, filename), target + ".tmp")
+        os.replace(target + ".tmp", target)
\ No newline at end of file
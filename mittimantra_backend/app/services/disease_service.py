@@ -6,12 +6,35 @@ Handles disease detection from leaf images
 import tensorflow as tf
 import numpy as np
 import logging
+import os
 from pathlib import Path
-from typing import Dict, List
-from app.utils.image_utils import preprocess_image
+from typing import Dict, List, Optional
+from app.utils.image_utils import LEAF_MAX_TILES, DecodedImage, augment_views, decode_image, leaf_crops
+from app.utils.metrics import model_forward, registry, stage
+from app.utils.perceptual_hash import NearDuplicateIndex, phash
 
 logger = logging.getLogger(__name__)
 
+# Test-time augmentation: views averaged for low-confidence predictions (0 or 1 disables)
+DISEASE_TTA_VIEWS = int(os.getenv("DISEASE_TTA_VIEWS", "8"))
+# Predictions below this confidence are re-scored with augmentation (matches the severity cut-off)
+DISEASE_TTA_THRESHOLD = float(os.getenv("DISEASE_TTA_THRESHOLD", "0.8"))
+
+# Hamming distance between perceptual hashes at which uploads count as the same photo
+DISEASE_DEDUP_DISTANCE = int(os.getenv("DISEASE_DEDUP_DISTANCE", "6"))
+# Recent results kept for near-duplicate uploads, per model version (0 disables)
+DISEASE_DEDUP_MAX_ENTRIES = int(os.getenv("DISEASE_DEDUP_MAX_ENTRIES", "4096"))
+
+DISEASE_DUPLICATE_HITS = registry.counter(
+    "mittimantra_disease_duplicate_hits_total",
+    "Disease predictions answered from a near-duplicate upload without a forward pass"
+)
+DISEASE_TTA = registry.counter(
+    "mittimantra_disease_tta_total",
+    "Low-confidence disease predictions re-scored with test-time augmentation, by whether the class changed",
+    ["outcome"]
+)
+
 
 class DiseaseDetectionService:
     """Service for plant disease detection"""
@@ -59,10 +82,33 @@ class DiseaseDetectionService:
         'Tomato___healthy'
     ]
     
-    def __init__(self):
-        """Load disease detection model"""
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        tta_views: int = DISEASE_TTA_VIEWS,
+        tta_threshold: float = DISEASE_TTA_THRESHOLD,
+        leaf_tiles: int = LEAF_MAX_TILES,
+        dedup_distance: int = DISEASE_DEDUP_DISTANCE,
+        dedup_max_entries: int = DISEASE_DEDUP_MAX_ENTRIES
+    ):
+        """
+        Load disease detection model
+        
+        Args:
+            model_path: Keras model file (default models/plant_disease_model.keras)
+            tta_views: Augmented views averaged for low-confidence images (0 or 1 disables)
+            tta_threshold: Confidence below which augmentation is applied
+            leaf_tiles: Close-up tiles of large leaves classified with the leaf crop (0 disables)
+            dedup_distance: Hamming distance at which uploads are near duplicates
+            dedup_max_entries: Results kept for near-duplicate lookups (0 disables)
+        """
+        self.tta_views = tta_views
+        self.tta_threshold = tta_threshold
+        self.leaf_tiles = leaf_tiles
+        # Results are only valid for this model, so each loaded version has its own index
+        self.duplicates = NearDuplicateIndex(dedup_distance, dedup_max_entries) if dedup_max_entries > 0 else None
         try:
-            model_path = Path("models/plant_disease_model.keras")
+            model_path = Path(model_path or "models/plant_disease_model.keras")
             self.model = tf.keras.models.load_model(model_path)
             self.input_shape = self.model.input_shape[1:3]
             
@@ -71,7 +117,7 @@ class DiseaseDetectionService:
             
             # Adjust class list if needed
             if num_classes != len(self.DISEASE_CLASSES):
-                logger.warning(f"Model has {num_classes} classes but DISEASE_CLASSES has {len(self.DISEASE_CLASSES)}")
+                logger.warning("Model has %s classes but DISEASE_CLASSES has %s", num_classes, len(self.DISEASE_CLASSES))
                 # Use generic names if mismatch
                 if num_classes < len(self.DISEASE_CLASSES):
                     self.DISEASE_CLASSES = self.DISEASE_CLASSES[:num_classes]
@@ -80,12 +126,16 @@ class DiseaseDetectionService:
                     for i in range(len(self.DISEASE_CLASSES), num_classes):
                         self.DISEASE_CLASSES.append(f"Disease_Class_{i}")
             
-            logger.info(f"Disease detection model loaded successfully with input shape {self.input_shape}")
-            logger.info(f"Number of disease classes: {num_classes}")
+            logger.info("Disease detection model loaded successfully with input shape %s", self.input_shape)
+            logger.info("Number of disease classes: %s", num_classes)
         except Exception as e:
-            logger.error(f"Failed to load disease detection model: {str(e)}")
+            logger.error("Failed to load disease detection model: %s", e)
             raise
     
+    def warm_up(self):
+        """Run one throwaway forward pass so graph tracing happens before traffic arrives"""
+        self.model.predict(np.zeros((1, *self.input_shape, 3), dtype=np.float32), verbose=0)
+    
     def predict_disease(self, image_bytes: bytes) -> Dict:
         """
         Predict plant disease from leaf image
@@ -97,54 +147,207 @@ class DiseaseDetectionService:
             Dictionary containing disease name and additional information
         """
         try:
-            # Preprocess image
-            processed_image = preprocess_image(image_bytes, self.input_shape)
-            
-            # Add batch dimension
-            image_batch = np.expand_dims(processed_image, axis=0)
+            decoded = decode_image(image_bytes)
             
-            # Make prediction
-            predictions = self.model.predict(image_batch, verbose=0)
-            predicted_class = np.argmax(predictions[0])
-            confidence = float(predictions[0][predicted_class])
+            # Same photo as a recent upload: reuse its result
+            fingerprint, duplicate = self._find_duplicate(decoded)
+            if duplicate is not None:
+                logger.info("Disease result reused for near-duplicate upload: %s", duplicate["disease"])
+                return duplicate
             
-            # Safety check
-            if predicted_class >= len(self.DISEASE_CLASSES):
-                logger.error(f"Predicted class {predicted_class} exceeds available classes {len(self.DISEASE_CLASSES)}")
-                raise ValueError(f"Predicted class index out of range")
+            # Preprocess image into the leaf crop (and any tiles)
+            crops = leaf_crops(decoded, self.input_shape, self.leaf_tiles)
             
-            # Get disease name
-            disease_name = self.DISEASE_CLASSES[predicted_class]
+            # Make prediction
+            predictions = self._predict_crops([crops])
             
-            # Parse disease name to extract plant and disease
-            if '___' in disease_name:
-                parts = disease_name.split('___')
-                affected_plant = parts[0].replace('_', ' ')
-                disease = parts[1].replace('_', ' ') if len(parts) > 1 else "Unknown"
-            elif '_' in disease_name and 'Class' in disease_name:
-                # Generic class name
-                affected_plant = "Plant"
-                disease = disease_name
-            else:
-                affected_plant = "Plant"
-                disease = disease_name.replace('_', ' ')
+            predictions = self._augment_low_confidence([crops[0]], predictions)
             
-            # Determine severity based on confidence and disease type
-            severity = self._determine_severity(disease, confidence)
+            with stage("postprocess"):
+                result = self._build_result(predictions[0])
+            self._remember(fingerprint, result)
             
-            logger.info(f"Disease detected: {disease} (confidence: {confidence:.2f}, severity: {severity})")
+            logger.info(
+                "Disease detected: %s (confidence: %.2f, severity: %s)",
+                result["disease"], result["confidence"], result["severity"],
+                extra={
+                    "disease": result["disease"],
+                    "confidence": round(result["confidence"], 4),
+                    "severity": result["severity"]
+                }
+            )
             
-            return {
-                "disease": disease,
-                "confidence": confidence,
-                "severity": severity,
-                "affected_plant": affected_plant
-            }
+            return result
             
         except Exception as e:
-            logger.error(f"Disease prediction error: {str(e)}")
+            logger.error("Disease prediction error: %s", e)
             raise ValueError(f"Failed to predict disease: {str(e)}")
     
+    def predict_diseases(self, images: List[bytes]) -> List[Dict]:
+        """
+        Predict plant diseases for a batch of leaf images in one forward pass
+        
+        Args:
+            images: Image file bytes
+            
+        Returns:
+            One dictionary per image, in input order; images that cannot be
+            decoded get {"error": ...} instead of a prediction
+        """
+        results: List[Optional[Dict]] = [None] * len(images)
+        batch = []
+        positions = []
+        fingerprints = []
+        failed = 0
+        for i, image_bytes in enumerate(images):
+            try:
+                decoded = decode_image(image_bytes)
+                fingerprint, duplicate = self._find_duplicate(decoded)
+                if duplicate is not None:
+                    results[i] = duplicate
+                    continue
+                batch.append(leaf_crops(decoded, self.input_shape, self.leaf_tiles))
+                positions.append(i)
+                fingerprints.append(fingerprint)
+            except ValueError as e:
+                results[i] = {"error": str(e)}
+                failed += 1
+        
+        if batch:
+            try:
+                predictions = self._predict_crops(batch)
+                
+                predictions = self._augment_low_confidence([crops[0] for crops in batch], predictions)
+                
+                with stage("postprocess"):
+                    for position, fingerprint, row in zip(positions, fingerprints, predictions):
+                        results[position] = self._build_result(row)
+                        self._remember(fingerprint, results[position])
+            except Exception as e:
+                logger.error("Batch disease prediction error: %s", e)
+                raise ValueError(f"Failed to predict diseases: {str(e)}")
+        
+        logger.info(
+            "Batch disease detection: %s images, %s failed, %s near duplicates",
+            len(images), failed, len(images) - len(batch) - failed
+        )
+        return results
+    
+    def _find_duplicate(self, decoded: DecodedImage):
+        """
+        Perceptual hash of an upload and a copy of a near-duplicate's result
+        
+        Returns:
+            (hash, result); the hash is None when deduplication is disabled
+            and the result is None when no recent upload is close enough
+        """
+        if self.duplicates is None:
+            return None, None
+        with stage("image_hash"):
+            fingerprint = phash(decoded.thumbnail)
+        match = self.duplicates.get(fingerprint)
+        if match is None:
+            return fingerprint, None
+        DISEASE_DUPLICATE_HITS.inc()
+        return fingerprint, dict(match[1])
+    
+    def _remember(self, fingerprint: Optional[int], result: Dict) -> None:
+        """Keep a result for near-duplicate uploads"""
+        if fingerprint is not None:
+            self.duplicates.set(fingerprint, dict(result))
+    
+    def _predict_crops(self, images: List[np.ndarray]) -> np.ndarray:
+        """
+        Score every crop of every image in one forward pass
+        
+        Args:
+            images: Per image, its leaf crop followed by any tiles
+            
+        Returns:
+            One row of class probabilities per image, averaged over its crops
+        """
+        with model_forward("disease"):
+            predictions = self.model.predict(np.concatenate(images), verbose=0)
+        if len(predictions) == len(images):
+            return predictions
+        offsets = np.cumsum([0] + [len(crops) for crops in images[:-1]])
+        counts = np.array([len(crops) for crops in images])[:, None]
+        return np.add.reduceat(predictions, offsets, axis=0) / counts
+    
+    def _augment_low_confidence(self, images: List[np.ndarray], predictions: np.ndarray) -> np.ndarray:
+        """
+        Re-score low-confidence predictions by averaging over augmented views
+        
+        Confident predictions are returned untouched, so only uncertain images
+        pay for augmentation. The extra views of every uncertain image go
+        through the model as one batch, and each image's softmax outputs are
+        averaged with the prediction already made for the original.
+        
+        Args:
+            images: Preprocessed images, in the same order as predictions
+            predictions: Class probabilities from the forward pass on the originals
+            
+        Returns:
+            Probabilities with low-confidence rows replaced by the view average
+        """
+        if self.tta_views <= 1:
+            return predictions
+        uncertain = [i for i, row in enumerate(predictions) if float(np.max(row)) < self.tta_threshold]
+        if not uncertain:
+            return predictions
+        
+        with stage("image_augment"):
+            # View 0 is the original, already scored
+            views = np.concatenate([augment_views(images[i], self.tta_views)[1:] for i in uncertain])
+        extra = len(views) // len(uncertain)
+        with model_forward("disease"):
+            view_predictions = self.model.predict(views, verbose=0)
+        
+        predictions = np.array(predictions, copy=True)
+        for n, i in enumerate(uncertain):
+            averaged = (predictions[i] + view_predictions[n * extra:(n + 1) * extra].sum(axis=0)) / (extra + 1)
+            changed = np.argmax(averaged) != np.argmax(predictions[i])
+            DISEASE_TTA.inc(outcome="changed" if changed else "unchanged")
+            predictions[i] = averaged
+        logger.debug("Applied %s-view test-time augmentation to %s image(s)", extra + 1, len(uncertain))
+        return predictions
+    
+    def _build_result(self, probabilities: np.ndarray) -> Dict:
+        """Turn one image's class probabilities into a diagnosis"""
+        predicted_class = np.argmax(probabilities)
+        confidence = float(probabilities[predicted_class])
+        
+        # Safety check
+        if predicted_class >= len(self.DISEASE_CLASSES):
+            logger.error("Predicted class %s exceeds available classes %s", predicted_class, len(self.DISEASE_CLASSES))
+            raise ValueError(f"Predicted class index out of range")
+        
+        # Get disease name
+        disease_name = self.DISEASE_CLASSES[predicted_class]
+        
+        # Parse disease name to extract plant and disease
+        if '___' in disease_name:
+            parts = disease_name.split('___')
+            affected_plant = parts[0].replace('_', ' ')
+            disease = parts[1].replace('_', ' ') if len(parts) > 1 else "Unknown"
+        elif '_' in disease_name and 'Class' in disease_name:
+            # Generic class name
+            affected_plant = "Plant"
+            disease = disease_name
+        else:
+            affected_plant = "Plant"
+            disease = disease_name.replace('_', ' ')
+        
+        # Determine severity based on confidence and disease type
+        severity = self._determine_severity(disease, confidence)
+        
+        return {
+            "disease": disease,
+            "confidence": confidence,
+            "severity": severity,
+            "affected_plant": affected_plant
+        }
+    
     def _determine_severity(self, disease: str, confidence: float) -> str:
         """Determine disease severity"""
         if "healthy" in disease.lower():
@@ -0,0 +1,301 @@
+# app/services/export_service.py
+"""
+Prediction Export Service
+Incremental columnar export of prediction history to date-partitioned Parquet files
+"""
+
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from sqlalchemy import Boolean, DateTime, Float, Integer, Table, func, select
+from sqlalchemy.orm import Session
+
+from app.db_models import AggregationWatermark, CropPrediction, DiseasePrediction, IrrigationSchedule
+from app.utils.file_lock import exclusive_file_lock
+
+logger = logging.getLogger(__name__)
+
+# Root of the exported dataset (type=<kind>/date=<YYYY-MM-DD>/part-<first id>-<last id>.parquet)
+EXPORT_DIR = os.getenv("EXPORT_DIR", "data/exports")
+# Rows per database fetch and Parquet record batch
+EXPORT_BATCH_ROWS = int(os.getenv("EXPORT_BATCH_ROWS", "10000"))
+# Date partitions written to at once; older ones are closed (and reopened as a new part if needed)
+EXPORT_OPEN_FILES = int(os.getenv("EXPORT_OPEN_FILES", "16"))
+
+_PART_NAME = re.compile(r"^part-(\d+)-(\d+)\.parquet$")
+
+# Held by the export of a type for its whole run (dot-prefixed, so dataset readers skip it)
+_LOCK_NAME = ".export.lock"
+
+# Rows without a timestamp land in this date partition
+_UNKNOWN_DATE = "unknown"
+
+
+def arrow_schema(table: Table):
+    """Arrow schema matching a table's columns (timestamps as UTC microseconds)"""
+    import pyarrow as pa
+
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
+
+
+class _PartitionWriters:
+    """
+    Parquet writers for the date partitions of one export run
+
+    At most max_open files are open at once; the least recently written
+    is closed when another date arrives. Files are written under temporary
+    names and only renamed to part-<first id>-<last id>.parquet by
+    commit(), so an interrupted run leaves no visible parts.
+    """
+
+    def __init__(self, root: str, schema, max_open: int):
+        self.root = root
+        self.schema = schema
+        self.max_open = max_open
+        self._open: "OrderedDict[str, List]" = OrderedDict()
+        self._finished: List[tuple] = []
+
+    def write(self, date: str, batch) -> None:
+        import pyarrow.parquet as pq
+
+        entry = self._open.pop(date, None)
+        if entry is None:
+            while len(self._open) >= self.max_open:
+                self._close(*self._open.popitem(last=False))
+            directory = os.path.join(self.root, f"date={date}")
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".part-", suffix=".tmp")
+            os.close(fd)
+            entry = [pq.ParquetWriter(tmp_path, self.schema), tmp_path, None, None]
+        writer, _, first_id, _ = entry
+        writer.write_batch(batch)
+        ids = batch.column(self.schema.get_field_index("id"))
+        entry[2] = ids[0].as_py() if first_id is None else first_id
+        entry[3] = ids[-1].as_py()
+        self._open[date] = entry
+
+    def _close(self, date: str, entry: List) -> None:
+        writer, tmp_path, first_id, last_id = entry
+        writer.close()
+        self._finished.append((tmp_path, os.path.join(os.path.dirname(tmp_path), f"part-{first_id:012d}-{last_id:012d}.parquet")))
+
+    def commit(self) -> List[str]:
+        """Close every file and give it its final name; returns the part paths"""
+        while self._open:
+            self._close(*self._open.popitem(last=False))
+        paths = []
+        for tmp_path, path in self._finished:
+            os.replace(tmp_path, path)
+            paths.append(path)
+        return paths
+
+    def abort(self) -> None:
+        """Close and delete everything written in this run"""
+        while self._open:
+            self._close(*self._open.popitem(last=False))
+        for tmp_path, _ in self._finished:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+class PredictionExportService:
+    """
+    Service for incremental Parquet exports of prediction history
+
+    Each prediction table is exported to its own type=<kind> directory,
+    partitioned by the UTC date of created_at. A run reads only the rows
+    above that table's watermark (aggregation_watermarks) up to the
+    highest id present when it started, streamed with a server-side cursor
+    batch_rows at a time and written as fixed-size record batches, so
+    memory use depends on the batch size, not the table size. The
+    watermark advances only after the new files are in place; parts above
+    the watermark left by an interrupted run are deleted before exporting.
+    Each run holds a lock file in the type's directory from that cleanup
+    until the watermark is advanced, so a concurrent run cannot delete
+    parts that are in place but not yet committed.
+    """
+
+    EXPORT_TABLES = {
+        "crop": CropPrediction,
+        "disease": DiseasePrediction,
+        "irrigation": IrrigationSchedule,
+    }
+
+    WATERMARK_PREFIX = "parquet_export_"
+
+    def __init__(
+        self,
+        output_dir: str = EXPORT_DIR,
+        batch_rows: int = EXPORT_BATCH_ROWS,
+        max_open_files: int = EXPORT_OPEN_FILES
+    ):
+        """
+        Initialize prediction export service
+
+        Args:
+            output_dir: Root directory of the exported dataset
+            batch_rows: Rows per database fetch and record batch
+            max_open_files: Date partitions written to at once
+        """
+        self.output_dir = output_dir
+        self.batch_rows = batch_rows
+        self.max_open_files = max_open_files
+
+    def _watermark(self, db: Session, kind: str) -> int:
+        """Last exported id of a type, creating its watermark on the first run"""
+        name = self.WATERMARK_PREFIX + kind
+        watermark = db.get(AggregationWatermark, name)
+        if watermark is None:
+            watermark = AggregationWatermark(name=name, last_id=0)
+            db.add(watermark)
+            db.commit()
+        return watermark.last_id
+
+    def _remove_uncommitted(self, kind: str, last_id: int) -> int:
+        """Delete parts above the watermark (written by a run that never advanced it)"""
+        removed = 0
+        for path, first_id, _ in self.parts(kind):
+            if first_id > last_id:
+                os.remove(path)
+                removed += 1
+        return removed
+
+    def parts(self, kind: str) -> List[tuple]:
+        """(path, first id, last id) of every exported part of one type"""
+        root = os.path.join(self.output_dir, f"type={kind}")
+        found = []
+        if not os.path.isdir(root):
+            return found
+        for directory in sorted(os.listdir(root)):
+            partition = os.path.join(root, directory)
+            if not os.path.isdir(partition):
+                continue
+            for name in os.listdir(partition):
+                match = _PART_NAME.match(name)
+                if match:
+                    found.append((os.path.join(partition, name), int(match.group(1)), int(match.group(2))))
+        return found
+
+    def export(self, db: Session, kind: str) -> Dict:
+        """
+        Export the rows of one prediction table added since the last export
+
+        Args:
+            db: Database session
+            kind: "crop", "disease" or "irrigation"
+
+        Returns:
+            Rows exported, the id range, number of files written and seconds taken
+        """
+        if kind not in self.EXPORT_TABLES:
+            raise ValueError(f"Unknown export type: {kind}")
+        with self._lock(kind) as locked:
+            if not locked:
+                raise ValueError(f"Another export of {kind} predictions is running")
+            return self._export(db, kind)
+
+    def _export(self, db: Session, kind: str) -> Dict:
+        """Export one type's new rows (the caller holds the type's lock)"""
+        import pyarrow as pa
+
+        table = self.EXPORT_TABLES[kind].__table__
+        started = time.perf_counter()
+
+        last_id = self._watermark(db, kind)
+        self._remove_uncommitted(kind, last_id)
+        upper_id = db.query(func.max(table.c.id)).scalar() or 0
+        db.rollback()
+        if upper_id <= last_id:
+            return {"type": kind, "rows": 0, "files": 0, "from_id": last_id, "to_id": last_id, "seconds": 0.0}
+
+        schema = arrow_schema(table)
+        created_at_index = schema.get_field_index("created_at")
+        writers = _PartitionWriters(os.path.join(self.output_dir, f"type={kind}"), schema, self.max_open_files)
+        query = (
+            select(*table.columns)
+            .where(table.c.id > last_id, table.c.id <= upper_id)
+            .order_by(table.c.id)
+            .execution_options(stream_results=True, yield_per=self.batch_rows)
+        )
+        rows = 0
+        try:
+            for partition in db.execute(query).partitions():
+                columns = list(zip(*partition))
+                batch = pa.RecordBatch.from_arrays(
+                    [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                    schema=schema
+                )
+                # Rows arrive in id order, so each date is a run of consecutive rows
+                dates = [value.date().isoformat() if value is not None else _UNKNOWN_DATE for value in columns[created_at_index]]
+                start = 0
+                for end in range(1, len(dates) + 1):
+                    if end == len(dates) or dates[end] != dates[start]:
+                        writers.write(dates[start], batch.slice(start, end - start))
+                        start = end
+                rows += len(partition)
+            db.rollback()
+            files = writers.commit()
+        except Exception:
+            writers.abort()
+            db.rollback()
+            raise
+
+        # Advance the watermark only if no concurrent export moved it first
+        advanced = (
+            db.query(AggregationWatermark)
+            .filter(
+                AggregationWatermark.name == self.WATERMARK_PREFIX + kind,
+                AggregationWatermark.last_id == last_id
+            )
+            .update({"last_id": upper_id}, synchronize_session=False)
+        )
+        if not advanced:
+            db.rollback()
+            for path in files:
+                os.remove(path)
+            raise ValueError(f"Another export of {kind} predictions finished first")
+        db.commit()
+
+        seconds = round(time.perf_counter() - started, 3)
+        logger.info("Exported %s %s predictions (ids %s-%s) to %s files in %ss", rows, kind, last_id + 1, upper_id, len(files), seconds)
+        return {"type": kind, "rows": rows, "files": len(files), "from_id": last_id + 1, "to_id": upper_id, "seconds": seconds}
+
+    def export_all(self, db: Session, kinds: Optional[List[str]] = None) -> List[Dict]:
+        """Export every (or the given) prediction table"""
+        return [self.export(db, kind) for kind in (kinds or list(self.EXPORT_TABLES))]
+
+    def reset(self, db: Session, kind: str) -> None:
+        """Delete a type's exported files and watermark, so the next run exports everything again"""
+        if kind not in self.EXPORT_TABLES:
+            raise ValueError(f"Unknown export type: {kind}")
+        with self._lock(kind) as locked:
+            if not locked:
+                raise ValueError(f"Another export of {kind} predictions is running")
+            for path, _, _ in self.parts(kind):
+                os.remove(path)
+            db.query(AggregationWatermark).filter(
+                AggregationWatermark.name == self.WATERMARK_PREFIX + kind
+            ).delete(synchronize_session=False)
+            db.commit()
+
+    def _lock(self, kind: str):
+        """Exclusive lock on a type's export directory (yields False if another run holds it)"""
+        return exclusive_file_lock(os.path.join(self.output_dir, f"type={kind}", _LOCK_NAME))
\ No newline at end of file
@@ -0,0 +1,425 @@
+# app/services/feedback_service.py
+"""
+Feedback Service
+Append-only log of farmer feedback on predictions, written in batches and compacted into Parquet
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.db_models import CropPrediction, DiseasePrediction, PredictionFeedback
+from app.utils.file_lock import exclusive_file_lock
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Feedback entries written per bulk insert
+FEEDBACK_BATCH_SIZE = int(os.getenv("FEEDBACK_BATCH_SIZE", "200"))
+# Seconds accepted feedback may wait in memory before it is written
+FEEDBACK_FLUSH_INTERVAL = float(os.getenv("FEEDBACK_FLUSH_INTERVAL", "2"))
+# Unwritten entries kept while the database is unavailable (oldest are dropped beyond this)
+FEEDBACK_MAX_PENDING = int(os.getenv("FEEDBACK_MAX_PENDING", "20000"))
+
+# Where compacted Parquet segments of the feedback log are kept
+FEEDBACK_PARQUET_DIR = os.getenv("FEEDBACK_PARQUET_DIR", "data/feedback")
+# Seconds between compaction runs (0 disables the periodic job)
+FEEDBACK_COMPACTION_INTERVAL = int(os.getenv("FEEDBACK_COMPACTION_INTERVAL", "3600"))
+# Segments with fewer rows are merged once FEEDBACK_MERGE_SEGMENTS of them have accumulated
+FEEDBACK_SEGMENT_ROWS = int(os.getenv("FEEDBACK_SEGMENT_ROWS", "100000"))
+FEEDBACK_MERGE_SEGMENTS = int(os.getenv("FEEDBACK_MERGE_SEGMENTS", "8"))
+
+FEEDBACK_RECORDS = registry.counter(
+    "mittimantra_feedback_records_total",
+    "Feedback entries by outcome (written, dropped)",
+    ["outcome"]
+)
+FEEDBACK_PENDING = registry.gauge(
+    "mittimantra_feedback_pending",
+    "Accepted feedback entries not yet written to the database"
+)
+
+# Rows per Parquet record batch / row group
+_PARQUET_BATCH_ROWS = 10000
+
+_SEGMENT_NAME = re.compile(r"^feedback-(\d+)-(\d+)\.parquet$")
+
+# Held in the segment directory for the whole of a compaction run
+_LOCK_NAME = ".compaction.lock"
+
+
+class FeedbackLog:
+    """
+    Buffered, append-only writer for prediction feedback
+
+    Accepted entries are queued in memory and written by a background
+    thread with one bulk INSERT per batch, either when batch_size entries
+    are waiting or after flush_interval seconds. Rows are never updated:
+    a later entry for the same prediction supersedes earlier ones, which
+    readers resolve by taking the highest id. Entries still buffered when
+    the process stops are flushed by stop().
+    """
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Session]] = None,
+        batch_size: int = FEEDBACK_BATCH_SIZE,
+        flush_interval: float = FEEDBACK_FLUSH_INTERVAL,
+        max_pending: int = FEEDBACK_MAX_PENDING
+    ):
+        """
+        Initialize feedback log
+
+        Args:
+            session_factory: Callable returning a new Session (default: SessionLocal)
+            batch_size: Entries written per bulk insert
+            flush_interval: Seconds an entry may wait before being written
+            max_pending: Unwritten entries kept while writes are failing
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[Dict] = []
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def append(
+        self,
+        prediction_type: str,
+        prediction_id: int,
+        correct: Optional[bool] = None,
+        actual_label: Optional[str] = None,
+        notes: Optional[str] = None,
+        user_id: Optional[int] = None
+    ) -> None:
+        """
+        Queue one feedback entry
+
+        Raises:
+            ValueError: If the entry neither confirms nor corrects the prediction
+        """
+        if correct is None and not actual_label:
+            raise ValueError("Feedback must confirm the prediction or give the actual label")
+        if actual_label and correct is None:
+            correct = False
+        entry = {
+            "prediction_type": prediction_type,
+            "prediction_id": prediction_id,
+            "user_id": user_id,
+            "correct": correct,
+            "actual_label": actual_label,
+            "notes": notes,
+            # Stamped on arrival, not when the batch happens to be written
+            "created_at": datetime.now(timezone.utc),
+        }
+        with self._condition:
+            self._pending.append(entry)
+            FEEDBACK_PENDING.set(len(self._pending))
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+
+    def flush(self) -> int:
+        """
+        Write all buffered entries with bulk inserts
+
+        Returns:
+            Number of entries written
+        """
+        with self._flush_lock:
+            with self._condition:
+                entries, self._pending = self._pending, []
+            written = 0
+            try:
+                db = self._session()
+                try:
+                    for start in range(0, len(entries), self.batch_size):
+                        db.execute(insert(PredictionFeedback), entries[start:start + self.batch_size])
+                        db.commit()
+                        written = start + min(self.batch_size, len(entries) - start)
+                finally:
+                    db.close()
+            except Exception as e:
+                logger.error("Failed to write %s feedback entries: %s", len(entries) - written, e)
+                self._requeue(entries[written:])
+            if written:
+                FEEDBACK_RECORDS.inc(written, outcome="written")
+            with self._condition:
+                FEEDBACK_PENDING.set(len(self._pending))
+            return written
+
+    def _session(self) -> Session:
+        if self.session_factory is None:
+            from app.database import SessionLocal
+            self.session_factory = SessionLocal
+        return self.session_factory()
+
+    def _requeue(self, entries: List[Dict]) -> None:
+        """Put unwritten entries back in front of newer ones, dropping the oldest beyond max_pending"""
+        with self._condition:
+            self._pending = entries + self._pending
+            overflow = len(self._pending) - self.max_pending
+            if overflow > 0:
+                del self._pending[:overflow]
+                FEEDBACK_RECORDS.inc(overflow, outcome="dropped")
+                logger.error("Dropped %s feedback entries while the database is unavailable", overflow)
+
+    @property
+    def pending(self) -> int:
+        with self._condition:
+            return len(self._pending)
+
+    def start(self) -> None:
+        """Start the background writer"""
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="feedback-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background writer and write whatever is still buffered"""
+        if self._thread is not None:
+            with self._condition:
+                self._stopping = True
+                self._condition.notify()
+            self._thread.join(timeout=10)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._stopping or len(self._pending) >= self.batch_size,
+                    timeout=self.flush_interval
+                )
+                if self._stopping:
+                    return
+            if self.pending:
+                self.flush()
+
+
+class Segment(NamedTuple):
+    """A compacted Parquet file holding feedback ids first_id..last_id"""
+    first_id: int
+    last_id: int
+    path: str
+
+
+class FeedbackCompactor:
+    """
+    Compacts the feedback log into Parquet segments for analytics and retraining scans
+
+    Each run streams the feedback rows added since the last segment, joined
+    with the predicted label and confidence of the prediction they refer to,
+    into a new segment named after its id range (feedback-<first>-<last>.parquet).
+    The file names are the watermark: a segment only appears, via rename,
+    once it is complete, so an interrupted run is simply repeated. Once
+    merge_segments small segments have accumulated they are merged into one,
+    so the directory stays at a few large files; segments covered by a
+    larger one (left behind by an interrupted merge) are removed.
+    """
+
+    def __init__(
+        self,
+        output_dir: str = FEEDBACK_PARQUET_DIR,
+        segment_rows: int = FEEDBACK_SEGMENT_ROWS,
+        merge_segments: int = FEEDBACK_MERGE_SEGMENTS,
+        batch_rows: int = _PARQUET_BATCH_ROWS
+    ):
+        """
+        Initialize feedback compactor
+
+        Args:
+            output_dir: Directory of Parquet segments
+            segment_rows: Segments with fewer rows are candidates for merging
+            merge_segments: Number of trailing small segments that triggers a merge
+            batch_rows: Rows per database fetch and Parquet row group
+        """
+        self.output_dir = output_dir
+        self.segment_rows = segment_rows
+        self.merge_segments = merge_segments
+        self.batch_rows = batch_rows
+
+    @staticmethod
+    def schema():
+        import pyarrow as pa
+
+        return pa.schema([
+            ("id", pa.int64()),
+            ("prediction_type", pa.string()),
+            ("prediction_id", pa.int64()),
+            ("user_id", pa.int64()),
+            ("correct", pa.bool_()),
+            ("actual_label", pa.string()),
+            ("notes", pa.string()),
+            ("predicted_label", pa.string()),
+            ("confidence", pa.float64()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+        ])
+
+    def segments(self) -> List[Segment]:
+        """Segments in id order"""
+        try:
+            names = os.listdir(self.output_dir)
+        except OSError:
+            return []
+        segments = []
+        for name in names:
+            match = _SEGMENT_NAME.match(name)
+            if match:
+                segments.append(Segment(int(match.group(1)), int(match.group(2)), os.path.join(self.output_dir, name)))
+        return sorted(segments, key=lambda segment: (segment.first_id, -segment.last_id))
+
+    def _live_segments(self) -> List[Segment]:
+        """Segments in id order, after deleting any whose ids another segment already covers"""
+        live = []
+        for segment in self.segments():
+            if live and segment.last_id <= live[-1].last_id:
+                os.remove(segment.path)
+                continue
+            live.append(segment)
+        return live
+
+    def _segment_path(self, first_id: int, last_id: int) -> str:
+        return os.path.join(self.output_dir, f"feedback-{first_id:012d}-{last_id:012d}.parquet")
+
+    def _new_rows(self, db: Session, after_id: int):
+        """Feedback rows after an id with their prediction's label, fetched batch_rows at a time"""
+        query = (
+            select(
+                PredictionFeedback.id,
+                PredictionFeedback.prediction_type,
+                PredictionFeedback.prediction_id,
+                PredictionFeedback.user_id,
+                PredictionFeedback.correct,
+                PredictionFeedback.actual_label,
+                PredictionFeedback.notes,
+                func.coalesce(CropPrediction.recommended_crop, DiseasePrediction.disease).label("predicted_label"),
+                func.coalesce(CropPrediction.confidence, DiseasePrediction.confidence).label("confidence"),
+                PredictionFeedback.created_at,
+            )
+            .outerjoin(CropPrediction, and_(
+                PredictionFeedback.prediction_type == "crop", CropPrediction.id == PredictionFeedback.prediction_id
+            ))
+            .outerjoin(DiseasePrediction, and_(
+                PredictionFeedback.prediction_type == "disease", DiseasePrediction.id == PredictionFeedback.prediction_id
+            ))
+            .where(PredictionFeedback.id > after_id)
+            .order_by(PredictionFeedback.id)
+            .execution_options(yield_per=self.batch_rows)
+        )
+        return db.execute(query).mappings().partitions()
+
+    def compact(self, db: Session) -> Dict:
+        """
+        Write new feedback to a segment, then merge small segments if enough have accumulated
+
+        Every uvicorn worker runs the periodic job, so the run holds a lock
+        file in output_dir; if another process is already compacting, this
+        run is skipped rather than deleting segments that one is reading.
+
+        Returns:
+            Rows written, the new segment (if any), the number of segments
+            merged and whether the run was skipped
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with exclusive_file_lock(os.path.join(self.output_dir, _LOCK_NAME)) as locked:
+            if not locked:
+                logger.info("Feedback compaction skipped: another process is compacting")
+                return {"rows": 0, "segment": None, "merged": 0, "skipped": True}
+            segments = self._live_segments()
+            after_id = segments[-1].last_id if segments else 0
+
+            schema = self.schema()
+            fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=".feedback-", suffix=".tmp")
+            os.close(fd)
+            rows, first_id, last_id = 0, None, None
+            try:
+                writer = None
+                try:
+                    for partition in self._new_rows(db, after_id):
+                        batch = pa.RecordBatch.from_pylist([dict(row) for row in partition], schema=schema)
+                        if writer is None:
+                            writer = pq.ParquetWriter(tmp_path, schema)
+                            first_id = partition[0]["id"]
+                        writer.write_batch(batch)
+                        rows += len(partition)
+                        last_id = partition[-1]["id"]
+                finally:
+                    if writer is not None:
+                        writer.close()
+                if rows:
+                    path = self._segment_path(first_id, last_id)
+                    os.replace(tmp_path, path)
+                    segments.append(Segment(first_id, last_id, path))
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+            merged = self._merge_tail(segments)
+
+        if rows:
+            logger.info("Compacted %s feedback entries (ids %s-%s)", rows, first_id, last_id)
+        return {
+            "rows": rows,
+            "segment": os.path.basename(self._segment_path(first_id, last_id)) if rows else None,
+            "merged": merged,
+            "skipped": False,
+        }
+
+    def _merge_tail(self, segments: List[Segment]) -> int:
+        """Merge the trailing run of small segments into one once it is merge_segments long"""
+        import pyarrow.parquet as pq
+
+        run = []
+        for segment in reversed(segments):
+            if pq.ParquetFile(segment.path).metadata.num_rows >= self.segment_rows:
+                break
+            run.insert(0, segment)
+        if len(run) < max(self.merge_segments, 2):
+            return 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, prefix=".feedback-", suffix=".tmp")
+        os.close(fd)
+        try:
+            with pq.ParquetWriter(tmp_path, self.schema()) as writer:
+                for segment in run:
+                    for batch in pq.ParquetFile(segment.path).iter_batches(batch_size=self.batch_rows):
+                        writer.write_batch(batch)
+            os.replace(tmp_path, self._segment_path(run[0].first_id, run[-1].last_id))
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        for segment in run:
+            os.remove(segment.path)
+        logger.info("Merged %s feedback segments (ids %s-%s)", len(run), run[0].first_id, run[-1].last_id)
+        return len(run)
+
+    def get_stats(self) -> Dict:
+        import pyarrow.parquet as pq
+
+        segments = self.segments()
+        return {
+            "directory": self.output_dir,
+            "segments": len(segments),
+            "rows": sum(pq.ParquetFile(segment.path).metadata.num_rows for segment in segments),
+            "bytes": sum(os.path.getsize(segment.path) for segment in segments),
+            "last_id": max((segment.last_id for segment in segments), default=0),
+        }
+
+
+# Process-wide feedback writer and compactor
+feedback_log = FeedbackLog()
+feedback_compactor = FeedbackCompactor()
@@ -0,0 +1,282 @@
+# app/services/history_service.py
+"""
+Prediction History Service
+Persists prediction results (with per-user statistics) and pages through stored history
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, func, literal, or_
+from sqlalchemy.orm import Session
+
+from app.db_models import CropPrediction, DiseasePrediction, IrrigationSchedule
+from app.services.stats_service import UserStatsService
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionHistoryService:
+    """Service for storing and listing prediction history"""
+
+    # History kind -> (model, columns projected in list views)
+    HISTORY_KINDS = {
+        "crop": (CropPrediction, [
+            "recommended_crop", "confidence", "nitrogen", "phosphorus",
+            "potassium", "temperature", "humidity", "ph", "rainfall"
+        ]),
+        "disease": (DiseasePrediction, [
+            "disease", "confidence", "severity", "affected_plant", "region"
+        ]),
+        "irrigation": (IrrigationSchedule, [
+            "crop_type", "crop_stage", "soil_moisture", "irrigation_needed",
+            "water_amount", "next_irrigation"
+        ]),
+    }
+
+    MAX_PAGE_SIZE = 100
+
+    def __init__(self):
+        """Initialize prediction history service"""
+        self.stats_service = UserStatsService()
+        logger.info("Prediction history service initialized")
+
+    def record_crop_prediction(
+        self,
+        db: Session,
+        features: Dict,
+        result: Dict,
+        user_id: Optional[int] = None
+    ) -> CropPrediction:
+        """
+        Store a crop recommendation result
+
+        Args:
+            db: Database session
+            features: Soil and weather inputs passed to predict_crop
+            result: Result dictionary from CropRecommendationService.predict_crop
+            user_id: Owning user, if the request was authenticated
+
+        Returns:
+            The stored CropPrediction row
+        """
+        prediction = CropPrediction(
+            user_id=user_id,
+            nitrogen=features["nitrogen"],
+            phosphorus=features["phosphorus"],
+            potassium=features["potassium"],
+            temperature=features["temperature"],
+            humidity=features["humidity"],
+            ph=features["ph"],
+            rainfall=features["rainfall"],
+            recommended_crop=result["recommended_crop"],
+            confidence=result.get("confidence"),
+            alternative_crops=json.dumps(result["alternative_crops"]) if result.get("alternative_crops") else None,
+            reasoning=result.get("reasoning")
+        )
+        db.add(prediction)
+        if user_id is not None:
+            self.stats_service.apply_crop_prediction(db, user_id, prediction.recommended_crop)
+        db.commit()
+        return prediction
+
+    def record_disease_prediction(
+        self,
+        db: Session,
+        result: Dict,
+        user_id: Optional[int] = None,
+        region: Optional[str] = None,
+        image_path: Optional[str] = None
+    ) -> DiseasePrediction:
+        """
+        Store a disease detection result
+
+        Args:
+            db: Database session
+            result: Result dictionary from DiseaseDetectionService.predict_disease
+            user_id: Owning user, if the request was authenticated
+            region: Optional region reported by the client
+            image_path: Optional path of the archived upload
+
+        Returns:
+            The stored DiseasePrediction row
+        """
+        prediction = DiseasePrediction(
+            user_id=user_id,
+            disease=result["disease"],
+            confidence=result["confidence"],
+            severity=result.get("severity"),
+            affected_plant=result.get("affected_plant"),
+            region=region.strip() if region else None,
+            image_path=image_path
+        )
+        db.add(prediction)
+        if user_id is not None:
+            self.stats_service.apply_disease_prediction(db, user_id)
+        db.commit()
+        return prediction
+
+    def record_irrigation_schedule(
+        self,
+        db: Session,
+        inputs: Dict,
+        result: Dict,
+        user_id: Optional[int] = None
+    ) -> IrrigationSchedule:
+        """
+        Store an irrigation schedule result
+
+        Args:
+            db: Database session
+            inputs: Field inputs passed to calculate_irrigation_schedule
+            result: Result dictionary from IrrigationService.calculate_irrigation_schedule
+            user_id: Owning user, if the request was authenticated
+
+        Returns:
+            The stored IrrigationSchedule row
+        """
+        schedule = IrrigationSchedule(
+            user_id=user_id,
+            crop_type=inputs["crop_type"],
+            soil_moisture=inputs["soil_moisture"],
+            temperature=inputs["temperature"],
+            humidity=inputs["humidity"],
+            rainfall=inputs["rainfall"],
+            crop_stage=inputs["crop_stage"],
+            irrigation_needed=result["irrigation_needed"],
+            water_amount=result["water_amount"],
+            schedule=result["schedule"],
+            next_irrigation=result["next_irrigation"],
+            reasoning=result["reasoning"]
+        )
+        db.add(schedule)
+        if user_id is not None:
+            self.stats_service.apply_irrigation_schedule(db, user_id, schedule.water_amount)
+        db.commit()
+        return schedule
+
+    def list_history(
+        self,
+        db: Session,
+        user_id: int,
+        kind: str,
+        cursor: Optional[str] = None,
+        limit: int = 20
+    ) -> Dict:
+        """
+        Page through a user's history, newest first
+
+        Uses keyset pagination on (created_at, id) backed by the
+        (user_id, created_at, id) index, so every page costs the same
+        regardless of depth. Only the list columns are selected; no ORM
+        objects are loaded. The cursor holds the last row's created_at
+        (ISO 8601) and id.
+
+        Args:
+            db: Database session
+            user_id: Owning user
+            kind: History kind ("crop", "disease" or "irrigation")
+            cursor: Opaque cursor from the previous page, if any
+            limit: Page size
+
+        Returns:
+            Dictionary with "items" and "next_cursor" (None on the last page)
+        """
+        if kind not in self.HISTORY_KINDS:
+            raise ValueError(f"Unknown history type: {kind}")
+        limit = max(1, min(limit, self.MAX_PAGE_SIZE))
+
+        model, column_names = self.HISTORY_KINDS[kind]
+
+        query = db.query(
+            model.id,
+            model.created_at,
+            *[getattr(model, name) for name in column_names]
+        ).filter(model.user_id == user_id)
+
+        if cursor:
+            cursor_created_at, cursor_id = self._decode_cursor(cursor)
+            # Seek from the cursor row's own stored timestamp when it still exists: SQLite keeps
+            # timestamps as text in the format they were written in (CURRENT_TIMESTAMP has no
+            # fraction), so the decoded datetime would not compare equal to its own row there
+            cursor_value = func.coalesce(
+                db.query(model.created_at).filter(model.id == cursor_id, model.user_id == user_id).scalar_subquery(),
+                literal(cursor_created_at, model.created_at.type)
+            )
+            query = query.filter(
+                model.created_at <= cursor_value,
+                or_(
+                    model.created_at < cursor_value,
+                    and_(model.created_at == cursor_value, model.id < cursor_id)
+                )
+            )
+
+        rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = []
+        for row in rows:
+            item = dict(row._mapping)
+            item["created_at"] = self._format_timestamp(row.created_at)
+            items.append(item)
+
+        next_cursor = None
+        if has_more and rows:
+            next_cursor = self._encode_cursor(rows[-1].created_at, rows[-1].id)
+
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get_entry(self, db: Session, user_id: int, kind: str, entry_id: int):
+        """
+        Load one full history entry owned by the user
+
+        Args:
+            db: Database session
+            user_id: Owning user
+            kind: History kind ("crop", "disease" or "irrigation")
+            entry_id: Row id
+
+        Returns:
+            The ORM row, or None if it does not exist or belongs to another user
+        """
+        if kind not in self.HISTORY_KINDS:
+            raise ValueError(f"Unknown history type: {kind}")
+        model, _ = self.HISTORY_KINDS[kind]
+        return db.query(model).filter(model.id == entry_id, model.user_id == user_id).first()
+
+    @staticmethod
+    def serialize_entry(entry) -> Dict:
+        """Convert a full history row to a JSON-compatible dictionary"""
+        data = {column.name: getattr(entry, column.name) for column in entry.__table__.columns}
+        if data.get("created_at") is not None:
+            data["created_at"] = data["created_at"].isoformat()
+        if isinstance(entry, CropPrediction) and data.get("alternative_crops"):
+            data["alternative_crops"] = json.loads(data["alternative_crops"])
+        return data
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, entry_id: int) -> str:
+        """Encode a keyset position as an opaque URL-safe token"""
+        raw = json.dumps([created_at.isoformat(), entry_id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Decode a cursor produced by _encode_cursor"""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, entry_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), int(entry_id)
+        except Exception:
+            raise ValueError("Invalid history cursor")
+
+    @staticmethod
+    def _format_timestamp(value) -> Optional[str]:
+        """Render a stored timestamp as ISO 8601"""
+        return value.isoformat() if value is not None else None
+
@@ -0,0 +1,233 @@
+# app/services/inference_scheduler.py
+"""
+Inference Scheduler
+Priority lanes with weighted fair queueing in front of the model services
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_QUEUE_LATENCY = registry.histogram(
+    "mittimantra_inference_queue_seconds",
+    "Time inference work waits in its scheduler lane",
+    ["lane"]
+)
+INFERENCE_LANE_DEPTH = registry.gauge(
+    "mittimantra_inference_lane_depth",
+    "Inference work items waiting per scheduler lane",
+    ["lane"]
+)
+INFERENCE_LANE_IN_FLIGHT = registry.gauge(
+    "mittimantra_inference_lane_in_flight",
+    "Inference work items executing per scheduler lane",
+    ["lane"]
+)
+
+
+class LaneFull(Exception):
+    """Raised when a lane's queue is at capacity"""
+
+
+class Lane:
+    """One priority class: a FIFO queue with a fair-share weight and a concurrency cap"""
+
+    # Recent queue latencies kept for percentile reporting
+    LATENCY_WINDOW = 1000
+
+    def __init__(self, name: str, weight: float, max_concurrency: int, max_queue: int):
+        self.name = name
+        self.weight = weight
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue: deque = deque()
+        self.in_flight = 0
+        self.last_finish = 0.0
+        self.completed = 0
+        self.latencies: deque = deque(maxlen=self.LATENCY_WINDOW)
+
+
+class _WorkItem:
+    __slots__ = ("lane", "fn", "args", "kwargs", "context", "future", "finish_tag", "enqueued")
+
+    def __init__(self, lane: Lane, fn: Callable, args, kwargs, future: Future):
+        self.lane = lane
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        # Run in the submitter's context so request IDs, spans and stage timings carry over
+        self.context = contextvars.copy_context()
+        self.future = future
+        self.finish_tag = 0.0
+        self.enqueued = time.perf_counter()
+
+
+class InferenceScheduler:
+    """
+    Dispatches model work from priority lanes onto a fixed worker pool
+
+    Uses self-clocked weighted fair queueing: each item's virtual finish tag
+    is max(virtual clock, lane's last finish tag) + cost / weight, free
+    workers take the smallest finish tag among lanes below their concurrency
+    cap, and the virtual clock follows the tag of the last dispatched item.
+    Work items are single batches, so a bulk job yields to interactive
+    requests at every batch boundary.
+    """
+
+    # Default lanes: name -> (weight, max concurrency, max queued items)
+    DEFAULT_LANES = {
+        "interactive": (8.0, 4, 1000),
+        "bulk": (2.0, 2, 10000),
+        "background": (1.0, 1, 10000),
+    }
+
+    def __init__(self, workers: Optional[int] = None, lanes: Optional[Dict[str, tuple]] = None):
+        """
+        Initialize scheduler
+
+        Args:
+            workers: Worker threads running model work (INFERENCE_WORKERS, default 4)
+            lanes: Lane name -> (weight, max concurrency, max queued items)
+        """
+        self.workers = workers or int(os.getenv("INFERENCE_WORKERS", "4"))
+        self.lanes: Dict[str, Lane] = {
+            name: Lane(name, weight, min(cap, self.workers), max_queue)
+            for name, (weight, cap, max_queue) in (lanes or self.DEFAULT_LANES).items()
+        }
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._virtual_time = 0.0
+        self._running = 0
+        logger.info("Inference scheduler started with %s workers and lanes %s", self.workers, list(self.lanes))
+
+    def submit(self, lane_name: str, fn: Callable, *args, cost: float = 1.0, **kwargs) -> Future:
+        """
+        Queue a unit of model work
+
+        Args:
+            lane_name: Priority lane
+            fn: Callable to run on a worker thread
+            cost: Relative size of the work (e.g. rows in the batch)
+
+        Returns:
+            Future resolved with fn's result
+
+        Raises:
+            ValueError: If the lane does not exist
+            LaneFull: If the lane's queue is at capacity
+        """
+        lane = self.lanes.get(lane_name)
+        if lane is None:
+            raise ValueError(f"Unknown inference lane: {lane_name}")
+
+        future: Future = Future()
+        item = _WorkItem(lane, fn, args, kwargs, future)
+        with self._lock:
+            if len(lane.queue) >= lane.max_queue:
+                raise LaneFull(f"Inference lane '{lane_name}' is full")
+            item.finish_tag = max(self._virtual_time, lane.last_finish) + cost / lane.weight
+            lane.last_finish = item.finish_tag
+            lane.queue.append(item)
+            INFERENCE_LANE_DEPTH.inc(lane=lane.name)
+            self._dispatch()
+        return future
+
+    async def run(self, lane_name: str, fn: Callable, *args, cost: float = 1.0, **kwargs):
+        """Submit work and await its result from async code"""
+        return await asyncio.wrap_future(self.submit(lane_name, fn, *args, cost=cost, **kwargs))
+
+    def _dispatch(self):
+        """Start queued items while workers are free (caller holds the lock)"""
+        while self._running < self.workers:
+            candidates = [
+                lane for lane in self.lanes.values()
+                if lane.queue and lane.in_flight < lane.max_concurrency
+            ]
+            if not candidates:
+                return
+            lane = min(candidates, key=lambda candidate: candidate.queue[0].finish_tag)
+            item = lane.queue.popleft()
+            self._virtual_time = max(self._virtual_time, item.finish_tag)
+            lane.in_flight += 1
+            self._running += 1
+
+            waited = time.perf_counter() - item.enqueued
+            lane.latencies.append(waited)
+            INFERENCE_QUEUE_LATENCY.observe(waited, lane=lane.name)
+            INFERENCE_LANE_DEPTH.dec(lane=lane.name)
+            INFERENCE_LANE_IN_FLIGHT.inc(lane=lane.name)
+            self._executor.submit(self._execute, item)
+
+    def _execute(self, item: _WorkItem):
+        """Run one item on a worker thread and release its slot"""
+        try:
+            if item.future.set_running_or_notify_cancel():
+                try:
+                    item.future.set_result(item.context.run(item.fn, *item.args, **item.kwargs))
+                except BaseException as e:
+                    item.future.set_exception(e)
+        finally:
+            with self._lock:
+                item.lane.in_flight -= 1
+                item.lane.completed += 1
+                self._running -= 1
+                INFERENCE_LANE_IN_FLIGHT.dec(lane=item.lane.name)
+                self._dispatch()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Per-lane queue depth, concurrency and queue latency percentiles"""
+        stats = {}
+        with self._lock:
+            for lane in self.lanes.values():
+                latencies = np.asarray(lane.latencies) * 1000
+                stats[lane.name] = {
+                    "weight": lane.weight,
+                    "max_concurrency": lane.max_concurrency,
+                    "queued": len(lane.queue),
+                    "in_flight": lane.in_flight,
+                    "completed": lane.completed,
+                    "queue_p50_ms": round(float(np.percentile(latencies, 50)), 3) if latencies.size else None,
+                    "queue_p99_ms": round(float(np.percentile(latencies, 99)), 3) if latencies.size else None,
+                }
+        return stats
+
+    def shutdown(self):
+        """Stop accepting work and wait for running items"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def parse_lanes(value: str) -> Dict[str, tuple]:
+        """Parse "interactive=8:4:1000,bulk=2:2:10000" (weight:concurrency:queue) into a lane mapping"""
+        lanes = {}
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            name, _, spec = item.partition("=")
+            weight, concurrency, max_queue = spec.split(":")
+            lanes[name.strip()] = (float(weight), int(concurrency), int(max_queue))
+        return lanes
+
+
+def chunked(items: List, size: int) -> List[List]:
+    """Split items into consecutive batches of at most size"""
+    return [items[start:start + size] for start in range(0, len(items), size)]
+
+
+def scheduler_from_env() -> InferenceScheduler:
+    """Build the scheduler configured by INFERENCE_WORKERS and INFERENCE_LANES"""
+    lanes = os.getenv("INFERENCE_LANES")
+    return InferenceScheduler(lanes=InferenceScheduler.parse_lanes(lanes) if lanes else None)
+
+
+# Process-wide scheduler shared by the prediction endpoints (threads start on first use)
+scheduler = scheduler_from_env()
\ No newline at end of file
@@ -5,6 +5,7 @@ Provides intelligent irrigation recommendations
 """
 
 import logging
+import numpy as np
 from typing import Dict, List
 from datetime import datetime, timedelta
 
@@ -69,6 +70,15 @@ class IrrigationService:
         "maturity": 4
     }
     
+    # Plant-available water held in the root zone at 100% soil moisture (mm)
+    AVAILABLE_WATER_CAPACITY = 120
+    
+    # Moisture points above optimal that an irrigation refills to
+    REFILL_MARGIN = 10
+    
+    # Share of rainfall that reaches the root zone
+    RAINFALL_EFFICIENCY = 0.8
+    
     def __init__(self):
         """Initialize irrigation service"""
         logger.info("Irrigation service initialized")
@@ -109,7 +119,7 @@ class IrrigationService:
             adjusted_water_req = water_req * et_factor
             
             # Account for recent rainfall
-            effective_rainfall = rainfall * 0.8  # 80% efficiency
+            effective_rainfall = rainfall * self.RAINFALL_EFFICIENCY
             net_water_needed = max(0, adjusted_water_req - effective_rainfall)
             
             # Determine if irrigation is needed based on soil moisture
@@ -151,15 +161,109 @@ class IrrigationService:
             }
             
         except Exception as e:
-            logger.error(f"Irrigation calculation error: {str(e)}")
+            logger.error("Irrigation calculation error: %s", e)
             raise ValueError(f"Failed to calculate irrigation schedule: {str(e)}")
     
-    def _calculate_et_factor(self, temperature: float, humidity: float) -> float:
-        """Calculate evapotranspiration factor"""
+    def calculate_forecast_schedule(
+        self,
+        crop_type: str,
+        soil_moisture: float,
+        crop_stage: str,
+        forecast: List[Dict]
+    ) -> Dict:
+        """
+        Calculate an irrigation schedule over a multi-day weather forecast
+        
+        Projects soil moisture day by day (forecast rainfall in, crop water
+        use out) and schedules irrigation on the days it would fall below the
+        crop's optimal level, instead of guessing the next irrigation date.
+        
+        Args:
+            crop_type: Type of crop planted
+            soil_moisture: Current soil moisture percentage
+            crop_stage: Current crop growth stage
+            forecast: Daily forecast from WeatherService.get_forecast
+            
+        Returns:
+            Dictionary containing today's recommendation and the daily plan
+        """
+        try:
+            if not forecast:
+                raise ValueError("Forecast is empty")
+            
+            crop_type_lower = crop_type.lower()
+            stage_requirements = self.CROP_WATER_REQUIREMENTS.get(crop_type_lower, self.DEFAULT_WATER_REQUIREMENT)
+            water_req = stage_requirements[crop_stage]
+            
+            optimal_moisture = self._get_optimal_moisture(crop_type_lower, crop_stage)
+            refill_target = min(100, optimal_moisture + self.REFILL_MARGIN)
+            mm_per_point = self.AVAILABLE_WATER_CAPACITY / 100
+            
+            moisture = soil_moisture
+            daily_plan = []
+            for day in forecast:
+                crop_use = water_req * self._calculate_et_factor(day["temperature"], day["humidity"])
+                effective_rainfall = day["rainfall"] * self.RAINFALL_EFFICIENCY
+                
+                moisture = min(100, moisture + (effective_rainfall - crop_use) / mm_per_point)
+                
+                water_amount = 0.0
+                if moisture < optimal_moisture:
+                    water_amount = (refill_target - max(moisture, 0)) * mm_per_point
+                    moisture = refill_target
+                
+                daily_plan.append({
+                    "date": day["date"],
+                    "temperature": day["temperature"],
+                    "humidity": day["humidity"],
+                    "rainfall": day["rainfall"],
+                    "crop_water_use": round(crop_use, 2),
+                    "irrigate": water_amount > 0,
+                    "water_amount": round(water_amount, 2),
+                    "projected_moisture": round(moisture, 1)
+                })
+            
+            today = daily_plan[0]
+            irrigation_days = [day for day in daily_plan if day["irrigate"]]
+            
+            if irrigation_days:
+                next_irrigation = irrigation_days[0]["date"]
+                schedule = "Irrigate on " + ", ".join(
+                    f"{day['date']} ({day['water_amount']} mm)" for day in irrigation_days
+                )
+            else:
+                next_irrigation = f"Not needed before {daily_plan[-1]['date']}"
+                schedule = f"No irrigation needed over the next {len(daily_plan)} days"
+            
+            forecast_rain = sum(day["rainfall"] for day in forecast)
+            reasoning = self._generate_reasoning(
+                today["irrigate"], soil_moisture, optimal_moisture,
+                max(day["temperature"] for day in forecast), 0, crop_stage
+            )
+            reasoning += f". Projection covers {len(daily_plan)} forecast days with {forecast_rain:.0f}mm expected rainfall"
+            
+            return {
+                "irrigation_needed": today["irrigate"],
+                "water_amount": today["water_amount"],
+                "schedule": schedule,
+                "next_irrigation": next_irrigation,
+                "reasoning": reasoning,
+                "tips": self._get_irrigation_tips(crop_type_lower, crop_stage, today["temperature"]),
+                "total_water_amount": round(sum(day["water_amount"] for day in daily_plan), 2),
+                "daily_plan": daily_plan
+            }
+            
+        except Exception as e:
+            logger.error("Forecast irrigation calculation error: %s", e)
+            raise ValueError(f"Failed to calculate forecast irrigation schedule: {str(e)}")
+    
+    def _calculate_et_factor(self, temperature, humidity):
+        """Calculate evapotranspiration factor (scalars or NumPy arrays)"""
         # Higher temperature and lower humidity increase ET
-        temp_factor = 1 + (temperature - 25) * 0.02
-        humidity_factor = 1 + (75 - humidity) * 0.005
-        return max(0.5, min(2.0, temp_factor * humidity_factor))
+        temp_factor = 1 + (np.asarray(temperature) - 25) * 0.02
+        humidity_factor = 1 + (75 - np.asarray(humidity)) * 0.005
+        factor = np.clip(temp_factor * humidity_factor, 0.5, 2.0)
+        return float(factor) if factor.ndim == 0 else factor
     
     def _get_optimal_moisture(self, crop_type: str, crop_stage: str) -> float:
         """Get optimal soil moisture for crop"""
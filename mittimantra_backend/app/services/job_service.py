@@ -0,0 +1,434 @@
+# app/services/job_service.py
+"""
+Job Service
+Persistent chunked job queue for bulk predictions, stored in the application database
+"""
+
+import json
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, case, or_, update
+from sqlalchemy.orm import Session
+
+from app.db_models import Job, JobChunk
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Service for submitting, claiming and tracking bulk prediction jobs
+
+    A job is split into chunks when it is submitted. Workers claim one chunk
+    at a time under a lease (a compare-and-set UPDATE, so any number of
+    processes can share one SQLite file) and store its results when done;
+    a stored chunk is never redone, and a chunk whose worker crashed is
+    claimed again once its lease expires.
+    """
+
+    JOB_KINDS = ("crop", "disease")
+    FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None
+    ):
+        """
+        Initialize job service
+
+        Args:
+            storage_dir: Directory for uploaded job inputs (JOB_STORAGE_DIR, default job_data)
+            chunk_size: Default items per chunk (JOB_CHUNK_SIZE, default 256)
+            lease_seconds: Time a worker may hold a chunk before it is reclaimed (JOB_LEASE_SECONDS, default 300)
+            max_attempts: Claims per chunk before it is marked failed (JOB_MAX_ATTEMPTS, default 3)
+        """
+        self.storage_dir = storage_dir or os.getenv("JOB_STORAGE_DIR", "job_data")
+        self.chunk_size = chunk_size or int(os.getenv("JOB_CHUNK_SIZE", "256"))
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", "300"))
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+    def create_crop_job(
+        self,
+        db: Session,
+        rows: List[Dict],
+        user_id: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Job:
+        """
+        Queue crop recommendations for many rows of soil readings
+
+        Args:
+            db: Database session
+            rows: Dictionaries with the predict_crop keyword arguments
+            user_id: Owner of the job, if authenticated
+            chunk_size: Rows per chunk (defaults to the service setting)
+
+        Returns:
+            The queued job
+        """
+        return self._create_job(db, "crop", rows, user_id, chunk_size or self.chunk_size)
+
+    def create_disease_job(
+        self,
+        db: Session,
+        files: Iterable[Tuple[str, BinaryIO]],
+        user_id: Optional[int] = None,
+        chunk_size: Optional[int] = None
+    ) -> Job:
+        """
+        Queue disease detection for an archive of leaf images
+
+        Images are copied to the job's storage directory so workers in
+        other processes can read them; chunks hold their paths.
+
+        Args:
+            db: Database session
+            files: (filename, readable file object) pairs
+            user_id: Owner of the job, if authenticated
+            chunk_size: Images per chunk (default 16)
+
+        Returns:
+            The queued job
+        """
+        job_id = uuid.uuid4().hex
+        job_dir = os.path.join(self.storage_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        items = []
+        try:
+            for index, (filename, fileobj) in enumerate(files):
+                safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(filename or "image"))
+                path = os.path.join(job_dir, f"{index:06d}_{safe_name}")
+                with open(path, "wb") as out:
+                    shutil.copyfileobj(fileobj, out)
+                items.append({"filename": filename, "path": path})
+            return self._create_job(db, "disease", items, user_id, chunk_size or 16, job_id=job_id)
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+    def _create_job(
+        self,
+        db: Session,
+        kind: str,
+        items: List,
+        user_id: Optional[int],
+        chunk_size: int,
+        job_id: Optional[str] = None
+    ) -> Job:
+        """Store a job and its chunks in one transaction"""
+        if kind not in self.JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if not items:
+            raise ValueError("A job needs at least one item")
+
+        chunks = [items[start:start + chunk_size] for start in range(0, len(items), chunk_size)]
+        job = Job(
+            id=job_id or uuid.uuid4().hex,
+            user_id=user_id,
+            kind=kind,
+            status="queued",
+            total_items=len(items),
+            processed_items=0,
+            failed_items=0,
+            chunk_count=len(chunks),
+            finished_chunks=0
+        )
+        db.add(job)
+        db.add_all(
+            JobChunk(job_id=job.id, chunk_index=index, status="pending", payload=json.dumps(chunk), attempts=0)
+            for index, chunk in enumerate(chunks)
+        )
+        db.commit()
+        db.refresh(job)
+        logger.info(
+            "Queued %s job %s with %s items in %s chunks", kind, job.id, len(items), len(chunks),
+            extra={"job_id": job.id}
+        )
+        return job
+
+    def claim_chunk(self, db: Session, worker_id: str, kinds: Iterable[str] = JOB_KINDS) -> Optional[JobChunk]:
+        """
+        Take the next chunk that is pending or whose lease has expired
+
+        Args:
+            db: Database session
+            worker_id: Identifier of the claiming worker
+            kinds: Job kinds this worker can process
+
+        Returns:
+            The claimed chunk, or None if there is no work
+        """
+        kinds = list(kinds)
+        while True:
+            now = time.time()
+            claimable = or_(
+                JobChunk.status == "pending",
+                and_(JobChunk.status == "running", JobChunk.lease_expires < now)
+            )
+            candidate = (
+                db.query(JobChunk.id)
+                .join(Job, Job.id == JobChunk.job_id)
+                .filter(claimable, Job.kind.in_(kinds), Job.status.in_(("queued", "running")))
+                .order_by(JobChunk.id)
+                .first()
+            )
+            if candidate is None:
+                db.rollback()
+                return None
+
+            # Compare-and-set: only one worker's UPDATE matches the claimable row
+            claimed = db.execute(
+                update(JobChunk)
+                .where(JobChunk.id == candidate.id, claimable)
+                .values(
+                    status="running",
+                    worker_id=worker_id,
+                    lease_expires=now + self.lease_seconds,
+                    attempts=JobChunk.attempts + 1
+                )
+            ).rowcount
+            if not claimed:
+                db.rollback()
+                continue
+
+            chunk = db.get(JobChunk, candidate.id)
+            job = chunk.job
+            if job.status == "queued":
+                job.status = "running"
+                job.started_at = datetime.now(timezone.utc)
+            db.commit()
+
+            if chunk.attempts > self.max_attempts:
+                self._finish_chunk(db, chunk, worker_id, "failed", error="Exceeded maximum attempts")
+                continue
+            return chunk
+
+    def complete_chunk(self, db: Session, chunk: JobChunk, worker_id: str, results: List[Dict]) -> bool:
+        """
+        Checkpoint a chunk's results and advance its job
+
+        Returns:
+            False if the worker lost its lease (the results are discarded)
+        """
+        return self._finish_chunk(db, chunk, worker_id, "done", results=results)
+
+    def release_chunk(self, db: Session, chunk: JobChunk, worker_id: str) -> None:
+        """Hand a claimed chunk back without counting the attempt"""
+        db.execute(
+            update(JobChunk)
+            .where(JobChunk.id == chunk.id, JobChunk.worker_id == worker_id, JobChunk.status == "running")
+            .values(status="pending", worker_id=None, lease_expires=None, attempts=JobChunk.attempts - 1)
+        )
+        db.commit()
+
+    def fail_chunk(self, db: Session, chunk: JobChunk, worker_id: str, error: str) -> bool:
+        """
+        Record a failed attempt; the chunk is retried until it reaches max_attempts
+
+        Returns:
+            False if the worker lost its lease
+        """
+        if chunk.attempts < self.max_attempts:
+            released = db.execute(
+                update(JobChunk)
+                .where(JobChunk.id == chunk.id, JobChunk.worker_id == worker_id, JobChunk.status == "running")
+                .values(status="pending", worker_id=None, lease_expires=None, error=error)
+            ).rowcount
+            db.commit()
+            logger.warning(
+                "Chunk %s of job %s failed (attempt %s): %s", chunk.chunk_index, chunk.job_id, chunk.attempts, error,
+                extra={"job_id": chunk.job_id}
+            )
+            return bool(released)
+        return self._finish_chunk(db, chunk, worker_id, "failed", error=error)
+
+    def _finish_chunk(
+        self,
+        db: Session,
+        chunk: JobChunk,
+        worker_id: str,
+        status: str,
+        results: Optional[List[Dict]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """Store a chunk's final state and update the job counters in one transaction"""
+        item_count = len(json.loads(chunk.payload))
+        finished = db.execute(
+            update(JobChunk)
+            .where(JobChunk.id == chunk.id, JobChunk.worker_id == worker_id, JobChunk.status == "running")
+            .values(
+                status=status,
+                result=json.dumps(results) if results is not None else None,
+                error=error,
+                lease_expires=None
+            )
+        ).rowcount
+        if not finished:
+            db.rollback()
+            logger.warning("Worker %s lost the lease on chunk %s", worker_id, chunk.id, extra={"job_id": chunk.job_id})
+            return False
+
+        failed_items = item_count if status == "failed" else sum(1 for result in results if "error" in result)
+        db.execute(
+            update(Job)
+            .where(Job.id == chunk.job_id)
+            .values(
+                processed_items=Job.processed_items + item_count,
+                failed_items=Job.failed_items + failed_items,
+                finished_chunks=Job.finished_chunks + 1
+            )
+        )
+        # Close the job once its last chunk is in (failed only if nothing succeeded)
+        db.execute(
+            update(Job)
+            .where(Job.id == chunk.job_id, Job.finished_chunks >= Job.chunk_count, Job.status == "running")
+            .values(
+                status=case((Job.failed_items >= Job.total_items, "failed"), else_="completed"),
+                finished_at=datetime.now(timezone.utc)
+            )
+        )
+        db.commit()
+
+        job = db.get(Job, chunk.job_id)
+        db.refresh(job)
+        if job.status in self.FINISHED_STATUSES:
+            self._remove_inputs_when_idle(db, job)
+            logger.info(
+                "Job %s %s: %s items, %s failed", job.id, job.status, job.processed_items, job.failed_items,
+                extra={"job_id": job.id}
+            )
+        return True
+
+    def get_job(self, db: Session, job_id: str) -> Optional[Job]:
+        """Get a job by ID"""
+        return db.get(Job, job_id)
+
+    def cancel_job(self, db: Session, job: Job) -> Job:
+        """
+        Stop a job; chunks already claimed finish, but no new ones are handed out
+
+        The inputs are deleted once no chunk is claimed: by the last claimed
+        chunk to finish, or by remove_orphaned_inputs after its lease expires.
+        """
+        if job.status not in self.FINISHED_STATUSES:
+            job.status = "cancelled"
+            job.finished_at = datetime.now(timezone.utc)
+            db.commit()
+            self._remove_inputs_when_idle(db, job)
+            logger.info("Job %s cancelled", job.id, extra={"job_id": job.id})
+        return job
+
+    def iter_results(self, db: Session, job_id: str) -> Iterator[Dict]:
+        """
+        Yield per-item results in input order, loading one chunk at a time
+
+        Items of chunks that failed permanently (or never ran) get an error entry.
+        """
+        chunk_ids = [row.id for row in db.query(JobChunk.id).filter(JobChunk.job_id == job_id).order_by(JobChunk.chunk_index)]
+        index = 0
+        for chunk_id in chunk_ids:
+            chunk = db.get(JobChunk, chunk_id)
+            results = self._chunk_items(chunk)
+            # Drop the chunk from the session before loading the next
+            db.expunge(chunk)
+            for result in results:
+                yield {"index": index, **result}
+                index += 1
+
+    def chunk_results(
+        self,
+        db: Session,
+        job_id: str,
+        chunk_index: int,
+        include_unfinished: bool = False
+    ) -> Optional[List[Dict]]:
+        """
+        Per-item results of one chunk, with their item indexes
+
+        Args:
+            db: Database session
+            job_id: Job ID
+            chunk_index: Chunk position in the job
+            include_unfinished: Return error entries for a chunk that will never run (job finished)
+
+        Returns:
+            None if the chunk does not exist or is still pending or running
+        """
+        chunk = db.query(JobChunk).filter(JobChunk.job_id == job_id, JobChunk.chunk_index == chunk_index).first()
+        if chunk is None or (chunk.status in ("pending", "running") and not include_unfinished):
+            return None
+        # Chunks are equal-sized except the last, so the offset follows from the first one
+        first = db.query(JobChunk.payload).filter(JobChunk.job_id == job_id, JobChunk.chunk_index == 0).scalar()
+        offset = chunk_index * len(json.loads(first))
+        return [{"index": offset + position, **result} for position, result in enumerate(self._chunk_items(chunk))]
+
+    def _chunk_items(self, chunk: JobChunk) -> List[Dict]:
+        """Stored results of a chunk, or an error entry per item if it never completed"""
+        if chunk.status == "done":
+            return json.loads(chunk.result)
+        error = chunk.error or f"Chunk {chunk.status}"
+        return [{"error": error} for _ in json.loads(chunk.payload)]
+
+    def serialize_job(self, job: Job) -> Dict:
+        """Job status for API responses"""
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "total_items": job.total_items,
+            "processed_items": job.processed_items,
+            "failed_items": job.failed_items,
+            "progress": round(job.processed_items / job.total_items, 4) if job.total_items else 0.0,
+            "chunk_count": job.chunk_count,
+            "finished_chunks": job.finished_chunks,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    def remove_orphaned_inputs(self, db: Session) -> int:
+        """
+        Delete inputs of finished jobs that were kept for a claimed chunk
+        (e.g. a job cancelled while a worker that later died held a chunk)
+
+        Returns:
+            Number of jobs whose inputs were removed
+        """
+        try:
+            job_ids = os.listdir(self.storage_dir)
+        except OSError:
+            return 0
+        if not job_ids:
+            return 0
+        finished = db.query(Job).filter(Job.id.in_(job_ids), Job.status.in_(self.FINISHED_STATUSES)).all()
+        removed = sum(1 for job in finished if self._remove_inputs_when_idle(db, job))
+        db.rollback()
+        return removed
+
+    def _remove_inputs_when_idle(self, db: Session, job: Job) -> bool:
+        """Delete a finished job's inputs unless a worker still holds a live lease on one of its chunks"""
+        claimed = (
+            db.query(JobChunk.id)
+            .filter(JobChunk.job_id == job.id, JobChunk.status == "running", JobChunk.lease_expires >= time.time())
+            .first()
+        )
+        if claimed is not None:
+            return False
+        self._remove_inputs(job)
+        return True
+
+    def _remove_inputs(self, job: Job):
+        """Delete a finished job's uploaded inputs"""
+        shutil.rmtree(os.path.join(self.storage_dir, job.id), ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,143 @@
+# app/services/job_worker.py
+"""
+Job Worker
+Claims job chunks from the database queue and runs them through the prediction services
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Dict, List, Optional
+
+from app.services.job_service import JobService
+from app.services.model_registry import ModelRegistry, ModelUnavailable
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Processes job chunks one at a time until stopped
+
+    Models are loaded on first use, and a worker that cannot load a model
+    stops claiming jobs of that kind so another worker can take them. The
+    model files are checked before each chunk, so new versions are picked
+    up between chunks without restarting the worker.
+    """
+
+    def __init__(
+        self,
+        job_service: JobService,
+        session_factory: Callable,
+        worker_id: Optional[str] = None,
+        services: Optional[Dict] = None,
+        poll_interval: Optional[float] = None,
+        model_registry: Optional[ModelRegistry] = None
+    ):
+        """
+        Initialize job worker
+
+        Args:
+            job_service: Queue operations
+            session_factory: Creates database sessions (e.g. SessionLocal)
+            worker_id: Lease owner name (default host-pid)
+            services: Preloaded prediction services by job kind (never reloaded)
+            poll_interval: Seconds to sleep when the queue is empty (JOB_POLL_INTERVAL, default 1)
+            model_registry: Loads the other kinds' models (default: a registry over MODELS_DIR)
+        """
+        self.job_service = job_service
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.services = dict(services or {})
+        self.model_registry = model_registry or ModelRegistry(watch_interval=0)
+        self.kinds = set(self.services) | set(self.model_registry.specs)
+        self.poll_interval = poll_interval or float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+    def _service(self, kind: str):
+        if kind in self.services:
+            return self.services[kind]
+        previous = self.model_registry.current(kind)
+        model = self.model_registry.refresh(kind)
+        if model is None:
+            raise ModelUnavailable(f"The {kind} model could not be loaded")
+        if model is not previous:
+            logger.info("Worker %s loaded %s model version %s", self.worker_id, kind, model.version)
+        return model.service
+
+    def run_chunk(self, kind: str, items: List) -> List[Dict]:
+        """Run one chunk's items through the prediction service for its kind"""
+        service = self._service(kind)
+        if kind == "crop":
+            return service.predict_crops(items)
+
+        images = []
+        for item in items:
+            with open(item["path"], "rb") as f:
+                images.append(f.read())
+        predictions = service.predict_diseases(images)
+        return [{"filename": item["filename"], **prediction} for item, prediction in zip(items, predictions)]
+
+    def run_once(self) -> bool:
+        """
+        Claim and process a single chunk
+
+        Returns:
+            False if there was no work to claim
+        """
+        db = self.session_factory()
+        try:
+            chunk = self.job_service.claim_chunk(db, self.worker_id, self.kinds)
+            if chunk is None:
+                # Idle: clean up inputs of cancelled jobs whose last claimed chunk was abandoned
+                self.job_service.remove_orphaned_inputs(db)
+                return False
+
+            kind = chunk.job.kind
+            items = json.loads(chunk.payload)
+            try:
+                results = self.run_chunk(kind, items)
+            except ModelUnavailable as e:
+                # Model could not be loaded here; hand the chunk back untouched
+                logger.error("Worker %s cannot process %s jobs: %s", self.worker_id, kind, e)
+                self.kinds.discard(kind)
+                self.job_service.release_chunk(db, chunk, self.worker_id)
+                return True
+            except Exception as e:
+                self.job_service.fail_chunk(db, chunk, self.worker_id, str(e))
+                return True
+
+            self.job_service.complete_chunk(db, chunk, self.worker_id, results)
+            return True
+        finally:
+            db.close()
+
+    def run(self, stop_event: Optional[threading.Event] = None, max_chunks: Optional[int] = None) -> int:
+        """
+        Process chunks until stopped
+
+        Args:
+            stop_event: Set to stop after the current chunk
+            max_chunks: Stop after this many chunks (for tests and one-shot runs)
+
+        Returns:
+            Number of chunks processed
+        """
+        stop_event = stop_event or threading.Event()
+        processed = 0
+        logger.info("Job worker %s started", self.worker_id)
+        while not stop_event.is_set() and self.kinds:
+            try:
+                worked = self.run_once()
+            except Exception as e:
+                logger.error("Job worker %s error: %s", self.worker_id, e)
+                worked = False
+            if worked:
+                processed += 1
+                if max_chunks is not None and processed >= max_chunks:
+                    break
+            else:
+                stop_event.wait(self.poll_interval)
+        logger.info("Job worker %s stopped after %s chunks", self.worker_id, processed)
+        return processed
\ No newline at end of file
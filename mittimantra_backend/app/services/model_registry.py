@@ -0,0 +1,322 @@
+# app/services/model_registry.py
+"""
+Model Registry
+Versioned model services with background reloads, warm-up and drain-aware swaps
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+MODELS_DIR = os.getenv("MODELS_DIR", "models")
+# Seconds between checks of the models directory for new files (0 disables watching)
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", "30"))
+
+MODEL_RELOADS = registry.counter(
+    "mittimantra_model_reloads_total",
+    "Model loads by outcome (loaded, failed)",
+    ["model", "role", "outcome"]
+)
+MODEL_VERSIONS_DRAINING = registry.gauge(
+    "mittimantra_model_versions_draining",
+    "Replaced model versions still serving in-flight requests",
+    ["model", "role"]
+)
+
+
+class ModelUnavailable(Exception):
+    """Raised when a model has no loaded version"""
+
+
+class ModelSpec(NamedTuple):
+    """Files a model is built from and how to load them into a service"""
+    files: Tuple[str, ...]
+    loader: Callable[..., object]
+
+
+class ModelVersion:
+    """One loaded version of a model and the requests currently using it"""
+
+    def __init__(self, name: str, version: str, service, signature: Tuple):
+        self.name = name
+        self.version = version
+        self.service = service
+        self.signature = signature
+        self.loaded_at = time.time()
+        self.retired_at: Optional[float] = None
+        self.in_flight = 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.version,
+            "loaded_at": self.loaded_at,
+            "retired_at": self.retired_at,
+            "in_flight": self.in_flight,
+        }
+
+
+def _load_crop_service(model_path: str, encoder_path: str):
+    from app.services.crop_service import CropRecommendationService
+    return CropRecommendationService(model_path, encoder_path)
+
+
+def _load_disease_service(model_path: str):
+    from app.services.disease_service import DiseaseDetectionService
+    return DiseaseDetectionService(model_path)
+
+
+class ModelRegistry:
+    """
+    Holds the current version of each model service and swaps in new ones
+
+    A new version is loaded and warmed up off the request path, then made
+    current with a single reference swap. Requests hold a lease on the
+    version they started with, so a batch keeps one model throughout; the
+    replaced version is dropped once its last lease is released.
+
+    Versions are named after a hash of the model files, so responses (and
+    any cache keyed by them) change whenever the files do. Replace files
+    atomically (write elsewhere, then rename) to avoid loading a partial copy.
+    """
+
+    DEFAULT_SPECS = {
+        "crop": ModelSpec(("crop_planning_brain.pkl", "crop_label_encoder.pkl"), _load_crop_service),
+        "disease": ModelSpec(("plant_disease_model.keras",), _load_disease_service),
+    }
+
+    def __init__(
+        self,
+        models_dir: str = MODELS_DIR,
+        specs: Optional[Dict[str, ModelSpec]] = None,
+        watch_interval: float = MODEL_WATCH_INTERVAL,
+        role: str = "production"
+    ):
+        """
+        Initialize an empty registry
+
+        Args:
+            models_dir: Directory holding the model files
+            specs: Model name -> ModelSpec (default crop and disease)
+            watch_interval: Seconds between file checks by the watcher thread
+            role: Label for metrics and logs ("production", or "candidate" for shadow models)
+        """
+        self.models_dir = models_dir
+        self.specs = dict(specs or self.DEFAULT_SPECS)
+        self.watch_interval = watch_interval
+        self.role = role
+        self._current: Dict[str, ModelVersion] = {}
+        self._draining: List[ModelVersion] = []
+        self._failed_signatures: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _paths(self, name: str) -> List[str]:
+        return [os.path.join(self.models_dir, filename) for filename in self.specs[name].files]
+
+    def _signature(self, name: str) -> Tuple:
+        """Cheap change detector: size and modification time of each model file"""
+        signature = []
+        for path in self._paths(name):
+            stat_result = os.stat(path)
+            signature.append((stat_result.st_size, stat_result.st_mtime_ns))
+        return tuple(signature)
+
+    def _version_id(self, name: str) -> str:
+        digest = hashlib.sha256()
+        for path in self._paths(name):
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        return digest.hexdigest()[:12]
+
+    def load(self, name: str) -> ModelVersion:
+        """
+        Load, warm up and swap in the model files currently on disk
+
+        Raises:
+            ValueError: If the files cannot be loaded or change while loading
+        """
+        with self._load_lock:
+            signature = None
+            try:
+                signature = self._signature(name)
+                version = self._version_id(name)
+                current = self._current.get(name)
+                if current is not None and current.version == version:
+                    # Touched but identical; remember the new mtimes
+                    current.signature = signature
+                    return current
+
+                started = time.perf_counter()
+                service = self.specs[name].loader(*self._paths(name))
+                if hasattr(service, "warm_up"):
+                    service.warm_up()
+                if self._signature(name) != signature:
+                    raise ValueError("model files changed while loading")
+            except Exception as e:
+                self._failed_signatures[name] = signature
+                MODEL_RELOADS.inc(model=name, role=self.role, outcome="failed")
+                logger.error("Failed to load %s %s model: %s", self.role, name, e)
+                raise ValueError(f"Failed to load {name} model: {str(e)}")
+
+            loaded = ModelVersion(name, version, service, signature)
+            self._failed_signatures.pop(name, None)
+            self._swap(loaded)
+            MODEL_RELOADS.inc(model=name, role=self.role, outcome="loaded")
+            logger.info(
+                "Loaded %s %s model version %s in %.2fs", self.role, name, version, time.perf_counter() - started,
+                extra={"model": name, "model_role": self.role, "model_version": version}
+            )
+            return loaded
+
+    def _swap(self, loaded: ModelVersion) -> None:
+        with self._lock:
+            previous = self._current.get(loaded.name)
+            self._current[loaded.name] = loaded
+            if previous is None:
+                return
+            previous.retired_at = time.time()
+            if previous.in_flight:
+                self._draining.append(previous)
+                MODEL_VERSIONS_DRAINING.inc(model=loaded.name, role=self.role)
+                logger.info("%s model version %s draining %s request(s)", loaded.name, previous.version, previous.in_flight)
+
+    def load_all(self) -> Dict[str, bool]:
+        """Load every model, logging (not raising) failures; returns which loaded"""
+        loaded = {}
+        for name in self.specs:
+            try:
+                self.load(name)
+                loaded[name] = True
+            except ValueError:
+                loaded[name] = False
+        return loaded
+
+    def refresh(self, name: str) -> Optional[ModelVersion]:
+        """
+        Load a model if it is missing or its files changed, then return the current version
+
+        A version that failed to load is not retried until its files change again.
+        """
+        try:
+            signature = self._signature(name)
+        except OSError:
+            return self._current.get(name)
+        current = self._current.get(name)
+        if (current is None or current.signature != signature) and self._failed_signatures.get(name) != signature:
+            try:
+                return self.load(name)
+            except ValueError:
+                pass
+        return self._current.get(name)
+
+    def check_for_updates(self) -> List[str]:
+        """Reload every model whose files changed; returns the names swapped"""
+        swapped = []
+        for name in self.specs:
+            before = self._current.get(name)
+            if self.refresh(name) is not before:
+                swapped.append(name)
+        return swapped
+
+    def reload_async(self) -> bool:
+        """Check for new model files in a background thread; False if a check is already running"""
+        with self._lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return False
+            self._reload_thread = threading.Thread(
+                target=self.check_for_updates, name="model-reload", daemon=True
+            )
+            self._reload_thread.start()
+            return True
+
+    def start_watching(self) -> None:
+        """Poll the models directory every watch_interval seconds"""
+        if self.watch_interval <= 0 or self._watch_thread is not None:
+            return
+        self._stop.clear()
+
+        def watch():
+            while not self._stop.wait(self.watch_interval):
+                try:
+                    self.check_for_updates()
+                except Exception as e:
+                    logger.error("Model watcher error: %s", e)
+
+        self._watch_thread = threading.Thread(target=watch, name=f"{self.role}-model-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def stop_watching(self) -> None:
+        self._stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join(timeout=5)
+            self._watch_thread = None
+
+    def current(self, name: str) -> Optional[ModelVersion]:
+        """The version new requests get, or None if the model is not loaded"""
+        return self._current.get(name)
+
+    def service(self, name: str):
+        """The current service instance, or None"""
+        current = self._current.get(name)
+        return current.service if current is not None else None
+
+    @contextmanager
+    def lease(self, name: str, version: Optional[ModelVersion] = None) -> Iterator[ModelVersion]:
+        """
+        Use one model version for the duration of the block
+
+        Args:
+            name: Model name
+            version: Pin this version (e.g. one whose number was already sent
+                in a response header); defaults to the current version
+
+        Raises:
+            ModelUnavailable: If the model is not loaded
+        """
+        with self._lock:
+            leased = version or self._current.get(name)
+            if leased is None:
+                raise ModelUnavailable(f"The {name} model is not loaded")
+            leased.in_flight += 1
+        try:
+            yield leased
+        finally:
+            with self._lock:
+                leased.in_flight -= 1
+                drained = leased.retired_at is not None and leased.in_flight == 0 and leased in self._draining
+                if drained:
+                    self._draining.remove(leased)
+                    MODEL_VERSIONS_DRAINING.dec(model=name, role=self.role)
+            if drained:
+                logger.info("%s model version %s drained and released", name, leased.version)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                name: {
+                    "current": self._current[name].to_dict() if name in self._current else None,
+                    "draining": [version.to_dict() for version in self._draining if version.name == name],
+                }
+                for name in self.specs
+            }
+
+
+def model_version_header(*versions: ModelVersion) -> Dict[str, str]:
+    """X-Model-Version response header naming the model versions behind a response"""
+    return {"X-Model-Version": ", ".join(f"{version.name}={version.version}" for version in versions)}
+
+
+# Process-wide registry used by the prediction endpoints (models load in the app lifespan)
+model_registry = ModelRegistry()
\ No newline at end of file
@@ -0,0 +1,259 @@
+# app/services/outbreak_service.py
+"""
+Disease Outbreak Aggregation Service
+Rolls up stored disease detections into daily per-disease, crop and region counts
+"""
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import increment_counters
+from app.db_models import AggregationWatermark, DiseaseOutbreakStat, DiseasePrediction
+
+logger = logging.getLogger(__name__)
+
+
+class OutbreakAggregationService:
+    """Service for incremental disease outbreak aggregation"""
+
+    WATERMARK_NAME = "disease_outbreak_stats"
+
+    # Maximum number of source rows folded in per transaction
+    BATCH_SIZE = 10000
+
+    def __init__(self):
+        """Initialize outbreak aggregation service"""
+        logger.info("Outbreak aggregation service initialized")
+
+    def refresh(self, db: Session) -> int:
+        """
+        Fold disease predictions inserted since the last refresh into the summary table
+
+        Only rows above the stored watermark are read (a primary key range scan),
+        so the cost depends on the number of new detections, not the history size.
+        Safe to call after every insert and from a periodic job.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of source rows aggregated
+        """
+        total = 0
+        while True:
+            processed = self._refresh_batch(db)
+            if processed is None:
+                return total
+            total += processed
+
+    def _refresh_batch(self, db: Session) -> Optional[int]:
+        """
+        Aggregate one batch of new detections and advance the watermark
+
+        Returns:
+            Number of detections aggregated (0 if the id range held none),
+            or None when there was nothing to do or another refresh got there first
+        """
+        try:
+            watermark = db.get(AggregationWatermark, self.WATERMARK_NAME)
+            if watermark is None:
+                watermark = AggregationWatermark(name=self.WATERMARK_NAME, last_id=0)
+                db.add(watermark)
+                db.flush()
+            last_id = watermark.last_id
+
+            max_id = db.query(func.max(DiseasePrediction.id)).scalar() or 0
+            if max_id <= last_id:
+                db.rollback()
+                return None
+            upper_id = min(max_id, last_id + self.BATCH_SIZE)
+
+            affected_plant = func.coalesce(DiseasePrediction.affected_plant, "")
+            region = func.coalesce(DiseasePrediction.region, "")
+            # created_at is stored in UTC, so buckets are UTC dates (see _today)
+            bucket = func.date(DiseasePrediction.created_at)
+
+            rows = (
+                db.query(
+                    bucket,
+                    DiseasePrediction.disease,
+                    affected_plant,
+                    region,
+                    func.count(DiseasePrediction.id),
+                    func.coalesce(func.sum(DiseasePrediction.confidence), 0.0),
+                    func.sum(case((DiseasePrediction.severity == "High", 1), else_=0)),
+                )
+                .filter(
+                    DiseasePrediction.id > last_id,
+                    DiseasePrediction.id <= upper_id,
+                    DiseasePrediction.disease.isnot(None),
+                )
+                .group_by(bucket, DiseasePrediction.disease, affected_plant, region)
+                .all()
+            )
+
+            for bucket_date, disease, plant, region_name, count, confidence_sum, high_count in rows:
+                increment_counters(
+                    db,
+                    DiseaseOutbreakStat,
+                    keys={
+                        "bucket_date": self._as_date(bucket_date),
+                        "disease": disease,
+                        "affected_plant": plant,
+                        "region": region_name,
+                    },
+                    increments={
+                        "detection_count": count,
+                        "confidence_sum": float(confidence_sum),
+                        "high_severity_count": int(high_count or 0),
+                    },
+                )
+
+            # Advance the watermark only if no concurrent refresh moved it first
+            advanced = (
+                db.query(AggregationWatermark)
+                .filter(
+                    AggregationWatermark.name == self.WATERMARK_NAME,
+                    AggregationWatermark.last_id == last_id,
+                )
+                .update({"last_id": upper_id}, synchronize_session=False)
+            )
+            if not advanced:
+                db.rollback()
+                return None
+
+            db.commit()
+            # Rows actually folded in; deleted or rolled-back ids leave gaps in the range
+            return sum(int(count) for _, _, _, _, count, _, _ in rows)
+
+        except IntegrityError:
+            # Another worker created the watermark row first; it will do the work
+            db.rollback()
+            return None
+        except Exception as e:
+            db.rollback()
+            logger.error("Outbreak aggregation error: %s", e)
+            raise
+
+    def top_diseases(
+        self,
+        db: Session,
+        days: int = 7,
+        limit: int = 5,
+        region: Optional[str] = None,
+        include_healthy: bool = False
+    ) -> List[Dict]:
+        """
+        Get the most detected diseases over a recent window
+
+        Reads only the summary rows for the window, so the query cost is
+        bounded by days x distinct (disease, crop, region) keys.
+
+        Args:
+            db: Database session
+            days: Window size in days, including today
+            limit: Maximum number of diseases to return
+            region: Optional region filter
+            include_healthy: Whether to include "healthy" classifications
+
+        Returns:
+            List of disease summaries ordered by detection count
+        """
+        since = self._today() - timedelta(days=max(1, days) - 1)
+
+        query = db.query(
+            DiseaseOutbreakStat.disease,
+            DiseaseOutbreakStat.affected_plant,
+            DiseaseOutbreakStat.region,
+            func.sum(DiseaseOutbreakStat.detection_count),
+            func.sum(DiseaseOutbreakStat.confidence_sum),
+            func.sum(DiseaseOutbreakStat.high_severity_count),
+        ).filter(DiseaseOutbreakStat.bucket_date >= since)
+
+        if region:
+            query = query.filter(DiseaseOutbreakStat.region == region)
+        if not include_healthy:
+            query = query.filter(~func.lower(DiseaseOutbreakStat.disease).contains("healthy"))
+
+        rows = query.group_by(
+            DiseaseOutbreakStat.disease,
+            DiseaseOutbreakStat.affected_plant,
+            DiseaseOutbreakStat.region,
+        ).all()
+
+        # Fold regions into one entry per (disease, crop)
+        summaries: Dict = {}
+        for disease, plant, region_name, count, confidence_sum, high_count in rows:
+            entry = summaries.setdefault((disease, plant), {
+                "disease": disease,
+                "affected_plant": plant or "Unknown",
+                "detections": 0,
+                "confidence_sum": 0.0,
+                "high_severity": 0,
+                "regions": [],
+            })
+            entry["detections"] += int(count or 0)
+            entry["confidence_sum"] += float(confidence_sum or 0.0)
+            entry["high_severity"] += int(high_count or 0)
+            if region_name:
+                entry["regions"].append(region_name)
+
+        ranked = sorted(summaries.values(), key=lambda entry: entry["detections"], reverse=True)[:limit]
+        for entry in ranked:
+            confidence_sum = entry.pop("confidence_sum")
+            entry["avg_confidence"] = round(confidence_sum / entry["detections"], 4) if entry["detections"] else 0.0
+            entry["window_days"] = days
+        return ranked
+
+    def daily_counts(
+        self,
+        db: Session,
+        days: int = 30,
+        disease: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get per-day detection totals for the dashboard trend chart
+
+        Args:
+            db: Database session
+            days: Window size in days, including today
+            disease: Optional disease filter
+            region: Optional region filter
+
+        Returns:
+            List of {"date", "detections"} entries in date order
+        """
+        since = self._today() - timedelta(days=max(1, days) - 1)
+
+        query = db.query(
+            DiseaseOutbreakStat.bucket_date,
+            func.sum(DiseaseOutbreakStat.detection_count),
+        ).filter(DiseaseOutbreakStat.bucket_date >= since)
+
+        if disease:
+            query = query.filter(DiseaseOutbreakStat.disease == disease)
+        if region:
+            query = query.filter(DiseaseOutbreakStat.region == region)
+
+        rows = query.group_by(DiseaseOutbreakStat.bucket_date).order_by(DiseaseOutbreakStat.bucket_date).all()
+        return [{"date": bucket.isoformat(), "detections": int(count or 0)} for bucket, count in rows]
+
+    @staticmethod
+    def _today() -> date:
+        """Current UTC date, the calendar the summary buckets use"""
+        return datetime.now(timezone.utc).date()
+
+    @staticmethod
+    def _as_date(value) -> date:
+        """Normalize a SQL date() result (string on SQLite) to a date"""
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        return date.fromisoformat(str(value)[:10])
@@ -5,7 +5,7 @@ Provides pest control recommendations based on disease detection
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from app.services.disease_service import DiseaseDetectionService
 
 logger = logging.getLogger(__name__)
@@ -135,24 +135,35 @@ class PestPredictionService:
         }
     }
     
-    def __init__(self):
-        """Initialize pest prediction service"""
-        self.disease_service = DiseaseDetectionService()
+    def __init__(self, disease_service: Optional[DiseaseDetectionService] = None):
+        """
+        Initialize pest prediction service
+        
+        Args:
+            disease_service: Detection service to share (loads its own model if omitted)
+        """
+        self.disease_service = disease_service if disease_service is not None else DiseaseDetectionService()
         logger.info("Pest prediction service initialized")
     
-    def get_control_recommendations(self, image_bytes: bytes) -> Dict:
+    def get_control_recommendations(
+        self,
+        image_bytes: bytes,
+        disease_service: Optional[DiseaseDetectionService] = None
+    ) -> Dict:
         """
         Get pest/disease control recommendations from image
         
         Args:
             image_bytes: Image file bytes
+            disease_service: Detection service to use for this call (e.g. the
+                model version leased from the registry); defaults to the shared one
             
         Returns:
             Dictionary containing disease info and control measures
         """
         try:
             # First detect the disease
-            disease_result = self.disease_service.predict_disease(image_bytes)
+            disease_result = (disease_service or self.disease_service).predict_disease(image_bytes)
             
             disease_name = disease_result["disease"]
             
@@ -174,7 +185,7 @@ class PestPredictionService:
             }
             
         except Exception as e:
-            logger.error(f"Pest control recommendation error: {str(e)}")
+            logger.error("Pest control recommendation error: %s", e)
             raise ValueError(f"Failed to get control recommendations: {str(e)}")
     
     def _normalize_disease_name(self, disease_name: str) -> str:
@@ -226,9 +237,18 @@ class PestPredictionService:
             "recovery_time": "2-4 weeks with proper management"
         }
     
-    def get_active_alerts(self) -> List[Dict]:
-        """Get active pest and disease alerts"""
-        return [
+    def get_active_alerts(self, outbreaks: Optional[List[Dict]] = None) -> List[Dict]:
+        """
+        Get active pest and disease alerts
+        
+        Args:
+            outbreaks: Recent disease summaries from OutbreakAggregationService.top_diseases
+            
+        Returns:
+            Outbreak alerts from stored detections followed by seasonal advisories
+        """
+        alerts = [self._build_outbreak_alert(outbreak) for outbreak in outbreaks or []]
+        return alerts + [
             {
                 "alert_type": "Disease Alert",
                 "pest_disease": "Late Blight",
@@ -253,4 +273,31 @@ class PestPredictionService:
                 "severity": "Medium",
                 "recommendation": "High humidity conditions favor fungal diseases"
             }
-        ]
\ No newline at end of file
+        ]
+    
+    def _build_outbreak_alert(self, outbreak: Dict) -> Dict:
+        """Build an alert from an aggregated disease summary"""
+        control_data = self._get_control_measures(self._normalize_disease_name(outbreak["disease"]))
+        
+        detections = outbreak["detections"]
+        high_share = outbreak["high_severity"] / detections if detections else 0
+        if high_share >= 0.5:
+            severity = "High"
+        elif high_share >= 0.2:
+            severity = "Medium"
+        else:
+            severity = "Low"
+        
+        recommendation = (
+            control_data["preventive"][0] if control_data["preventive"]
+            else "Monitor fields regularly for early detection"
+        )
+        
+        return {
+            "alert_type": "Outbreak Alert",
+            "pest_disease": outbreak["disease"],
+            "affected_crops": [outbreak["affected_plant"]],
+            "regions": outbreak["regions"] or ["Unspecified"],
+            "severity": severity,
+            "recommendation": f"{detections} detections in the last {outbreak['window_days']} days. {recommendation}"
+        }
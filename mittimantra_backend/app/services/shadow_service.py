@@ -0,0 +1,261 @@
+# app/services/shadow_service.py
+"""
+Shadow Evaluation Service
+Scores a sample of live traffic with candidate models off the request path
+"""
+
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from app.services.model_registry import MODEL_WATCH_INTERVAL, ModelRegistry, ModelUnavailable, ModelVersion
+from app.utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Candidate models, in the same layout as MODELS_DIR
+SHADOW_MODELS_DIR = os.getenv("SHADOW_MODELS_DIR", os.path.join(os.getenv("MODELS_DIR", "models"), "candidate"))
+# Fraction of /predict-crop and /predict-disease requests also scored by the candidate
+SHADOW_SAMPLE_RATE = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+# Pending comparisons; further samples are dropped while the queue is full
+SHADOW_MAX_QUEUE = int(os.getenv("SHADOW_MAX_QUEUE", "32"))
+
+SHADOW_COMPARISONS = registry.counter(
+    "mittimantra_shadow_comparisons_total",
+    "Candidate model comparisons by outcome (agree, disagree, error, dropped)",
+    ["model", "outcome"]
+)
+SHADOW_LATENCY = registry.histogram(
+    "mittimantra_shadow_inference_seconds",
+    "Model execution time of shadowed requests, production vs candidate",
+    ["model", "role"]
+)
+
+# Result field compared between production and candidate, per model
+DECISION_FIELDS = {"crop": "recommended_crop", "disease": "disease"}
+
+# Latency samples kept per comparison for percentiles
+_LATENCY_WINDOW = 1000
+
+
+def run_timed(fn: Callable, *args, **kwargs) -> Tuple[Any, float]:
+    """Call fn and return (result, seconds), measured where the model runs"""
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+class ShadowComparison:
+    """Running agreement, confidence and latency statistics for one production/candidate pair"""
+
+    def __init__(self, production_version: str, candidate_version: str):
+        self.production_version = production_version
+        self.candidate_version = candidate_version
+        self.compared = 0
+        self.agreements = 0
+        self.errors = 0
+        self.confidence_deltas = 0
+        self.delta_sum = 0.0
+        self.abs_delta_sum = 0.0
+        self.production_latencies = deque(maxlen=_LATENCY_WINDOW)
+        self.candidate_latencies = deque(maxlen=_LATENCY_WINDOW)
+
+    def record(self, field: str, production: Dict, candidate: Dict, production_seconds: float, candidate_seconds: float):
+        self.compared += 1
+        if production.get(field) == candidate.get(field):
+            self.agreements += 1
+        if production.get("confidence") is not None and candidate.get("confidence") is not None:
+            delta = candidate["confidence"] - production["confidence"]
+            self.confidence_deltas += 1
+            self.delta_sum += delta
+            self.abs_delta_sum += abs(delta)
+        self.production_latencies.append(production_seconds)
+        self.candidate_latencies.append(candidate_seconds)
+
+    def to_dict(self) -> Dict:
+        def percentiles(latencies):
+            values = np.asarray(latencies) * 1000
+            if not values.size:
+                return {"p50_ms": None, "p99_ms": None}
+            return {
+                "p50_ms": round(float(np.percentile(values, 50)), 3),
+                "p99_ms": round(float(np.percentile(values, 99)), 3),
+            }
+
+        return {
+            "production_version": self.production_version,
+            "candidate_version": self.candidate_version,
+            "compared": self.compared,
+            "errors": self.errors,
+            "agreement_rate": round(self.agreements / self.compared, 4) if self.compared else None,
+            "mean_confidence_delta": round(self.delta_sum / self.confidence_deltas, 4) if self.confidence_deltas else None,
+            "mean_abs_confidence_delta": round(self.abs_delta_sum / self.confidence_deltas, 4) if self.confidence_deltas else None,
+            "production_latency": percentiles(self.production_latencies),
+            "candidate_latency": percentiles(self.candidate_latencies),
+        }
+
+
+class ShadowEvaluator:
+    """
+    Replays sampled requests against candidate models in a background thread
+
+    submit() only samples and enqueues, so the request never waits for the
+    candidate. The queue is bounded: when the candidate falls behind, new
+    samples are dropped (and counted) rather than piling up in memory.
+    """
+
+    def __init__(
+        self,
+        candidates: Optional[ModelRegistry] = None,
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+        max_queue: int = SHADOW_MAX_QUEUE
+    ):
+        """
+        Initialize shadow evaluator
+
+        Args:
+            candidates: Registry of candidate models (default: SHADOW_MODELS_DIR)
+            sample_rate: Fraction of eligible requests to shadow (0 disables)
+            max_queue: Pending comparisons before samples are dropped
+        """
+        self.candidates = candidates or ModelRegistry(SHADOW_MODELS_DIR, watch_interval=MODEL_WATCH_INTERVAL, role="candidate")
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._comparisons: Dict[Tuple[str, str, str], ShadowComparison] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Load any candidate models present and start the comparison thread"""
+        if self.sample_rate <= 0:
+            return
+        self.candidates.check_for_updates()
+        self.candidates.start_watching()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="shadow-evaluator", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self.candidates.stop_watching()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def submit(
+        self,
+        name: str,
+        method: str,
+        args: Tuple,
+        kwargs: Dict,
+        production: ModelVersion,
+        production_result: Dict,
+        production_seconds: float
+    ) -> bool:
+        """
+        Maybe queue a request for candidate scoring (never blocks)
+
+        Args:
+            name: Model name ("crop" or "disease")
+            method: Service method the production model ran
+            args: Its positional arguments
+            kwargs: Its keyword arguments
+            production: Version that served the request
+            production_result: What it returned
+            production_seconds: How long it took
+
+        Returns:
+            Whether the request was queued
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return False
+        candidate = self.candidates.current(name)
+        if candidate is None:
+            return False
+        try:
+            self._queue.put_nowait((name, method, args, kwargs, production.version, production_result, production_seconds))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            SHADOW_COMPARISONS.inc(model=name, outcome="dropped")
+            return False
+
+    def _comparison(self, name: str, production_version: str, candidate_version: str) -> ShadowComparison:
+        key = (name, production_version, candidate_version)
+        with self._lock:
+            if key not in self._comparisons:
+                self._comparisons[key] = ShadowComparison(production_version, candidate_version)
+            return self._comparisons[key]
+
+    def process(self, item: Tuple) -> None:
+        """Score one queued request with the candidate and record the comparison"""
+        name, method, args, kwargs, production_version, production_result, production_seconds = item
+        try:
+            with self.candidates.lease(name) as candidate:
+                comparison = self._comparison(name, production_version, candidate.version)
+                try:
+                    candidate_result, candidate_seconds = run_timed(
+                        getattr(candidate.service, method), *args, **kwargs
+                    )
+                except Exception as e:
+                    with self._lock:
+                        comparison.errors += 1
+                    SHADOW_COMPARISONS.inc(model=name, outcome="error")
+                    logger.warning("Candidate %s model %s failed: %s", name, candidate.version, e)
+                    return
+        except ModelUnavailable:
+            return
+
+        field = DECISION_FIELDS[name]
+        with self._lock:
+            comparison.record(field, production_result, candidate_result, production_seconds, candidate_seconds)
+        agreed = production_result.get(field) == candidate_result.get(field)
+        SHADOW_COMPARISONS.inc(model=name, outcome="agree" if agreed else "disagree")
+        SHADOW_LATENCY.observe(production_seconds, model=name, role="production")
+        SHADOW_LATENCY.observe(candidate_seconds, model=name, role="candidate")
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self.process(item)
+            except Exception as e:
+                logger.error("Shadow evaluation error: %s", e)
+
+    def get_stats(self) -> Dict:
+        """Comparisons per model and version pair, plus candidate and queue state"""
+        with self._lock:
+            comparisons = [
+                {"model": name, **comparison.to_dict()}
+                for (name, _, _), comparison in self._comparisons.items()
+            ]
+        return {
+            "sample_rate": self.sample_rate,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+            "candidates": {
+                name: model["current"]["version"] if model["current"] else None
+                for name, model in self.candidates.get_stats().items()
+            },
+            "comparisons": comparisons,
+        }
+
+    def reset(self) -> None:
+        """Discard recorded comparisons (e.g. after changing candidates)"""
+        with self._lock:
+            self._comparisons.clear()
+            self.dropped = 0
+
+
+# Process-wide evaluator used by the prediction endpoints (started in the app lifespan)
+shadow_evaluator = ShadowEvaluator()
\ No newline at end of file
@@ -0,0 +1,197 @@
+# app/services/stats_service.py
+"""
+User Statistics Service
+Maintains pre-aggregated per-user prediction statistics for the analytics dashboard
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import increment_counters
+from app.db_models import CropPrediction, DiseasePrediction, IrrigationSchedule, UserStats
+
+logger = logging.getLogger(__name__)
+
+
+class UserStatsService:
+    """Service for incremental per-user statistics"""
+
+    # Number of crops returned in the most-recommended list
+    TOP_CROPS = 5
+
+    def __init__(self):
+        """Initialize user statistics service"""
+        logger.info("User statistics service initialized")
+
+    def apply_crop_prediction(self, db: Session, user_id: int, recommended_crop: str) -> None:
+        """
+        Count a crop recommendation in the user's statistics
+
+        Runs inside the caller's transaction so the history row and the
+        statistics commit together.
+        """
+        increment_counters(db, UserStats, {"user_id": user_id}, {"crop_prediction_count": 1})
+        stats = self._lock_row(db, user_id)
+
+        crop_counts = self._load_json(stats.crop_counts)
+        crop_counts[recommended_crop] = crop_counts.get(recommended_crop, 0) + 1
+        stats.crop_counts = json.dumps(crop_counts)
+
+    def apply_disease_prediction(self, db: Session, user_id: int) -> None:
+        """Count a disease detection in the user's statistics"""
+        increment_counters(db, UserStats, {"user_id": user_id}, {"disease_prediction_count": 1})
+
+    def apply_irrigation_schedule(self, db: Session, user_id: int, water_amount: float) -> None:
+        """Count an irrigation schedule and its recommended water in the user's statistics"""
+        increment_counters(
+            db, UserStats, {"user_id": user_id},
+            {"irrigation_schedule_count": 1, "total_water_recommended": float(water_amount or 0.0)}
+        )
+        if not water_amount:
+            return
+        stats = self._lock_row(db, user_id)
+
+        month = datetime.now(timezone.utc).strftime("%Y-%m")
+        water_by_month = self._load_json(stats.water_by_month)
+        water_by_month[month] = round(water_by_month.get(month, 0.0) + float(water_amount), 2)
+        stats.water_by_month = json.dumps(water_by_month)
+
+    def get_stats(self, db: Session, user_id: int) -> Dict:
+        """
+        Get a user's statistics with a single primary key lookup
+
+        Args:
+            db: Database session
+            user_id: User to look up
+
+        Returns:
+            Dictionary of counts, most-recommended crops and monthly water totals
+        """
+        stats = db.get(UserStats, user_id)
+        if stats is None:
+            return self._to_dict(user_id, None)
+        return self._to_dict(user_id, stats)
+
+    def rebuild(self, db: Session, user_id: Optional[int] = None) -> int:
+        """
+        Recompute statistics from the prediction tables
+
+        Used to backfill existing history; live traffic is maintained
+        incrementally. Scans the history with GROUP BY queries, so run it
+        offline or per user.
+
+        Args:
+            db: Database session
+            user_id: Rebuild a single user, or all users when None
+
+        Returns:
+            Number of statistics rows written
+        """
+        rebuilt: Dict[int, Dict] = {}
+
+        def entry(uid: int) -> Dict:
+            return rebuilt.setdefault(uid, {
+                "crop_prediction_count": 0,
+                "disease_prediction_count": 0,
+                "irrigation_schedule_count": 0,
+                "crop_counts": {},
+                "total_water_recommended": 0.0,
+                "water_by_month": {},
+            })
+
+        def scoped(query, model):
+            query = query.filter(model.user_id.isnot(None))
+            return query.filter(model.user_id == user_id) if user_id is not None else query
+
+        crop_rows = scoped(
+            db.query(CropPrediction.user_id, CropPrediction.recommended_crop, func.count(CropPrediction.id)),
+            CropPrediction
+        ).group_by(CropPrediction.user_id, CropPrediction.recommended_crop)
+        for uid, crop, count in crop_rows:
+            stats = entry(uid)
+            stats["crop_prediction_count"] += count
+            if crop:
+                stats["crop_counts"][crop] = count
+
+        disease_rows = scoped(
+            db.query(DiseasePrediction.user_id, func.count(DiseasePrediction.id)),
+            DiseasePrediction
+        ).group_by(DiseasePrediction.user_id)
+        for uid, count in disease_rows:
+            entry(uid)["disease_prediction_count"] = count
+
+        day = func.date(IrrigationSchedule.created_at)
+        irrigation_rows = scoped(
+            db.query(
+                IrrigationSchedule.user_id, day,
+                func.count(IrrigationSchedule.id),
+                func.coalesce(func.sum(IrrigationSchedule.water_amount), 0.0)
+            ),
+            IrrigationSchedule
+        ).group_by(IrrigationSchedule.user_id, day)
+        for uid, bucket, count, water in irrigation_rows:
+            stats = entry(uid)
+            stats["irrigation_schedule_count"] += count
+            stats["total_water_recommended"] += float(water)
+            if water:
+                month = str(bucket)[:7]
+                stats["water_by_month"][month] = round(stats["water_by_month"].get(month, 0.0) + float(water), 2)
+
+        if user_id is not None:
+            db.query(UserStats).filter(UserStats.user_id == user_id).delete()
+        else:
+            db.query(UserStats).delete()
+
+        for uid, stats in rebuilt.items():
+            db.add(UserStats(
+                user_id=uid,
+                crop_prediction_count=stats["crop_prediction_count"],
+                disease_prediction_count=stats["disease_prediction_count"],
+                irrigation_schedule_count=stats["irrigation_schedule_count"],
+                crop_counts=json.dumps(stats["crop_counts"]),
+                total_water_recommended=round(stats["total_water_recommended"], 2),
+                water_by_month=json.dumps(stats["water_by_month"]),
+            ))
+        db.commit()
+        return len(rebuilt)
+
+    def _lock_row(self, db: Session, user_id: int) -> UserStats:
+        """Load the user's statistics row for update, bypassing any stale identity map copy"""
+        return (
+            db.query(UserStats)
+            .filter(UserStats.user_id == user_id)
+            .populate_existing()
+            .with_for_update()
+            .one()
+        )
+
+    def _to_dict(self, user_id: int, stats: Optional[UserStats]) -> Dict:
+        """Convert a statistics row to the API response shape"""
+        crop_counts = self._load_json(stats.crop_counts) if stats else {}
+        water_by_month = self._load_json(stats.water_by_month) if stats else {}
+
+        # Ties by name, so incremental and rebuilt rows list crops in the same order
+        top_crops = sorted(crop_counts.items(), key=lambda item: (-item[1], item[0]))[:self.TOP_CROPS]
+
+        return {
+            "user_id": user_id,
+            "crop_prediction_count": stats.crop_prediction_count if stats else 0,
+            "disease_prediction_count": stats.disease_prediction_count if stats else 0,
+            "irrigation_schedule_count": stats.irrigation_schedule_count if stats else 0,
+            "top_crops": [{"crop": crop, "count": count} for crop, count in top_crops],
+            "total_water_recommended": round(stats.total_water_recommended, 2) if stats else 0.0,
+            "water_by_month": [
+                {"month": month, "water_amount": water_by_month[month]}
+                for month in sorted(water_by_month)
+            ],
+        }
+
+    @staticmethod
+    def _load_json(value: Optional[str]) -> Dict:
+        """Parse a JSON breakdown column"""
+        return json.loads(value) if value else {}
@@ -0,0 +1,328 @@
+# app/services/water_balance_service.py
+"""
+Soil Water Balance Service
+Daily root-zone water balance (FAO-56 bucket model) vectorized across many fields
+"""
+
+import logging
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.irrigation_service import IrrigationService
+from app.utils.evapotranspiration import (
+    clear_sky_radiation,
+    extraterrestrial_radiation,
+    hargreaves_et0,
+    penman_monteith_et0,
+    stage_crop_coefficient
+)
+
+logger = logging.getLogger(__name__)
+
+
+class WaterBalanceService:
+    """Service for season-long irrigation planning"""
+
+    STAGES = ["seedling", "vegetative", "flowering", "fruiting", "maturity"]
+
+    # Share of the season spent in each growth stage
+    STAGE_FRACTIONS = [0.15, 0.30, 0.20, 0.20, 0.15]
+
+    DEFAULT_SEASON_LENGTH = 120
+
+    # Smallest and largest net application per irrigation event (mm)
+    MIN_APPLICATION = 10.0
+    MAX_APPLICATION = 60.0
+
+    # Days of forecast rainfall credited when sizing an irrigation
+    RAIN_LOOKAHEAD_DAYS = 2
+
+    def __init__(self, irrigation_service: Optional[IrrigationService] = None):
+        """Build per-crop, per-stage lookup tables from the irrigation service"""
+        self.irrigation_service = irrigation_service or IrrigationService()
+
+        self.crop_index = {crop: i for i, crop in enumerate(self.irrigation_service.CROP_WATER_REQUIREMENTS)}
+        self.default_crop_index = len(self.crop_index)
+
+        tables = list(self.irrigation_service.CROP_WATER_REQUIREMENTS.items())
+        tables.append(("default", self.irrigation_service.DEFAULT_WATER_REQUIREMENT))
+
+        # (crops + default, stages) tables of daily water requirement and optimal moisture
+        self.water_table = np.array(
+            [[requirements[stage] for stage in self.STAGES] for _, requirements in tables],
+            dtype=np.float64
+        )
+        self.optimal_table = np.array(
+            [[self.irrigation_service._get_optimal_moisture(crop, stage) for stage in self.STAGES] for crop, _ in tables],
+            dtype=np.float64
+        )
+        self.kc_table = np.array(
+            [[stage_crop_coefficient(crop, stage) for stage in self.STAGES] for crop, _ in tables],
+            dtype=np.float64
+        )
+        self.stage_bounds = np.cumsum(self.STAGE_FRACTIONS)[:-1]
+
+        logger.info("Water balance service initialized")
+
+    def simulate(
+        self,
+        crop_types: Sequence[str],
+        soil_moisture: Sequence[float],
+        days_after_planting: Sequence[float],
+        temperature: np.ndarray,
+        humidity: np.ndarray,
+        rainfall: np.ndarray,
+        season_length: Optional[Sequence[float]] = None,
+        available_water: Optional[Sequence[float]] = None,
+        reference_et: Optional[np.ndarray] = None
+    ) -> Dict:
+        """
+        Simulate daily root-zone depletion for many fields at once
+
+        Each day: depletion += crop water use - effective rainfall, clipped
+        at field capacity (the excess is deep percolation). When depletion
+        passes the crop's allowable level (derived from its optimal moisture)
+        the field is irrigated, net of rain expected in the next few days.
+
+        Args:
+            crop_types: Crop per field (F)
+            soil_moisture: Current soil moisture percentage per field (F)
+            days_after_planting: Crop age in days per field (F)
+            temperature: Daily mean temperature, shape (D,) shared or (F, D)
+            humidity: Daily relative humidity, shape (D,) or (F, D)
+            rainfall: Daily rainfall in mm, shape (D,) or (F, D)
+            season_length: Days from planting to harvest per field (F)
+            available_water: Root-zone available water at 100% moisture in mm (F)
+            reference_et: Reference evapotranspiration ET0 in mm/day, shape (D,)
+                or (F, D); crop water use is then Kc x ET0 instead of the stage
+                requirement table scaled by the ET factor
+
+        Returns:
+            Dictionary of NumPy arrays: "irrigation", "depletion" and
+            "crop_water_use" with shape (F, D), plus per-field totals
+        """
+        fields = len(crop_types)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        humidity = np.asarray(humidity, dtype=np.float64)
+        rainfall = np.asarray(rainfall, dtype=np.float64)
+        days = temperature.shape[-1]
+        shape = (fields, days)
+
+        crop_idx = np.array(
+            [self.crop_index.get(crop.lower(), self.default_crop_index) for crop in crop_types],
+            dtype=np.intp
+        )
+        season = np.full(fields, self.DEFAULT_SEASON_LENGTH, dtype=np.float64) \
+            if season_length is None else np.asarray(season_length, dtype=np.float64)
+        taw = np.full(fields, float(self.irrigation_service.AVAILABLE_WATER_CAPACITY)) \
+            if available_water is None else np.asarray(available_water, dtype=np.float64)
+
+        # Growth stage per field and day from crop age
+        age = np.asarray(days_after_planting, dtype=np.float64)[:, None] + np.arange(days)
+        season_share = age / season[:, None]
+        stage_idx = np.searchsorted(self.stage_bounds, season_share, side="right")
+        active = season_share < 1.0
+
+        if reference_et is not None:
+            # Crop water use: stage crop coefficient times reference ET
+            crop_use = self.kc_table[crop_idx[:, None], stage_idx] * np.broadcast_to(reference_et, shape)
+        else:
+            # Crop water use: stage requirement scaled by the weather ET factor
+            et_factor = self.irrigation_service._calculate_et_factor(temperature, humidity)
+            crop_use = self.water_table[crop_idx[:, None], stage_idx] * np.broadcast_to(et_factor, shape)
+        crop_use = np.where(active, crop_use, 0.0)
+
+        # Irrigate once moisture would fall below optimal; refill above it
+        optimal = self.optimal_table[crop_idx[:, None], stage_idx]
+        allowable_depletion = taw[:, None] * (1 - optimal / 100)
+        refill_depletion = taw[:, None] * (
+            1 - np.minimum(100, optimal + self.irrigation_service.REFILL_MARGIN) / 100
+        )
+
+        effective_rain = np.broadcast_to(rainfall * self.irrigation_service.RAINFALL_EFFICIENCY, shape)
+        upcoming_rain = self._rolling_sum_ahead(effective_rain, self.RAIN_LOOKAHEAD_DAYS)
+
+        depletion = taw * (1 - np.clip(np.asarray(soil_moisture, dtype=np.float64), 0, 100) / 100)
+        depletion_out = np.empty(shape)
+        irrigation_out = np.zeros(shape)
+        percolation = np.zeros(fields)
+        stress_days = np.zeros(fields, dtype=np.int64)
+
+        for day in range(days):
+            depletion = depletion + crop_use[:, day] - effective_rain[:, day]
+
+            # Rain beyond field capacity drains below the root zone
+            percolation += np.maximum(-depletion, 0.0)
+            depletion = np.maximum(depletion, 0.0)
+
+            trigger = active[:, day] & (depletion > allowable_depletion[:, day])
+            if trigger.any():
+                needed = depletion - refill_depletion[:, day] - upcoming_rain[:, day]
+                amount = np.clip(needed, self.MIN_APPLICATION, self.MAX_APPLICATION)
+                amount = np.where(trigger, np.minimum(amount, depletion), 0.0)
+                irrigation_out[:, day] = amount
+                depletion = depletion - amount
+
+            stress_days += active[:, day] & (depletion > allowable_depletion[:, day])
+            depletion = np.minimum(depletion, taw)
+            depletion_out[:, day] = depletion
+
+        return {
+            "irrigation": irrigation_out,
+            "depletion": depletion_out,
+            "crop_water_use": crop_use,
+            "soil_moisture": 100 * (1 - depletion_out / taw[:, None]),
+            "total_irrigation": irrigation_out.sum(axis=1),
+            "irrigation_events": (irrigation_out > 0).sum(axis=1),
+            "deep_percolation": percolation,
+            "stress_days": stress_days,
+        }
+
+    def plan_fields(
+        self,
+        fields: List[Dict],
+        forecast: List[Dict],
+        horizon_days: int = 120,
+        start_date: Optional[date] = None,
+        latitude: Optional[float] = None,
+        elevation: float = 0.0
+    ) -> List[Dict]:
+        """
+        Build an irrigation calendar for each field
+
+        The forecast covers the first days; beyond it the forecast mean is
+        used as a persistence estimate.
+
+        Args:
+            fields: Dicts with "crop_type", "soil_moisture" and either
+                "days_after_planting" or "crop_stage"; optional "season_length"
+                and "available_water"
+            forecast: Daily forecast from WeatherService.get_forecast
+            horizon_days: Number of days to simulate
+            start_date: Date of the first simulated day (defaults to today)
+            latitude: Field latitude; enables reference ET (Penman-Monteith
+                when the forecast has wind and solar radiation, otherwise
+                Hargreaves) when the forecast has min/max temperatures
+            elevation: Field elevation in metres (Penman-Monteith only)
+
+        Returns:
+            One calendar dictionary per field, in input order
+        """
+        if not fields:
+            return []
+        if not forecast:
+            raise ValueError("Forecast is empty")
+
+        start_date = start_date or date.today()
+        weather = {
+            key: self._extend_series([day[key] for day in forecast], horizon_days)
+            for key in ("temperature", "humidity", "rainfall")
+        }
+
+        season_length = [field.get("season_length") or self.DEFAULT_SEASON_LENGTH for field in fields]
+        days_after_planting = [
+            field["days_after_planting"] if field.get("days_after_planting") is not None
+            else self.stage_start_day(field["crop_stage"], season)
+            for field, season in zip(fields, season_length)
+        ]
+
+        reference_et, et_method = self.reference_et(forecast, horizon_days, start_date, latitude, elevation)
+
+        result = self.simulate(
+            crop_types=[field["crop_type"] for field in fields],
+            soil_moisture=[field["soil_moisture"] for field in fields],
+            days_after_planting=days_after_planting,
+            temperature=weather["temperature"],
+            humidity=weather["humidity"],
+            rainfall=weather["rainfall"],
+            season_length=season_length,
+            available_water=[
+                field.get("available_water") or self.irrigation_service.AVAILABLE_WATER_CAPACITY
+                for field in fields
+            ],
+            reference_et=reference_et
+        )
+
+        calendars = []
+        for i, field in enumerate(fields):
+            irrigation_days = np.flatnonzero(result["irrigation"][i])
+            calendars.append({
+                "crop_type": field["crop_type"],
+                "irrigation_calendar": [
+                    {
+                        "date": (start_date + timedelta(days=int(day))).isoformat(),
+                        "water_amount": round(float(result["irrigation"][i, day]), 2),
+                        "projected_moisture": round(float(result["soil_moisture"][i, day]), 1)
+                    }
+                    for day in irrigation_days
+                ],
+                "total_irrigation": round(float(result["total_irrigation"][i]), 2),
+                "total_crop_water_use": round(float(result["crop_water_use"][i].sum()), 2),
+                "deep_percolation": round(float(result["deep_percolation"][i]), 2),
+                "stress_days": int(result["stress_days"][i]),
+                "et_method": et_method,
+                "horizon_days": horizon_days
+            })
+        return calendars
+
+    def reference_et(
+        self,
+        forecast: List[Dict],
+        horizon_days: int,
+        start_date: date,
+        latitude: Optional[float],
+        elevation: float = 0.0
+    ):
+        """
+        Compute daily reference ET over the horizon from a forecast
+
+        Returns:
+            Tuple of (ET0 array of shape (horizon_days,) or None, method name)
+        """
+        if latitude is None or not all("temp_min" in day and "temp_max" in day for day in forecast):
+            return None, "et-factor"
+
+        temp_min = self._extend_series([day["temp_min"] for day in forecast], horizon_days)
+        temp_max = self._extend_series([day["temp_max"] for day in forecast], horizon_days)
+        day_of_year = np.array(
+            [(start_date + timedelta(days=offset)).timetuple().tm_yday for offset in range(horizon_days)]
+        )
+        radiation = extraterrestrial_radiation(latitude, day_of_year)
+
+        if all("wind_speed" in day and "solar_radiation" in day for day in forecast):
+            humidity = self._extend_series([day["humidity"] for day in forecast], horizon_days)
+            wind_speed = self._extend_series([day["wind_speed"] for day in forecast], horizon_days)
+            solar = self._extend_series([day["solar_radiation"] for day in forecast], horizon_days)
+            # Solar radiation cannot exceed clear-sky radiation; applies to forecast and persistence days alike
+            solar = np.minimum(solar, clear_sky_radiation(radiation, elevation))
+            return (
+                penman_monteith_et0(temp_min, temp_max, humidity, wind_speed, radiation, solar, elevation),
+                "penman-monteith"
+            )
+
+        return hargreaves_et0(temp_min, temp_max, radiation), "hargreaves"
+
+    def stage_start_day(self, crop_stage: str, season_length: float = DEFAULT_SEASON_LENGTH) -> float:
+        """Get the crop age at which a growth stage begins"""
+        if crop_stage not in self.STAGES:
+            raise ValueError(f"Unknown crop stage: {crop_stage}")
+        stage = self.STAGES.index(crop_stage)
+        return float(sum(self.STAGE_FRACTIONS[:stage]) * season_length)
+
+    @staticmethod
+    def _extend_series(values: List[float], days: int) -> np.ndarray:
+        """Extend a forecast series to the horizon with its mean"""
+        series = np.full(days, float(np.mean(values)))
+        count = min(days, len(values))
+        series[:count] = values[:count]
+        return series
+
+    @staticmethod
+    def _rolling_sum_ahead(values: np.ndarray, window: int) -> np.ndarray:
+        """Sum of values over the next `window` days (excluding today) along the last axis"""
+        padded = np.concatenate([values, np.zeros(values.shape[:-1] + (window + 1,))], axis=-1)
+        cumulative = np.cumsum(padded, axis=-1)
+        days = values.shape[-1]
+        return cumulative[..., window:days + window] - cumulative[..., :days]
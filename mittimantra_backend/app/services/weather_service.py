@@ -0,0 +1,248 @@
+# app/services/weather_service.py
+"""
+Weather Forecast Service
+Pluggable forecast providers behind a per-grid-cell TTL cache
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Forecast horizon fetched from providers; requests slice from this
+MAX_FORECAST_DAYS = 7
+
+
+class WeatherProvider(ABC):
+    """Interface for daily weather forecast sources"""
+
+    name = "base"
+
+    @abstractmethod
+    def get_forecast(self, latitude: float, longitude: float, days: int) -> List[Dict]:
+        """
+        Get a daily forecast starting today
+
+        Args:
+            latitude: Latitude in decimal degrees
+            longitude: Longitude in decimal degrees
+            days: Number of days to return
+
+        Returns:
+            List of daily dictionaries with "date", "temperature", "temp_min",
+            "temp_max", "humidity" and "rainfall" (mm); "wind_speed" (m/s) and
+            "solar_radiation" (MJ/m²/day) when the source provides them
+        """
+
+
+class FileWeatherProvider(WeatherProvider):
+    """Forecast provider backed by a local JSON fixture (offline stand-in for a weather API)"""
+
+    name = "file"
+
+    def __init__(self, path: str = "data/weather_forecast.json"):
+        """Load forecast fixture"""
+        try:
+            with open(Path(path), encoding="utf-8") as f:
+                fixture = json.load(f)
+            self.default = fixture["default"]
+            self.locations = fixture.get("locations", [])
+            logger.info("File weather provider loaded %s locations from %s", len(self.locations), path)
+        except Exception as e:
+            logger.error("Failed to load weather fixture: %s", e)
+            raise
+
+    def get_forecast(self, latitude: float, longitude: float, days: int) -> List[Dict]:
+        """Return the nearest fixture location's forecast, dated from today"""
+        daily = self.default
+        best_distance = None
+        for location in self.locations:
+            distance = math.hypot(location["latitude"] - latitude, location["longitude"] - longitude)
+            if distance <= location.get("radius", 1.0) and (best_distance is None or distance < best_distance):
+                best_distance = distance
+                daily = location["daily"]
+
+        today = date.today()
+        forecast = []
+        for offset in range(days):
+            # Repeat the last fixture day if the horizon is longer than the fixture
+            day = dict(daily[min(offset, len(daily) - 1)])
+            day["date"] = (today + timedelta(days=offset)).isoformat()
+            day.setdefault("temperature", round((day["temp_min"] + day["temp_max"]) / 2, 1))
+            forecast.append(day)
+        return forecast
+
+
+class ForecastCache:
+    """Thread-safe TTL cache with single-flight fetches per key, bounded by LRU eviction"""
+
+    # Upper bound on cached cells; least recently used entries are evicted beyond this
+    MAX_ENTRIES = 10000
+
+    def __init__(self, ttl_seconds: float, max_entries: int = MAX_ENTRIES):
+        """Initialize an empty cache"""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict]]]" = OrderedDict()
+        self._locks: Dict[Tuple, threading.Lock] = {}
+        self._guard = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_fetch(self, key: Tuple, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Return the cached value for key, calling fetch at most once per TTL
+
+        Concurrent misses on the same key wait for the first caller's fetch
+        instead of each calling the provider. If a refresh fails, the stale
+        value is served when one exists.
+        """
+        with self._guard:
+            entry = self._fresh(key)
+            if entry is not None:
+                return entry[1]
+            lock = self._locks.setdefault(key, threading.Lock())
+
+        with lock:
+            with self._guard:
+                entry = self._fresh(key)
+                if entry is not None:
+                    return entry[1]
+                entry = self._entries.get(key)
+                self.misses += 1
+
+            try:
+                value = fetch()
+            except Exception as e:
+                if entry is not None:
+                    logger.warning("Forecast refresh failed for cell %s, serving stale data: %s", key, e)
+                    return entry[1]
+                raise
+
+            with self._guard:
+                self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._entries.move_to_end(key)
+                if len(self._entries) > self.max_entries:
+                    self._prune()
+            return value
+
+    def __len__(self) -> int:
+        """Number of cached entries"""
+        return len(self._entries)
+
+    def _fresh(self, key: Tuple) -> Optional[Tuple[float, List[Dict]]]:
+        """Unexpired entry for key, counted as a hit and marked recently used (caller holds _guard)"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def _prune(self):
+        """Drop expired entries, then the least recently used ones down to max_entries (caller holds _guard)"""
+        now = time.monotonic()
+        for key in [key for key, (expires, _) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        # Keep locks of cached keys and of fetches still in flight
+        for key in [key for key, lock in self._locks.items() if key not in self._entries and not lock.locked()]:
+            del self._locks[key]
+
+
+class WeatherService:
+    """Service for cached, grid-aligned weather forecasts"""
+
+    def __init__(
+        self,
+        provider: Optional[WeatherProvider] = None,
+        ttl_seconds: Optional[float] = None,
+        grid_resolution: Optional[float] = None
+    ):
+        """
+        Initialize weather service
+
+        Args:
+            provider: Forecast source; defaults to WEATHER_PROVIDER from the environment
+            ttl_seconds: Forecast cache lifetime (WEATHER_CACHE_TTL, default 1 hour)
+            grid_resolution: Cell size in degrees (WEATHER_GRID_RESOLUTION, default 0.25)
+        """
+        self.provider = provider or self._provider_from_env()
+        self.grid_resolution = grid_resolution or float(os.getenv("WEATHER_GRID_RESOLUTION", "0.25"))
+        self.cache = ForecastCache(ttl_seconds or float(os.getenv("WEATHER_CACHE_TTL", "3600")))
+        self.upstream_calls = 0
+        logger.info("Weather service initialized with %s provider", self.provider.name)
+
+    def get_forecast(self, latitude: float, longitude: float, days: int = MAX_FORECAST_DAYS) -> List[Dict]:
+        """
+        Get a daily forecast for a location
+
+        All requests inside one grid cell share a single cached provider call
+        for the cell centre, so upstream calls per TTL are bounded by the
+        number of distinct cells requested. Entries are keyed by the
+        forecast's start date, so a forecast fetched before midnight is not
+        served as today's after it.
+
+        Args:
+            latitude: Latitude in decimal degrees
+            longitude: Longitude in decimal degrees
+            days: Number of days to return (at most MAX_FORECAST_DAYS)
+
+        Returns:
+            List of daily forecast dictionaries
+        """
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Latitude must be within ±90 and longitude within ±180")
+        days = max(1, min(days, MAX_FORECAST_DAYS))
+
+        cell = self.grid_cell(latitude, longitude)
+        center_lat, center_lon = self.cell_center(cell)
+
+        def fetch():
+            self.upstream_calls += 1
+            return self.provider.get_forecast(center_lat, center_lon, MAX_FORECAST_DAYS)
+
+        forecast = self.cache.get_or_fetch((cell, date.today()), fetch)
+        return forecast[:days]
+
+    def grid_cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """Map a location to its grid cell index"""
+        return (
+            math.floor(latitude / self.grid_resolution),
+            math.floor(longitude / self.grid_resolution)
+        )
+
+    def cell_center(self, cell: Tuple[int, int]) -> Tuple[float, float]:
+        """Get the centre coordinates of a grid cell"""
+        return (
+            round((cell[0] + 0.5) * self.grid_resolution, 6),
+            round((cell[1] + 0.5) * self.grid_resolution, 6)
+        )
+
+    def get_cache_stats(self) -> Dict:
+        """Get forecast cache counters"""
+        return {
+            "provider": self.provider.name,
+            "upstream_calls": self.upstream_calls,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "grid_resolution": self.grid_resolution
+        }
+
+    @staticmethod
+    def _provider_from_env() -> WeatherProvider:
+        """Build the provider selected by WEATHER_PROVIDER"""
+        provider_name = os.getenv("WEATHER_PROVIDER", "file")
+        if provider_name == "file":
+            return FileWeatherProvider(os.getenv("WEATHER_FIXTURE_PATH", "data/weather_forecast.json"))
+        raise ValueError(f"Unknown weather provider: {provider_name}")
@@ -0,0 +1,105 @@
+# app/utils/compression.py
+"""
+Compression Utilities
+Accept-Encoding negotiation and gzip/brotli encoders shared by responses and static assets
+"""
+
+import gzip
+import logging
+import zlib
+from typing import Optional, Sequence
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip is used when brotli is not installed
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Encodings we can produce, most preferred first
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# File extensions for precompressed variants
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Content types worth compressing (images, archives and model files already are)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/x-ndjson",
+    "application/xml",
+    "application/msgpack",
+    "image/svg+xml",
+)
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this content type benefits from compression"""
+    content_type = content_type.lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+
+def choose_encoding(accept_encoding: str, available: Sequence[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    """
+    Pick the response encoding for an Accept-Encoding header
+
+    Args:
+        accept_encoding: Request header value, e.g. "gzip, deflate, br;q=0.9"
+        available: Encodings that can be served, most preferred first
+
+    Returns:
+        The encoding with the highest q-value (ties go to the earlier entry
+        in available), or None to send the body unencoded
+    """
+    if not accept_encoding:
+        return None
+
+    weights = {}
+    for part in accept_encoding.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class StreamCompressor:
+    """Incremental encoder; each compress() call returns bytes the client can decode immediately"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        else:
+            # wbits=31 writes a gzip header and trailer
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def compress_bytes(data: bytes, encoding: str, level: int) -> bytes:
+    """Encode a complete body in one pass"""
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
\ No newline at end of file
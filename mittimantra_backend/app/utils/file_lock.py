@@ -0,0 +1,44 @@
+# app/utils/file_lock.py
+"""
+File Lock Utilities
+Non-blocking exclusive locks on a file, shared by processes and threads working on the same directory
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def exclusive_file_lock(path: str):
+    """
+    Try to take an exclusive lock on path (created if missing) without waiting
+
+    Yields True while the lock is held, or False if another process or
+    thread holds it. Locks belong to the open file, so two threads of one
+    process exclude each other too; the lock is released if the holder dies.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+b") as f:
+        try:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
\ No newline at end of file
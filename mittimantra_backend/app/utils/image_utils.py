@@ -7,45 +7,269 @@ from PIL import Image
 import numpy as np
 import io
 import logging
+import os
+from typing import List, NamedTuple, Optional, Tuple
+
+from app.utils.metrics import stage
 
 logger = logging.getLogger(__name__)
 
+# Crop uploads to the detected leaf before resizing to the model input
+LEAF_CROP = os.getenv("LEAF_CROP", "true").lower() == "true"
+# Extra tiles of a large leaf classified alongside the crop in the same batch (0 disables tiling)
+LEAF_MAX_TILES = int(os.getenv("LEAF_MAX_TILES", "0"))
+
+# Longest side of the downsampled copy the leaf is located on
+_LOCATE_SIZE = 128
+# Excess green (2G - R - B, 0-255 scale) above which a pixel counts as leaf
+_EXCESS_GREEN_THRESHOLD = 20
+# Leaf pixels needed (fraction of the frame) before cropping is attempted
+_MIN_LEAF_FRACTION = 0.005
+# Margin added around the leaf, as a fraction of its size
+_LEAF_MARGIN = 0.1
+# Minimum leaf fraction of a tile worth classifying
+_MIN_TILE_LEAF_FRACTION = 0.3
+
+Box = Tuple[int, int, int, int]
+
+
+class DecodedImage(NamedTuple):
+    """An upload decoded to RGB, with the small copy used for leaf location and hashing"""
+    image: Image.Image
+    thumbnail: Image.Image
+    step: int
+
 
-def preprocess_image(image_bytes: bytes, target_size: tuple) -> np.ndarray:
+def _decode(image_bytes: bytes) -> Image.Image:
+    with stage("image_decode"):
+        # Open image from bytes
+        image = Image.open(io.BytesIO(image_bytes))
+        
+        # Convert to RGB if needed
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+    return image
+
+
+def _to_array(image: Image.Image, target_size: tuple) -> np.ndarray:
+    # Resize to target size and normalize pixel values to [0, 1]
+    image = image.resize(target_size, Image.Resampling.LANCZOS)
+    return np.asarray(image, dtype=np.float32) / 255.0
+
+
+def _thumbnail(image: Image.Image) -> Tuple[Image.Image, int]:
+    """Copy with the longest side near _LOCATE_SIZE, and the downsampling factor"""
+    step = max(1, -(-max(image.size) // _LOCATE_SIZE))
+    # Box-filtered reduction averages out sensor and JPEG noise
+    return (image.reduce(step) if step > 1 else image), step
+
+
+def _leaf_mask(thumbnail: Image.Image) -> np.ndarray:
+    """Excess-green segmentation of the thumbnail"""
+    pixels = np.asarray(thumbnail, dtype=np.int16)
+    red, green, blue = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    return (2 * green - red - blue) > _EXCESS_GREEN_THRESHOLD
+
+
+def _leaf_box(mask: np.ndarray, step: int, width: int, height: int) -> Optional[Box]:
+    """Square-ish box around the leaf pixels in full-size coordinates, or None to keep the frame"""
+    rows, cols = np.nonzero(mask)
+    if rows.size < _MIN_LEAF_FRACTION * mask.size:
+        return None
+    # Percentiles rather than min/max so stray green pixels do not stretch the box
+    top, bottom = np.percentile(rows, [1, 99]) * step
+    left, right = np.percentile(cols, [1, 99]) * step
+    bottom += step
+    right += step
+    
+    # Add a margin, then grow the short side so the leaf is not squashed by the resize
+    side = max(bottom - top, right - left) * (1 + 2 * _LEAF_MARGIN)
+    side_y, side_x = min(side, height), min(side, width)
+    center_y, center_x = (top + bottom) / 2, (left + right) / 2
+    top = int(np.clip(center_y - side_y / 2, 0, height - side_y))
+    left = int(np.clip(center_x - side_x / 2, 0, width - side_x))
+    box = (left, top, min(width, left + int(round(side_x))), min(height, top + int(round(side_y))))
+    if (box[2] - box[0]) * (box[3] - box[1]) >= 0.9 * width * height:
+        return None
+    return box
+
+
+def _leaf_tiles(mask: np.ndarray, step: int, box: Box, target_size: tuple, max_tiles: int) -> List[Box]:
+    """
+    Tiles of a leaf region with at least twice the model's resolution, most leaf first
+    
+    Each tile is about the model input size, so fine lesions that the
+    whole-leaf resize would blur out are seen at (near) full resolution.
+    """
+    left, top, right, bottom = box
+    grid_rows = min((bottom - top) // target_size[0], 3)
+    grid_cols = min((right - left) // target_size[1], 3)
+    if max_tiles <= 0 or grid_rows < 2 or grid_cols < 2:
+        return []
+    
+    tiles = []
+    tile_height, tile_width = (bottom - top) / grid_rows, (right - left) / grid_cols
+    for row in range(grid_rows):
+        for col in range(grid_cols):
+            tile = (
+                int(left + col * tile_width), int(top + row * tile_height),
+                int(left + (col + 1) * tile_width), int(top + (row + 1) * tile_height)
+            )
+            region = mask[tile[1] // step:max(tile[1] // step + 1, tile[3] // step),
+                          tile[0] // step:max(tile[0] // step + 1, tile[2] // step)]
+            leaf_fraction = float(region.mean()) if region.size else 0.0
+            if leaf_fraction >= _MIN_TILE_LEAF_FRACTION:
+                tiles.append((leaf_fraction, tile))
+    tiles.sort(key=lambda item: -item[0])
+    return [tile for _, tile in tiles[:max_tiles]]
+
+
+def locate_leaf(image: Image.Image) -> Optional[Box]:
+    """
+    Find the leaf in a photo by green-channel segmentation
+    
+    Args:
+        image: RGB image
+        
+    Returns:
+        (left, top, right, bottom) crop box around the leaf, or None when no
+        leaf is found or it already fills most of the frame
+    """
+    thumbnail, step = _thumbnail(image)
+    return _leaf_box(_leaf_mask(thumbnail), step, image.width, image.height)
+
+
+def preprocess_image(image_bytes: bytes, target_size: tuple, crop_to_leaf: bool = LEAF_CROP) -> np.ndarray:
     """
     Preprocess image for model prediction
     
     Args:
         image_bytes: Raw image bytes
         target_size: Target size as (height, width)
+        crop_to_leaf: Crop to the detected leaf before resizing
         
     Returns:
         Preprocessed image as numpy array
     """
-    try:
-        # Open image from bytes
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # Convert to RGB if needed
-        if image.mode != 'RGB':
-            image = image.convert('RGB')
-        
-        # Resize to target size
-        image = image.resize(target_size, Image.Resampling.LANCZOS)
-        
-        # Convert to numpy array
-        image_array = np.array(image)
+    return preprocess_leaf_crops(image_bytes, target_size, max_tiles=0, crop_to_leaf=crop_to_leaf)[0]
+
+
+def preprocess_leaf_crops(
+    image_bytes: bytes,
+    target_size: tuple,
+    max_tiles: int = LEAF_MAX_TILES,
+    crop_to_leaf: bool = LEAF_CROP
+) -> np.ndarray:
+    """
+    Preprocess an image into the leaf crop plus optional close-up tiles
+    
+    Args:
+        image_bytes: Raw image bytes
+        target_size: Target size as (height, width)
+        max_tiles: Most tiles of a large leaf to add (0 for the crop only)
+        crop_to_leaf: Crop to the detected leaf before resizing
         
-        # Normalize pixel values to [0, 1]
-        image_array = image_array.astype('float32') / 255.0
+    Returns:
+        Array of shape (1 + tiles, height, width, channels); the first entry
+        is the whole leaf (or the whole frame if no leaf was found)
+    """
+    return leaf_crops(decode_image(image_bytes), target_size, max_tiles, crop_to_leaf)
+
+
+def decode_image(image_bytes: bytes) -> DecodedImage:
+    """
+    Decode an upload and build its thumbnail
+    
+    Raises:
+        ValueError: If the bytes are not a readable image
+    """
+    try:
+        image = _decode(image_bytes)
+        with stage("image_decode"):
+            thumbnail, step = _thumbnail(image)
+        return DecodedImage(image, thumbnail, step)
+    except Exception as e:
+        logger.error("Image preprocessing error: %s", e)
+        raise ValueError(f"Failed to preprocess image: {str(e)}")
+
+
+def leaf_crops(
+    decoded: DecodedImage,
+    target_size: tuple,
+    max_tiles: int = LEAF_MAX_TILES,
+    crop_to_leaf: bool = LEAF_CROP
+) -> np.ndarray:
+    """Model inputs for a decoded upload (see preprocess_leaf_crops)"""
+    image, step = decoded.image, decoded.step
+    try:
+        crops = [image]
+        if crop_to_leaf or max_tiles > 0:
+            with stage("leaf_localize"):
+                mask = _leaf_mask(decoded.thumbnail)
+                box = _leaf_box(mask, step, image.width, image.height)
+                tiles = _leaf_tiles(mask, step, box or (0, 0, image.width, image.height), target_size, max_tiles)
+            if crop_to_leaf and box is not None:
+                crops = [image.crop(box)]
+            crops.extend(image.crop(tile) for tile in tiles)
         
-        return image_array
+        with stage("image_resize"):
+            return np.stack([_to_array(crop, target_size) for crop in crops])
         
     except Exception as e:
-        logger.error(f"Image preprocessing error: {str(e)}")
+        logger.error("Image preprocessing error: %s", e)
         raise ValueError(f"Failed to preprocess image: {str(e)}")
 
 
+def _crop_resize(image: np.ndarray, scale: float, shift_y: float = 0.0, shift_x: float = 0.0) -> np.ndarray:
+    """
+    Nearest-neighbour view of a window scale times the image size, resized back to the image size
+    
+    scale < 1 zooms in (crops), scale > 1 zooms out (edges are repeated);
+    shifts move the window centre by a fraction of the image size.
+    """
+    height, width = image.shape[:2]
+    rows = (np.arange(height) + 0.5) * scale + (height * (1 - scale) / 2 + shift_y * height)
+    cols = (np.arange(width) + 0.5) * scale + (width * (1 - scale) / 2 + shift_x * width)
+    rows = np.clip(rows.astype(np.int64), 0, height - 1)
+    cols = np.clip(cols.astype(np.int64), 0, width - 1)
+    return image[rows[:, None], cols[None, :]]
+
+
+# Test-time augmentation views, cheapest first: (horizontal flip, scale, shift_y, shift_x)
+_TTA_VIEWS = (
+    (False, 1.0, 0.0, 0.0),
+    (True, 1.0, 0.0, 0.0),
+    (False, 0.85, 0.0, 0.0),
+    (True, 0.85, 0.0, 0.0),
+    (False, 0.85, -0.07, -0.07),
+    (False, 0.85, 0.07, 0.07),
+    (False, 1.1, 0.0, 0.0),
+    (True, 1.1, 0.0, 0.0),
+)
+
+MAX_TTA_VIEWS = len(_TTA_VIEWS)
+
+
+def augment_views(image: np.ndarray, count: int) -> np.ndarray:
+    """
+    Build test-time augmentation views of a preprocessed image
+    
+    Args:
+        image: Preprocessed image array (height, width, channels)
+        count: Number of views (1 to MAX_TTA_VIEWS); the first is the image itself
+        
+    Returns:
+        Array of shape (count, height, width, channels) for one batched forward pass
+    """
+    views = []
+    for flip, scale, shift_y, shift_x in _TTA_VIEWS[:max(1, min(count, MAX_TTA_VIEWS))]:
+        view = image[:, ::-1] if flip else image
+        if scale != 1.0 or shift_y or shift_x:
+            view = _crop_resize(view, scale, shift_y, shift_x)
+        views.append(view)
+    return np.stack(views)
+
+
 def validate_image(image_bytes: bytes) -> bool:
     """
     Validate if the uploaded file is a valid image
@@ -84,5 +308,5 @@ def get_image_info(image_bytes: bytes) -> dict:
             "height": image.height
         }
     except Exception as e:
-        logger.error(f"Failed to get image info: {str(e)}")
+        logger.error("Failed to get image info: %s", e)
         return {}
\ No newline at end of file
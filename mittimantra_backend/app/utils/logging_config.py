@@ -0,0 +1,174 @@
+# app/utils/logging_config.py
+"""
+Logging Configuration
+Structured JSON logs written off the request path, with per-route sampling
+and request-ID correlation
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Correlation context for the current request (propagates into threadpool calls)
+request_id_var: contextvars.ContextVar = contextvars.ContextVar("mittimantra_request_id", default=None)
+request_path_var: contextvars.ContextVar = contextvars.ContextVar("mittimantra_request_path", default=None)
+log_sampled_var: contextvars.ContextVar = contextvars.ContextVar("mittimantra_log_sampled", default=True)
+
+# Records buffered for the writer thread before new ones are dropped
+LOG_QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RESERVED_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_request_id() -> Optional[str]:
+    """Get the ID of the request being handled, if any"""
+    return request_id_var.get()
+
+
+class ContextFilter(logging.Filter):
+    """Attach the request ID and path, and drop low-level records of unsampled requests"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.request_path = request_path_var.get()
+        return record.levelno >= logging.WARNING or log_sampled_var.get()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; fields passed via extra= are included"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRIBUTES and not key.startswith("_") and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never blocks or formats on the calling thread
+
+    The stock QueueHandler renders the message before enqueueing; here the
+    record is enqueued as-is and formatted by the listener thread. Records
+    are dropped (and counted) when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class RequestSampler:
+    """Per-route sampling rates for INFO/DEBUG logs, matched by longest path prefix"""
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: float = 1.0):
+        self.rates = sorted((rates or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_rate = default_rate
+
+    def rate_for(self, path: str) -> float:
+        for prefix, rate in self.rates:
+            if path.startswith(prefix):
+                return rate
+        return self.default_rate
+
+    def should_log(self, path: str) -> bool:
+        """Decide once per request whether its INFO/DEBUG records are kept"""
+        rate = self.rate_for(path)
+        return rate >= 1.0 or random.random() < rate
+
+    @staticmethod
+    def parse_rates(value: str) -> Dict[str, float]:
+        """Parse "/predict-disease=0.1,/predict-crop=0.25" into a rate mapping"""
+        rates = {}
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            prefix, _, rate = item.partition("=")
+            rates[prefix.strip()] = max(0.0, min(1.0, float(rate)))
+        return rates
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    log_format: Optional[str] = None,
+    stream=None
+) -> NonBlockingQueueHandler:
+    """
+    Route all logging through a queue drained by a background writer thread
+
+    Args:
+        level: Root log level (LOG_LEVEL, default INFO)
+        log_format: "json" or "text" (LOG_FORMAT, default json)
+        stream: Output stream for the writer (default stderr)
+
+    Returns:
+        The queue handler installed on the root logger
+    """
+    global _listener
+    shutdown_logging()
+
+    level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "json")).lower()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return queue_handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def sampler_from_env() -> RequestSampler:
+    """Build the request sampler configured by LOG_SAMPLE_RATES and LOG_SAMPLE_DEFAULT"""
+    return RequestSampler(
+        RequestSampler.parse_rates(os.getenv("LOG_SAMPLE_RATES", "")),
+        float(os.getenv("LOG_SAMPLE_DEFAULT", "1.0"))
+    )
\ No newline at end of file
@@ -0,0 +1,124 @@
+# app/utils/page_cache.py
+"""
+Page Cache Utilities
+Compiled-template bytecode caching and rendered HTML caching for the Jinja pages
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+# Compiled template bytecode directory (default: a per-user directory under the system temp dir)
+TEMPLATE_CACHE_DIR = os.getenv("TEMPLATE_CACHE_DIR") or None
+# Re-check template files for changes on each render; disable in production
+TEMPLATE_AUTO_RELOAD = os.getenv("TEMPLATE_AUTO_RELOAD", "true").lower() == "true"
+
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "300"))
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "1024"))
+
+
+def configure_templates(templates, cache_dir: Optional[str] = TEMPLATE_CACHE_DIR, auto_reload: bool = TEMPLATE_AUTO_RELOAD):
+    """
+    Enable bytecode caching on a Jinja2Templates environment
+
+    Compiled templates are written to cache_dir, so new worker processes
+    and restarts load them instead of re-parsing and compiling the source.
+    """
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    templates.env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    templates.env.auto_reload = auto_reload
+    return templates
+
+
+class RenderCache:
+    """
+    Thread-safe LRU cache of rendered pages with a TTL
+
+    Entries are keyed by tuples whose first items are ("anonymous",
+    template) or ("user", username); invalidate_user drops every page
+    rendered for one user. Each process keeps its own cache, so with
+    several workers the TTL bounds how long another worker can serve a
+    page rendered before an invalidation.
+    """
+
+    def __init__(self, ttl_seconds: float = PAGE_CACHE_TTL, max_entries: int = PAGE_CACHE_MAX_ENTRIES):
+        """Initialize an empty cache"""
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Return the cached page for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Tuple, html: str) -> None:
+        """Store a rendered page, evicting the least recently used beyond max_entries"""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_render(self, key: Tuple, render: Callable[[], str]) -> str:
+        """Return the cached page for key, rendering and storing it on a miss"""
+        html = self.get(key)
+        if html is None:
+            html = render()
+            self.set(key, html)
+        return html
+
+    def invalidate_user(self, username: str) -> None:
+        """Drop every page rendered for a user (after a profile change)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] == ("user", username)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def anonymous_page_key(template: str) -> Tuple[Hashable, ...]:
+    """
+    Cache key for a page whose output depends only on the template
+
+    The query string is deliberately not part of the key: the anonymous
+    pages read their parameters (e.g. login.html's error) client-side, and
+    keying on them would let arbitrary query strings fill the cache and
+    evict the users' dashboards.
+    """
+    return ("anonymous", template)
+
+
+def user_page_key(username: str, template: str) -> Tuple[Hashable, ...]:
+    """Cache key for a page rendered for one user"""
+    return ("user", username, template)
+
+
+page_cache = RenderCache()
\ No newline at end of file
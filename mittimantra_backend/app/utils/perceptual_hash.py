@@ -0,0 +1,154 @@
+# app/utils/perceptual_hash.py
+"""
+Perceptual Hashing Utilities
+DCT image fingerprints and a multi-index hash table for near-duplicate lookups
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+
+# pHash: DCT of a 32x32 grayscale copy, keeping the 8x8 lowest frequencies
+_SAMPLE_SIZE = 32
+_KEEP = 8
+
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so the 2-D transform is two small matrix products"""
+    k = np.arange(size)[:, None]
+    n = np.arange(size)[None, :]
+    matrix = np.cos(np.pi * (2 * n + 1) * k / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+_DCT = _dct_matrix(_SAMPLE_SIZE)[:_KEEP]
+
+
+def phash(image: Image.Image) -> int:
+    """
+    64-bit perceptual hash of an image
+
+    Robust to rescaling, recompression and small shifts, so the same photo
+    sent twice (or re-encoded by a messaging app) lands a few bits apart.
+    Pass the already-downsampled thumbnail; hashing the full image gives
+    the same result at a higher cost.
+    """
+    gray = image.convert("L").resize((_SAMPLE_SIZE, _SAMPLE_SIZE), Image.Resampling.BOX)
+    coefficients = (_DCT @ np.asarray(gray, dtype=np.float32) @ _DCT.T).ravel()
+    # The DC term only encodes overall brightness; leave it out of the median
+    bits = coefficients > np.median(coefficients[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class NearDuplicateIndex:
+    """
+    LRU-bounded map from perceptual hashes to values, looked up by Hamming distance
+
+    Uses multi-index hashing: each hash is split into max_distance + 1
+    chunks, and every chunk indexes its own table. Two hashes at most
+    max_distance bits apart must agree exactly on at least one chunk, so a
+    lookup only compares against entries sharing a chunk rather than
+    scanning them all. Unlike a BK-tree, entries can be evicted cheaply.
+    """
+
+    def __init__(self, max_distance: int = 6, max_entries: int = 4096):
+        """
+        Initialize an empty index
+
+        Args:
+            max_distance: Largest Hamming distance counted as a duplicate
+            max_entries: Entries kept before the least recently used are evicted
+        """
+        self.max_distance = max(0, max_distance)
+        self.max_entries = max_entries
+        chunks = min(self.max_distance + 1, HASH_BITS)
+        bounds = np.linspace(0, HASH_BITS, chunks + 1).astype(int)
+        self._chunks = [(int(start), int(end - start)) for start, end in zip(bounds[:-1], bounds[1:])]
+        self._tables: List[Dict[int, Set[int]]] = [{} for _ in self._chunks]
+        self._entries: "OrderedDict[int, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _keys(self, value: int):
+        for table, (shift, width) in zip(self._tables, self._chunks):
+            yield table, (value >> shift) & ((1 << width) - 1)
+
+    def get(self, value: int) -> Optional[Tuple[int, Any]]:
+        """
+        Nearest stored entry within max_distance
+
+        Returns:
+            (distance, stored value), or None if there is no near duplicate
+        """
+        with self._lock:
+            best = None
+            if value in self._entries:
+                best = (0, value)
+            else:
+                candidates = set()
+                for table, key in self._keys(value):
+                    candidates.update(table.get(key, ()))
+                for candidate in candidates:
+                    distance = hamming_distance(value, candidate)
+                    if distance <= self.max_distance and (best is None or distance < best[0]):
+                        best = (distance, candidate)
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best[1])
+            return best[0], self._entries[best[1]]
+
+    def set(self, value: int, stored: Any) -> None:
+        """Store a value under a hash, evicting the least recently used beyond max_entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if value not in self._entries:
+                for table, key in self._keys(value):
+                    table.setdefault(key, set()).add(value)
+            self._entries[value] = stored
+            self._entries.move_to_end(value)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._remove(evicted)
+
+    def _remove(self, value: int) -> None:
+        for table, key in self._keys(value):
+            bucket = table.get(key)
+            if bucket is not None:
+                bucket.discard(value)
+                if not bucket:
+                    del table[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            for table in self._tables:
+                table.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
\ No newline at end of file
@@ -0,0 +1,260 @@
+# app/utils/profiling.py
+"""
+Profiling Utilities
+On-demand sampling profiler, tracemalloc snapshots and slow-request captures
+"""
+
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Longest profiling session and fastest sampling interval accepted
+MAX_PROFILE_SECONDS = 120
+MIN_INTERVAL_MS = 1
+
+
+def _frame_label(frame) -> str:
+    """Collapsed-stack label for one frame: module:function:line"""
+    code = frame.f_code
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}:{code.co_firstlineno}"
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over all Python threads
+
+    A background thread snapshots every thread's stack with
+    sys._current_frames() at a fixed interval, so the profiled code runs
+    uninstrumented. Results are folded into flamegraph.pl / speedscope
+    compatible collapsed stacks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at: Optional[datetime] = None
+        self.seconds = 0.0
+        self.interval_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds: float, interval_ms: float = 10.0) -> None:
+        """
+        Sample all threads for the given duration
+
+        Args:
+            seconds: Profiling duration (at most MAX_PROFILE_SECONDS)
+            interval_ms: Time between samples
+
+        Raises:
+            ValueError: If a session is already running or the arguments are out of range
+        """
+        if not 0 < seconds <= MAX_PROFILE_SECONDS:
+            raise ValueError(f"seconds must be between 0 and {MAX_PROFILE_SECONDS}")
+        if interval_ms < MIN_INTERVAL_MS:
+            raise ValueError(f"interval_ms must be at least {MIN_INTERVAL_MS}")
+
+        with self._lock:
+            if self.running:
+                raise ValueError("A profiling session is already running")
+            self._stacks = Counter()
+            self.samples = 0
+            self.started_at = datetime.now(timezone.utc)
+            self.seconds = seconds
+            self.interval_ms = interval_ms
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+            self._thread.start()
+        logger.info("Sampling profiler started for %ss at %sms intervals", seconds, interval_ms)
+
+    def stop(self) -> None:
+        """Stop the running session early"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        interval = self.interval_ms / 1000
+        deadline = time.monotonic() + self.seconds
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(thread_id, f"thread-{thread_id}"))
+                self._stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+            self._stop.wait(interval)
+        logger.info("Sampling profiler finished with %s samples", self.samples)
+
+    def collapsed(self) -> str:
+        """Folded stacks ("frame;frame;frame count" per line), heaviest first"""
+        stacks = list(self._stacks.items())
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(stacks, key=lambda item: -item[1]))
+
+    def status(self) -> Dict:
+        return {
+            "running": self.running,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "seconds": self.seconds,
+            "interval_ms": self.interval_ms,
+            "samples": self.samples,
+            "distinct_stacks": len(self._stacks),
+        }
+
+
+def start_tracemalloc(frames: int = 10) -> bool:
+    """Start tracing allocations; returns False if already tracing"""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(frames)
+    return True
+
+
+def stop_tracemalloc() -> None:
+    """Stop tracing allocations and free the trace data"""
+    tracemalloc.stop()
+
+
+def top_allocations(limit: int = 20, group_by: str = "lineno") -> Dict:
+    """
+    Summarize live allocations traced since tracemalloc was started
+
+    Args:
+        limit: Number of entries to return
+        group_by: "lineno", "filename" or "traceback"
+
+    Returns:
+        Dictionary with traced totals and the largest allocation sites
+
+    Raises:
+        ValueError: If tracemalloc is not running or group_by is invalid
+    """
+    if not tracemalloc.is_tracing():
+        raise ValueError("tracemalloc is not running")
+    if group_by not in ("lineno", "filename", "traceback"):
+        raise ValueError("group_by must be lineno, filename or traceback")
+
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    entries = []
+    for stat in snapshot.statistics(group_by)[:limit]:
+        entries.append({
+            "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        })
+    return {
+        "traced_kb": round(current / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "group_by": group_by,
+        "top": entries,
+    }
+
+
+class RequestStages:
+    """Per-request stage timings, with the call stack of the slowest stage"""
+
+    __slots__ = ("stages", "slowest", "slowest_stack", "capture_min")
+
+    # Stack depth kept for the slowest stage
+    STACK_LIMIT = 15
+
+    def __init__(self, capture_min: float):
+        """
+        Args:
+            capture_min: Stages shorter than this (seconds) never capture a stack
+        """
+        self.stages: List = []
+        self.slowest = 0.0
+        self.slowest_stack: Optional[List[str]] = None
+        self.capture_min = capture_min
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Record a finished stage (called from inside the stage's frame)"""
+        self.stages.append((name, elapsed))
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            if elapsed >= self.capture_min:
+                # Skip the recorder and the contextmanager frames
+                frames = traceback.extract_stack(sys._getframe(3), limit=self.STACK_LIMIT)
+                self.slowest_stack = [f"{frame.filename}:{frame.lineno} in {frame.name}" for frame in frames]
+
+
+request_stages_var: contextvars.ContextVar = contextvars.ContextVar("mittimantra_request_stages", default=None)
+
+
+class SlowRequestLog:
+    """Bounded log of requests slower than a latency threshold"""
+
+    def __init__(self, threshold_ms: float, max_entries: int = 50):
+        self.threshold_ms = threshold_ms
+        self._entries: deque = deque(maxlen=max_entries)
+
+    def begin(self) -> RequestStages:
+        """Start collecting stage timings for the current request"""
+        # Only stages that are a meaningful share of the threshold are worth a stack
+        return RequestStages(self.threshold_ms / 1000 / 10)
+
+    def finish(self, stages: RequestStages, elapsed: float, **details) -> Optional[Dict]:
+        """Keep a capture if the request exceeded the threshold"""
+        duration_ms = elapsed * 1000
+        if duration_ms < self.threshold_ms:
+            return None
+        slowest = max(stages.stages, key=lambda stage: stage[1]) if stages.stages else None
+        capture = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "duration_ms": round(duration_ms, 2),
+            **details,
+            "stages": [{"name": name, "duration_ms": round(value * 1000, 2)} for name, value in stages.stages],
+            "slowest_stage": {
+                "name": slowest[0],
+                "duration_ms": round(slowest[1] * 1000, 2),
+                "stack": stages.slowest_stack,
+            } if slowest else None,
+        }
+        self._entries.append(capture)
+        logger.warning(
+            "Slow request %s %s took %.1f ms", details.get("method"), details.get("route"), duration_ms,
+            extra={"duration_ms": round(duration_ms, 2), "slowest_stage": slowest[0] if slowest else None}
+        )
+        return capture
+
+    def entries(self, limit: int = 20) -> List[Dict]:
+        """Most recent captures first"""
+        return list(reversed(self._entries))[:limit]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Process-wide profiling state
+profiler = SamplingProfiler()
+slow_requests = SlowRequestLog(float(os.getenv("SLOW_REQUEST_MS", "1000")))
\ No newline at end of file
@@ -0,0 +1,247 @@
+# app/utils/rate_limit.py
+"""
+Rate Limiting Utilities
+Cost-weighted token buckets with in-memory and shared SQLite backends
+"""
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Decision(NamedTuple):
+    """Outcome of a token bucket check"""
+    allowed: bool
+    remaining: float
+    retry_after: float
+
+
+def _refill(tokens: float, updated: float, now: float, capacity: float, refill_rate: float) -> float:
+    """Tokens in a bucket after refilling since its last update"""
+    return min(capacity, tokens + max(0.0, now - updated) * refill_rate)
+
+
+def _decide(tokens: float, cost: float, capacity: float, refill_rate: float) -> Decision:
+    """Decide whether cost can be paid from tokens (a negative cost refunds, up to capacity)"""
+    if tokens >= cost:
+        return Decision(True, min(capacity, tokens - cost), 0.0)
+    wait = (cost - tokens) / refill_rate if refill_rate > 0 else math.inf
+    return Decision(False, tokens, wait)
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets"""
+
+    name = "base"
+
+    # Whether consume() may wait on I/O or locks (callers on an event loop should use a thread)
+    blocking = False
+
+    @abstractmethod
+    def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> Decision:
+        """
+        Atomically take cost tokens from the bucket for key if available
+
+        Args:
+            key: Bucket identifier
+            cost: Tokens this request needs (negative to refund, never above capacity)
+            capacity: Bucket size (maximum burst)
+            refill_rate: Tokens added per second
+
+        Returns:
+            Decision with the tokens left and, if refused, seconds until it would pass
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process buckets (one worker, or limits that are per worker)"""
+
+    name = "memory"
+
+    # Idle buckets are dropped once this many keys are tracked
+    MAX_KEYS = 100000
+
+    def __init__(self):
+        self._buckets: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> Decision:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            decision = _decide(_refill(tokens, updated, now, capacity, refill_rate), cost, capacity, refill_rate)
+            self._buckets[key] = (decision.remaining, now)
+            if len(self._buckets) > self.MAX_KEYS:
+                self._prune(now, capacity, refill_rate)
+        return decision
+
+    def _prune(self, now: float, capacity: float, refill_rate: float):
+        """Drop buckets that have refilled completely (equivalent to a new bucket)"""
+        full_after = capacity / refill_rate if refill_rate > 0 else math.inf
+        for key in [key for key, (_, updated) in self._buckets.items() if now - updated >= full_after]:
+            del self._buckets[key]
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """Buckets in a SQLite file shared by all worker processes on the host"""
+
+    name = "sqlite"
+
+    # BEGIN IMMEDIATE waits up to the connection timeout while another process holds the write lock
+    blocking = True
+
+    def __init__(self, path: str = "rate_limits.db"):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def consume(self, key: str, cost: float, capacity: float, refill_rate: float) -> Decision:
+        # Wall clock, since buckets are shared across processes
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated FROM token_buckets WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            decision = _decide(_refill(tokens, updated, now, capacity, refill_rate), cost, capacity, refill_rate)
+            conn.execute(
+                "INSERT INTO token_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, decision.remaining, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return decision
+
+
+class RateLimiter:
+    """
+    Cost-aware admission control
+
+    Each request pays a path-dependent cost from its client's bucket (and
+    from an optional global bucket shared by all clients), so one disease
+    upload uses the budget of many irrigation requests.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        capacity: float,
+        refill_rate: float,
+        costs: Dict[str, float],
+        default_cost: float = 0.0,
+        global_capacity: float = 0.0,
+        global_refill_rate: float = 0.0
+    ):
+        """
+        Initialize rate limiter
+
+        Args:
+            backend: Bucket storage
+            capacity: Per-client burst size in cost units
+            refill_rate: Per-client cost units restored per second
+            costs: Path prefix -> cost (longest prefix wins)
+            default_cost: Cost of paths not listed (0 means unlimited)
+            global_capacity: Burst size of the bucket shared by all clients (0 disables it)
+            global_refill_rate: Cost units restored per second to the shared bucket
+        """
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.costs = sorted(costs.items(), key=lambda item: len(item[0]), reverse=True)
+        self.default_cost = default_cost
+        self.global_capacity = global_capacity
+        self.global_refill_rate = global_refill_rate
+
+    def cost_for(self, path: str) -> float:
+        """Get the cost of a request path"""
+        for prefix, cost in self.costs:
+            if path.startswith(prefix):
+                return cost
+        return self.default_cost
+
+    def check(self, client_key: str, path: str) -> Optional[Decision]:
+        """
+        Admit or refuse a request
+
+        Returns:
+            None for free paths, otherwise the Decision (refused if either the
+            client's or the global bucket is short)
+        """
+        cost = self.cost_for(path)
+        if cost <= 0:
+            return None
+        if cost > self.capacity:
+            cost = self.capacity
+
+        decision = self.backend.consume(f"client:{client_key}", cost, self.capacity, self.refill_rate)
+        if not decision.allowed or self.global_capacity <= 0:
+            return decision
+
+        shared = self.backend.consume(
+            "global", min(cost, self.global_capacity), self.global_capacity, self.global_refill_rate
+        )
+        if not shared.allowed:
+            # Refund the client; the request was refused for global load, not its own rate
+            self.backend.consume(f"client:{client_key}", -cost, self.capacity, self.refill_rate)
+            return Decision(False, decision.remaining + cost, shared.retry_after)
+        return decision
+
+    @staticmethod
+    def parse_costs(value: str) -> Dict[str, float]:
+        """Parse "/predict-disease=20,/irrigation-schedule=1" into a cost mapping"""
+        costs = {}
+        for item in filter(None, (part.strip() for part in value.split(","))):
+            prefix, _, cost = item.partition("=")
+            costs[prefix.strip()] = float(cost)
+        return costs
+
+
+DEFAULT_COSTS = "/jobs/disease=100,/jobs/crop=50,/predict-disease/batch=100,/predict-crop/batch=50,/predict-disease=20,/pest-control=20,/predict-crop=2,/irrigation-forecast=2,/irrigation-plan=5,/irrigation-schedule=1,/api/auth/login=5,/api/auth/register=5"
+
+
+def rate_limiter_from_env() -> Optional[RateLimiter]:
+    """Build the limiter configured by the RATE_LIMIT_* variables (None when disabled)"""
+    if os.getenv("RATE_LIMIT_ENABLED", "true").lower() not in ("1", "true", "yes"):
+        return None
+
+    backend_name = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    if backend_name == "memory":
+        backend = MemoryRateLimitBackend()
+    elif backend_name == "sqlite":
+        backend = SQLiteRateLimitBackend(os.getenv("RATE_LIMIT_SQLITE_PATH", "rate_limits.db"))
+    else:
+        raise ValueError(f"Unknown rate limit backend: {backend_name}")
+
+    limiter = RateLimiter(
+        backend,
+        capacity=float(os.getenv("RATE_LIMIT_CAPACITY", "100")),
+        refill_rate=float(os.getenv("RATE_LIMIT_REFILL", "2")),
+        costs=RateLimiter.parse_costs(os.getenv("RATE_LIMIT_COSTS", DEFAULT_COSTS)),
+        global_capacity=float(os.getenv("RATE_LIMIT_GLOBAL_CAPACITY", "0")),
+        global_refill_rate=float(os.getenv("RATE_LIMIT_GLOBAL_REFILL", "0"))
+    )
+    logger.info("Rate limiting enabled with %s backend", backend.name)
+    return limiter
\ No newline at end of file
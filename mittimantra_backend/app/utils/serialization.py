@@ -0,0 +1,94 @@
+# app/utils/serialization.py
+"""
+Serialization Utilities
+orjson-backed JSON responses with optional MessagePack content negotiation
+"""
+
+import contextvars
+import logging
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+
+try:
+    import msgpack
+except ImportError:  # Optional: only needed for Accept: application/msgpack
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Response encoding negotiated for the current request ("json" or "msgpack")
+response_format_var: contextvars.ContextVar = contextvars.ContextVar("mittimantra_response_format", default="json")
+
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not handle natively"""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if hasattr(value, "tolist"):
+        # numpy scalars and arrays with unsupported dtypes
+        return value.tolist()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content as JSON bytes (numpy values, datetimes and Pydantic models included)"""
+    return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+def dumps_msgpack(content: Any) -> bytes:
+    """Encode content as MessagePack, via the same type conversions as JSON"""
+    # Round-trip through orjson so numpy values, datetimes and models are normalized
+    return msgpack.packb(orjson.loads(dumps(content)), use_bin_type=True)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: orjson encoding, or MessagePack when negotiated
+
+    Renders JSON with orjson instead of json.dumps. If the request's Accept
+    header asked for MessagePack (see ContentNegotiationMiddleware), the
+    same content is packed with msgpack instead.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if response_format_var.get() == "msgpack":
+            self.media_type = MSGPACK_MEDIA_TYPES[0]
+            return dumps_msgpack(content)
+        return dumps(content)
+
+
+def trusted_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> FastJSONResponse:
+    """
+    Serialize service output directly
+
+    Returning a response object skips FastAPI's response-model validation
+    and jsonable_encoder pass, which dominate serialization cost for large
+    batch results. Use only for dictionaries built by our own services.
+    """
+    return FastJSONResponse(content, status_code=status_code, headers=headers)
+
+
+def accepts_msgpack(accept: str) -> bool:
+    """Whether an Accept header prefers MessagePack (and msgpack is installed)"""
+    if msgpack is None or not accept:
+        return False
+    for part in accept.split(","):
+        media_type, *params = [item.strip() for item in part.split(";")]
+        if media_type.lower() in MSGPACK_MEDIA_TYPES:
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        return float(value) > 0
+                    except ValueError:
+                        return False
+            return True
+    return False
\ No newline at end of file
@@ -0,0 +1,173 @@
+# app/utils/static_assets.py
+"""
+Static Asset Utilities
+Content-hashed, precompressed static files and the StaticFiles app that serves them
+"""
+
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+from typing import Dict
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.utils.compression import ENCODING_SUFFIXES, SUPPORTED_ENCODINGS, choose_encoding, compress_bytes, is_compressible
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = os.getenv("STATIC_DIR", "static")
+STATIC_BUILD_DIR = os.getenv("STATIC_BUILD_DIR", "static_build")
+# Build at startup; set false when build_static.py runs at deploy time instead
+STATIC_BUILD_ON_STARTUP = os.getenv("STATIC_BUILD_ON_STARTUP", "true").lower() == "true"
+
+MANIFEST_NAME = "manifest.json"
+
+# Maximum compression: assets are encoded once, not per request
+_BUILD_LEVELS = {"gzip": 9, "br": 11}
+
+# Files smaller than this are not precompressed
+_PRECOMPRESS_MIN_SIZE = 256
+
+# name.<12 hex digits>.ext, as written by build_static_assets
+_HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Logical path -> hashed path, for static_url()
+_manifest: Dict[str, str] = {}
+
+
+def _write_if_changed(path: str, data: bytes) -> None:
+    """Write data unless the file already holds it (keeps mtimes, and so ETags, stable)"""
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _write_variants(path: str, data: bytes) -> None:
+    """Write a file plus its .br/.gz variants where they are smaller"""
+    _write_if_changed(path, data)
+    content_type = mimetypes.guess_type(path)[0] or ""
+    if len(data) < _PRECOMPRESS_MIN_SIZE or not is_compressible(content_type):
+        return
+    for encoding in SUPPORTED_ENCODINGS:
+        encoded = compress_bytes(data, encoding, _BUILD_LEVELS[encoding])
+        if len(encoded) < len(data):
+            _write_if_changed(path + ENCODING_SUFFIXES[encoding], encoded)
+
+
+def build_static_assets(source_dir: str = STATIC_DIR, build_dir: str = STATIC_BUILD_DIR) -> Dict[str, str]:
+    """
+    Copy static assets into build_dir with hashed names and precompressed variants
+
+    Every file is written under its own name and as name.<hash>.ext, each
+    with .br (when brotli is installed) and .gz siblings for compressible
+    types. Hashed names change with the content, so they are served as
+    immutable.
+
+    Args:
+        source_dir: Directory with the original assets
+        build_dir: Output directory served at /static
+
+    Returns:
+        Manifest mapping each logical path to its hashed path (also written
+        to build_dir/manifest.json)
+    """
+    manifest = {}
+    for root, _, files in os.walk(source_dir):
+        for filename in sorted(files):
+            source_path = os.path.join(root, filename)
+            logical_path = os.path.relpath(source_path, source_dir).replace(os.sep, "/")
+            with open(source_path, "rb") as f:
+                data = f.read()
+
+            stem, ext = os.path.splitext(logical_path)
+            hashed_path = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+            _write_variants(os.path.join(build_dir, logical_path), data)
+            _write_variants(os.path.join(build_dir, hashed_path), data)
+            manifest[logical_path] = hashed_path
+
+    _write_if_changed(os.path.join(build_dir, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    logger.info("Built %d static assets into %s", len(manifest), build_dir)
+    return manifest
+
+
+def prepare_static_assets(
+    source_dir: str = STATIC_DIR,
+    build_dir: str = STATIC_BUILD_DIR,
+    build: bool = STATIC_BUILD_ON_STARTUP
+) -> str:
+    """
+    Build (or load a prebuilt) static manifest and return the directory to serve
+
+    Falls back to serving source_dir unhashed and uncompressed when the
+    build directory is missing or cannot be written.
+    """
+    global _manifest
+    try:
+        if build:
+            _manifest = build_static_assets(source_dir, build_dir)
+            return build_dir
+        with open(os.path.join(build_dir, MANIFEST_NAME)) as f:
+            _manifest = json.load(f)
+        return build_dir
+    except (OSError, ValueError) as e:
+        logger.warning("Serving unbuilt static assets from %s: %s", source_dir, e)
+        _manifest = {}
+        return source_dir
+
+
+def static_url(path: str) -> str:
+    """URL of a static asset, using its hashed name when one was built (a Jinja global)"""
+    return f"/static/{_manifest.get(path, path)}"
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles serving prebuilt .br/.gz variants and cache headers
+
+    A client accepting brotli or gzip gets the matching variant file with
+    Content-Encoding set, so nothing is compressed per request. Hashed
+    files are marked immutable; everything else must be revalidated.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200):
+        request_headers = Headers(scope=scope)
+        full_path = str(full_path)
+        headers = {
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if _HASHED_NAME.search(full_path) else REVALIDATE_CACHE_CONTROL,
+            "Vary": "Accept-Encoding",
+        }
+
+        available = [encoding for encoding in SUPPORTED_ENCODINGS if os.path.isfile(full_path + ENCODING_SUFFIXES[encoding])]
+        encoding = choose_encoding(request_headers.get("accept-encoding", ""), available)
+        if encoding is not None:
+            variant_path = full_path + ENCODING_SUFFIXES[encoding]
+            headers["Content-Encoding"] = encoding
+            response = FileResponse(
+                variant_path,
+                status_code=status_code,
+                headers=headers,
+                media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                stat_result=os.stat(variant_path)
+            )
+        else:
+            response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
\ No newline at end of file
@@ -0,0 +1,80 @@
+# app/utils/streaming.py
+"""
+Streaming Utilities
+Server-sent event formatting and responses for incremental results
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Keep proxies from buffering or caching the stream
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",
+}
+
+# Interval at which idle streams send a comment line so proxies keep them open
+KEEPALIVE_SECONDS = 15
+
+
+def format_event(data: Any, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """
+    Encode one server-sent event
+
+    Args:
+        data: JSON-serializable payload
+        event: Event type (the EventSource listener name)
+        event_id: Sent back by the browser as Last-Event-ID on reconnect
+
+    Returns:
+        The event as text, terminated by a blank line
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {dumps(data).decode()}")
+    return "\n".join(lines) + "\n\n"
+
+
+def keepalive() -> str:
+    """Comment line ignored by EventSource clients"""
+    return ": keepalive\n\n"
+
+
+async def batch_events(chunks: AsyncIterator[List[Dict]], total: int) -> AsyncIterator[str]:
+    """
+    Turn per-chunk batch results into server-sent events as each chunk is scored
+
+    Emits one "result" event per item, a "progress" event per chunk and a
+    final "done" (or "error") event; nothing is accumulated server-side.
+    """
+    processed = 0
+    try:
+        async for results in chunks:
+            for result in results:
+                yield format_event({"index": processed, **result}, event="result")
+                processed += 1
+            del results
+            yield format_event({"processed": processed, "total": total}, event="progress")
+        yield format_event({"processed": processed, "total": total}, event="done")
+    except HTTPException as e:
+        yield format_event({"detail": e.detail, "processed": processed}, event="error")
+    except ValueError as e:
+        yield format_event({"detail": str(e), "processed": processed}, event="error")
+    except Exception as e:
+        logger.error("Batch streaming error: %s", e)
+        yield format_event({"detail": "Batch prediction failed", "processed": processed}, event="error")
+
+
+def event_stream(events: AsyncIterator[str], headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """Wrap an async iterator of formatted events in a text/event-stream response"""
+    return StreamingResponse(events, media_type="text/event-stream", headers={**SSE_HEADERS, **(headers or {})})
\ No newline at end of file
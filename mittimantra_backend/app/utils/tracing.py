@@ -0,0 +1,275 @@
+# app/utils/tracing.py
+"""
+Tracing Utilities
+Lightweight request spans exported in batches as OTLP/JSON to a local collector
+"""
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("mittimantra_current_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "kind", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes: Dict = {}
+        self.status = STATUS_OK
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> Dict:
+        """Convert to the OTLP/JSON span representation"""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    """Encode one attribute as an OTLP key/value pair"""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Dict]:
+    """
+    Parse a W3C traceparent header
+
+    Returns:
+        Dictionary with "trace_id", "parent_id" and "sampled", or None if malformed
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        flags = int(parts[3][:2], 16)
+        int(parts[1], 16), int(parts[2], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return {"trace_id": parts[1], "parent_id": parts[2], "sampled": bool(flags & 1)}
+
+
+class OTLPExporter:
+    """Background exporter posting finished spans to an OTLP/HTTP JSON endpoint"""
+
+    # Spans buffered before new ones are dropped (the request path never blocks)
+    MAX_QUEUE = 10000
+
+    def __init__(
+        self,
+        endpoint: str,
+        service_name: str = "mittimantra-backend",
+        batch_size: int = 256,
+        flush_interval: float = 2.0
+    ):
+        """
+        Initialize exporter
+
+        Args:
+            endpoint: Collector traces URL, e.g. http://127.0.0.1:4318/v1/traces
+            service_name: service.name resource attribute
+            batch_size: Maximum spans per export request
+            flush_interval: Seconds between exports when the batch is not full
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.exported = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUE)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        """Queue a finished span for export"""
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        """Drain the queue in batches"""
+        while True:
+            batch: List[Span] = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._export(batch)
+
+    def _export(self, batch: List[Span]):
+        """Post one batch; failures are logged and the batch is discarded"""
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "mittimantra"},
+                    "spans": [span.to_otlp() for span in batch],
+                }],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5) as response:
+                response.read()
+            self.exported += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning("Span export to %s failed: %s", self.endpoint, e)
+
+
+class Tracer:
+    """Creates request traces and nested stage spans"""
+
+    def __init__(self, exporter: Optional[OTLPExporter] = None, sample_ratio: float = 1.0):
+        """
+        Initialize tracer
+
+        Args:
+            exporter: Destination for finished spans; tracing is disabled when None
+            sample_ratio: Fraction of new traces recorded (incoming sampled
+                traceparent headers are always honoured)
+        """
+        self.exporter = exporter
+        self.sample_ratio = sample_ratio
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    @contextmanager
+    def start_trace(self, name: str, traceparent: Optional[str] = None, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Open the root (server) span of a request
+
+        Yields None when tracing is disabled or the trace is not sampled, in
+        which case nested spans are no-ops.
+        """
+        if self.exporter is None:
+            yield None
+            return
+
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            sampled = parent["sampled"]
+        else:
+            sampled = random.random() < self.sample_ratio
+        if not sampled:
+            yield None
+            return
+
+        trace_id = parent["trace_id"] if parent else f"{random.getrandbits(128):032x}"
+        span = Span(name, trace_id, parent["parent_id"] if parent else None, kind=SPAN_KIND_SERVER)
+        span.attributes.update(attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Open a child span of the active span; a no-op outside a sampled trace"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        span = Span(name, parent.trace_id, parent.span_id)
+        span.attributes.update(attributes)
+        with self._activate(span):
+            yield span
+
+    @contextmanager
+    def _activate(self, span: Span) -> Iterator[Span]:
+        """Make span current for the block and export it when the block exits"""
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = STATUS_ERROR
+            span.set_attribute("exception.type", type(e).__name__)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            self.exporter.submit(span)
+
+    @staticmethod
+    def current_span() -> Optional[Span]:
+        """Get the active span, if any"""
+        return _current_span.get()
+
+
+def _tracer_from_env() -> Tracer:
+    """Build the tracer configured by OTLP_ENDPOINT and TRACE_SAMPLE_RATIO"""
+    endpoint = os.getenv("OTLP_ENDPOINT", "")
+    sample_ratio = float(os.getenv("TRACE_SAMPLE_RATIO", "1.0"))
+    if not endpoint:
+        return Tracer(None, sample_ratio)
+    logger.info("Exporting traces to %s (sample ratio %s)", endpoint, sample_ratio)
+    return Tracer(OTLPExporter(endpoint), sample_ratio)
+
+
+# Process-wide tracer
+tracer = _tracer_from_env()
\ No newline at end of file
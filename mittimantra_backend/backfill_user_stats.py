@@ -0,0 +1,35 @@
+"""
+User Statistics Backfill Script
+Rebuilds the pre-aggregated user_stats table from existing prediction history
+"""
+
+import argparse
+
+from app.database import SessionLocal
+from app.services.stats_service import UserStatsService
+
+
+def backfill_user_stats(user_id=None):
+    """Recompute statistics for one user or for everyone"""
+    print("=" * 60)
+    print("BACKFILLING USER STATISTICS")
+    print("=" * 60)
+
+    db = SessionLocal()
+    try:
+        rebuilt = UserStatsService().rebuild(db, user_id=user_id)
+        print(f"\n✅ Rebuilt statistics for {rebuilt} user(s)")
+    except Exception as e:
+        db.rollback()
+        print(f"\n❌ Backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-user prediction statistics")
+    parser.add_argument("--user-id", type=int, default=None, help="Only rebuild this user")
+    args = parser.parse_args()
+    backfill_user_stats(args.user_id)
@@ -0,0 +1,265 @@
+# benchmarks/load.py
+"""
+HTTP Load Generator
+Drives the prediction endpoints of a local server at fixed concurrency
+"""
+
+import http.client
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks.micro import CROP_FEATURES, IRRIGATION_INPUTS
+from benchmarks.results import summarize
+from benchmarks.stub_models import build_stub_models, sample_leaf_image
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+BENCH_USER = {"username": "benchuser", "email": "bench@example.com", "password": "benchmark-password"}
+
+_STAGE_SAMPLE = re.compile(r'^mittimantra_stage_duration_seconds_(sum|count)\{stage="([^"]+)"\} (\S+)$')
+
+
+def _json_request(method: str, path: str, payload: Dict) -> Dict:
+    return {
+        "method": method,
+        "path": path,
+        "body": json.dumps(payload).encode("utf-8"),
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+def _upload_request(path: str, image_bytes: bytes) -> Dict:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="leaf.jpg"\r\n'
+        "Content-Type: image/jpeg\r\n\r\n"
+    ).encode("utf-8") + image_bytes + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    return {
+        "method": "POST",
+        "path": path,
+        "body": body,
+        "headers": {"Content-Type": f"multipart/form-data; boundary={boundary}"},
+    }
+
+
+def build_scenarios(image_bytes: Optional[bytes] = None) -> Dict[str, Dict]:
+    """Request templates for every benchmarked endpoint"""
+    image_bytes = image_bytes or sample_leaf_image()
+    return {
+        "predict_crop": _json_request("POST", "/predict-crop", CROP_FEATURES),
+        "predict_disease": _upload_request("/predict-disease", image_bytes),
+        "irrigation_schedule": _json_request("POST", "/irrigation-schedule", IRRIGATION_INPUTS),
+        "pest_control": _upload_request("/pest-control", image_bytes),
+        "login_page": {"method": "GET", "path": "/login", "body": None, "headers": {}},
+        "api_auth_login": _json_request(
+            "POST", "/api/auth/login",
+            {"username": BENCH_USER["username"], "password": BENCH_USER["password"]}
+        ),
+    }
+
+
+def prepare_workdir(workdir: str) -> Dict[str, str]:
+    """
+    Lay out a server working directory with stub models and a fresh database
+
+    Returns:
+        Environment for the server process
+    """
+    workdir = Path(workdir)
+    build_stub_models(str(workdir / "models"))
+    for name in ("static", "templates", "data"):
+        target = workdir / name
+        if not target.exists():
+            shutil.copytree(BACKEND_DIR / name, target)
+
+    database = workdir / "benchmark.db"
+    if database.exists():
+        database.unlink()
+
+    env = dict(os.environ)
+    env.update({
+        "DATABASE_URL": f"sqlite:///{database}",
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(BACKEND_DIR), os.environ.get("PYTHONPATH")])),
+        "OUTBREAK_REFRESH_INTERVAL": "3600",
+        "RATE_LIMIT_ENABLED": "false",
+    })
+    env.pop("OTLP_ENDPOINT", None)
+    subprocess.run(
+        [sys.executable, str(BACKEND_DIR / "init_db.py")],
+        cwd=workdir, env=env, check=True, capture_output=True
+    )
+    return env
+
+
+def start_server(workdir: str, env: Dict[str, str], port: int, timeout: float = 60.0) -> subprocess.Popen:
+    """Start uvicorn in workdir (logging to server.log) and wait until /health answers"""
+    log_path = Path(workdir) / "server.log"
+    with open(log_path, "ab") as log_file:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--log-level", "warning"],
+            cwd=workdir, env=env, stdout=log_file, stderr=subprocess.STDOUT
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(
+                f"Server exited with code {process.returncode}:\n{log_path.read_text(errors='replace')[-2000:]}"
+            )
+        try:
+            status, _ = _request("127.0.0.1", port, {"method": "GET", "path": "/health", "body": None, "headers": {}})
+            if status == 200:
+                return process
+        except OSError:
+            pass
+        time.sleep(0.25)
+    process.terminate()
+    raise RuntimeError("Server did not become healthy in time")
+
+
+def _request(host: str, port: int, request: Dict, connection: Optional[http.client.HTTPConnection] = None):
+    """Send one request and return (status, body)"""
+    conn = connection or http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        conn.request(request["method"], request["path"], body=request["body"], headers=request["headers"])
+        response = conn.getresponse()
+        return response.status, response.read()
+    finally:
+        if connection is None:
+            conn.close()
+
+
+def ensure_bench_user(host: str, port: int) -> None:
+    """Register the login benchmark user (ignored if it already exists)"""
+    _request(host, port, _json_request("POST", "/api/auth/register", BENCH_USER))
+
+
+def run_scenario(
+    host: str,
+    port: int,
+    request: Dict,
+    concurrency: int,
+    duration: float,
+    warmup: int = 5
+) -> Dict:
+    """
+    Drive one request template with a fixed number of keep-alive workers
+
+    Args:
+        host: Server host
+        port: Server port
+        request: Template from build_scenarios
+        concurrency: Number of concurrent workers
+        duration: Seconds to run after warmup
+        warmup: Untimed requests sent first
+
+    Returns:
+        Latency summary plus throughput_rps, errors and status counts
+    """
+    for _ in range(warmup):
+        _request(host, port, request)
+
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def worker():
+        conn = http.client.HTTPConnection(host, port, timeout=30)
+        local_latencies, local_statuses = [], {}
+        try:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    status, _ = _request(host, port, request, conn)
+                except (OSError, http.client.HTTPException):
+                    conn.close()
+                    conn = http.client.HTTPConnection(host, port, timeout=30)
+                    status = 0
+                local_latencies.append(time.perf_counter() - start)
+                local_statuses[status] = local_statuses.get(status, 0) + 1
+        finally:
+            conn.close()
+            with lock:
+                latencies.extend(local_latencies)
+                for status, count in local_statuses.items():
+                    statuses[status] = statuses.get(status, 0) + count
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(latencies, elapsed)
+    summary["throughput_rps"] = summary.pop("ops_per_sec", None)
+    summary["concurrency"] = concurrency
+    summary["errors"] = sum(count for status, count in statuses.items() if not 200 <= status < 300)
+    summary["status_counts"] = {str(status): count for status, count in sorted(statuses.items())}
+    return summary
+
+
+def scrape_stage_timings(host: str, port: int) -> Dict[str, Dict]:
+    """Read mean per-stage server timings from the /metrics endpoint"""
+    status, body = _request(host, port, {"method": "GET", "path": "/metrics", "body": None, "headers": {}})
+    if status != 200:
+        return {}
+    totals: Dict[str, Dict] = {}
+    for line in body.decode("utf-8").splitlines():
+        match = _STAGE_SAMPLE.match(line)
+        if match:
+            kind, stage_name, value = match.groups()
+            totals.setdefault(stage_name, {})[kind] = float(value)
+    return {
+        name: {"count": int(values["count"]), "mean_ms": round(values["sum"] / values["count"] * 1000, 4)}
+        for name, values in totals.items()
+        if values.get("count")
+    }
+
+
+def run_load(
+    workdir: str,
+    concurrency: int = 8,
+    duration: float = 10.0,
+    port: int = 8765,
+    scenarios: Optional[List[str]] = None
+) -> Tuple[Dict, Dict]:
+    """
+    Start a stub-model server and load test each endpoint in turn
+
+    Returns:
+        (scenario name -> summary, mean server stage timings from /metrics)
+    """
+    env = prepare_workdir(workdir)
+    process = start_server(workdir, env, port)
+    results = {}
+    try:
+        ensure_bench_user("127.0.0.1", port)
+        for name, request in build_scenarios().items():
+            if scenarios and name not in scenarios:
+                continue
+            logger.info(f"Load testing {name} at concurrency {concurrency} for {duration}s")
+            results[name] = run_scenario("127.0.0.1", port, request, concurrency, duration)
+        stages = scrape_stage_timings("127.0.0.1", port)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    return results, stages
\ No newline at end of file
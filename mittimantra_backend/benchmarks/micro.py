@@ -0,0 +1,187 @@
+# benchmarks/micro.py
+"""
+Microbenchmarks
+In-process timings of the prediction pipeline building blocks
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator
+
+from benchmarks.results import summarize
+from benchmarks.stub_models import build_stub_models, sample_field_photo, sample_leaf_image
+
+logger = logging.getLogger(__name__)
+
+CROP_FEATURES = {
+    "nitrogen": 90, "phosphorus": 42, "potassium": 43,
+    "temperature": 21.5, "humidity": 82.0, "ph": 6.5, "rainfall": 203.0
+}
+IRRIGATION_INPUTS = {
+    "crop_type": "rice", "soil_moisture": 35.0, "temperature": 31.0,
+    "humidity": 60.0, "rainfall": 2.0, "crop_stage": "flowering"
+}
+
+# bcrypt is deliberately slow; fewer iterations keep the suite short
+BCRYPT_ITERATIONS = 10
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def time_call(fn: Callable[[], object], iterations: int, warmup: int = 3) -> Dict:
+    """Time repeated calls of fn and summarize the latencies"""
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - start)
+    return summarize(latencies)
+
+
+@contextmanager
+def stub_workdir(workdir: str) -> Iterator[Dict[str, bool]]:
+    """Run the block inside workdir with stub models under workdir/models"""
+    built = build_stub_models(os.path.join(workdir, "models"))
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        yield built
+    finally:
+        os.chdir(previous)
+
+
+def run_micro(workdir: str, iterations: int = 200) -> Dict:
+    """
+    Run every microbenchmark
+
+    Args:
+        workdir: Scratch directory for stub models
+        iterations: Timed calls per benchmark (bcrypt uses BCRYPT_ITERATIONS)
+
+    Returns:
+        Benchmark name -> latency summary, or {"skipped": reason}
+    """
+    from app.services.irrigation_service import IrrigationService
+    from app.utils.image_utils import preprocess_image
+
+    results = {}
+    image_bytes = sample_leaf_image()
+
+    with stub_workdir(workdir) as built:
+        results["preprocess_image"] = time_call(lambda: preprocess_image(image_bytes, (224, 224)), iterations)
+
+        from app.services.crop_service import CropRecommendationService
+        crop_service = CropRecommendationService()
+        results["crop_predict"] = time_call(lambda: crop_service.predict_crop(**CROP_FEATURES), iterations)
+
+        if built["disease"]:
+            from app.services.disease_service import DiseaseDetectionService
+            disease_service = DiseaseDetectionService()
+            results["disease_predict"] = time_call(lambda: disease_service.predict_disease(image_bytes), iterations)
+        else:
+            results["disease_predict"] = {"skipped": "TensorFlow is not installed"}
+
+    irrigation_service = IrrigationService()
+    results["irrigation_schedule"] = time_call(
+        lambda: irrigation_service.calculate_irrigation_schedule(**IRRIGATION_INPUTS), iterations
+    )
+
+    from app.auth import get_password_hash, verify_password
+    password_hash = get_password_hash("benchmark-password")
+    results["bcrypt_verify"] = time_call(
+        lambda: verify_password("benchmark-password", password_hash), BCRYPT_ITERATIONS, warmup=1
+    )
+
+    results.update(run_leaf_localization(iterations))
+    results.update(run_near_duplicate_lookup(iterations))
+    results.update(run_page_renders(workdir, iterations))
+    return results
+
+
+def run_leaf_localization(iterations: int) -> Dict:
+    """
+    Time field photo preprocessing with and without leaf cropping and tiling
+
+    Each entry also reports leaf_pixel_share, the fraction of the model
+    input covered by leaf pixels, as a proxy for the accuracy gained.
+    """
+    from app.utils.image_utils import _decode, locate_leaf, preprocess_leaf_crops
+
+    image_bytes, leaf_mask = sample_field_photo()
+    box = locate_leaf(_decode(image_bytes))
+    if box is None:
+        cropped_share = float(leaf_mask.mean())
+    else:
+        left, top, right, bottom = box
+        cropped_share = float(leaf_mask[top:bottom, left:right].mean())
+
+    def preprocess(**options) -> Callable[[], object]:
+        return lambda: preprocess_leaf_crops(image_bytes, (224, 224), **options)
+
+    large_bytes, _ = sample_field_photo(width=4000, height=3000)
+    return {
+        "preprocess_field_photo": {
+            **time_call(preprocess(max_tiles=0, crop_to_leaf=False), iterations),
+            "leaf_pixel_share": round(float(leaf_mask.mean()), 4),
+        },
+        "preprocess_field_photo_leaf_crop": {
+            **time_call(preprocess(max_tiles=0, crop_to_leaf=True), iterations),
+            "leaf_pixel_share": round(cropped_share, 4),
+        },
+        "preprocess_large_photo_leaf_tiles": time_call(
+            lambda: preprocess_leaf_crops(large_bytes, (224, 224), max_tiles=4, crop_to_leaf=True),
+            max(1, iterations // 10), warmup=1
+        ),
+    }
+
+
+def run_near_duplicate_lookup(iterations: int) -> Dict:
+    """Time perceptual hashing of a decoded upload and a lookup in a full index"""
+    import numpy as np
+    from app.utils.image_utils import decode_image
+    from app.utils.perceptual_hash import NearDuplicateIndex, phash
+
+    decoded = decode_image(sample_field_photo()[0])
+    index = NearDuplicateIndex(max_distance=6, max_entries=4096)
+    rng = np.random.default_rng(0)
+    for value in rng.integers(0, 1 << 63, 4096, dtype=np.int64):
+        index.set(int(value), {})
+    fingerprint = phash(decoded.thumbnail)
+    return {
+        "image_phash": time_call(lambda: phash(decoded.thumbnail), iterations),
+        "near_duplicate_lookup": time_call(lambda: index.get(fingerprint), iterations),
+    }
+
+
+def run_page_renders(workdir: str, iterations: int) -> Dict:
+    """Time Jinja page renders (as on a page cache miss) against page cache hits"""
+    from fastapi.templating import Jinja2Templates
+    from app.utils.page_cache import RenderCache, configure_templates, user_page_key
+    from app.utils.static_assets import static_url
+
+    templates = configure_templates(
+        Jinja2Templates(directory=str(TEMPLATES_DIR)),
+        cache_dir=os.path.join(workdir, "template_cache")
+    )
+    templates.env.globals["static_url"] = static_url
+    user = SimpleNamespace(username="benchuser", email="bench@example.com", full_name="Bench User")
+
+    def render(name: str, **context) -> str:
+        return templates.get_template(name).render({"request": None, **context})
+
+    results = {
+        "page_render_login": time_call(lambda: render("login.html"), iterations),
+        "page_render_dashboard": time_call(lambda: render("dashboard.html", user=user), iterations),
+    }
+
+    cache = RenderCache()
+    key = user_page_key(user.username, "dashboard.html")
+    cache.set(key, render("dashboard.html", user=user))
+    results["page_cache_hit"] = time_call(lambda: cache.get(key), iterations)
+    return results
\ No newline at end of file
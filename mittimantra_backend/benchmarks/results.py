@@ -0,0 +1,133 @@
+# benchmarks/results.py
+"""
+Benchmark Results
+Latency summaries, JSON result files and regression checks against a baseline
+"""
+
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Metrics where a larger value is a regression; throughput is the reverse
+LOWER_IS_BETTER = ("p50_ms", "p90_ms", "p99_ms", "mean_ms")
+HIGHER_IS_BETTER = ("ops_per_sec", "throughput_rps")
+
+THRESHOLDS_PATH = Path(__file__).with_name("thresholds.json")
+
+
+def summarize(latencies: Sequence[float], elapsed: Optional[float] = None) -> Dict:
+    """
+    Summarize latencies measured in seconds
+
+    Args:
+        latencies: Per-operation latencies in seconds
+        elapsed: Wall time of the run; throughput is derived from the
+            latencies when omitted (single-threaded runs)
+
+    Returns:
+        Dictionary of count, mean/p50/p90/p99/max in milliseconds and ops_per_sec
+    """
+    values = np.asarray(latencies, dtype=np.float64) * 1000
+    if values.size == 0:
+        return {"count": 0}
+    wall = elapsed if elapsed is not None else values.sum() / 1000
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(values.mean()), 4),
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p90_ms": round(float(np.percentile(values, 90)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "max_ms": round(float(values.max()), 4),
+        "ops_per_sec": round(values.size / wall, 2) if wall > 0 else None,
+    }
+
+
+def environment() -> Dict:
+    """Describe the machine and commit a result was produced on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(report: Dict, path: str) -> None:
+    """Write a report as pretty-printed JSON"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict:
+    """Read a report written by write_results"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_thresholds(path: Optional[str] = None) -> Dict:
+    """Read regression thresholds (relative change allowed per metric)"""
+    with open(path or THRESHOLDS_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: Dict, baseline: Dict, thresholds: Dict) -> List[Dict]:
+    """
+    Find regressions between two reports
+
+    A metric regresses when it is worse than the baseline by more than its
+    allowed relative change. Thresholds come from "benchmarks" -> name ->
+    metric, falling back to "default" -> metric; metrics without a
+    threshold are not checked.
+
+    Args:
+        current: Report being checked
+        baseline: Report from the reference commit
+        thresholds: Parsed thresholds file
+
+    Returns:
+        One dictionary per regression with benchmark, metric, baseline,
+        current, change and allowed
+    """
+    regressions = []
+    defaults = thresholds.get("default", {})
+    for suite, benchmarks in current.get("results", {}).items():
+        for name, metrics in benchmarks.items():
+            reference = baseline.get("results", {}).get(suite, {}).get(name)
+            if not reference or metrics.get("skipped") or reference.get("skipped"):
+                continue
+            limits = {**defaults, **thresholds.get("benchmarks", {}).get(name, {})}
+            for metric, allowed in limits.items():
+                old, new = reference.get(metric), metrics.get(metric)
+                if not old or new is None:
+                    continue
+                if metric in LOWER_IS_BETTER:
+                    change = (new - old) / old
+                elif metric in HIGHER_IS_BETTER:
+                    change = (old - new) / old
+                else:
+                    continue
+                if change > allowed:
+                    regressions.append({
+                        "benchmark": f"{suite}/{name}",
+                        "metric": metric,
+                        "baseline": old,
+                        "current": new,
+                        "change": round(change, 4),
+                        "allowed": allowed,
+                    })
+    return regressions
\ No newline at end of file
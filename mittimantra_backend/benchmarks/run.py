@@ -0,0 +1,103 @@
+# benchmarks/run.py
+"""
+Benchmark Runner
+Runs the micro and HTTP load suites, writes JSON results and checks for regressions
+
+Usage (from mittimantra_backend/):
+    python -m benchmarks.run all --output benchmarks/results/latest.json
+    python -m benchmarks.run micro --baseline benchmarks/results/main.json
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+
+from benchmarks.results import compare, environment, load_results, load_thresholds, write_results
+
+
+def run_benchmarks(args) -> dict:
+    """Run the selected suites and build a report"""
+    report = {"environment": environment(), "results": {}}
+    with tempfile.TemporaryDirectory(prefix="mittimantra-bench-") as workdir:
+        if args.suite in ("micro", "all"):
+            from benchmarks.micro import run_micro
+            print("\nRunning microbenchmarks...")
+            report["results"]["micro"] = run_micro(f"{workdir}/micro", iterations=args.iterations)
+
+        if args.suite in ("load", "all"):
+            from benchmarks.load import run_load
+            print(f"\nRunning HTTP load test (concurrency {args.concurrency}, {args.duration}s per endpoint)...")
+            scenario_results, stages = run_load(
+                f"{workdir}/load",
+                concurrency=args.concurrency,
+                duration=args.duration,
+                port=args.port,
+                scenarios=args.scenario
+            )
+            report["results"]["load"] = scenario_results
+            report["server_stages"] = stages
+            report["environment"]["concurrency"] = args.concurrency
+    return report
+
+
+def print_report(report: dict) -> None:
+    """Print a one-line summary per benchmark"""
+    for suite, benchmarks in report["results"].items():
+        print(f"\n{suite}:")
+        for name, metrics in benchmarks.items():
+            if metrics.get("skipped"):
+                print(f"  {name:<22} skipped ({metrics['skipped']})")
+                continue
+            rate = metrics.get("throughput_rps") or metrics.get("ops_per_sec")
+            errors = f"  errors {metrics['errors']}" if metrics.get("errors") else ""
+            print(
+                f"  {name:<22} p50 {metrics['p50_ms']:>9.3f} ms  p99 {metrics['p99_ms']:>9.3f} ms"
+                f"  {rate:>9.1f}/s{errors}"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mittimantra benchmark suite")
+    parser.add_argument("suite", choices=["micro", "load", "all"], nargs="?", default="all")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--baseline", default=None, help="Compare against this JSON report")
+    parser.add_argument("--thresholds", default=None, help="Regression thresholds (default benchmarks/thresholds.json)")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per microbenchmark")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent HTTP workers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per load-tested endpoint")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the benchmark server")
+    parser.add_argument("--scenario", action="append", default=None, help="Only load test this endpoint (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    print("=" * 60)
+    print("MITTIMANTRA BENCHMARKS")
+    print("=" * 60)
+
+    report = run_benchmarks(args)
+    print_report(report)
+
+    if args.output:
+        write_results(report, args.output)
+        print(f"\n✅ Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(report, load_results(args.baseline), load_thresholds(args.thresholds))
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(
+                    f"  {regression['benchmark']} {regression['metric']}: "
+                    f"{regression['baseline']} -> {regression['current']} "
+                    f"({regression['change']:+.0%}, allowed {regression['allowed']:.0%})"
+                )
+            return 1
+        print(f"\n✅ No regressions against {args.baseline}")
+
+    print("\n" + "=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
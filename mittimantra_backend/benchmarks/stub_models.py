@@ -0,0 +1,132 @@
+# benchmarks/stub_models.py
+"""
+Benchmark Stub Models
+Tiny locally generated stand-ins for the crop and disease model files
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Dict, Tuple
+
+import joblib
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Crop classes and representative N, P, K, temperature, humidity, pH, rainfall
+CROP_CENTROIDS = {
+    "rice": (80, 48, 40, 24, 82, 6.4, 236),
+    "maize": (78, 48, 20, 22, 65, 6.2, 85),
+    "chickpea": (40, 68, 80, 19, 17, 7.3, 80),
+    "cotton": (118, 46, 20, 24, 80, 6.9, 80),
+    "wheat": (100, 50, 30, 18, 55, 6.8, 75),
+    "banana": (100, 82, 50, 27, 80, 6.0, 105),
+    "mango": (20, 27, 30, 31, 50, 5.8, 95),
+    "coffee": (101, 29, 30, 25, 59, 6.8, 158),
+}
+
+# Number of outputs of the real PlantVillage disease model
+DISEASE_CLASS_COUNT = 38
+
+
+class StubCropModel:
+    """Nearest-centroid classifier with the predict/predict_proba interface of the real model"""
+
+    def __init__(self, centroids: np.ndarray):
+        self.centroids = np.asarray(centroids, dtype=np.float64)
+        self.scale = self.centroids.std(axis=0) + 1e-6
+
+    def predict_proba(self, features) -> np.ndarray:
+        distances = np.linalg.norm(
+            (np.asarray(features, dtype=np.float64)[:, None, :] - self.centroids[None]) / self.scale,
+            axis=-1
+        )
+        weights = np.exp(-distances)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def predict(self, features) -> np.ndarray:
+        return np.argmax(self.predict_proba(features), axis=1)
+
+
+class StubLabelEncoder:
+    """Label encoder exposing inverse_transform like sklearn's LabelEncoder"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, indices) -> np.ndarray:
+        return self.classes_[np.asarray(indices, dtype=np.intp)]
+
+
+def build_stub_models(models_dir: str, image_size: int = 64) -> Dict[str, bool]:
+    """
+    Write stub model files in the layout the services load from
+
+    Args:
+        models_dir: Directory to write crop_planning_brain.pkl,
+            crop_label_encoder.pkl and plant_disease_model.keras into
+        image_size: Input size of the stub disease model
+
+    Returns:
+        Which stubs were written ({"crop": True, "disease": bool}); the disease
+        stub needs TensorFlow
+    """
+    models_dir = Path(models_dir)
+    models_dir.mkdir(parents=True, exist_ok=True)
+
+    joblib.dump(StubCropModel(list(CROP_CENTROIDS.values())), models_dir / "crop_planning_brain.pkl")
+    joblib.dump(StubLabelEncoder(list(CROP_CENTROIDS)), models_dir / "crop_label_encoder.pkl")
+    built = {"crop": True, "disease": False}
+
+    try:
+        import tensorflow as tf
+    except ImportError:
+        logger.warning("TensorFlow is not installed; skipping the disease model stub")
+        return built
+
+    tf.keras.utils.set_random_seed(0)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(image_size, image_size, 3)),
+        tf.keras.layers.Conv2D(8, 3, strides=2, activation="relu"),
+        tf.keras.layers.GlobalAveragePooling2D(),
+        tf.keras.layers.Dense(DISEASE_CLASS_COUNT, activation="softmax"),
+    ])
+    model.save(models_dir / "plant_disease_model.keras")
+    built["disease"] = True
+    return built
+
+
+def sample_leaf_image(width: int = 1024, height: int = 768, seed: int = 0) -> bytes:
+    """Generate a deterministic leaf-coloured JPEG upload"""
+    rng = np.random.default_rng(seed)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    pixels[..., 0] = rng.integers(30, 90, (height, width))
+    pixels[..., 1] = rng.integers(110, 200, (height, width))
+    pixels[..., 2] = rng.integers(20, 70, (height, width))
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+def sample_field_photo(width: int = 1600, height: int = 1200, seed: int = 0) -> Tuple[bytes, np.ndarray]:
+    """
+    Generate a deterministic field photo: sky and soil with a small leaf off-centre
+
+    Returns:
+        JPEG bytes and the boolean leaf mask (height, width)
+    """
+    rng = np.random.default_rng(seed)
+    rows, cols = np.mgrid[0:height, 0:width]
+    pixels = np.empty((height, width, 3), dtype=np.int16)
+    sky = rows < height * 0.3
+    pixels[sky] = (125, 170, 225)
+    pixels[~sky] = (115, 85, 55)
+    leaf = ((rows - height * 0.6) / (height * 0.12)) ** 2 + ((cols - width * 0.45) / (width * 0.08)) ** 2 <= 1
+    pixels[leaf] = (60, 150, 45)
+    lesions = leaf & (((rows - height * 0.58) ** 2 + (cols - width * 0.46) ** 2) <= (height * 0.015) ** 2)
+    pixels[lesions] = (120, 95, 40)
+    pixels += rng.integers(-20, 21, pixels.shape, dtype=np.int16)
+    buffer = io.BytesIO()
+    Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8)).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue(), leaf
\ No newline at end of file
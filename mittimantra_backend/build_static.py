@@ -0,0 +1,35 @@
+"""
+Static Asset Build Script
+Writes hashed, precompressed static assets for deployment (run before starting the server
+with STATIC_BUILD_ON_STARTUP=false)
+"""
+
+import argparse
+
+from app.utils.compression import SUPPORTED_ENCODINGS
+from app.utils.static_assets import STATIC_BUILD_DIR, STATIC_DIR, build_static_assets
+
+
+def build_static(source_dir, build_dir):
+    """Build the static directory served at /static"""
+    print("=" * 60)
+    print("BUILDING STATIC ASSETS")
+    print("=" * 60)
+
+    try:
+        manifest = build_static_assets(source_dir, build_dir)
+    except OSError as e:
+        print(f"\n❌ Static build failed: {e}")
+        raise
+    for logical_path, hashed_path in sorted(manifest.items()):
+        print(f"   {logical_path} -> {hashed_path}")
+    print(f"\n✅ Built {len(manifest)} asset(s) into {build_dir} ({', '.join(SUPPORTED_ENCODINGS)})")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build hashed, precompressed static assets")
+    parser.add_argument("--source", default=STATIC_DIR, help="Directory with the original assets")
+    parser.add_argument("--output", default=STATIC_BUILD_DIR, help="Directory served at /static")
+    args = parser.parse_args()
+    build_static(args.source, args.output)
\ No newline at end of file
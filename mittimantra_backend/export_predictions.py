@@ -0,0 +1,52 @@
+"""
+Prediction Export Script
+Exports crop, disease and irrigation history added since the last run to date-partitioned Parquet files
+
+Usage (e.g. nightly from cron):
+    python export_predictions.py
+    python export_predictions.py --types disease --output /data/lake/mittimantra
+"""
+
+import argparse
+
+from app.services.export_service import (
+    EXPORT_BATCH_ROWS, EXPORT_DIR, EXPORT_OPEN_FILES, PredictionExportService
+)
+
+
+def export_predictions(args):
+    """Export new rows of each prediction table and report what was written"""
+    from app.database import SessionLocal
+
+    print("=" * 60)
+    print("PREDICTION EXPORT")
+    print("=" * 60)
+
+    service = PredictionExportService(args.output, batch_rows=args.batch_rows, max_open_files=args.open_files)
+    db = SessionLocal()
+    try:
+        if args.reset:
+            for kind in args.types:
+                service.reset(db, kind)
+                print(f"✅ Removed the {kind} export; it will be rebuilt from the first row")
+        for result in service.export_all(db, args.types):
+            if result["rows"]:
+                print(f"✅ {result['type']}: {result['rows']} rows (ids {result['from_id']}-{result['to_id']}) "
+                      f"in {result['files']} files, {result['seconds']}s")
+            else:
+                print(f"✅ {result['type']}: up to date")
+    finally:
+        db.close()
+    print(f"\nDataset: {service.output_dir}")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export prediction history to Parquet")
+    parser.add_argument("--types", nargs="+", choices=sorted(PredictionExportService.EXPORT_TABLES),
+                        default=list(PredictionExportService.EXPORT_TABLES))
+    parser.add_argument("--output", default=EXPORT_DIR, help="Root directory of the dataset")
+    parser.add_argument("--batch-rows", type=int, default=EXPORT_BATCH_ROWS, help="Rows per fetch and record batch")
+    parser.add_argument("--open-files", type=int, default=EXPORT_OPEN_FILES, help="Date partitions written to at once")
+    parser.add_argument("--reset", action="store_true", help="Delete the existing export and start again from the first row")
+    export_predictions(parser.parse_args())
\ No newline at end of file
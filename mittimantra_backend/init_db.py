@@ -4,7 +4,7 @@ Creates all database tables for SQLite
 """
 
 from app.database import engine, Base
-from app.db_models import User, CropPrediction, DiseasePrediction, IrrigationSchedule
+from app.db_models import User, CropPrediction, DiseasePrediction, IrrigationSchedule, DiseaseOutbreakStat, AggregationWatermark, UserStats, Job, JobChunk, PredictionFeedback
 
 def init_db():
     """Create all database tables"""
@@ -21,6 +21,12 @@ def init_db():
         print("  - crop_predictions")
         print("  - disease_predictions")
         print("  - irrigation_schedules")
+        print("  - disease_outbreak_stats")
+        print("  - aggregation_watermarks")
+        print("  - user_stats")
+        print("  - jobs")
+        print("  - job_chunks")
+        print("  - prediction_feedback")
         print("\n" + "=" * 60)
     except Exception as e:
         print(f"\n❌ Error creating tables: {e}")
@@ -0,0 +1,98 @@
+"""
+Local OTLP Collector Stand-in
+Receives OTLP/HTTP JSON trace exports and prints per-request stage timings
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def summarize_spans(payload):
+    """Flatten an OTLP/JSON export into (trace_id, span) pairs"""
+    spans = []
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                duration_ms = (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+                spans.append({
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_id": span.get("parentSpanId"),
+                    "name": span["name"],
+                    "kind": span.get("kind", 1),
+                    "duration_ms": round(duration_ms, 3),
+                    "status": span.get("status", {}).get("code", 0),
+                })
+    return spans
+
+
+def make_handler(output_path=None, quiet=False):
+    """Build a request handler writing spans to output_path (JSON lines)"""
+
+    class CollectorHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != "/v1/traces":
+                self.send_response(404)
+                self.end_headers()
+                return
+
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            try:
+                spans = summarize_spans(json.loads(body))
+            except (ValueError, KeyError) as e:
+                self.send_response(400)
+                self.end_headers()
+                self.wfile.write(str(e).encode("utf-8"))
+                return
+
+            if output_path:
+                with open(output_path, "a", encoding="utf-8") as f:
+                    for span in spans:
+                        f.write(json.dumps(span) + "\n")
+            if not quiet:
+                for span in spans:
+                    # Server spans are request roots; others are stages inside them
+                    if span["kind"] == 2:
+                        print(f"{span['trace_id'][:8]}  {span['name']:<40} {span['duration_ms']:>9.2f} ms")
+                    else:
+                        print(f"{span['trace_id'][:8]}    └ {span['name']:<36} {span['duration_ms']:>9.2f} ms")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            pass
+
+    return CollectorHandler
+
+
+def run_collector(host="127.0.0.1", port=4318, output_path=None, quiet=False):
+    """Serve the collector until interrupted"""
+    print("=" * 60)
+    print("LOCAL OTLP COLLECTOR")
+    print("=" * 60)
+    print(f"\nListening on http://{host}:{port}/v1/traces")
+    if output_path:
+        print(f"Writing spans to {output_path}")
+    print("Set OTLP_ENDPOINT to the URL above and restart the backend\n")
+
+    server = ThreadingHTTPServer((host, port), make_handler(output_path, quiet))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n✅ Collector stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Receive OTLP/JSON traces from the backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4318)
+    parser.add_argument("--output", default=None, help="Append received spans to this JSON lines file")
+    parser.add_argument("--quiet", action="store_true", help="Do not print spans")
+    args = parser.parse_args()
+    run_collector(args.host, args.port, args.output, args.quiet)
\ No newline at end of file
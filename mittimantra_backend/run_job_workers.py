@@ -0,0 +1,89 @@
+"""
+Job Worker Launcher
+Runs background job workers in separate processes against the application database
+
+Usage:
+    python run_job_workers.py --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import time
+
+
+def _worker_main(stop_event, threads: int):
+    """Entry point of one worker process"""
+    # Keep each process to its share of the cores
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    os.environ.setdefault("TF_NUM_INTRAOP_THREADS", str(threads))
+    os.environ.setdefault("TF_NUM_INTEROP_THREADS", "1")
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app.database import SessionLocal
+    from app.services.job_service import JobService
+    from app.services.job_worker import JobWorker
+    from app.utils.logging_config import configure_logging, shutdown_logging
+
+    configure_logging()
+    try:
+        JobWorker(JobService(), SessionLocal).run(stop_event)
+    finally:
+        shutdown_logging()
+
+
+def run_workers(processes: int, threads: int):
+    """Start worker processes and restart any that exit until interrupted"""
+    print("=" * 60)
+    print("MITTIMANTRA JOB WORKERS")
+    print("=" * 60)
+    print(f"\nStarting {processes} worker process(es), {threads} thread(s) each...")
+
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+
+    def start(index):
+        process = context.Process(target=_worker_main, args=(stop_event, threads), name=f"job-worker-{index}")
+        process.start()
+        return process
+
+    workers = {index: start(index) for index in range(processes)}
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    try:
+        while not stop_event.is_set() and workers:
+            for index, process in list(workers.items()):
+                if process.is_alive():
+                    continue
+                if process.exitcode == 0:
+                    # Clean exit without a stop request: no model this worker can load
+                    print(f"❌ Worker {index} has no usable models; not restarting")
+                    del workers[index]
+                else:
+                    # Chunks the dead worker held are reclaimed when their lease expires
+                    print(f"❌ Worker {index} exited with code {process.exitcode}; restarting")
+                    workers[index] = start(index)
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\nStopping workers after their current chunk...")
+        stop_event.set()
+        for process in workers.values():
+            process.join()
+        print("✅ Workers stopped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument(
+        "--processes", type=int,
+        default=int(os.getenv("JOB_WORKER_PROCESSES", "0")) or os.cpu_count() or 1,
+        help="Worker processes (default JOB_WORKER_PROCESSES or one per core)"
+    )
+    parser.add_argument(
+        "--threads", type=int, default=int(os.getenv("JOB_WORKER_THREADS", "1")),
+        help="Math library threads per process"
+    )
+    args = parser.parse_args()
+    run_workers(args.processes, args.threads)
\ No newline at end of file
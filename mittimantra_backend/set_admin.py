@@ -0,0 +1,38 @@
+"""
+Admin Role Script
+Grants or revokes administrator rights (needed for /api/admin endpoints)
+"""
+
+import argparse
+
+from app.database import SessionLocal
+from app.db_models import User
+
+
+def set_admin(username, is_admin=True):
+    """Set the is_admin flag on a user"""
+    print("=" * 60)
+    print("GRANTING ADMIN RIGHTS" if is_admin else "REVOKING ADMIN RIGHTS")
+    print("=" * 60)
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == username).first()
+        if user is None:
+            print(f"\n❌ No user named {username}")
+            return False
+        user.is_admin = is_admin
+        db.commit()
+        print(f"\n✅ {username} is {'now' if is_admin else 'no longer'} an administrator")
+        return True
+    finally:
+        db.close()
+        print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Grant or revoke administrator rights")
+    parser.add_argument("username")
+    parser.add_argument("--revoke", action="store_true", help="Remove administrator rights")
+    args = parser.parse_args()
+    set_admin(args.username, not args.revoke)
\ No newline at end of file
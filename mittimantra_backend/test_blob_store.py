@@ -0,0 +1,91 @@
+"""
+Blob Store Test
+Checks content-addressed image archiving, deduplication, re-encoding and size-based eviction
+"""
+import sys
+import os
+import io
+import hashlib
+import tempfile
+import time
+
+import numpy as np
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.blob_store import BlobStore
+
+
+def photo(seed, size=(1600, 1200)):
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 255, (size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).resize(size).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def test_blob_store():
+    print("Testing blob store...")
+    root = tempfile.mkdtemp()
+
+    # 1. Uploads are keyed by SHA-256, sharded and re-encoded within the size cap
+    store = BlobStore(root, max_bytes=10 * 1024 * 1024, image_format="webp", max_dimension=512)
+    upload = photo(0)
+    stored = store.put(io.BytesIO(upload))
+    key = hashlib.sha256(upload).hexdigest()
+    assert stored.key == key and not stored.duplicate
+    assert stored.path == os.path.join(key[:2], key[2:4], key + ".webp")
+    with Image.open(os.path.join(root, stored.path)) as archived:
+        assert archived.format == "WEBP" and max(archived.size) == 512
+    assert stored.size < len(upload)
+    assert os.listdir(os.path.join(root, "tmp")) == []
+    print("✅ Upload archived under its SHA-256, re-encoded to capped WebP")
+
+    # 2. The same bytes again are not written twice
+    again = store.put(io.BytesIO(upload))
+    assert again.duplicate and again.path == stored.path
+    assert store.get_stats()["blobs"] == 1
+    assert store.find(key) == os.path.join(root, stored.path)
+    print("✅ Duplicate uploads deduplicated")
+
+    # 3. Original mode keeps the bytes as uploaded, streamed from the current position
+    original = BlobStore(tempfile.mkdtemp(), max_bytes=10 * 1024 * 1024, image_format="original")
+    fileobj = io.BytesIO(upload)
+    stored = original.put(fileobj)
+    with open(os.path.join(original.root, stored.path), "rb") as f:
+        assert f.read() == upload
+    print("✅ Original bytes stored unchanged")
+
+    # 4. Beyond the size limit the least recently stored images are evicted
+    uploads = [photo(seed) for seed in range(1, 7)]
+    sizes = []
+    for upload in uploads:
+        stored = store.put(io.BytesIO(upload))
+        sizes.append(stored.size)
+        time.sleep(0.01)
+    limited = BlobStore(root, max_bytes=int(sum(sizes[-3:]) / 0.9) + 1, image_format="webp", max_dimension=512)
+    # Re-uploading the oldest image keeps it
+    limited.put(io.BytesIO(uploads[0]))
+    evicted = limited.enforce_limit()
+    assert evicted > 0
+    stats = limited.get_stats()
+    assert stats["bytes"] <= limited.max_bytes * 0.9
+    assert limited.find(hashlib.sha256(uploads[0]).hexdigest()) is not None
+    assert limited.find(hashlib.sha256(photo(0)).hexdigest()) is None
+    assert limited.find(hashlib.sha256(uploads[-1]).hexdigest()) is not None
+    print("✅ Archive kept within its size limit, oldest first")
+
+    # 5. Unreadable uploads fail cleanly
+    try:
+        store.put(io.BytesIO(b"not an image"))
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    assert os.listdir(os.path.join(root, "tmp")) == []
+    print("✅ Invalid images rejected without leftovers")
+
+
+if __name__ == "__main__":
+    test_blob_store()
\ No newline at end of file
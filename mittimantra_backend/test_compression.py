@@ -0,0 +1,106 @@
+"""
+Compression Test
+Checks negotiated response compression and precompressed, hashed static assets
+"""
+import sys
+import os
+import gzip
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.middleware.compression import CompressionMiddleware
+from app.utils.compression import choose_encoding
+from app.utils.static_assets import PrecompressedStaticFiles, prepare_static_assets, static_url
+
+CSS = "body { color: #2e7d32; }\n" * 200
+
+
+def build_app(static_dir):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/large")
+    async def large():
+        return {"results": [{"crop": "rice", "confidence": 0.9}] * 100}
+
+    @app.get("/lines")
+    async def lines():
+        return StreamingResponse((f'{{"index": {i}}}\n' for i in range(200)), media_type="application/x-ndjson")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 1000, headers={"Content-Encoding": "identity"})
+
+    app.mount("/static", PrecompressedStaticFiles(directory=static_dir), name="static")
+    return app
+
+
+def test_compression():
+    print("Testing compression...")
+
+    # 1. Accept-Encoding negotiation honours q-values
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("br;q=1.0, gzip;q=0.5", available=("br", "gzip")) == "br"
+    assert choose_encoding("br;q=0.4, gzip;q=0.5", available=("br", "gzip")) == "gzip"
+    assert choose_encoding("*", available=("br", "gzip")) == "br"
+    assert choose_encoding("") is None
+    print("✅ Accept-Encoding negotiated")
+
+    workdir = tempfile.mkdtemp()
+    source_dir = os.path.join(workdir, "static")
+    os.makedirs(source_dir)
+    with open(os.path.join(source_dir, "style.css"), "w") as f:
+        f.write(CSS)
+    static_dir = prepare_static_assets(source_dir, os.path.join(workdir, "build"), build=True)
+    client = TestClient(build_app(static_dir))
+    headers = {"Accept-Encoding": "gzip"}
+
+    # 2. Responses above the threshold are compressed; small and pre-encoded ones are not
+    response = client.get("/large", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content)
+    assert response.json()["results"][0] == {"crop": "rice", "confidence": 0.9}
+    assert "content-encoding" not in client.get("/small", headers=headers).headers
+    assert client.get("/text", headers=headers).headers["content-encoding"] == "identity"
+    assert "content-encoding" not in client.get("/large", headers={"Accept-Encoding": "identity"}).headers
+    print("✅ Bodies above the size threshold compressed")
+
+    # 3. Streamed bodies are compressed chunk by chunk
+    response = client.get("/lines", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.text.splitlines()[199] == '{"index": 199}'
+    print("✅ Streamed NDJSON compressed")
+
+    # 4. Static assets: hashed URL, precompressed variant, immutable caching
+    url = static_url("style.css")
+    assert url.startswith("/static/style.") and url.endswith(".css") and url != "/static/style.css"
+    with open(os.path.join(static_dir, url[len("/static/"):] + ".gz"), "rb") as f:
+        assert gzip.decompress(f.read()).decode() == CSS
+
+    response = client.get(url, headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"].startswith("text/css")
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.text == CSS
+
+    response = client.get("/static/style.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers and response.text == CSS
+    assert response.headers["cache-control"] == "no-cache"
+    revalidated = client.get("/static/style.css", headers={"Accept-Encoding": "identity", "If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    print("✅ Static assets served precompressed with cache headers")
+
+
+if __name__ == "__main__":
+    test_compression()
\ No newline at end of file
@@ -0,0 +1,145 @@
+"""
+Crop Training Test
+Checks feedback labelling, chunked streaming, parallel candidate training and the versioned artifact
+"""
+import sys
+import os
+import csv
+import json
+import tempfile
+
+import numpy as np
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.database import Base
+from app.db_models import CropPrediction, PredictionFeedback
+from app.services.crop_service import CropRecommendationService
+from app.services.crop_training import (
+    ENCODER_FILE, MODEL_FILE, REPORT_FILE, CropTrainingPipeline, iter_feedback_rows, promote
+)
+from benchmarks.stub_models import CROP_CENTROIDS
+
+
+class CentroidModel:
+    """Nearest-centroid classifier with the fit/predict/predict_proba interface"""
+
+    def fit(self, features, labels):
+        self.classes_ = np.unique(labels)
+        self.centroids = np.stack([features[labels == label].mean(axis=0) for label in self.classes_])
+        self.scale = features.std(axis=0) + 1e-6
+        return self
+
+    def predict_proba(self, features):
+        distances = np.linalg.norm((features[:, None, :] - self.centroids[None]) / self.scale, axis=-1)
+        weights = np.exp(-distances)
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def predict(self, features):
+        return self.classes_[np.argmax(self.predict_proba(features), axis=1)]
+
+
+class FirstClassModel(CentroidModel):
+    """Always predicts the first class"""
+
+    def predict(self, features):
+        return np.full(len(features), self.classes_[0])
+
+
+def centroid(threads):
+    return CentroidModel()
+
+
+def first_class(threads):
+    return FirstClassModel()
+
+
+def missing(threads):
+    import not_installed_booster  # noqa: F401
+
+
+def samples(crop, count, rng):
+    return rng.normal(CROP_CENTROIDS[crop], np.abs(CROP_CENTROIDS[crop]) * 0.05 + 0.1, (count, 7))
+
+
+def test_crop_training():
+    print("Testing crop model training...")
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'train.db')}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    rng = np.random.default_rng(0)
+
+    # Predictions: confirmed, corrected, rejected without correction and without feedback
+    crops = ["rice", "maize", "chickpea"]
+    for crop in crops:
+        for row in samples(crop, 40, rng):
+            prediction = CropPrediction(**dict(zip(CropRecommendationService.FEATURE_NAMES, map(float, row))), recommended_crop=crop)
+            db.add(prediction)
+            db.flush()
+            db.add(PredictionFeedback(prediction_type="crop", prediction_id=prediction.id, correct=True))
+    wrong = CropPrediction(**dict(zip(CropRecommendationService.FEATURE_NAMES, CROP_CENTROIDS["maize"])), recommended_crop="rice")
+    rejected = CropPrediction(**dict(zip(CropRecommendationService.FEATURE_NAMES, CROP_CENTROIDS["rice"])), recommended_crop="cotton")
+    unconfirmed = CropPrediction(**dict(zip(CropRecommendationService.FEATURE_NAMES, CROP_CENTROIDS["rice"])), recommended_crop="rice")
+    db.add_all([wrong, rejected, unconfirmed])
+    db.flush()
+    db.add_all([
+        PredictionFeedback(prediction_type="crop", prediction_id=wrong.id, correct=True),
+        PredictionFeedback(prediction_type="crop", prediction_id=wrong.id, correct=False, actual_label=" Maize "),
+        PredictionFeedback(prediction_type="crop", prediction_id=rejected.id, correct=False),
+        PredictionFeedback(prediction_type="disease", prediction_id=unconfirmed.id, correct=True),
+    ])
+    db.commit()
+
+    # 1. Labels come from the latest feedback, streamed in chunks
+    chunks = list(iter_feedback_rows(db, chunk_size=50))
+    assert len(chunks) == 3 and all(len(labels) <= 50 for _, labels, _ in chunks)
+    labels = [label for _, chunk_labels, _ in chunks for label in chunk_labels]
+    assert len(labels) == 121 and labels[-1] == "maize"
+    assert sum(counts["corrected"] for _, _, counts in chunks) == 1
+    with_unconfirmed = [label for _, chunk_labels, _ in iter_feedback_rows(db, 50, include_unconfirmed=True) for label in chunk_labels]
+    assert len(with_unconfirmed) == 122
+    print("✅ Feedback labels streamed in chunks")
+
+    # 2. Seed CSV rows join the feedback rows
+    seed_path = os.path.join(workdir, "seed.csv")
+    with open(seed_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["N", "P", "K", "temperature", "humidity", "ph", "rainfall", "label"])
+        for row in samples("cotton", 30, rng):
+            writer.writerow([*row, "cotton"])
+    pipeline = CropTrainingPipeline(
+        candidates={"centroid": centroid, "first_class": first_class, "missing": missing},
+        output_dir=os.path.join(workdir, "trained"), chunk_size=50, n_jobs=2
+    )
+    features, labels, sources = pipeline.load_data(db, seed_path)
+    assert features.shape == (151, 7) and sources["seed"] == 30 and sources["confirmed"] == 120
+    print("✅ Seed data loaded alongside feedback")
+
+    # 3. Candidates train in parallel; the best on the holdout is written as an artifact
+    report = pipeline.train(features, labels, sources, baseline_dir=None)
+    assert report["winner"] == "centroid"
+    assert report["candidates"]["centroid"]["macro_f1"] > report["candidates"]["first_class"]["macro_f1"]
+    assert "skipped" in report["candidates"]["missing"]
+    assert report["candidates"]["centroid"]["train_seconds"] >= 0 and report["peak_rss_mb"] > 0
+    assert sorted(os.listdir(report["artifact"])) == sorted([ENCODER_FILE, MODEL_FILE, REPORT_FILE])
+    with open(os.path.join(report["artifact"], REPORT_FILE)) as f:
+        assert json.load(f)["version"] == report["version"]
+    print("✅ Best candidate selected on the holdout and saved with its report")
+
+    # 4. The artifact loads in the crop service, and can be promoted for shadow evaluation
+    promote(report["artifact"], os.path.join(workdir, "candidate"))
+    service = CropRecommendationService(
+        os.path.join(workdir, "candidate", MODEL_FILE), os.path.join(workdir, "candidate", ENCODER_FILE)
+    )
+    result = service.predict_crop(*CROP_CENTROIDS["cotton"])
+    assert result["recommended_crop"] == "cotton"
+    print("✅ Artifact served by CropRecommendationService")
+    db.close()
+
+
+if __name__ == "__main__":
+    test_crop_training()
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""
+Feedback Log Test
+Checks batched feedback writes, retries while the database fails, and compaction into Parquet segments
+"""
+import sys
+import os
+import tempfile
+import time
+
+import pyarrow.parquet as pq
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.database import Base
+from app.db_models import CropPrediction, DiseasePrediction, PredictionFeedback
+from app.services.feedback_service import FeedbackCompactor, FeedbackLog
+from app.utils.file_lock import exclusive_file_lock
+
+
+class FailingSessions:
+    """Session factory whose sessions fail until healed"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.failing = True
+
+    def __call__(self):
+        if self.failing:
+            raise RuntimeError("database is locked")
+        return self.factory()
+
+
+def test_feedback():
+    print("Testing feedback log...")
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'feedback.db')}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    crop = CropPrediction(recommended_crop="rice", confidence=0.9)
+    disease = DiseasePrediction(disease="Tomato___Early_blight", confidence=0.6)
+    db.add_all([crop, disease])
+    db.commit()
+
+    # 1. Entries are buffered and written in bulk batches by the background thread
+    log = FeedbackLog(Session, batch_size=3, flush_interval=60)
+    log.start()
+    for _ in range(2):
+        log.append("crop", crop.id, correct=True)
+    assert db.query(PredictionFeedback).count() == 0 and log.pending == 2
+    log.append("disease", disease.id, actual_label="Tomato___Late_blight", notes="spots spread fast")
+    for _ in range(50):
+        if db.query(PredictionFeedback).count() == 3:
+            break
+        time.sleep(0.05)
+    assert db.query(PredictionFeedback).count() == 3 and log.pending == 0
+    correction = db.query(PredictionFeedback).filter(PredictionFeedback.prediction_type == "disease").one()
+    assert correction.correct is False and correction.actual_label == "Tomato___Late_blight"
+    print("✅ Full batch written with one bulk insert")
+
+    # 2. stop() writes what is left; feedback must confirm or correct
+    log.append("crop", crop.id, correct=False, actual_label="maize")
+    log.stop()
+    assert db.query(PredictionFeedback).count() == 4
+    try:
+        log.append("crop", crop.id)
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+    print("✅ Buffered entries flushed on stop, empty feedback rejected")
+
+    # 3. Failed writes are retried, dropping the oldest beyond max_pending
+    sessions = FailingSessions(Session)
+    failing = FeedbackLog(sessions, batch_size=10, max_pending=3)
+    for label in ["a", "b", "c", "d"]:
+        failing.append("crop", crop.id, actual_label=label)
+    assert failing.flush() == 0 and failing.pending == 3
+    sessions.failing = False
+    assert failing.flush() == 3
+    labels = [row.actual_label for row in db.query(PredictionFeedback).order_by(PredictionFeedback.id)][-3:]
+    assert labels == ["b", "c", "d"]
+    print("✅ Entries kept for retry while the database is unavailable")
+
+    # 4. Compaction writes new rows to a segment named after its id range
+    compactor = FeedbackCompactor(os.path.join(workdir, "parquet"), segment_rows=100, merge_segments=3, batch_rows=2)
+    result = compactor.compact(db)
+    assert result == {"rows": 7, "segment": "feedback-000000000001-000000000007.parquet", "merged": 0, "skipped": False}
+    table = pq.read_table(os.path.join(compactor.output_dir, result["segment"]))
+    assert table.num_rows == 7 and table.schema == compactor.schema()
+    rows = table.to_pylist()
+    assert rows[0]["predicted_label"] == "rice" and rows[2]["predicted_label"] == "Tomato___Early_blight"
+    assert rows[2]["confidence"] == 0.6 and rows[2]["notes"] == "spots spread fast"
+    assert compactor.compact(db)["rows"] == 0
+    print("✅ New feedback compacted into a Parquet segment with prediction labels")
+
+    # 5. Small segments are merged, and leftovers of an interrupted merge removed
+    for _ in range(2):
+        log.append("crop", crop.id, correct=True)
+        log.flush()
+        result = compactor.compact(db)
+    assert result["merged"] == 3
+    segments = compactor.segments()
+    assert [(segment.first_id, segment.last_id) for segment in segments] == [(1, 9)]
+    assert pq.read_table(segments[0].path).column("id").to_pylist() == list(range(1, 10))
+    stale = os.path.join(compactor.output_dir, "feedback-000000000008-000000000008.parquet")
+    pq.write_table(pq.read_table(segments[0].path).slice(7, 1), stale)
+    log.append("disease", disease.id, correct=True)
+    log.flush()
+    compactor.compact(db)
+    assert not os.path.exists(stale)
+    stats = compactor.get_stats()
+    assert stats["rows"] == 10 and stats["last_id"] == 10
+    print("✅ Segments merged and superseded files cleaned up")
+
+    # 6. A run is skipped while another process holds the compaction lock
+    log.append("crop", crop.id, correct=True)
+    log.flush()
+    before = compactor.segments()
+    with exclusive_file_lock(os.path.join(compactor.output_dir, ".compaction.lock")) as locked:
+        assert locked
+        assert compactor.compact(db) == {"rows": 0, "segment": None, "merged": 0, "skipped": True}
+        assert compactor.segments() == before
+    assert compactor.compact(db)["rows"] == 1
+    print("✅ Compaction skipped while another run holds the lock")
+    db.close()
+
+
+if __name__ == "__main__":
+    test_feedback()
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""
+Prediction History Test
+Checks keyset pagination of the history list: ordering on equal timestamps, cursors and the last page
+"""
+import sys
+import os
+import base64
+import tempfile
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.auth import create_access_token, get_password_hash
+from app.database import Base, get_db
+from app.db_models import CropPrediction, User
+from app.routes import history_routes
+from app.services.history_service import PredictionHistoryService
+
+
+def test_history():
+    print("Testing prediction history pagination...")
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'history.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    ravi = User(email="ravi@example.com", username="ravi", hashed_password=get_password_hash("secret123"))
+    other = User(email="asha@example.com", username="asha", hashed_password=get_password_hash("secret123"))
+    db.add_all([ravi, other])
+    db.commit()
+
+    # Five predictions share one timestamp, two are later; another user's rows interleave
+    same = datetime(2026, 3, 1, 8, 0)
+    for i in range(7):
+        created_at = same if i < 5 else same + timedelta(hours=i)
+        db.add(CropPrediction(user_id=ravi.id, recommended_crop=f"crop-{i}", created_at=created_at))
+        db.add(CropPrediction(user_id=other.id, recommended_crop="rice", created_at=created_at))
+    db.commit()
+    service = PredictionHistoryService()
+
+    # 1. Pages are newest first, ties broken by id, with no row repeated or skipped
+    pages, cursor = [], None
+    while True:
+        page = service.list_history(db, ravi.id, "crop", cursor=cursor, limit=2)
+        pages.append([item["recommended_crop"] for item in page["items"]])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [["crop-6", "crop-5"], ["crop-4", "crop-3"], ["crop-2", "crop-1"], ["crop-0"]]
+
+    # Rows stamped by the database default (second resolution text on SQLite) page the same way
+    db.add_all([CropPrediction(user_id=other.id, recommended_crop="wheat") for _ in range(4)])
+    db.commit()
+    seen, cursor = [], None
+    for _ in range(20):
+        page = service.list_history(db, other.id, "crop", cursor=cursor, limit=1)
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 11
+    print("✅ Stable order across pages on equal created_at")
+
+    # 2. Cursors round-trip the keyset position of the page's last row
+    page = service.list_history(db, ravi.id, "crop", limit=3)
+    created_at, entry_id = PredictionHistoryService._decode_cursor(page["next_cursor"])
+    assert entry_id == page["items"][-1]["id"]
+    assert created_at == same and page["items"][-1]["created_at"] == same.isoformat()
+    assert PredictionHistoryService._encode_cursor(created_at, entry_id) == page["next_cursor"]
+    print("✅ Cursor round-trips the last row's position")
+
+    # 3. A last page that fills the limit exactly ends the listing
+    page = service.list_history(db, ravi.id, "crop", cursor=page["next_cursor"], limit=4)
+    assert len(page["items"]) == 4 and page["next_cursor"] is None
+    assert service.list_history(db, ravi.id, "irrigation") == {"items": [], "next_cursor": None}
+    print("✅ next_cursor is None on the last page")
+
+    # 4. Malformed cursors are rejected with 400
+    # Not base64, not JSON, and well-formed JSON of the wrong shape
+    for cursor in ["not-a-cursor!", base64.urlsafe_b64encode(b"[1, 2").decode(), base64.urlsafe_b64encode(b'{"id": 3}').decode()]:
+        try:
+            service.list_history(db, ravi.id, "crop", cursor=cursor)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+    db.close()
+
+    app = FastAPI()
+    app.include_router(history_routes.router, prefix="/history")
+
+    def override_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ravi'})}"}
+    response = client.get("/history/crop", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert response.status_code == 400 and response.json()["detail"] == "Invalid history cursor"
+    assert client.get("/history/crop", params={"limit": 2}, headers=headers).json()["next_cursor"]
+    print("✅ Malformed cursor rejected with 400")
+
+
+if __name__ == "__main__":
+    test_history()
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Inference Scheduler Test
+Checks lane priority, per-lane concurrency caps, load shedding and batch prediction
+"""
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.crop_service import CropRecommendationService
+from app.services.inference_scheduler import InferenceScheduler, LaneFull, chunked
+
+LANES = {
+    "interactive": (8.0, 1, 100),
+    "bulk": (2.0, 1, 100),
+    "background": (1.0, 1, 2),
+}
+
+
+class ThresholdModel:
+    """Predicts class 1 when rainfall exceeds 100, else class 0"""
+
+    def predict(self, features):
+        return (features[:, 6] > 100).astype(int)
+
+    def predict_proba(self, features):
+        rainy = (features[:, 6] > 100).astype(float)
+        return np.stack([1 - rainy * 0.9, rainy * 0.9 + 0.05], axis=1)
+
+
+class Encoder:
+    classes_ = np.array(["chickpea", "rice"])
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices)]
+
+
+def test_inference_scheduler():
+    print("Testing inference scheduler...")
+
+    # 1. With one worker busy, queued interactive work overtakes earlier bulk batches
+    scheduler = InferenceScheduler(workers=1, lanes=LANES)
+    release = threading.Event()
+    order = []
+    blocker = scheduler.submit("background", release.wait)
+    bulk = [scheduler.submit("bulk", order.append, f"bulk-{i}", cost=256) for i in range(3)]
+    interactive = [scheduler.submit("interactive", order.append, f"interactive-{i}") for i in range(3)]
+    release.set()
+    for future in [blocker, *bulk, *interactive]:
+        future.result(timeout=5)
+    assert order[:3] == ["interactive-0", "interactive-1", "interactive-2"], order
+    print("✅ Interactive work runs ahead of queued bulk batches")
+
+    # 2. Per-lane concurrency caps hold even with spare workers
+    scheduler = InferenceScheduler(workers=4, lanes=LANES)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+
+    futures = [scheduler.submit("bulk", work) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    assert active["peak"] == 1, active
+    print("✅ Bulk lane never exceeds its concurrency cap")
+
+    # 3. A full lane sheds load; unknown lanes and errors surface to the caller
+    release = threading.Event()
+    running = scheduler.submit("background", release.wait)
+    queued = [scheduler.submit("background", lambda: None) for _ in range(2)]
+    try:
+        scheduler.submit("background", lambda: None)
+        raise AssertionError("expected LaneFull")
+    except LaneFull:
+        pass
+    release.set()
+    for future in [running, *queued]:
+        future.result(timeout=5)
+    try:
+        scheduler.submit("urgent", lambda: None)
+        raise AssertionError("expected ValueError")
+    except ValueError:
+        pass
+    failing = scheduler.submit("interactive", lambda: 1 / 0)
+    try:
+        failing.result(timeout=5)
+        raise AssertionError("expected ZeroDivisionError")
+    except ZeroDivisionError:
+        pass
+    print("✅ Full lanes refuse work and task errors reach the caller")
+
+    # 4. Per-lane queue latency is reported
+    stats = scheduler.get_stats()
+    assert stats["background"]["completed"] == 3
+    assert stats["background"]["queue_p99_ms"] >= stats["background"]["queue_p50_ms"] >= 0
+    assert stats["interactive"]["queued"] == 0 and stats["interactive"]["in_flight"] == 0
+    print(f"✅ Lane stats: {stats['background']}")
+
+    # 5. Batch crop prediction matches single-row prediction
+    service = CropRecommendationService.__new__(CropRecommendationService)
+    service.model = ThresholdModel()
+    service.label_encoder = Encoder()
+    rows = [
+        {"nitrogen": 90, "phosphorus": 42, "potassium": 43, "temperature": 21, "humidity": 82, "ph": 6.5, "rainfall": rain}
+        for rain in (20, 150, 250, 40, 120)
+    ]
+    batch = []
+    for chunk in chunked(rows, 2):
+        batch.extend(scheduler.submit("bulk", service.predict_crops, chunk, cost=len(chunk)).result(timeout=5))
+    singles = [service.predict_crop(**row) for row in rows]
+    assert batch == singles, (batch, singles)
+    assert [result["recommended_crop"] for result in batch] == ["chickpea", "rice", "rice", "chickpea", "rice"]
+    print("✅ Chunked batch predictions match per-row predictions")
+
+    scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    test_inference_scheduler()
\ No newline at end of file
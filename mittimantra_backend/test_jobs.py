@@ -0,0 +1,163 @@
+"""
+Background Job Test
+Checks chunked job processing, crash recovery via leases and the /jobs endpoints
+"""
+import sys
+import os
+import json
+import tempfile
+import time
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.database import Base, get_db
+from app.db_models import JobChunk
+from app.routes import job_routes
+from app.services.crop_service import CropRecommendationService
+from app.services.job_service import JobService
+from app.services.job_worker import JobWorker
+
+
+class ThresholdModel:
+    """Predicts class 1 when rainfall exceeds 100, else class 0"""
+
+    def predict(self, features):
+        return (features[:, 6] > 100).astype(int)
+
+
+class Encoder:
+    classes_ = np.array(["chickpea", "rice"])
+
+    def inverse_transform(self, indices):
+        return self.classes_[np.asarray(indices)]
+
+
+class FakeDiseaseService:
+    def predict_diseases(self, images):
+        return [{"disease": "healthy"} if image.startswith(b"leaf") else {"error": "not an image"} for image in images]
+
+
+def make_rows(count):
+    return [
+        {"nitrogen": 90, "phosphorus": 42, "potassium": 43, "temperature": 21, "humidity": 82, "ph": 6.5, "rainfall": float(i * 10)}
+        for i in range(count)
+    ]
+
+
+def test_jobs():
+    print("Testing background jobs...")
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'jobs.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    crop = CropRecommendationService.__new__(CropRecommendationService)
+    crop.model = ThresholdModel()
+    crop.label_encoder = Encoder()
+    services = {"crop": crop, "disease": FakeDiseaseService()}
+    jobs = JobService(storage_dir=os.path.join(workdir, "data"), lease_seconds=0.2, max_attempts=2)
+
+    # 1. A worker that dies mid-chunk loses its lease and another worker resumes the job
+    db = Session()
+    job = jobs.create_crop_job(db, make_rows(25), chunk_size=10)
+    assert job.chunk_count == 3 and job.status == "queued"
+
+    crashed = jobs.claim_chunk(db, "crashed-worker")
+    assert crashed.chunk_index == 0
+    worker = JobWorker(jobs, Session, worker_id="worker-1", services=services, poll_interval=0.05)
+    assert worker.run(max_chunks=2) == 2
+    db.expire_all()
+    job = jobs.get_job(db, job.id)
+    assert job.status == "running" and job.processed_items == 15, jobs.serialize_job(job)
+    print("✅ Other chunks progress while one is held by a dead worker")
+
+    time.sleep(0.3)
+    assert worker.run(max_chunks=1) == 1
+    db.expire_all()
+    job = jobs.get_job(db, job.id)
+    assert job.status == "completed" and job.processed_items == 25 and job.finished_chunks == 3
+    assert not jobs.complete_chunk(db, crashed, "crashed-worker", [])
+    results = list(jobs.iter_results(db, job.id))
+    assert [result["index"] for result in results] == list(range(25))
+    assert results[5]["recommended_crop"] == "chickpea" and results[20]["recommended_crop"] == "rice"
+    print("✅ Expired lease reclaimed; late results from the dead worker are discarded")
+
+    # 2. Endpoints: submit, poll, download, cancel
+    app = FastAPI()
+    app.include_router(job_routes.router, prefix="/jobs")
+
+    def override_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    job_routes.job_service = jobs
+    job_routes.SessionLocal = Session
+    client = TestClient(app)
+
+    response = client.post("/jobs/disease", files=[
+        ("files", ("a.png", b"leaf-a", "image/png")),
+        ("files", ("b.png", b"junk", "image/png")),
+        ("files", ("c.png", b"leaf-c", "image/png")),
+    ], data={"chunk_size": "2"})
+    assert response.status_code == 202, response.text
+    job_id = response.json()["id"]
+    assert client.get(f"/jobs/{job_id}/results").status_code == 409
+    worker.run(max_chunks=2)
+    status = client.get(f"/jobs/{job_id}").json()
+    assert status["status"] == "completed" and status["failed_items"] == 1, status
+    lines = [json.loads(line) for line in client.get(f"/jobs/{job_id}/results").text.splitlines()]
+    assert [line["filename"] for line in lines] == ["a.png", "b.png", "c.png"]
+    assert lines[1]["error"] == "not an image"
+    assert not os.path.exists(os.path.join(jobs.storage_dir, job_id))
+    print("✅ Disease job results downloaded as JSON Lines; uploads removed")
+
+    job_id = client.post("/jobs/crop", json={"rows": make_rows(5)}).json()["id"]
+    assert client.delete(f"/jobs/{job_id}").json()["status"] == "cancelled"
+    assert worker.run_once() is False
+    assert client.get("/jobs/unknown").status_code == 404
+    print("✅ Cancelled jobs are never handed to workers")
+
+    # A chunk claimed before cancellation still finishes with its inputs in place
+    job_id = client.post("/jobs/disease", files=[
+        ("files", ("a.png", b"leaf-a", "image/png")),
+        ("files", ("b.png", b"leaf-b", "image/png")),
+    ], data={"chunk_size": "1"}).json()["id"]
+    claimed = jobs.claim_chunk(db, "busy-worker")
+    abandoned = jobs.claim_chunk(db, "dying-worker")
+    assert client.delete(f"/jobs/{job_id}").json()["status"] == "cancelled"
+    assert os.path.exists(os.path.join(jobs.storage_dir, job_id))
+    results = worker.run_chunk("disease", json.loads(claimed.payload))
+    assert jobs.complete_chunk(db, claimed, "busy-worker", results) and results[0]["disease"] == "healthy"
+    assert os.path.exists(os.path.join(jobs.storage_dir, job_id))
+    # The other chunk's worker died; its inputs go once the lease expires
+    time.sleep(0.3)
+    assert worker.run_once() is False
+    assert not os.path.exists(os.path.join(jobs.storage_dir, job_id))
+    print("✅ Cancelled job inputs kept until claimed chunks finish or expire")
+
+    # 3. A chunk that keeps failing is marked failed after max_attempts
+    failing = JobWorker(jobs, Session, worker_id="worker-2", services={"crop": object()}, poll_interval=0.05)
+    job = jobs.create_crop_job(db, make_rows(3))
+    failing.run(max_chunks=2)
+    db.expire_all()
+    job = jobs.get_job(db, job.id)
+    assert job.status == "failed" and job.failed_items == 3
+    chunk = db.query(JobChunk).filter(JobChunk.job_id == job.id).one()
+    assert chunk.attempts == 2 and "predict_crops" in chunk.error
+    print("✅ Chunks are retried, then failed with their error")
+    db.close()
+
+
+if __name__ == "__main__":
+    test_jobs()
\ No newline at end of file
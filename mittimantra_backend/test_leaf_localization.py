@@ -0,0 +1,64 @@
+"""
+Leaf Localization Test
+Checks green-channel leaf cropping and close-up tiling before classification
+"""
+import sys
+import os
+import io
+
+import numpy as np
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.utils.image_utils import _decode, locate_leaf, preprocess_image, preprocess_leaf_crops
+from benchmarks.stub_models import sample_field_photo, sample_leaf_image
+
+
+def test_leaf_localization():
+    print("Testing leaf localization...")
+
+    # 1. A small leaf in a field photo is found and boxed with a margin
+    image_bytes, leaf_mask = sample_field_photo()
+    box = locate_leaf(_decode(image_bytes))
+    assert box is not None
+    left, top, right, bottom = box
+    rows, cols = np.nonzero(leaf_mask)
+    assert left <= cols.min() and right > cols.max() and top <= rows.min() and bottom > rows.max()
+    assert leaf_mask[top:bottom, left:right].mean() > 10 * leaf_mask.mean()
+    assert abs((right - left) - (bottom - top)) <= 1
+    print("✅ Leaf located by green-channel segmentation")
+
+    # 2. Frames that are all leaf, or have no leaf, are left whole
+    assert locate_leaf(_decode(sample_leaf_image())) is None
+    buffer = io.BytesIO()
+    Image.fromarray(np.full((300, 400, 3), (115, 85, 55), dtype=np.uint8)).save(buffer, format="PNG")
+    assert locate_leaf(_decode(buffer.getvalue())) is None
+    uncropped = preprocess_image(buffer.getvalue(), (32, 32), crop_to_leaf=True)
+    assert np.allclose(uncropped, preprocess_image(buffer.getvalue(), (32, 32), crop_to_leaf=False))
+    print("✅ Whole frame kept when there is nothing to crop")
+
+    # 3. The model input is mostly leaf after cropping
+    full = preprocess_image(image_bytes, (64, 64), crop_to_leaf=False)
+    cropped = preprocess_image(image_bytes, (64, 64), crop_to_leaf=True)
+    assert full.shape == cropped.shape == (64, 64, 3) and cropped.dtype == np.float32
+
+    def green_share(array):
+        return float(((2 * array[..., 1] - array[..., 0] - array[..., 2]) > 0.1).mean())
+
+    assert green_share(cropped) > 0.3 > green_share(full)
+    print("✅ Leaf fills the model input after cropping")
+
+    # 4. Large leaves add close-up tiles; small ones and max_tiles=0 do not
+    large_bytes, _ = sample_field_photo(width=4000, height=3000)
+    crops = preprocess_leaf_crops(large_bytes, (224, 224), max_tiles=4)
+    assert crops.shape == (5, 224, 224, 3)
+    assert preprocess_leaf_crops(large_bytes, (224, 224), max_tiles=0).shape == (1, 224, 224, 3)
+    assert preprocess_leaf_crops(image_bytes, (224, 224), max_tiles=4).shape == (1, 224, 224, 3)
+    assert np.allclose(crops[0], preprocess_image(large_bytes, (224, 224), crop_to_leaf=True))
+    print("✅ Large leaves tiled for one batched forward pass")
+
+
+if __name__ == "__main__":
+    test_leaf_localization()
\ No newline at end of file
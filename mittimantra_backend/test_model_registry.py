@@ -0,0 +1,100 @@
+"""
+Model Registry Test
+Checks versioned loading, hot swaps with draining leases and failed reloads
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.model_registry import ModelRegistry, ModelSpec, ModelUnavailable, model_version_header
+
+
+class TextModelService:
+    """Stand-in service whose 'model' is the text of its file"""
+
+    def __init__(self, path):
+        with open(path) as f:
+            self.answer = f.read()
+        if self.answer == "broken":
+            raise ValueError("corrupt model file")
+        self.warmed = False
+
+    def warm_up(self):
+        self.warmed = True
+
+    def predict(self):
+        return self.answer
+
+
+def write_model(path, text):
+    """Replace a model file atomically, as a deployment would"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+    # Distinct mtimes even on coarse-grained filesystems
+    stat_result = os.stat(path)
+    os.utime(path, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 1_000_000_000))
+
+
+def test_model_registry():
+    print("Testing model registry...")
+    models_dir = tempfile.mkdtemp()
+    path = os.path.join(models_dir, "model.txt")
+    write_model(path, "v1")
+    registry = ModelRegistry(models_dir, specs={"toy": ModelSpec(("model.txt",), TextModelService)}, watch_interval=0)
+
+    # 1. Nothing is served before loading; loaded versions are warmed and named by content
+    try:
+        with registry.lease("toy"):
+            raise AssertionError("lease should fail before loading")
+    except ModelUnavailable:
+        pass
+    assert registry.load_all() == {"toy": True}
+    first = registry.current("toy")
+    assert first.service.warmed and first.service.predict() == "v1" and len(first.version) == 12
+    assert registry.check_for_updates() == []
+    print("✅ Models load warmed up with content-derived versions")
+
+    # 2. New files swap in while an in-flight lease keeps the old version until it drains
+    with registry.lease("toy") as leased:
+        write_model(path, "v2")
+        assert registry.check_for_updates() == ["toy"]
+        second = registry.current("toy")
+        assert second.service.predict() == "v2" and second.version != first.version
+        assert leased is first and leased.service.predict() == "v1"
+        assert registry.get_stats()["toy"]["draining"][0]["version"] == first.version
+    assert registry.get_stats()["toy"]["draining"] == []
+    assert model_version_header(second) == {"X-Model-Version": f"toy={second.version}"}
+    print("✅ New version swapped in, old one drained after its last lease")
+
+    # 3. A broken file keeps the current version and is not retried until it changes
+    write_model(path, "broken")
+    assert registry.check_for_updates() == []
+    assert registry.current("toy") is second
+    assert registry.refresh("toy") is second
+    write_model(path, "v3")
+    assert registry.refresh("toy").service.predict() == "v3"
+    print("✅ Failed reloads keep serving the previous version")
+
+    # 4. Touching a file without changing it keeps the loaded version
+    current = registry.current("toy")
+    write_model(path, "v3")
+    assert registry.refresh("toy") is current
+
+    # 5. Admin-triggered reloads run in the background
+    write_model(path, "v4")
+    assert registry.reload_async()
+    deadline = time.time() + 5
+    while registry.current("toy").service.predict() != "v4" and time.time() < deadline:
+        time.sleep(0.01)
+    assert registry.current("toy").service.predict() == "v4"
+    print("✅ Background reload picked up the new file")
+
+
+if __name__ == "__main__":
+    test_model_registry()
\ No newline at end of file
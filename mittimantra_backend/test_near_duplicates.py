@@ -0,0 +1,103 @@
+"""
+Near-Duplicate Upload Test
+Checks perceptual hashing, the multi-index lookup and reuse of disease results for re-sent photos
+"""
+import sys
+import os
+import io
+
+import numpy as np
+from PIL import Image
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.disease_service import DiseaseDetectionService
+from app.utils.image_utils import decode_image
+from app.utils.perceptual_hash import NearDuplicateIndex, hamming_distance, phash
+from benchmarks.stub_models import sample_field_photo
+
+
+class CountingModel:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, batch, verbose=0):
+        self.batch_sizes.append(len(batch))
+        return np.tile([[0.95, 0.05]], (len(batch), 1))
+
+
+def reencode(image_bytes, quality, scale=1.0):
+    image = Image.open(io.BytesIO(image_bytes))
+    if scale != 1.0:
+        image = image.resize((int(image.width * scale), int(image.height * scale)))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def other_photo():
+    rng = np.random.default_rng(7)
+    pixels = np.kron(rng.integers(0, 255, (12, 16, 3)), np.ones((100, 100, 1))).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def test_near_duplicates():
+    print("Testing near-duplicate detection...")
+
+    # 1. Re-sent and recompressed photos hash close together; different photos do not
+    photo, _ = sample_field_photo()
+    original = phash(decode_image(photo).thumbnail)
+    assert phash(decode_image(photo).thumbnail) == original
+    assert hamming_distance(original, phash(decode_image(reencode(photo, 40, 0.5)).thumbnail)) <= 6
+    assert hamming_distance(original, phash(decode_image(sample_field_photo(seed=3)[0]).thumbnail)) <= 6
+    assert hamming_distance(original, phash(decode_image(other_photo()).thumbnail)) > 12
+    print("✅ Perceptual hash survives recompression and resizing")
+
+    # 2. Multi-index lookups find the nearest entry within the threshold
+    index = NearDuplicateIndex(max_distance=4, max_entries=3)
+    index.set(0b1111, "a")
+    index.set(0xFF << 56, "b")
+    assert index.get(0b1111) == (0, "a")
+    assert index.get(0b0111) == (1, "a")
+    assert index.get((0xFF << 56) | 0b11) == (2, "b")
+    assert index.get(0b11111111_11111111) is None
+    print("✅ Lookups match within the Hamming threshold")
+
+    # 3. Least recently used entries are evicted from every table
+    index.set(0xFF << 32, "c")
+    index.get(0b1111)
+    index.set(0xFF << 16, "d")
+    assert index.get(0xFF << 56) is None
+    assert index.get(0b1111) == (0, "a")
+    assert index.get_stats()["entries"] == 3
+    assert all(0xFF << 56 not in bucket for table in index._tables for bucket in table.values())
+    print("✅ Index bounded with LRU eviction")
+
+    # 4. The disease service skips the forward pass for near duplicates, single and batched
+    service = DiseaseDetectionService.__new__(DiseaseDetectionService)
+    service.model = CountingModel()
+    service.input_shape = (32, 32)
+    service.DISEASE_CLASSES = ["Tomato___Late_blight", "Tomato___healthy"]
+    service.tta_views = 0
+    service.tta_threshold = 0.8
+    service.leaf_tiles = 0
+    service.duplicates = NearDuplicateIndex(max_distance=6, max_entries=16)
+
+    first = service.predict_disease(photo)
+    again = service.predict_disease(reencode(photo, 50))
+    assert again == first and service.model.batch_sizes == [1]
+    again["disease"] = "changed"
+    assert service.predict_disease(photo)["disease"] == first["disease"]
+
+    results = service.predict_diseases([photo, other_photo(), b"not an image"])
+    assert service.model.batch_sizes == [1, 1]
+    assert results[0] == first and "disease" in results[1] and "error" in results[2]
+    assert service.duplicates.get_stats()["hits"] == 3
+    print("✅ Near-duplicate uploads answered without a forward pass")
+
+
+if __name__ == "__main__":
+    test_near_duplicates()
\ No newline at end of file
@@ -0,0 +1,99 @@
+"""
+Observability Test
+Checks route latency metrics, stage timings and OTLP span export
+"""
+import sys
+import os
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.middleware.observability import ObservabilityMiddleware
+from app.utils import tracing
+from app.utils.metrics import (
+    MODEL_IN_FLIGHT, MODEL_QUEUE_DEPTH, REQUEST_LATENCY, STAGE_LATENCY,
+    model_forward, model_request, registry, stage
+)
+from otlp_collector import make_handler
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with model_request("test-model"):
+            assert MODEL_QUEUE_DEPTH.value(model="test-model") == 1
+            with stage("upload_read"):
+                pass
+            with model_forward("test-model"):
+                assert MODEL_QUEUE_DEPTH.value(model="test-model") == 0
+                assert MODEL_IN_FLIGHT.value(model="test-model") == 1
+        return {"item_id": item_id}
+
+    return app
+
+
+def test_observability():
+    print("=" * 60)
+    print("TESTING OBSERVABILITY")
+    print("=" * 60)
+
+    received = []
+    output_path = "test_observability_spans.jsonl"
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(output_path, quiet=True))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/v1/traces"
+
+    previous_tracer = tracing.tracer
+    tracing.tracer = tracing.Tracer(tracing.OTLPExporter(endpoint, flush_interval=0.1))
+    try:
+        client = TestClient(build_app())
+
+        # 1. Route latency is labelled by template, not raw path
+        before = REQUEST_LATENCY.count(method="GET", route="/items/{item_id}", status=200)
+        assert client.get("/items/1").status_code == 200
+        assert client.get("/items/2").status_code == 200
+        assert client.get("/missing").status_code == 404
+        assert REQUEST_LATENCY.count(method="GET", route="/items/{item_id}", status=200) == before + 2
+        assert REQUEST_LATENCY.count(method="GET", route="<unmatched>", status=404) >= 1
+        print("✅ Request latency recorded per route template")
+
+        # 2. Stage timings and model gauges
+        assert STAGE_LATENCY.count(stage="model_forward") >= 2
+        assert MODEL_QUEUE_DEPTH.value(model="test-model") == 0
+        assert MODEL_IN_FLIGHT.value(model="test-model") == 0
+        text = registry.render()
+        assert 'mittimantra_http_request_duration_seconds_bucket{method="GET",route="/items/{item_id}",status="200",le="+Inf"}' in text
+        assert 'mittimantra_stage_duration_seconds_count{stage="upload_read"}' in text
+        print("✅ Stage timings and model gauges rendered")
+
+        # 3. Spans reach the collector with parent links
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline and len(received) < 6:
+            if os.path.exists(output_path):
+                with open(output_path, encoding="utf-8") as f:
+                    received = [json.loads(line) for line in f]
+            time.sleep(0.05)
+        roots = [span for span in received if span["kind"] == 2]
+        assert any(span["name"] == "GET /items/{item_id}" for span in roots), roots
+        children = [span for span in received if span["parent_id"] in {root["span_id"] for root in roots}]
+        assert {"upload_read", "model_forward"} <= {span["name"] for span in children}
+        print(f"✅ Collector received {len(received)} spans")
+    finally:
+        tracing.tracer = previous_tracer
+        server.shutdown()
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+if __name__ == "__main__":
+    test_observability()
\ No newline at end of file
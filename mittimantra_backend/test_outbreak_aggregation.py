@@ -0,0 +1,108 @@
+"""
+Disease Outbreak Aggregation Test
+Checks incremental roll-up of disease detections into daily summary rows
+"""
+import sys
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.database import Base
+from app.db_models import DiseasePrediction, DiseaseOutbreakStat
+from app.services.outbreak_service import OutbreakAggregationService
+
+engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base.metadata.create_all(bind=engine)
+
+
+def add_detection(db, disease, plant, region, confidence, severity):
+    detection = DiseasePrediction(
+        disease=disease, affected_plant=plant, region=region,
+        confidence=confidence, severity=severity
+    )
+    db.add(detection)
+    db.commit()
+    return detection
+
+
+def test_outbreak_aggregation():
+    print("=" * 60)
+    print("TESTING DISEASE OUTBREAK AGGREGATION")
+    print("=" * 60)
+
+    service = OutbreakAggregationService()
+    db = TestingSessionLocal()
+    try:
+        # 1. Initial batch
+        add_detection(db, "Late blight", "Potato", "Punjab", 0.9, "High")
+        add_detection(db, "Late blight", "Potato", "Punjab", 0.7, "Low")
+        add_detection(db, "Early blight", "Tomato", None, 0.85, "High")
+        add_detection(db, "healthy", "Tomato", None, 0.99, "None")
+
+        processed = service.refresh(db)
+        assert processed == 4, processed
+        assert db.query(DiseaseOutbreakStat).count() == 3
+        print("✅ Initial detections aggregated")
+
+        # 2. Refresh is incremental and idempotent
+        assert service.refresh(db) == 0
+        add_detection(db, "Late blight", "Potato", "Haryana", 0.95, "High")
+        assert service.refresh(db) == 1
+        print("✅ Refresh only reads new detections")
+
+        # 3. Top diseases read from the summary table
+        top = service.top_diseases(db, days=7)
+        assert [entry["disease"] for entry in top] == ["Late blight", "Early blight"]
+        assert top[0]["detections"] == 3
+        assert top[0]["high_severity"] == 2
+        assert sorted(top[0]["regions"]) == ["Haryana", "Punjab"]
+        print(f"✅ Top diseases: {top}")
+
+        trend = service.daily_counts(db, days=7)
+        assert sum(entry["detections"] for entry in trend) == 5
+        print("✅ Daily trend matches stored detections")
+
+        # 4. Refresh counts the rows it aggregated, not the id span
+        add_detection(db, "Leaf curl", "Chilli", None, 0.8, "Low")
+        deleted = add_detection(db, "Leaf curl", "Chilli", None, 0.8, "Low")
+        add_detection(db, "Leaf curl", "Chilli", None, 0.8, "Low")
+        db.delete(deleted)
+        db.commit()
+        assert service.refresh(db) == 2
+        print("✅ Gaps in the id range are not counted")
+
+        # 5. Windows use UTC dates like the buckets, whatever the server's time zone
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        db.add_all([
+            DiseasePrediction(disease="Rust", affected_plant="Wheat", confidence=0.9, created_at=now - timedelta(days=1)),
+            DiseasePrediction(disease="Smut", affected_plant="Wheat", confidence=0.9, created_at=now),
+        ])
+        db.commit()
+        service.refresh(db)
+        # A zone whose local date differs from the UTC date right now
+        original_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Etc/GMT-14" if now.hour >= 10 else "Etc/GMT+12"
+        time.tzset()
+        try:
+            diseases = [entry["disease"] for entry in service.top_diseases(db, days=1)]
+            assert "Smut" in diseases and "Rust" not in diseases, diseases
+            assert [entry["date"] for entry in service.daily_counts(db, days=1)] == [now.date().isoformat()]
+        finally:
+            if original_tz is None:
+                os.environ.pop("TZ")
+            else:
+                os.environ["TZ"] = original_tz
+            time.tzset()
+        print("✅ One-day window matches the UTC buckets in a far-off time zone")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_outbreak_aggregation()
@@ -0,0 +1,100 @@
+"""
+Page Cache Test
+Checks rendered page caching, invalidation on profile updates and template bytecode caching
+"""
+import sys
+import os
+import tempfile
+import time
+
+from fastapi import FastAPI
+from fastapi.templating import Jinja2Templates
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.auth import create_access_token, get_password_hash
+from app.database import Base, get_db
+from app.db_models import User
+from app.routes import auth_routes
+from app.utils.page_cache import RenderCache, anonymous_page_key, configure_templates, page_cache, user_page_key
+from app.utils.static_assets import static_url
+
+
+def test_page_cache():
+    print("Testing page cache...")
+
+    # 1. Anonymous pages are rendered once, whatever the query string
+    cache = RenderCache(ttl_seconds=60, max_entries=2)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return "<html>login</html>"
+
+    login = anonymous_page_key("login.html")
+    assert cache.get_or_render(login, render) == "<html>login</html>"
+    assert cache.get_or_render(anonymous_page_key("login.html"), render) == "<html>login</html>"
+    assert len(renders) == 1
+    cache.get_or_render(anonymous_page_key("register.html"), render)
+    assert len(renders) == 2
+    print("✅ Anonymous pages rendered once per template")
+
+    # 2. LRU eviction, TTL expiry and per-user invalidation
+    cache.set(user_page_key("ravi", "dashboard.html"), "ravi")
+    assert cache.get(login) is None and cache.get_stats()["entries"] == 2
+    cache.invalidate_user("ravi")
+    assert cache.get(user_page_key("ravi", "dashboard.html")) is None
+
+    short = RenderCache(ttl_seconds=0.05)
+    short.set(anonymous_page_key("register.html"), "page")
+    time.sleep(0.1)
+    assert short.get(anonymous_page_key("register.html")) is None
+    print("✅ Entries evicted, expired and invalidated")
+
+    # 3. Profile updates drop the user's cached dashboard
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'pages.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    db.add(User(email="ravi@example.com", username="ravi", hashed_password=get_password_hash("secret123")))
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.include_router(auth_routes.router, prefix="/auth")
+
+    def override_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'ravi'})}"}
+
+    key = user_page_key("ravi", "dashboard.html")
+    page_cache.set(key, "Welcome, ravi!")
+    response = client.put("/auth/me", json={"full_name": "Ravi Kumar"}, headers=headers)
+    assert response.status_code == 200 and response.json()["full_name"] == "Ravi Kumar"
+    assert page_cache.get(key) is None
+    print("✅ Dashboard cache invalidated on profile update")
+
+    # 4. Compiled templates are written to the bytecode cache
+    cache_dir = os.path.join(workdir, "template_cache")
+    templates = configure_templates(Jinja2Templates(directory="templates"), cache_dir=cache_dir)
+    templates.env.globals["static_url"] = static_url
+    html = templates.get_template("login.html").render({"request": None})
+    assert "/static/style" in html
+    assert os.listdir(cache_dir)
+    print("✅ Template bytecode cached")
+
+
+if __name__ == "__main__":
+    test_page_cache()
\ No newline at end of file
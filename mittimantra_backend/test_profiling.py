@@ -0,0 +1,101 @@
+"""
+Profiling Hooks Test
+Checks the admin gate, sampling profiler, tracemalloc summary and slow-request captures
+"""
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.auth import get_current_user
+from app.middleware.observability import ObservabilityMiddleware
+from app.routes.admin_routes import router as admin_router
+from app.utils.metrics import stage
+from app.utils.profiling import slow_requests
+
+current = {"user": SimpleNamespace(is_admin=True, is_active=True)}
+
+
+def busy_model_call(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+    app.include_router(admin_router, prefix="/api/admin")
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+
+    @app.get("/slow")
+    def slow_endpoint():
+        with stage("image_decode"):
+            busy_model_call(0.01)
+        with stage("model_forward"):
+            busy_model_call(0.12)
+        return {"ok": True}
+
+    return app
+
+
+def test_profiling():
+    print("=" * 60)
+    print("TESTING PROFILING HOOKS")
+    print("=" * 60)
+
+    client = TestClient(build_app())
+    threshold = slow_requests.threshold_ms
+    slow_requests.threshold_ms = 100
+    slow_requests.clear()
+    try:
+        # 1. Non-admins are rejected
+        current["user"] = SimpleNamespace(is_admin=False, is_active=True)
+        assert client.get("/api/admin/profiler").status_code == 403
+        current["user"] = SimpleNamespace(is_admin=True, is_active=True)
+        print("✅ Admin endpoints require is_admin")
+
+        # 2. Sampling profiler produces collapsed stacks
+        assert client.post("/api/admin/profiler/start?seconds=1&interval_ms=2").status_code == 202
+        assert client.post("/api/admin/profiler/start?seconds=1").status_code == 409
+        for _ in range(3):
+            client.get("/slow")
+        client.post("/api/admin/profiler/stop")
+        stacks = client.get("/api/admin/profiler/stacks").text
+        assert "busy_model_call" in stacks
+        line = stacks.splitlines()[0]
+        assert ";" in line and line.rsplit(" ", 1)[1].isdigit()
+        print(f"✅ Profiler collected {client.get('/api/admin/profiler').json()['samples']} samples")
+
+        # 3. tracemalloc summary
+        assert client.get("/api/admin/memory/top").status_code == 400
+        client.post("/api/admin/memory/start")
+        retained = [bytearray(1024) for _ in range(100)]
+        top = client.get("/api/admin/memory/top?limit=5").json()
+        assert top["traced_kb"] > 0 and len(top["top"]) <= 5
+        client.post("/api/admin/memory/stop")
+        del retained
+        print("✅ tracemalloc top allocations reported")
+
+        # 4. Slow requests keep the stack of their slowest stage
+        # (admin calls under tracemalloc can cross the threshold too)
+        captures = client.get("/api/admin/slow-requests").json()["requests"]
+        captures = [capture for capture in captures if capture["route"] == "/slow"]
+        assert captures
+        slowest = captures[0]["slowest_stage"]
+        assert slowest["name"] == "model_forward"
+        assert any("slow_endpoint" in frame for frame in slowest["stack"])
+        assert client.delete("/api/admin/slow-requests").status_code == 204
+        print("✅ Slow request captured with the slowest stage's stack")
+    finally:
+        slow_requests.threshold_ms = threshold
+
+
+if __name__ == "__main__":
+    test_profiling()
\ No newline at end of file
@@ -0,0 +1,147 @@
+"""
+Rate Limiting Test
+Checks token buckets, cost weighting and early 429 responses
+"""
+import sys
+import os
+import asyncio
+import sqlite3
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.auth import create_access_token
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.utils.rate_limit import MemoryRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
+body_reads = {"count": 0}
+
+
+def build_app(limiter):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+    @app.post("/predict-disease")
+    async def predict_disease(request: Request):
+        body_reads["count"] += 1
+        await request.body()
+        return {"ok": True}
+
+    @app.post("/irrigation-schedule")
+    async def irrigation_schedule():
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    return app
+
+
+def check_backend(backend):
+    limiter = RateLimiter(backend, capacity=10, refill_rate=0.001, costs={"/a": 4})
+    results = [limiter.check("alice", "/a").allowed for _ in range(3)]
+    assert results == [True, True, False], results
+    refused = limiter.check("alice", "/a")
+    assert refused.retry_after > 1000
+    assert limiter.check("bob", "/a").allowed
+    assert limiter.check("alice", "/free") is None
+
+    # A refund (request refused for global load) never lifts a bucket above capacity
+    assert backend.consume("client:carol", -4, 10, 0.001).remaining == 10
+    assert stored_tokens(backend, "client:carol") == 10
+
+
+def stored_tokens(backend, key):
+    """Tokens last written for a bucket"""
+    if isinstance(backend, MemoryRateLimitBackend):
+        return backend._buckets[key][0]
+    return backend._connection().execute("SELECT tokens FROM token_buckets WHERE key = ?", (key,)).fetchone()[0]
+
+
+def test_rate_limit():
+    print("=" * 60)
+    print("TESTING RATE LIMITING")
+    print("=" * 60)
+
+    # 1. Both backends enforce the same buckets
+    check_backend(MemoryRateLimitBackend())
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "buckets.db")
+        check_backend(SQLiteRateLimitBackend(path))
+        # A second process-level instance sees the same state
+        shared = RateLimiter(SQLiteRateLimitBackend(path), capacity=10, refill_rate=0.001, costs={"/a": 4})
+        assert not shared.check("alice", "/a").allowed
+    print("✅ Memory and SQLite buckets enforce limits per client")
+
+    # 2. Costly endpoints are refused with Retry-After before the body is read
+    limiter = RateLimiter(
+        MemoryRateLimitBackend(), capacity=25, refill_rate=0.5,
+        costs={"/predict-disease": 20, "/irrigation-schedule": 1}
+    )
+    client = TestClient(build_app(limiter))
+    upload = {"file": ("leaf.jpg", b"x" * 1024, "image/jpeg")}
+    assert client.post("/predict-disease", files=upload).status_code == 200
+    response = client.post("/predict-disease", files=upload)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert body_reads["count"] == 1
+    print(f"✅ Second upload refused (Retry-After {response.headers['retry-after']}s) without reading it")
+
+    # 3. Cheap endpoints still fit in the remaining budget; free paths are never limited
+    statuses = [client.post("/irrigation-schedule").status_code for _ in range(5)]
+    assert statuses == [200] * 5, statuses
+    assert all(client.get("/health").status_code == 200 for _ in range(50))
+    print("✅ Irrigation requests cost far less than disease uploads")
+
+    # 4. Authenticated users get their own bucket
+    token = create_access_token({"sub": "farmer1"})
+    response = client.post("/predict-disease", files=upload, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    print("✅ Buckets are keyed by user when a token is present")
+
+    # 5. A locked SQLite bucket file delays only the requests that need it
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "buckets.db")
+        limiter = RateLimiter(
+            SQLiteRateLimitBackend(path), capacity=100, refill_rate=1,
+            costs={"/irrigation-schedule": 1}
+        )
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN EXCLUSIVE")
+        timings = asyncio.run(concurrent_requests(build_app(limiter), blocker))
+        blocker.close()
+    assert timings["/irrigation-schedule"] >= 1.0
+    assert timings["/health"] < 0.5, timings
+    print(f"✅ Other requests served in {timings['/health'] * 1000:.0f} ms while the bucket file was locked")
+
+
+async def concurrent_requests(app, blocker):
+    """Time a rate-limited and a free request sent together while blocker holds the write lock"""
+    timings = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def timed(method, path):
+            started = time.perf_counter()
+            response = await client.request(method, path)
+            assert response.status_code == 200
+            timings[path] = time.perf_counter() - started
+
+        async def release():
+            await asyncio.sleep(1.0)
+            blocker.execute("ROLLBACK")
+
+        limited = asyncio.create_task(timed("POST", "/irrigation-schedule"))
+        await asyncio.sleep(0.05)
+        await asyncio.gather(timed("GET", "/health"), release(), limited)
+    return timings
+
+
+if __name__ == "__main__":
+    test_rate_limit()
\ No newline at end of file
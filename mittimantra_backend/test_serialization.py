@@ -0,0 +1,73 @@
+"""
+Serialization Test
+Checks orjson responses, trusted outputs and MessagePack negotiation
+"""
+import sys
+import os
+from datetime import date
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.middleware.content_negotiation import ContentNegotiationMiddleware
+from app.utils import serialization
+from app.utils.serialization import FastJSONResponse, accepts_msgpack, dumps, trusted_response
+
+
+def build_app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(ContentNegotiationMiddleware)
+
+    @app.get("/plan")
+    async def plan():
+        return {"day": date(2024, 6, 1), "depth_mm": 12.5}
+
+    @app.get("/batch")
+    async def batch():
+        return trusted_response({"results": [{"confidence": np.float32(0.5), "scores": np.arange(3)}]})
+
+    return app
+
+
+def test_serialization():
+    print("Testing serialization...")
+
+    # 1. numpy values, dates and non-string keys encode without conversion passes
+    assert dumps({"x": np.float64(1.5), "ids": np.array([1, 2]), 3: date(2024, 1, 2)}) == b'{"x":1.5,"ids":[1,2],"3":"2024-01-02"}'
+    print("✅ numpy values and dates encoded by orjson")
+
+    # 2. Default response class and trusted responses both serve JSON
+    client = TestClient(build_app())
+    response = client.get("/plan")
+    assert response.json() == {"day": "2024-06-01", "depth_mm": 12.5}
+    assert response.headers["vary"] == "Accept"
+    assert client.get("/batch").json() == {"results": [{"confidence": 0.5, "scores": [0, 1, 2]}]}
+    print("✅ JSON responses served by default and for trusted outputs")
+
+    # 3. Accept header parsing
+    if serialization.msgpack is None:
+        assert not accepts_msgpack("application/msgpack")
+        response = client.get("/batch", headers={"Accept": "application/msgpack"})
+        assert response.headers["content-type"] == "application/json"
+        print("✅ msgpack not installed: JSON served to MessagePack clients")
+        return
+
+    assert accepts_msgpack("application/json;q=0.5, application/msgpack")
+    assert accepts_msgpack("application/x-msgpack; q=0.8")
+    assert not accepts_msgpack("application/msgpack;q=0")
+    assert not accepts_msgpack("text/html, */*")
+
+    # 4. Negotiated MessagePack carries the same payload
+    response = client.get("/batch", headers={"Accept": "application/msgpack"})
+    assert response.headers["content-type"] == "application/msgpack"
+    assert serialization.msgpack.unpackb(response.content) == {"results": [{"confidence": 0.5, "scores": [0, 1, 2]}]}
+    assert client.get("/batch").headers["content-type"] == "application/json"
+    print("✅ MessagePack served when requested")
+
+
+if __name__ == "__main__":
+    test_serialization()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""
+Shadow Evaluation Test
+Checks sampled candidate scoring, comparison statistics and the bounded queue
+"""
+import sys
+import os
+import tempfile
+import time
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.model_registry import ModelRegistry, ModelSpec
+from app.services.shadow_service import ShadowEvaluator, run_timed
+
+
+class ThresholdCropService:
+    """Recommends rice above a rainfall threshold read from the model file"""
+
+    def __init__(self, path):
+        with open(path) as f:
+            self.threshold = float(f.read())
+
+    def predict_crop(self, rainfall):
+        crop = "rice" if rainfall > self.threshold else "chickpea"
+        return {"recommended_crop": crop, "confidence": 0.9 if crop == "rice" else 0.6}
+
+
+def make_registry(directory, threshold, role):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "crop.txt"), "w") as f:
+        f.write(str(threshold))
+    registry = ModelRegistry(directory, specs={"crop": ModelSpec(("crop.txt",), ThresholdCropService)}, watch_interval=0, role=role)
+    registry.load_all()
+    return registry
+
+
+def test_shadow():
+    print("Testing shadow evaluation...")
+    workdir = tempfile.mkdtemp()
+    production = make_registry(os.path.join(workdir, "models"), 100, "production")
+    candidates = make_registry(os.path.join(workdir, "candidate"), 150, "candidate")
+
+    # 1. Sampled requests are replayed on the candidate in the background and compared
+    evaluator = ShadowEvaluator(candidates, sample_rate=1.0, max_queue=100)
+    evaluator.start()
+    model = production.current("crop")
+    for rainfall in (50, 120, 200, 130):
+        result, seconds = run_timed(model.service.predict_crop, rainfall=rainfall)
+        assert evaluator.submit("crop", "predict_crop", (), {"rainfall": rainfall}, model, result, seconds)
+
+    deadline = time.time() + 5
+    while (not evaluator.get_stats()["comparisons"] or evaluator.get_stats()["comparisons"][0]["compared"] < 4) and time.time() < deadline:
+        time.sleep(0.01)
+    evaluator.stop()
+
+    stats = evaluator.get_stats()
+    comparison = stats["comparisons"][0]
+    assert comparison["production_version"] == model.version
+    assert comparison["candidate_version"] == candidates.current("crop").version
+    # Rainfall 120 and 130 are rice for production but chickpea for the candidate
+    assert comparison["compared"] == 4 and comparison["agreement_rate"] == 0.5
+    assert comparison["mean_confidence_delta"] == -0.15 and comparison["mean_abs_confidence_delta"] == 0.15
+    assert comparison["candidate_latency"]["p50_ms"] is not None
+    print("✅ Agreement, confidence deltas and latency recorded per version pair")
+
+    # 2. Nothing is shadowed without a sample hit or a candidate
+    assert not ShadowEvaluator(candidates, sample_rate=0.0).submit("crop", "predict_crop", (), {"rainfall": 1}, model, {}, 0.0)
+    empty = ModelRegistry(os.path.join(workdir, "missing"), specs=candidates.specs, watch_interval=0, role="candidate")
+    assert not ShadowEvaluator(empty, sample_rate=1.0).submit("crop", "predict_crop", (), {"rainfall": 1}, model, {}, 0.0)
+    print("✅ Requests without a sample hit or candidate are not shadowed")
+
+    # 3. A full queue drops samples instead of blocking the request
+    stalled = ShadowEvaluator(candidates, sample_rate=1.0, max_queue=1)
+    assert stalled.submit("crop", "predict_crop", (), {"rainfall": 1}, model, {}, 0.0)
+    assert not stalled.submit("crop", "predict_crop", (), {"rainfall": 2}, model, {}, 0.0)
+    assert stalled.get_stats()["dropped"] == 1 and stalled.get_stats()["queued"] == 1
+    print("✅ Bounded queue drops excess samples")
+
+
+if __name__ == "__main__":
+    test_shadow()
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Streaming Test
+Checks server-sent event encoding, streamed batch results and job event streams
+"""
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.database import Base, get_db
+from app.routes import job_routes
+from app.services.job_service import JobService
+from app.services.job_worker import JobWorker
+from app.utils.streaming import batch_events, format_event
+
+
+def parse_events(text):
+    """Split an event stream into (event, id, data) tuples"""
+    events = []
+    for block in filter(None, text.split("\n\n")):
+        fields = {}
+        for line in block.splitlines():
+            if line.startswith(":"):
+                continue
+            key, _, value = line.partition(": ")
+            fields[key] = value
+        if "data" in fields:
+            events.append((fields.get("event"), fields.get("id"), json.loads(fields["data"])))
+    return events
+
+
+class EchoCropService:
+    def predict_crops(self, rows):
+        return [{"rainfall": row["rainfall"]} for row in rows]
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_streaming():
+    print("Testing streaming...")
+
+    # 1. Event encoding
+    assert format_event({"a": 1}, event="result", event_id="3") == 'id: 3\nevent: result\ndata: {"a":1}\n\n'
+    print("✅ Events encode as id/event/data lines")
+
+    # 2. Batch results stream per item with per-chunk progress; failures end with an error event
+    async def chunks():
+        yield [{"crop": "rice"}, {"crop": "maize"}]
+        yield [{"crop": "wheat"}]
+        raise ValueError("Failed to predict crops: bad row")
+
+    events = parse_events("".join(asyncio.run(collect(batch_events(chunks(), 5)))))
+    assert [event for event, _, _ in events] == ["result", "result", "progress", "result", "progress", "error"]
+    assert [data["index"] for event, _, data in events if event == "result"] == [0, 1, 2]
+    assert events[-1][2] == {"detail": "Failed to predict crops: bad row", "processed": 3}
+    print("✅ Batch results streamed per item, errors reported in-stream")
+
+    # 3. Job events: results in input order, chunk IDs for resuming, done at the end
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(workdir, 'jobs.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    jobs = JobService(storage_dir=os.path.join(workdir, "data"))
+
+    db = Session()
+    rows = [{"rainfall": float(i)} for i in range(7)]
+    job = jobs.create_crop_job(db, rows, chunk_size=3)
+    JobWorker(jobs, Session, services={"crop": EchoCropService()}).run(max_chunks=3)
+
+    app = FastAPI()
+    app.include_router(job_routes.router, prefix="/jobs")
+
+    def override_db():
+        session = Session()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_db
+    job_routes.job_service = jobs
+    job_routes.SessionLocal = Session
+    client = TestClient(app)
+
+    response = client.get(f"/jobs/{job.id}/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    results = [(event_id, data) for event, event_id, data in events if event == "result"]
+    assert [data["index"] for _, data in results] == list(range(7))
+    assert [data["rainfall"] for _, data in results] == [float(i) for i in range(7)]
+    assert [event_id for event_id, _ in results] == [None, None, "0", None, None, "1", "2"]
+    assert events[-1][0] == "done" and events[-1][2]["status"] == "completed"
+    print("✅ Job results streamed in order with resumable chunk IDs")
+
+    resumed = parse_events(client.get(f"/jobs/{job.id}/events", headers={"Last-Event-ID": "1"}).text)
+    assert [data["index"] for event, _, data in resumed if event == "result"] == [6]
+    print("✅ Reconnect with Last-Event-ID skips chunks already received")
+
+    # 4. Cancelled jobs close the stream with error entries for unprocessed items
+    job = jobs.create_crop_job(db, rows[:2])
+    jobs.cancel_job(db, job)
+    events = parse_events(client.get(f"/jobs/{job.id}/events").text)
+    assert [event for event, _, _ in events] == ["result", "result", "progress", "done"]
+    assert events[0][2]["error"] == "Chunk pending" and events[-1][2]["status"] == "cancelled"
+    print("✅ Cancelled job streams terminate")
+    db.close()
+
+
+if __name__ == "__main__":
+    test_streaming()
\ No newline at end of file
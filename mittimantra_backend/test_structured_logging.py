@@ -0,0 +1,92 @@
+"""
+Structured Logging Test
+Checks JSON records, request-ID correlation and per-route sampling
+"""
+import sys
+import os
+import io
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.concurrency import run_in_threadpool
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.middleware.request_context import RequestContextMiddleware
+from app.utils.logging_config import RequestSampler, configure_logging, shutdown_logging
+
+logger = logging.getLogger("test_structured_logging")
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(
+        RequestContextMiddleware,
+        sampler=RequestSampler(RequestSampler.parse_rates("/quiet=0"))
+    )
+
+    def service_call(name):
+        logger.info("Service handled %s", name, extra={"item": name})
+
+    @app.get("/loud/{name}")
+    async def loud(name: str):
+        await run_in_threadpool(service_call, name)
+        return {"name": name}
+
+    @app.get("/quiet/{name}")
+    async def quiet(name: str):
+        logger.info("Quiet info %s", name)
+        logger.warning("Quiet warning %s", name)
+        return {"name": name}
+
+    return app
+
+
+def read_records(stream):
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines() if line.startswith("{")]
+
+
+def test_structured_logging():
+    print("=" * 60)
+    print("TESTING STRUCTURED LOGGING")
+    print("=" * 60)
+
+    stream = io.StringIO()
+    configure_logging(level="INFO", log_format="json", stream=stream)
+    try:
+        client = TestClient(build_app())
+
+        # 1. Request IDs are echoed and attached to records from threadpool code
+        response = client.get("/loud/wheat", headers={"X-Request-ID": "req-123"})
+        assert response.headers["x-request-id"] == "req-123"
+        generated = client.get("/loud/rice").headers["x-request-id"]
+        assert len(generated) == 32
+        invalid = client.get("/loud/maize", headers={"X-Request-ID": "bad id!"}).headers["x-request-id"]
+        assert invalid != "bad id!"
+
+        # 2. Sampled-out routes keep warnings only
+        client.get("/quiet/potato")
+    finally:
+        records = read_records(stream)
+        configure_logging(level="INFO", log_format="text")
+
+    service = [record for record in records if record["logger"] == "test_structured_logging"]
+    wheat = next(record for record in service if record.get("item") == "wheat")
+    assert wheat["request_id"] == "req-123"
+    assert wheat["message"] == "Service handled wheat"
+    assert wheat["request_path"] == "/loud/wheat"
+    assert any(record.get("request_id") == generated for record in service)
+    print("✅ Records carry the request ID across the threadpool")
+
+    messages = [record["message"] for record in service]
+    assert "Quiet warning potato" in messages
+    assert "Quiet info potato" not in messages
+    print("✅ Sampling drops INFO records but keeps warnings")
+
+
+if __name__ == "__main__":
+    test_structured_logging()
\ No newline at end of file
@@ -0,0 +1,93 @@
+"""
+Test-Time Augmentation Test
+Checks augmented views and that only low-confidence disease predictions are re-scored in one batch
+"""
+import sys
+import os
+
+import numpy as np
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services.disease_service import DiseaseDetectionService
+from app.utils.image_utils import MAX_TTA_VIEWS, augment_views
+
+
+class ViewModel:
+    """Two classes: confidence in class 0 follows the mean of the left half of the image"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, batch, verbose=0):
+        self.batch_sizes.append(len(batch))
+        left = batch[:, :, :batch.shape[2] // 2].mean(axis=(1, 2, 3))
+        return np.stack([left, 1 - left], axis=1)
+
+
+def make_service(views=8, threshold=0.8):
+    service = DiseaseDetectionService.__new__(DiseaseDetectionService)
+    service.model = ViewModel()
+    service.input_shape = (8, 8)
+    service.DISEASE_CLASSES = ["Tomato___Late_blight", "Tomato___healthy"]
+    service.tta_views = views
+    service.tta_threshold = threshold
+    service.leaf_tiles = 0
+    return service
+
+
+def test_tta():
+    print("Testing test-time augmentation...")
+
+    # 1. Views: original first, then flips, crops and zooms with the same shape
+    image = np.random.default_rng(0).random((8, 8, 3)).astype(np.float32)
+    views = augment_views(image, 8)
+    assert views.shape == (8, 8, 8, 3) and views.dtype == np.float32
+    assert np.array_equal(views[0], image)
+    assert np.array_equal(views[1], image[:, ::-1])
+    assert augment_views(image, 100).shape[0] == MAX_TTA_VIEWS
+    assert augment_views(image, 0).shape[0] == 1
+    print("✅ Augmented views built with NumPy indexing")
+
+    # 2. Confident predictions are not augmented
+    confident = np.zeros((8, 8, 3), dtype=np.float32)
+    confident[:, :4] = 0.95
+    service = make_service()
+    predictions = service._augment_low_confidence([confident], service.model.predict(confident[None]))
+    assert service.model.batch_sizes == [1]
+    assert predictions[0][0] > 0.9
+    print("✅ Confident predictions skip augmentation")
+
+    # 3. Uncertain images are re-scored together in one batch and averaged with the original
+    uncertain = np.zeros((8, 8, 3), dtype=np.float32)
+    uncertain[:, :4] = 0.6
+    service = make_service()
+    originals = service.model.predict(np.stack([confident, uncertain, uncertain]))
+    predictions = service._augment_low_confidence([confident, uncertain, uncertain], originals)
+    assert service.model.batch_sizes == [3, 14]
+    assert np.array_equal(predictions[0], originals[0])
+    expected = np.concatenate([originals[1:2], service.model.predict(augment_views(uncertain, 8)[1:])]).mean(axis=0)
+    assert np.allclose(predictions[1], expected) and np.allclose(predictions[2], expected)
+    # Flipping moves the blank right half into view, so the average drops below the original
+    assert predictions[1][0] < originals[1][0]
+    assert np.allclose(predictions.sum(axis=1), 1)
+    print("✅ Low-confidence images averaged over one batched forward pass")
+
+    # 4. Disabled
+    service = make_service(views=0)
+    predictions = service._augment_low_confidence([uncertain], service.model.predict(uncertain[None]))
+    assert service.model.batch_sizes == [1]
+    print("✅ DISEASE_TTA_VIEWS=0 disables augmentation")
+
+    # 5. Leaf crops and tiles of several images share one forward pass, averaged per image
+    service = make_service()
+    predictions = service._predict_crops([np.stack([confident, uncertain]), confident[None]])
+    assert service.model.batch_sizes == [3]
+    assert np.allclose(predictions[0], service.model.predict(np.stack([confident, uncertain])).mean(axis=0))
+    assert np.allclose(predictions[1], service.model.predict(confident[None])[0])
+    print("✅ Leaf tiles averaged per image")
+
+
+if __name__ == "__main__":
+    test_tta()
\ No newline at end of file
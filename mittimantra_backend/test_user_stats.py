@@ -0,0 +1,101 @@
+"""
+User Statistics Test
+Checks that concurrent predictions never lose increments and that the backfill rebuild matches them
+"""
+import sys
+import os
+import tempfile
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+import backfill_user_stats as backfill
+from app.auth import get_password_hash
+from app.database import Base
+from app.db_models import User, UserStats
+from app.services.history_service import PredictionHistoryService
+
+FEATURES = dict(nitrogen=90.0, phosphorus=42.0, potassium=43.0, temperature=21.0, humidity=82.0, ph=6.5, rainfall=203.0)
+IRRIGATION = dict(crop_type="rice", soil_moisture=35.0, temperature=30.0, humidity=60.0, rainfall=0.0, crop_stage="vegetative")
+
+
+def irrigation_result(water_amount):
+    return dict(irrigation_needed=water_amount > 0, water_amount=water_amount, schedule="today",
+                next_irrigation="tomorrow", reasoning="dry soil")
+
+
+def test_user_stats():
+    print("Testing user statistics...")
+    workdir = tempfile.mkdtemp()
+    engine = create_engine(
+        f"sqlite:///{os.path.join(workdir, 'stats.db')}",
+        connect_args={"check_same_thread": False, "timeout": 30}
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    users = [User(email=f"farmer{i}@example.com", username=f"farmer{i}", hashed_password=get_password_hash("secret123"))
+             for i in range(2)]
+    db.add_all(users)
+    db.commit()
+    user_ids = [user.id for user in users]
+    service = PredictionHistoryService()
+
+    # 1. Eight writers record predictions for the same users at once
+    per_thread = 10
+    errors = []
+
+    def writer(index):
+        session = Session()
+        try:
+            for i in range(per_thread):
+                user_id = user_ids[(index + i) % 2]
+                service.record_crop_prediction(session, FEATURES, {"recommended_crop": ["rice", "maize"][i % 2]}, user_id)
+                service.record_disease_prediction(session, {"disease": "Tomato___Early_blight", "confidence": 0.8}, user_id)
+                service.record_irrigation_schedule(session, IRRIGATION, irrigation_result(12.5 if i % 3 else 0.0), user_id)
+            # Anonymous predictions are stored but not counted
+            service.record_crop_prediction(session, FEATURES, {"recommended_crop": "rice"})
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=writer, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+    stats = [service.stats_service.get_stats(db, user_id) for user_id in user_ids]
+    for user_stats in stats:
+        assert user_stats["crop_prediction_count"] == 40
+        assert user_stats["disease_prediction_count"] == 40
+        assert user_stats["irrigation_schedule_count"] == 40
+        assert {item["crop"]: item["count"] for item in user_stats["top_crops"]} == {"rice": 20, "maize": 20}
+        assert user_stats["total_water_recommended"] == sum(item["water_amount"] for item in user_stats["water_by_month"])
+    assert sum(user_stats["total_water_recommended"] for user_stats in stats) == 8 * 6 * 12.5
+    print("✅ No increments lost under concurrent writers")
+
+    # 2. Rebuilding from the prediction tables gives the same statistics
+    db.query(UserStats).filter(UserStats.user_id == user_ids[0]).update({"crop_prediction_count": 0, "crop_counts": None})
+    db.commit()
+    assert service.stats_service.rebuild(db, user_id=user_ids[0]) == 1
+    assert service.stats_service.get_stats(db, user_ids[0]) == stats[0]
+    db.close()
+
+    backfill.SessionLocal = Session
+    backfill.backfill_user_stats()
+    db = Session()
+    assert [service.stats_service.get_stats(db, user_id) for user_id in user_ids] == stats
+    assert db.query(UserStats).count() == 2
+    db.close()
+    print("✅ Rebuild matches the incrementally maintained statistics")
+
+
+if __name__ == "__main__":
+    test_user_stats()
\ No newline at end of file
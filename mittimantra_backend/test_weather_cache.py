@@ -0,0 +1,111 @@
+"""
+Weather Forecast Cache Test
+Checks single-flight fetches, TTL expiry, the LRU size bound and the day boundary of the forecast cache
+"""
+import sys
+import os
+import threading
+import time
+from datetime import date, timedelta
+
+# Add project root to sys.path
+sys.path.append(os.getcwd())
+
+from app.services import weather_service as weather_module
+from app.services.weather_service import ForecastCache, WeatherProvider, WeatherService
+
+
+class SlowProvider(WeatherProvider):
+    """Provider that takes a while to answer and can be made to fail"""
+
+    name = "slow"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.failing = False
+
+    def get_forecast(self, latitude, longitude, days):
+        time.sleep(self.delay)
+        if self.failing:
+            raise RuntimeError("upstream unavailable")
+        today = weather_module.date.today()
+        return [{"date": (today + timedelta(days=offset)).isoformat(), "temperature": 25.0 + offset,
+                 "temp_min": 20.0, "temp_max": 30.0, "humidity": 60.0, "rainfall": 0.0} for offset in range(days)]
+
+
+class Tomorrow(date):
+    """date whose today() is one day ahead"""
+
+    @classmethod
+    def today(cls):
+        return date.today() + timedelta(days=1)
+
+
+def test_weather_cache():
+    print("Testing weather forecast cache...")
+
+    # 1. Concurrent misses in one grid cell share a single provider call
+    provider = SlowProvider(delay=0.2)
+    service = WeatherService(provider=provider, ttl_seconds=0.5, grid_resolution=0.25)
+    results = []
+    threads = [
+        threading.Thread(target=lambda i=i: results.append(service.get_forecast(28.61 + i * 0.01, 77.21, days=3)))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert service.upstream_calls == 1 and len(results) == 8
+    assert all(result == results[0] for result in results) and len(results[0]) == 3
+    stats = service.get_cache_stats()
+    assert stats["cache_misses"] == 1 and stats["cache_hits"] == 7
+    print("✅ Concurrent misses fetched once")
+
+    # 2. Entries are served until the TTL passes, then refreshed; a failed refresh serves stale data
+    provider.delay = 0.0
+    service.get_forecast(28.61, 77.21)
+    assert service.upstream_calls == 1
+    time.sleep(0.6)
+    service.get_forecast(28.61, 77.21)
+    assert service.upstream_calls == 2
+    time.sleep(0.6)
+    provider.failing = True
+    assert service.get_forecast(28.61, 77.21, days=2) == results[0][:2]
+    assert service.upstream_calls == 3
+    provider.failing = False
+    print("✅ TTL expiry refetches, stale data served when the refresh fails")
+
+    # 3. After midnight the forecast is fetched again instead of serving yesterday as day 0
+    weather_module.date = Tomorrow
+    try:
+        forecast = service.get_forecast(28.61, 77.21)
+    finally:
+        weather_module.date = date
+    assert service.upstream_calls == 4
+    assert forecast[0]["date"] == (date.today() + timedelta(days=1)).isoformat()
+    print("✅ Cache keyed by the forecast start date")
+
+    # 4. The cache holds at most max_entries, evicting the least recently used
+    cache = ForecastCache(ttl_seconds=60, max_entries=3)
+    fetches = []
+
+    def fetcher(key):
+        def fetch():
+            fetches.append(key)
+            return [{"cell": key}]
+        return fetch
+
+    for key in range(3):
+        cache.get_or_fetch((key,), fetcher(key))
+    cache.get_or_fetch((0,), fetcher(0))
+    cache.get_or_fetch((3,), fetcher(3))
+    assert len(cache) == 3 and len(cache._locks) == 3
+    assert cache.get_or_fetch((0,), fetcher(0)) == [{"cell": 0}]
+    cache.get_or_fetch((1,), fetcher(1))
+    assert fetches == [0, 1, 2, 3, 1] and len(cache) == 3 and len(cache._locks) == 3
+    print("✅ Cache bounded by LRU eviction")
+
+
+if __name__ == "__main__":
+    test_weather_cache()
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Crop Model Training Script
+Retrains the crop model offline from stored predictions with farmer feedback (and optional seed data)
+
+Usage:
+    python train_crop_model.py --seed-data data/Crop_recommendation.csv --promote
+"""
+
+import argparse
+
+from app.services.crop_training import (
+    CANDIDATES, TRAINING_CHUNK_SIZE, TRAINING_OUTPUT_DIR, CropTrainingPipeline, promote
+)
+from app.services.model_registry import MODELS_DIR
+from app.services.shadow_service import SHADOW_MODELS_DIR
+
+
+def train_crop_model(args):
+    """Train candidates, report their scores and write the best as a new artifact"""
+    from app.database import SessionLocal
+
+    print("=" * 60)
+    print("CROP MODEL TRAINING")
+    print("=" * 60)
+
+    pipeline = CropTrainingPipeline(
+        candidates={name: CANDIDATES[name] for name in args.candidates},
+        output_dir=args.output,
+        chunk_size=args.chunk_size,
+        holdout_fraction=args.holdout,
+        n_jobs=args.n_jobs
+    )
+    db = None if args.no_db else SessionLocal()
+    try:
+        features, labels, sources = pipeline.load_data(db, args.seed_data, args.include_unconfirmed)
+    finally:
+        if db is not None:
+            db.close()
+    print(f"\nLoaded {len(labels)} rows: " + ", ".join(f"{source}={count}" for source, count in sources.items()))
+
+    report = pipeline.train(features, labels, sources, baseline_dir=MODELS_DIR)
+
+    print(f"\n{'candidate':<15}{'accuracy':>10}{'macro F1':>10}{'train s':>10}{'peak MB':>10}")
+    for name, result in report["candidates"].items():
+        if "macro_f1" in result:
+            print(f"{name:<15}{result['accuracy']:>10}{result['macro_f1']:>10}{result['train_seconds']:>10}{result['peak_rss_mb']:>10}")
+        else:
+            print(f"{name:<15}  {result.get('skipped') or result.get('failed')}")
+    if report["production"]:
+        print(f"{'(production)':<15}{report['production']['accuracy']:>10}{report['production']['macro_f1']:>10}")
+
+    print(f"\n✅ {report['winner']} saved as {report['artifact']} in {report['total_seconds']}s (peak {report['peak_rss_mb']} MB)")
+    if args.promote:
+        promote(report["artifact"], SHADOW_MODELS_DIR)
+        print(f"✅ Copied to {SHADOW_MODELS_DIR} for shadow evaluation")
+    print("\n" + "=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retrain the crop recommendation model offline")
+    parser.add_argument("--seed-data", help="Labelled CSV to train on alongside feedback (e.g. Crop_recommendation.csv)")
+    parser.add_argument("--no-db", action="store_true", help="Train on the seed data only")
+    parser.add_argument("--include-unconfirmed", action="store_true",
+                        help="Also use predictions without feedback, labelled with the model's own recommendation")
+    parser.add_argument("--candidates", nargs="+", choices=sorted(CANDIDATES), default=list(CANDIDATES))
+    parser.add_argument("--holdout", type=float, default=0.2, help="Share of each crop held out for evaluation")
+    parser.add_argument("--chunk-size", type=int, default=TRAINING_CHUNK_SIZE, help="Rows per database round trip")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="CPU cores to use (-1 for all)")
+    parser.add_argument("--output", default=TRAINING_OUTPUT_DIR, help="Directory for versioned artifacts")
+    parser.add_argument("--promote", action="store_true", help="Copy the new model to SHADOW_MODELS_DIR")
+    train_crop_model(parser.parse_args())
\ No newline at end of file
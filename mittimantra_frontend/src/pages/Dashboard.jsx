@@ -9,11 +9,46 @@ const Dashboard = () => {
   const [loading, setLoading] = useState(true);
   const [insights, setInsights] = useState(null);
   const [cropPatterns, setCropPatterns] = useState(null);
+  const [analytics, setAnalytics] = useState(null);
+  const [historyKind, setHistoryKind] = useState('crop');
+  const [historyItems, setHistoryItems] = useState([]);
+  const [historyCursor, setHistoryCursor] = useState(null);
+  const [historyLoading, setHistoryLoading] = useState(false);
 
   useEffect(() => {
     fetchDashboardData();
   }, []);
 
+  useEffect(() => {
+    setHistoryItems([]);
+    setHistoryCursor(null);
+    fetchHistoryPage(historyKind, null);
+  }, [historyKind]);
+
+  const fetchHistoryPage = async (kind, cursor) => {
+    setHistoryLoading(true);
+    try {
+      const page = await apiService.getHistory(kind, cursor);
+      setHistoryItems((items) => (cursor ? [...items, ...page.items] : page.items));
+      setHistoryCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Error fetching history:', error);
+      toast.error('Failed to load history');
+    } finally {
+      setHistoryLoading(false);
+    }
+  };
+
+  const describeHistoryItem = (item) => {
+    if (historyKind === 'crop') {
+      return `${item.recommended_crop} (pH ${item.ph}, rainfall ${item.rainfall}mm)`;
+    }
+    if (historyKind === 'disease') {
+      return `${item.disease} on ${item.affected_plant || 'plant'} (${Math.round((item.confidence || 0) * 100)}%)`;
+    }
+    return `${item.crop_type} - ${item.irrigation_needed ? `${item.water_amount} mm needed` : 'no irrigation needed'}`;
+  };
+
   const fetchDashboardData = async () => {
     setLoading(true);
     try {
@@ -23,6 +58,9 @@ const Dashboard = () => {
       ]);
       setInsights(insightsData);
       setCropPatterns(patternsData);
+      apiService.getMyAnalytics()
+        .then(setAnalytics)
+        .catch((error) => console.error('Error fetching analytics:', error));
     } catch (error) {
       console.error('Error fetching dashboard data:', error);
       toast.error('Failed to load dashboard data');
@@ -37,21 +75,21 @@ const Dashboard = () => {
     {
       icon: FaSeedling,
       title: 'Crop Recommendations',
-      value: '0',
+      value: String(analytics?.crop_prediction_count ?? 0),
       color: 'bg-green-500',
       description: 'Total recommendations made'
     },
     {
       icon: FaLeaf,
       title: 'Diseases Detected',
-      value: '0',
+      value: String(analytics?.disease_prediction_count ?? 0),
       color: 'bg-emerald-500',
       description: 'Plant diseases identified'
     },
     {
       icon: FaTint,
       title: 'Irrigation Schedules',
-      value: '0',
+      value: String(analytics?.irrigation_schedule_count ?? 0),
       color: 'bg-blue-500',
       description: 'Smart schedules created'
     },
@@ -308,6 +346,52 @@ const Dashboard = () => {
           )}
         </div>
 
+        {/* Prediction History */}
+        <motion.div
+          initial={{ opacity: 0, y: 20 }}
+          animate={{ opacity: 1, y: 0 }}
+          transition={{ delay: 0.75 }}
+          className="mt-12 card"
+        >
+          <div className="flex items-center justify-between mb-6">
+            <h2 className="text-xl font-bold text-gray-900">Your History</h2>
+            <div className="flex gap-2">
+              {['crop', 'disease', 'irrigation'].map((kind) => (
+                <button
+                  key={kind}
+                  onClick={() => setHistoryKind(kind)}
+                  className={`px-3 py-1 rounded-full text-sm font-medium capitalize ${
+                    historyKind === kind ? 'bg-primary-600 text-white' : 'bg-gray-100 text-gray-700'
+                  }`}
+                >
+                  {kind}
+                </button>
+              ))}
+            </div>
+          </div>
+          {historyItems.length === 0 && !historyLoading ? (
+            <p className="text-gray-500 text-sm">No {historyKind} history yet</p>
+          ) : (
+            <ul className="divide-y divide-gray-100">
+              {historyItems.map((item) => (
+                <li key={item.id} className="py-3 flex justify-between text-sm">
+                  <span className="text-gray-900 capitalize">{describeHistoryItem(item)}</span>
+                  <span className="text-gray-500">{new Date(item.created_at).toLocaleString()}</span>
+                </li>
+              ))}
+            </ul>
+          )}
+          {historyCursor && (
+            <button
+              onClick={() => fetchHistoryPage(historyKind, historyCursor)}
+              disabled={historyLoading}
+              className="mt-4 text-primary-600 text-sm font-medium"
+            >
+              {historyLoading ? 'Loading...' : 'Load more'}
+            </button>
+          )}
+        </motion.div>
+
         {/* Info Box */}
         <motion.div
           initial={{ opacity: 0, y: 20 }}
@@ -37,6 +37,51 @@ api.interceptors.response.use(
   }
 );
 
+// Read a text/event-stream response body, calling onEvent(type, data) per event
+const readEventStream = async (response, onEvent) => {
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let type = 'message';
+      const data = [];
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event: ')) type = line.slice(7);
+        else if (line.startsWith('data: ')) data.push(line.slice(6));
+      }
+      if (data.length) onEvent(type, JSON.parse(data.join('\n')));
+    }
+  }
+};
+
+// POST to a batch endpoint with ?stream=true (EventSource only supports GET)
+const streamBatch = async (path, body, onEvent) => {
+  const headers = { Accept: 'text/event-stream' };
+  const token = localStorage.getItem('token');
+  if (token) {
+    headers.Authorization = `Bearer ${token}`;
+  }
+  if (!(body instanceof FormData)) {
+    headers['Content-Type'] = 'application/json';
+    body = JSON.stringify(body);
+  }
+
+  const response = await fetch(`${API_BASE_URL}${path}?stream=true`, { method: 'POST', headers, body });
+  if (!response.ok) {
+    throw new Error((await response.json()).detail || `Request failed (${response.status})`);
+  }
+  await readEventStream(response, onEvent);
+};
+
 // API Services
 export const apiService = {
   // Health check
@@ -64,6 +109,30 @@ export const apiService = {
     return response.data;
   },
 
+  // Bulk predictions, streamed: onEvent('result' | 'progress' | 'done' | 'error', data)
+  streamCropBatch: (rows, onEvent, lane = 'bulk') =>
+    streamBatch('/predict-crop/batch', { rows, lane }, onEvent),
+
+  streamDiseaseBatch: (files, onEvent, lane = 'bulk') => {
+    const formData = new FormData();
+    files.forEach((file) => formData.append('files', file));
+    formData.append('lane', lane);
+    return streamBatch('/predict-disease/batch', formData, onEvent);
+  },
+
+  // Background job progress and results; returns the EventSource (call close() to stop)
+  watchJob: (jobId, onEvent) => {
+    const source = new EventSource(`${API_BASE_URL}/jobs/${jobId}/events`, { withCredentials: true });
+    ['result', 'progress'].forEach((type) =>
+      source.addEventListener(type, (event) => onEvent(type, JSON.parse(event.data)))
+    );
+    source.addEventListener('done', (event) => {
+      onEvent('done', JSON.parse(event.data));
+      source.close();
+    });
+    return source;
+  },
+
   // Irrigation Scheduler
   getIrrigationSchedule: async (data) => {
     const response = await api.post('/irrigation-schedule', data);
@@ -115,6 +184,22 @@ export const apiService = {
     return response.data;
   },
 
+  // Per-user Analytics
+  getMyAnalytics: async () => {
+    const response = await api.get('/api/analytics/me');
+    return response.data;
+  },
+
+  // Prediction History (keyset pagination: pass next_cursor from the previous page)
+  getHistory: async (kind, cursor = null, limit = 20) => {
+    const params = { limit };
+    if (cursor) {
+      params.cursor = cursor;
+    }
+    const response = await api.get(`/api/history/${kind}`, { params });
+    return response.data;
+  },
+
   // Farmer Insights
   getFarmerInsights: async () => {
     const response = await api.get('/farmer-insights');